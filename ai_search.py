@@ -5,11 +5,19 @@ AI 智能搜索模块
 当热搜筛选结果不足时，自动搜索相关资讯并使用 AI 筛选
 """
 
+import hashlib
 import json
 import os
+import random
+import re
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 import requests
 
 # 清除代理环境变量，避免代理问题
@@ -21,6 +29,212 @@ os.environ.pop('https_proxy', None)
 # 使用 requests 调用硅基流动 API（OpenAI 兼容格式）
 AI_AVAILABLE = True
 
+# 出站 HTTP 客户端：由 main.py 注入共享的 HttpClient；单独使用本模块时退回到模块内共享的 Session，
+# 两种情况下同一主机的请求都复用连接
+_http_client = None
+_session = requests.Session()
+_session.trust_env = False  # 禁用环境变量代理
+
+
+def set_http_client(client) -> None:
+    """设置共享的 HTTP 客户端（需提供 post(url, retries=..., **kwargs)）"""
+    global _http_client
+    _http_client = client
+
+
+def _post(url: str, **kwargs) -> requests.Response:
+    """发送 POST 请求（重试由调用方负责）"""
+    if _http_client is not None:
+        return _http_client.post(url, retries=0, **kwargs)
+    return _session.post(url, **kwargs)
+
+
+# Serper 新闻搜索接口
+SERPER_API_URL = "https://google.serper.dev/news"
+
+# 每次 AI 搜索最多推送的资讯条数
+MAX_FILTERED_RESULTS = 15
+
+# 跨订阅搜索时同时进行的搜索数
+DEFAULT_SEARCH_CONCURRENCY = 4
+
+# 评分提示词版本：修改提示词或评分标准时递增，旧的缓存评分随之失效
+PROMPT_VERSION = 1
+
+# 评分缓存文件与默认有效期（小时），有效期为 0 时不使用缓存
+SCORE_CACHE_PATH = Path("output") / "ai_score_cache.json"
+DEFAULT_SCORE_CACHE_TTL_HOURS = 72
+
+# AI 评分分块：每块新闻数、同时评分的块数、每块的重试次数与退避基数（秒）
+DEFAULT_SCORE_CHUNK_SIZE = 10
+DEFAULT_SCORE_CONCURRENCY = 4
+SCORE_MAX_RETRIES = 3
+SCORE_RETRY_BACKOFF = 1.0
+
+# 规范化 URL 时去掉的跟踪参数
+_TRACKING_PARAMS = {"spm", "from", "source", "share_token", "share_source", "fbclid", "gclid"}
+
+
+class ScoreCache:
+    """AI 相关度评分的持久化缓存
+
+    键由文章（规范化 URL，没有 URL 时用标题）与评分上下文（订阅关键字集合、模型、
+    提示词版本、相关度阈值）共同决定。上一次运行已评过分的文章不再发送给大模型，
+    直接沿用缓存的评分。条目超过有效期后失效。
+    """
+
+    def __init__(self, path: Path, ttl_hours: float):
+        """
+        初始化评分缓存
+
+        Args:
+            path: 缓存文件路径
+            ttl_hours: 有效期（小时）
+        """
+        self.path = Path(path)
+        self.ttl_seconds = ttl_hours * 3600
+        self.hits = 0
+        self.misses = 0
+        self._entries: Optional[Dict[str, Dict]] = None  # 首次使用时加载
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def normalize_url(url: str) -> str:
+        """规范化 URL：主机名小写，去掉锚点、跟踪参数和末尾斜杠，参数排序"""
+        url = (url or "").strip()
+        if not url:
+            return ""
+        try:
+            parts = urlsplit(url)
+        except ValueError:
+            return url
+        query = sorted(
+            (name, value)
+            for name, value in parse_qsl(parts.query, keep_blank_values=True)
+            if not name.lower().startswith("utm_") and name.lower() not in _TRACKING_PARAMS
+        )
+        return urlunsplit((
+            parts.scheme.lower(),
+            parts.netloc.lower(),
+            parts.path.rstrip("/"),
+            urlencode(query),
+            "",
+        ))
+
+    @classmethod
+    def article_key(cls, news: Dict) -> str:
+        """文章标识：规范化 URL，没有 URL 时用去掉空白的小写标题"""
+        url = cls.normalize_url(news.get("link", ""))
+        if url:
+            return "url:" + url
+        return "title:" + re.sub(r"\s+", "", news.get("title", "")).lower()
+
+    @staticmethod
+    def context_key(keywords: List[str], model: str, threshold) -> str:
+        """评分上下文：关键字集合、模型、提示词版本和阈值相同的评分才能复用"""
+        return json.dumps(
+            [sorted(set(keywords)), model, PROMPT_VERSION, threshold],
+            ensure_ascii=False
+        )
+
+    def make_key(self, news: Dict, context: str) -> str:
+        """缓存键（文章标识与评分上下文的哈希）"""
+        raw = f"{context}\n{self.article_key(news)}"
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def _load(self) -> Dict[str, Dict]:
+        """加载缓存文件并丢弃过期条目（调用方持有锁）"""
+        if self._entries is None:
+            entries = {}
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if isinstance(data, dict):
+                    entries = data.get("entries", {})
+            except FileNotFoundError:
+                pass
+            except (OSError, ValueError) as e:
+                print(f"   [警告] 评分缓存读取失败，将重新评分: {e}")
+            now = time.time()
+            self._entries = {
+                key: entry for key, entry in entries.items()
+                if now - entry.get("time", 0) < self.ttl_seconds
+            }
+            self._dirty = len(self._entries) != len(entries)
+        return self._entries
+
+    def get(self, key: str) -> Optional[Dict]:
+        """
+        查询缓存的评分
+
+        Returns:
+            {"score": 分数, "reason": 理由}；score 为 None 表示上次评分未达阈值。
+            没有缓存或已过期时返回 None
+        """
+        with self._lock:
+            entry = self._load().get(key)
+            if entry is not None and time.time() - entry.get("time", 0) >= self.ttl_seconds:
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return {"score": entry.get("score"), "reason": entry.get("reason", "")}
+
+    def put(self, key: str, score, reason: str = "") -> None:
+        """记录评分（score 为 None 表示未达阈值）"""
+        with self._lock:
+            self._load()[key] = {"score": score, "reason": reason, "time": time.time()}
+            self._dirty = True
+
+    def save(self) -> None:
+        """有改动时写回缓存文件（先写临时文件再替换）"""
+        with self._lock:
+            if not self._dirty:
+                return
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = self.path.with_name(self.path.name + ".tmp")
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(
+                        {"version": PROMPT_VERSION, "entries": self._entries},
+                        f, ensure_ascii=False
+                    )
+                os.replace(tmp_path, self.path)
+                self._dirty = False
+            except OSError as e:
+                print(f"   [警告] 评分缓存保存失败: {e}")
+
+
+# 评分缓存实例（按文件路径共享，同一次运行中的多个订阅共用）
+_score_caches: Dict[str, ScoreCache] = {}
+_score_caches_lock = threading.Lock()
+
+
+def get_score_cache(path: Path = SCORE_CACHE_PATH,
+                    ttl_hours: float = DEFAULT_SCORE_CACHE_TTL_HOURS) -> Optional[ScoreCache]:
+    """
+    获取评分缓存实例
+
+    Args:
+        path: 缓存文件路径
+        ttl_hours: 有效期（小时），不大于 0 时不使用缓存
+
+    Returns:
+        评分缓存实例；不使用缓存时返回 None
+    """
+    if not ttl_hours or ttl_hours <= 0:
+        return None
+    key = str(Path(path).resolve())
+    with _score_caches_lock:
+        cache = _score_caches.get(key)
+        if cache is None:
+            cache = _score_caches[key] = ScoreCache(path, ttl_hours)
+        else:
+            cache.ttl_seconds = ttl_hours * 3600
+        return cache
+
 
 class AISearchManager:
     """AI 智能搜索管理器"""
@@ -52,6 +266,20 @@ class AISearchManager:
         # AI 模型配置（硅基流动）
         self.ai_model_name = self.ai_config.get("AI_MODEL", "deepseek-ai/DeepSeek-V3")
         self.ai_api_base = self.ai_config.get("AI_API_BASE", "https://api.siliconflow.cn/v1")
+
+        self.serper_api_url = self.ai_config.get("SERPER_API_URL", SERPER_API_URL)
+
+        # 分块评分配置
+        self.score_chunk_size = self.ai_config.get("SCORE_CHUNK_SIZE", DEFAULT_SCORE_CHUNK_SIZE)
+        self.score_concurrency = self.ai_config.get("SCORE_CONCURRENCY", DEFAULT_SCORE_CONCURRENCY)
+        self.score_max_retries = SCORE_MAX_RETRIES
+        self.score_retry_backoff = SCORE_RETRY_BACKOFF
+
+        # 评分缓存
+        self.score_cache = get_score_cache(
+            self.ai_config.get("SCORE_CACHE_PATH", SCORE_CACHE_PATH),
+            self.ai_config.get("SCORE_CACHE_TTL_HOURS", DEFAULT_SCORE_CACHE_TTL_HOURS)
+        )
         
         # 验证配置
         self._validate_config()
@@ -93,7 +321,7 @@ class AISearchManager:
             
             # 限制推送条数，最多 15 条
             if filtered_results:
-                filtered_results = filtered_results[:15]
+                filtered_results = filtered_results[:MAX_FILTERED_RESULTS]
 
             print(f"[成功] AI 筛选后保留 {len(filtered_results)} 条高质量新闻")
             
@@ -110,7 +338,9 @@ class AISearchManager:
             print(f"[错误] AI 搜索出错: {e}")
             return []
     
-    def _search_with_serper(self) -> List[Dict]:
+    def _search_with_serper(
+        self, perform_search: Optional[Callable[[str, str], List[Dict]]] = None
+    ) -> List[Dict]:
         """
         使用 Serper API 搜索新闻（多轮搜索策略）
         
@@ -118,83 +348,22 @@ class AISearchManager:
         1. 优先使用主关键字（订阅关键字）搜索，目标获取30条结果
         2. 如果结果不足（< 20条），使用备用关键字补充搜索
         
+        Args:
+            perform_search: 执行单次查询的函数 (query, round_name) -> 结果列表，
+                默认为 self._perform_search（跨订阅计划时传入共享查询结果的版本）
+        
         Returns:
             搜索结果列表（去重后）
         """
         all_results = []
         seen_urls = set()  # 用于去重
-        
-        # API 请求参数
-        url = "https://google.serper.dev/news"
-        headers = {
-            "X-API-KEY": self.serper_api_key,
-            "Content-Type": "application/json"
-        }
-        
-        def _perform_search(query: str, round_name: str) -> List[Dict]:
-            """执行单次搜索"""
-            payload = {
-                "q": query,
-                "num": self.max_results,
-                "gl": "cn",  # 地区：中国
-                "hl": "zh-cn",  # 语言：中文
-                "tbs": f"qdr:d"  # 时间：过去一天
-            }
-            
-            print(f"[搜索] {round_name}: {query}")
-            print(f"   搜索范围: 过去 {self.time_range_hours} 小时")
-            
-            # 发送请求（添加重试机制）
-            max_retries = 3
-            for attempt in range(max_retries):
-                try:
-                    # 创建 session 并禁用代理
-                    session = requests.Session()
-                    session.trust_env = False  # 禁用环境变量代理
-                    
-                    response = session.post(
-                        url,
-                        headers=headers,
-                        json=payload,
-                        timeout=30
-                    )
-                    
-                    if response.status_code == 200:
-                        data = response.json()
-                        news_results = data.get("news", [])
-                        
-                        # 过滤时间范围
-                        filtered_news = self._filter_by_time(news_results)
-                        return filtered_news
-                    
-                    elif response.status_code == 429:
-                        # 速率限制，等待后重试
-                        wait_time = 2 ** attempt
-                        print(f"   [警告] 触发速率限制，等待 {wait_time} 秒后重试...")
-                        time.sleep(wait_time)
-                        continue
-                    
-                    else:
-                        print(f"   [错误] Serper API 错误: {response.status_code}")
-                        print(f"   响应内容: {response.text[:200]}")
-                        return []
-                
-                except requests.Timeout:
-                    if attempt < max_retries - 1:
-                        print(f"   [警告] 请求超时，重试 ({attempt + 1}/{max_retries})...")
-                        time.sleep(1)
-                        continue
-                    else:
-                        print("   [错误] 请求超时，已达到最大重试次数")
-                        return []
-            
-            return []
+        perform_search = perform_search or self._perform_search
         
         try:
             # 第一轮：使用主关键字搜索
             if self.primary_keywords:
                 query = " OR ".join(self.primary_keywords)
-                primary_results = _perform_search(query, "第一轮搜索（主关键字）")
+                primary_results = perform_search(query, "第一轮搜索（主关键字）")
                 
                 # 去重并添加到结果列表
                 for news in primary_results:
@@ -208,7 +377,7 @@ class AISearchManager:
             # 第二轮：如果结果不足，使用备用关键字补充
             if len(all_results) < 20 and self.fallback_keywords:
                 query = " OR ".join(self.fallback_keywords)
-                fallback_results = _perform_search(query, "第二轮搜索（备用关键字）")
+                fallback_results = perform_search(query, "第二轮搜索（备用关键字）")
                 
                 # 去重并添加到结果列表
                 added_count = 0
@@ -226,6 +395,84 @@ class AISearchManager:
         except Exception as e:
             print(f"[错误] Serper 搜索失败: {e}")
             return []
+
+    def _perform_search(self, query: str, round_name: str) -> List[Dict]:
+        """执行单次 Serper 搜索"""
+        headers = {
+            "X-API-KEY": self.serper_api_key,
+            "Content-Type": "application/json"
+        }
+        payload = {
+            "q": query,
+            "num": self.max_results,
+            "gl": "cn",  # 地区：中国
+            "hl": "zh-cn",  # 语言：中文
+            "tbs": f"qdr:d"  # 时间：过去一天
+        }
+        
+        print(f"[搜索] {round_name}: {query}")
+        print(f"   搜索范围: 过去 {self.time_range_hours} 小时")
+        
+        # 发送请求（添加重试机制）
+        max_retries = 3
+        for attempt in range(max_retries):
+            try:
+                response = _post(
+                    self.serper_api_url,
+                    headers=headers,
+                    json=payload,
+                    timeout=30
+                )
+                
+                if response.status_code == 200:
+                    data = response.json()
+                    news_results = data.get("news", [])
+                    
+                    # 过滤时间范围
+                    filtered_news = self._filter_by_time(news_results)
+                    return filtered_news
+                
+                elif response.status_code == 429:
+                    # 速率限制，等待后重试
+                    wait_time = 2 ** attempt
+                    print(f"   [警告] 触发速率限制，等待 {wait_time} 秒后重试...")
+                    time.sleep(wait_time)
+                    continue
+                
+                else:
+                    print(f"   [错误] Serper API 错误: {response.status_code}")
+                    print(f"   响应内容: {response.text[:200]}")
+                    return []
+            
+            except requests.Timeout:
+                if attempt < max_retries - 1:
+                    print(f"   [警告] 请求超时，重试 ({attempt + 1}/{max_retries})...")
+                    time.sleep(1)
+                    continue
+                else:
+                    print("   [错误] 请求超时，已达到最大重试次数")
+                    return []
+        
+        return []
+
+    def search_key(self) -> tuple:
+        """搜索条件：相同时两个搜索请求的 Serper 查询和结果完全相同"""
+        return (
+            tuple(sorted(set(self.primary_keywords))),
+            tuple(sorted(set(self.fallback_keywords))),
+            self.max_results,
+            self.time_range_hours,
+        )
+
+    def query_key(self, query: str) -> tuple:
+        """单次 Serper 查询的标识（OR 连接的关键字与顺序无关）"""
+        return (tuple(sorted(set(query.split(" OR ")))), self.max_results, self.time_range_hours)
+
+    def score_context(self) -> str:
+        """评分上下文：相同时同一篇文章的评分可以共用"""
+        return ScoreCache.context_key(
+            self.primary_keywords, self.ai_model_name, self.relevance_threshold
+        )
     
     def _filter_by_time(self, news_list: List[Dict]) -> List[Dict]:
         """
@@ -264,31 +511,155 @@ class AISearchManager:
         """
         使用硅基流动 AI（DeepSeek-V3）筛选和分析新闻
         
+        已缓存评分的新闻直接沿用缓存结果，只把未评过分的新闻发送给 AI。
+        
         Args:
             news_list: 搜索结果列表
             
         Returns:
-            筛选后的高质量新闻列表
+            筛选后的高质量新闻列表（保持搜索结果顺序）
         """
-        try:
-            # 构建新闻摘要供 AI 分析
-            news_summaries = []
+        flags = self._relevance_flags(news_list)
+        return [news for news, keep in zip(news_list, flags) if keep]
+
+    def _relevance_flags(self, news_list: List[Dict]) -> List[bool]:
+        """
+        为新闻评分并判断是否保留
+        
+        Args:
+            news_list: 搜索结果列表
+            
+        Returns:
+            与 news_list 等长的列表，True 表示保留（达到阈值，或评分失败按降级策略保留）
+        """
+        cache = self.score_cache
+        keys: List[Optional[str]] = [None] * len(news_list)
+        scores: Dict[int, Dict] = {}
+        pending = list(range(len(news_list)))
+
+        if cache is not None:
+            context = self.score_context()
+            pending = []
             for idx, news in enumerate(news_list):
-                summary = {
-                    "id": idx,
-                    "title": news.get("title", ""),
-                    "snippet": news.get("snippet", ""),
-                    "source": news.get("source", "")
-                }
-                news_summaries.append(summary)
+                keys[idx] = cache.make_key(news, context)
+                entry = cache.get(keys[idx])
+                if entry is None:
+                    pending.append(idx)
+                else:
+                    scores[idx] = entry
+            if scores:
+                print(f"[缓存] {len(scores)} 条新闻沿用缓存评分，{len(pending)} 条需要 AI 评分")
+
+        unscored = set()
+        if pending:
+            scored, failed = self._score_with_ai([news_list[idx] for idx in pending])
+            for local_id, idx in enumerate(pending):
+                if local_id in failed:
+                    # 降级策略：所在分块评分失败的新闻保留，也不写入缓存
+                    unscored.add(idx)
+                    continue
+                item = scored.get(local_id)
+                if item is not None:
+                    scores[idx] = {"score": item.get("score"), "reason": item.get("reason", "")}
+                else:
+                    # AI 只返回达到阈值的新闻，未返回的记为未达阈值
+                    scores[idx] = {"score": None, "reason": ""}
+                if cache is not None:
+                    cache.put(keys[idx], scores[idx]["score"], scores[idx]["reason"])
+            if cache is not None:
+                cache.save()
+
+        return [
+            idx in unscored or (idx in scores and scores[idx]["score"] is not None)
+            for idx in range(len(news_list))
+        ]
+
+    def _score_with_ai(self, news_list: List[Dict]) -> Tuple[Dict[int, Dict], Set[int]]:
+        """
+        调用 AI 为新闻评分
+        
+        新闻按固定大小分块，各块以有限的并发数同时评分，每块单独重试。
+        单个分块失败只影响该块的新闻，结果按下标合并，与分块完成顺序无关。
+        
+        Args:
+            news_list: 待评分的新闻列表（id 为列表下标）
             
-            # 构建订阅关键字信息（用于prompt）
-            keywords_info = ""
-            if self.primary_keywords:
-                keywords_info = f"订阅关键字: {', '.join(self.primary_keywords[:10])}"  # 只显示前10个
+        Returns:
+            (scored, failed)：scored 为 {id: {"id", "score", "reason"}}，只包含达到阈值的新闻；
+            failed 为所在分块评分失败的新闻 id 集合
+        """
+        chunk_size = max(1, self.score_chunk_size)
+        chunks = [
+            (start, news_list[start:start + chunk_size])
+            for start in range(0, len(news_list), chunk_size)
+        ]
+        workers = max(1, min(self.score_concurrency, len(chunks)))
+
+        print(
+            f"[AI] 正在调用 {self.ai_model_name} 进行智能筛选"
+            f"（{len(news_list)} 条，分 {len(chunks)} 块，并发 {workers}）..."
+        )
+
+        tasks = [
+            (chunk, f"分块 {number}/{len(chunks)}")
+            for number, (_, chunk) in enumerate(chunks, 1)
+        ]
+        if workers == 1:
+            results = [self._score_chunk(chunk, label) for chunk, label in tasks]
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(lambda task: self._score_chunk(*task), tasks))
+
+        scored: Dict[int, Dict] = {}
+        failed: Set[int] = set()
+        for (start, chunk), result in zip(chunks, results):
+            if result is None:
+                failed.update(range(start, start + len(chunk)))
+                continue
+            for local_id, item in result.items():
+                scored[start + local_id] = dict(item, id=start + local_id)
+
+        # 输出筛选详情
+        summary = f"   [成功] AI 分析完成，保留 {len(scored)}/{len(news_list) - len(failed)} 条"
+        if failed:
+            summary += f"，{len(failed)} 条所在分块评分失败，按降级策略保留"
+        print(summary)
+        details = [scored[idx] for idx in sorted(scored)]
+        for item in details[:3]:  # 显示前3条
+            print(f"      • ID {item['id']} (评分: {item.get('score')}/10): {item.get('reason', '')}")
+        if len(details) > 3:
+            print(f"      ... 还有 {len(details) - 3} 条")
+
+        return scored, failed
+
+    def _build_prompt(self, news_list: List[Dict]) -> str:
+        """
+        构建评分 Prompt
+        
+        Args:
+            news_list: 一个分块的新闻（id 为块内下标）
             
-            # 构建 Prompt
-            prompt = f"""你是一个专业的资讯分析专家。请分析以下新闻列表，筛选出与订阅主题强相关的高质量内容。
+        Returns:
+            Prompt 文本
+        """
+        # 构建新闻摘要供 AI 分析
+        news_summaries = []
+        for idx, news in enumerate(news_list):
+            summary = {
+                "id": idx,
+                "title": news.get("title", ""),
+                "snippet": news.get("snippet", ""),
+                "source": news.get("source", "")
+            }
+            news_summaries.append(summary)
+        
+        # 构建订阅关键字信息（用于prompt）
+        keywords_info = ""
+        if self.primary_keywords:
+            keywords_info = f"订阅关键字: {', '.join(self.primary_keywords[:10])}"  # 只显示前10个
+        
+        # 构建 Prompt
+        prompt = f"""你是一个专业的资讯分析专家。请分析以下新闻列表，筛选出与订阅主题强相关的高质量内容。
 
 **订阅主题关键字：**
 {keywords_info}
@@ -327,94 +698,92 @@ class AISearchManager:
 
 只返回评分 >= {self.relevance_threshold} 的新闻。请严格筛选，确保只保留真正相关的新闻。
 """
+        return prompt
+
+    def _score_chunk(self, news_list: List[Dict], label: str) -> Optional[Dict[int, Dict]]:
+        """
+        为一个分块的新闻评分（失败时按指数退避加随机抖动重试）
+        
+        Args:
+            news_list: 分块内的新闻（id 为块内下标）
+            label: 日志中的分块名称
             
-            print(f"[AI] 正在调用 {self.ai_model_name} 进行智能筛选...")
-            
-            # 调用硅基流动 API（OpenAI 兼容格式）
-            max_retries = 3
-            for attempt in range(max_retries):
-                try:
-                    api_url = f"{self.ai_api_base}/chat/completions"
-                    headers = {
-                        "Authorization": f"Bearer {self.ai_api_key}",
-                        "Content-Type": "application/json"
-                    }
-                    payload = {
-                        "model": self.ai_model_name,
-                        "messages": [
-                            {"role": "user", "content": prompt}
-                        ],
-                        "temperature": 0.3,
-                        "max_tokens": 2000
-                    }
-                    
-                    # 发送请求
-                    session = requests.Session()
-                    session.trust_env = False  # 禁用环境变量代理
-                    response = session.post(api_url, headers=headers, json=payload, timeout=60)
-                    
-                    if response.status_code != 200:
-                        raise Exception(f"API 返回错误: {response.status_code}, {response.text[:200]}")
-                    
-                    result_data = response.json()
-                    
-                    # 提取响应内容
-                    if "choices" in result_data and len(result_data["choices"]) > 0:
-                        response_text = result_data["choices"][0]["message"]["content"].strip()
-                    else:
-                        raise Exception(f"API 响应格式错误: {result_data}")
-                    
-                    # 提取 JSON（去除可能的 markdown 代码块标记）
-                    if "```json" in response_text:
-                        response_text = response_text.split("```json")[1].split("```")[0].strip()
-                    elif "```" in response_text:
-                        response_text = response_text.split("```")[1].split("```")[0].strip()
-                    
-                    result = json.loads(response_text)
-                    filtered_ids = [item["id"] for item in result.get("filtered_news", [])]
-                    
-                    # 返回筛选后的新闻
-                    filtered_news = [news_list[idx] for idx in filtered_ids if idx < len(news_list)]
-                    
-                    # 输出筛选详情
-                    print(f"   [成功] AI 分析完成，保留 {len(filtered_news)}/{len(news_list)} 条")
-                    for item in result.get("filtered_news", [])[:3]:  # 显示前3条
-                        print(f"      • ID {item['id']} (评分: {item['score']}/10): {item['reason']}")
-                    if len(result.get("filtered_news", [])) > 3:
-                        print(f"      ... 还有 {len(result.get('filtered_news', [])) - 3} 条")
-                    
-                    return filtered_news
+        Returns:
+            {块内 id: {"id", "score", "reason"}}，只包含达到阈值的新闻；重试后仍失败时返回 None
+        """
+        try:
+            prompt = self._build_prompt(news_list)
+        except Exception as e:
+            print(f"   [错误] {label} 构建 Prompt 失败: {e}")
+            return None
+
+        # 调用硅基流动 API（OpenAI 兼容格式）
+        api_url = f"{self.ai_api_base}/chat/completions"
+        headers = {
+            "Authorization": f"Bearer {self.ai_api_key}",
+            "Content-Type": "application/json"
+        }
+        payload = {
+            "model": self.ai_model_name,
+            "messages": [
+                {"role": "user", "content": prompt}
+            ],
+            "temperature": 0.3,
+            "max_tokens": 2000
+        }
+
+        max_retries = self.score_max_retries
+        for attempt in range(max_retries):
+            response_text = ""
+            try:
+                # 发送请求
+                response = _post(api_url, headers=headers, json=payload, timeout=60)
                 
-                except json.JSONDecodeError as e:
-                    if attempt < max_retries - 1:
-                        print(f"   [警告] JSON 解析失败，重试 ({attempt + 1}/{max_retries})...")
-                        if 'response_text' in locals():
-                            print(f"   响应内容: {response_text[:200]}...")
-                        time.sleep(1)
-                        continue
-                    else:
-                        print(f"   [错误] JSON 解析失败: {e}")
-                        # 降级策略：返回所有结果
-                        print("   [警告] 降级策略：返回所有搜索结果")
-                        return news_list
+                if response.status_code != 200:
+                    raise Exception(f"API 返回错误: {response.status_code}, {response.text[:200]}")
                 
-                except Exception as e:
-                    if attempt < max_retries - 1:
-                        print(f"   [警告] AI 调用失败，重试 ({attempt + 1}/{max_retries})...")
-                        print(f"   错误: {str(e)[:100]}")
-                        time.sleep(2)
-                        continue
-                    else:
-                        print(f"   [错误] AI 调用失败: {e}")
-                        # 降级策略：返回所有结果
-                        return news_list
-            
-            return news_list
+                result_data = response.json()
+                
+                # 提取响应内容
+                if "choices" in result_data and len(result_data["choices"]) > 0:
+                    response_text = result_data["choices"][0]["message"]["content"].strip()
+                else:
+                    raise Exception(f"API 响应格式错误: {result_data}")
+                
+                # 提取 JSON（去除可能的 markdown 代码块标记）
+                if "```json" in response_text:
+                    response_text = response_text.split("```json")[1].split("```")[0].strip()
+                elif "```" in response_text:
+                    response_text = response_text.split("```")[1].split("```")[0].strip()
+                
+                result = json.loads(response_text)
+                scored = {}
+                for item in result.get("filtered_news", []):
+                    idx = item.get("id")
+                    if isinstance(idx, int) and 0 <= idx < len(news_list):
+                        scored.setdefault(idx, item)
+                return scored
             
-        except Exception as e:
-            print(f"[错误] AI 筛选失败: {e}")
-            # 降级策略：返回所有结果
-            return news_list
+            except Exception as e:
+                if isinstance(e, json.JSONDecodeError):
+                    reason = "JSON 解析失败"
+                    detail = f"响应内容: {response_text[:200]}..."
+                else:
+                    reason = "AI 调用失败"
+                    detail = f"错误: {str(e)[:100]}"
+                if attempt < max_retries - 1:
+                    print(f"   [警告] {label} {reason}，重试 ({attempt + 1}/{max_retries})... {detail}")
+                    time.sleep(self._retry_delay(attempt))
+                    continue
+                print(f"   [错误] {label} {reason}: {str(e)[:200]}")
+                return None
+
+        return None
+
+    def _retry_delay(self, attempt: int) -> float:
+        """第 attempt 次失败后的等待时间：指数退避加随机抖动，避免各分块同时重试"""
+        base = self.score_retry_backoff * (2 ** attempt)
+        return base + random.uniform(0, self.score_retry_backoff)
     
     def _format_results(self, news_list: List[Dict]) -> List[Dict]:
         """
@@ -452,6 +821,161 @@ class AISearchManager:
         return formatted
 
 
+class _SharedQueries:
+    """跨订阅共享的 Serper 查询结果：相同查询只执行一次，并发的相同查询等待首个查询的结果"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._futures: Dict[tuple, Future] = {}
+        self.requested = 0
+        self.executed = 0
+
+    def runner(self, manager: AISearchManager) -> Callable[[str, str], List[Dict]]:
+        """生成供 manager._search_with_serper 使用的查询函数"""
+        def perform_search(query: str, round_name: str) -> List[Dict]:
+            key = manager.query_key(query)
+            with self._lock:
+                self.requested += 1
+                future = self._futures.get(key)
+                owner = future is None
+                if owner:
+                    future = self._futures[key] = Future()
+                    self.executed += 1
+            if owner:
+                try:
+                    future.set_result(manager._perform_search(query, round_name))
+                except Exception as e:
+                    print(f"   [错误] Serper 搜索失败: {e}")
+                    future.set_result([])
+            else:
+                print(f"[搜索] {round_name}: {query}（与其他订阅的查询相同，共用结果）")
+            return future.result()
+
+        return perform_search
+
+
+class AISearchPlanner:
+    """跨订阅的 AI 搜索计划
+
+    订阅模式下多个订阅可能同时需要 AI 搜索补充，关键字也常有重合。计划器先收集全部请求，
+    搜索条件相同的订阅合并为一组，各组并发搜索，相同的 Serper 查询只执行一次；
+    评分上下文（订阅关键字集合、模型、阈值）相同的各组合并文章，每篇文章只评一次分，
+    最后把各组的筛选结果分发回对应的订阅。
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_SEARCH_CONCURRENCY):
+        """
+        初始化搜索计划
+
+        Args:
+            max_workers: 同时进行的搜索数
+        """
+        self.max_workers = max_workers
+        self._requests: List[Tuple[Any, AISearchManager]] = []
+
+    def __len__(self) -> int:
+        return len(self._requests)
+
+    def add(self, request_id: Any, config: Dict) -> bool:
+        """
+        加入一个搜索请求
+
+        Args:
+            request_id: 请求标识（如订阅序号），用于取回结果
+            config: 配置字典，包含 AI_SEARCH 配置项（同 search_pension_news_with_ai）
+
+        Returns:
+            是否加入成功（未启用、未配置 API Keys 或配置无效时返回 False）
+        """
+        ai_config = config.get("AI_SEARCH", {})
+        if not ai_config.get("ENABLED", False):
+            return False
+        if not ai_config.get("SERPER_API_KEY") or not ai_config.get("AI_API_KEY"):
+            print("[警告] AI 搜索功能已启用但未配置 API Keys，跳过")
+            return False
+        try:
+            manager = AISearchManager(config)
+        except Exception as e:
+            print(f"[错误] AI 搜索出错: {e}")
+            return False
+        self._requests.append((request_id, manager))
+        return True
+
+    def run(self) -> Dict[Any, List[Dict]]:
+        """
+        执行搜索计划
+
+        Returns:
+            {request_id: 筛选后的资讯列表}，格式同 search_pension_news_with_ai
+        """
+        if not self._requests:
+            return {}
+
+        groups: "OrderedDict[tuple, List[Tuple[Any, AISearchManager]]]" = OrderedDict()
+        for request_id, manager in self._requests:
+            group_key = (manager.search_key(), manager.score_context())
+            groups.setdefault(group_key, []).append((request_id, manager))
+        leaders = [members[0][1] for members in groups.values()]
+
+        print("\n" + "="*60)
+        print(f"[AI] 跨订阅智能搜索启动：{len(self._requests)} 个订阅，{len(groups)} 组不同的搜索条件")
+        print("="*60)
+
+        # 1. 各组并发搜索，相同的查询只执行一次
+        shared = _SharedQueries()
+        workers = max(1, min(self.max_workers, len(leaders)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            search_results = list(pool.map(
+                lambda manager: manager._search_with_serper(shared.runner(manager)), leaders
+            ))
+        print(
+            f"[成功] Serper 共执行 {shared.executed} 次查询"
+            f"（合并 {shared.requested - shared.executed} 次重复查询）"
+        )
+
+        # 2. 按评分上下文合并文章，每篇只评一次分
+        contexts: "OrderedDict[str, Tuple[AISearchManager, List[Dict], Dict[str, int]]]" = OrderedDict()
+        for manager, results in zip(leaders, search_results):
+            scorer, articles, positions = contexts.setdefault(
+                manager.score_context(), (manager, [], {})
+            )
+            for news in results:
+                article_key = ScoreCache.article_key(news)
+                if article_key not in positions:
+                    positions[article_key] = len(articles)
+                    articles.append(news)
+
+        kept: Dict[str, Set[str]] = {}
+        for context, (scorer, articles, positions) in contexts.items():
+            kept[context] = set()
+            if not articles:
+                continue
+            try:
+                flags = scorer._relevance_flags(articles)
+            except Exception as e:
+                print(f"[错误] AI 筛选失败: {e}")
+                # 降级策略：返回所有结果
+                flags = [True] * len(articles)
+            kept[context] = {key for key, position in positions.items() if flags[position]}
+
+        # 3. 分发回各订阅
+        results: Dict[Any, List[Dict]] = {}
+        for members, manager, found in zip(groups.values(), leaders, search_results):
+            context_kept = kept[manager.score_context()]
+            filtered = [
+                news for news in found if ScoreCache.article_key(news) in context_kept
+            ][:MAX_FILTERED_RESULTS]
+            formatted = manager._format_results(filtered)
+            for request_id, _ in members:
+                results[request_id] = [dict(item) for item in formatted]
+
+        print("="*60)
+        print(f"[完成] 跨订阅 AI 搜索完成，{len(contexts)} 组评分")
+        print("="*60 + "\n")
+
+        return results
+
+
 def search_pension_news_with_ai(config: Dict) -> List[Dict]:
     """
     便捷函数：使用AI搜索相关资讯
@@ -0,0 +1,66 @@
+# coding=utf-8
+
+"""
+关键词多模式匹配
+频率词匹配（main.py 的 WordGroupMatcher）和订阅匹配（subscription_manager.py 的
+SubscriptionMatcher）共用同一个自动机，保证两处的子串判定规则一致
+"""
+
+from typing import Dict, List, Tuple
+
+
+class KeywordAutomaton:
+    """Aho-Corasick 多模式匹配自动机
+
+    一次扫描文本即可得到所有出现过的关键词编号，替代逐词的 `in` 子串判断。
+    空字符串关键词与 `"" in text` 语义一致，视为总是命中。
+    """
+
+    def __init__(self, patterns: List[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[int, ...]] = [()]
+        self._always = tuple(i for i, p in enumerate(patterns) if not p)
+
+        outputs: List[List[int]] = [[]]
+        for pattern_id, pattern in enumerate(patterns):
+            if not pattern:
+                continue
+            state = 0
+            for ch in pattern:
+                next_state = self._goto[state].get(ch)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][ch] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    outputs.append([])
+                state = next_state
+            outputs[state].append(pattern_id)
+
+        # 广度优先构建失败指针，并沿失败链合并输出
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for ch, next_state in self._goto[state].items():
+                fail_state = self._fail[state]
+                while fail_state and ch not in self._goto[fail_state]:
+                    fail_state = self._fail[fail_state]
+                target = self._goto[fail_state].get(ch, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                queue.append(next_state)
+        for state in queue:
+            outputs[state].extend(outputs[self._fail[state]])
+        self._out = [tuple(dict.fromkeys(ids)) for ids in outputs]
+
+    def find_ids(self, text: str) -> set:
+        """返回 text 中出现的所有关键词编号"""
+        goto, fail, out = self._goto, self._fail, self._out
+        hits = set(self._always)
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                hits.update(out[state])
+        return hits
@@ -1,23 +1,36 @@
 # coding=utf-8
 
+import functools
+import io
 import json
 import os
 import random
 import re
+import shutil
+import struct
 import time
+import zlib
 import webbrowser
 import smtplib
+import sys
+import threading
+from array import array
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.header import Header
 from email.utils import formataddr, formatdate, make_msgid
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional, Union
+from typing import Callable, Dict, List, Tuple, Optional, Union
 
 import pytz
 import requests
 import yaml
+from requests.adapters import HTTPAdapter
+
+from keyword_automaton import KeywordAutomaton
 
 # 清除代理环境变量，避免代理问题导致网络请求失败
 os.environ.pop('HTTP_PROXY', None)
@@ -27,7 +40,8 @@ os.environ.pop('https_proxy', None)
 
 # AI 搜索模块（可选）
 try:
-    from ai_search import search_pension_news_with_ai
+    from ai_search import AISearchPlanner, search_pension_news_with_ai
+    from ai_search import set_http_client as set_ai_search_http_client
     AI_SEARCH_AVAILABLE = True
 except ImportError:
     AI_SEARCH_AVAILABLE = False
@@ -198,9 +212,16 @@ def load_config():
         "VERSION_CHECK_URL": config_data["app"]["version_check_url"],
         "SHOW_VERSION_UPDATE": config_data["app"]["show_version_update"],
         "REQUEST_INTERVAL": config_data["crawler"]["request_interval"],
+        "CRAWLER_MAX_WORKERS": config_data["crawler"].get("max_workers", 4),
+        "CRAWLER_HOST_BURST": config_data["crawler"].get("host_burst", 3),
+        "HTTP_POOL_SIZE": config_data.get("http", {}).get("pool_size", 16),
+        "HTTP_MAX_RETRIES": config_data.get("http", {}).get("max_retries", 2),
+        "HTTP_RETRY_BACKOFF": config_data.get("http", {}).get("retry_backoff", 0.5),
         "REPORT_MODE": os.environ.get("REPORT_MODE", "").strip()
         or config_data["report"]["mode"],
         "RANK_THRESHOLD": config_data["report"]["rank_threshold"],
+        "CLUSTER_SIMILAR_TITLES": config_data["report"].get("cluster_similar_titles", True),
+        "CLUSTER_THRESHOLD": config_data["report"].get("cluster_threshold", 0.5),
         "SORT_BY_POSITION_FIRST": os.environ.get("SORT_BY_POSITION_FIRST", "").strip().lower()
         in ("true", "1")
         if os.environ.get("SORT_BY_POSITION_FIRST", "").strip()
@@ -231,6 +252,9 @@ def load_config():
         "BARK_BATCH_SIZE": config_data["notification"].get("bark_batch_size", 3600),
         "SLACK_BATCH_SIZE": config_data["notification"].get("slack_batch_size", 4000),
         "BATCH_SEND_INTERVAL": config_data["notification"]["batch_send_interval"],
+        "NOTIFICATION_DISPATCH_TIMEOUT": config_data["notification"].get(
+            "dispatch_timeout", 300
+        ),
         "FEISHU_MESSAGE_SEPARATOR": config_data["notification"][
             "feishu_message_separator"
         ],
@@ -287,6 +311,9 @@ def load_config():
             "AI_MODEL": config_data.get("ai_search", {}).get("ai_model", "deepseek-ai/DeepSeek-V3"),
             "AI_API_BASE": config_data.get("ai_search", {}).get("ai_api_base", "https://api.siliconflow.cn/v1"),
             "RELEVANCE_THRESHOLD": config_data.get("ai_search", {}).get("relevance_threshold", 5),
+            "SCORE_CACHE_TTL_HOURS": config_data.get("ai_search", {}).get("score_cache_ttl_hours", 72),
+            "SCORE_CHUNK_SIZE": config_data.get("ai_search", {}).get("score_chunk_size", 10),
+            "SCORE_CONCURRENCY": config_data.get("ai_search", {}).get("score_concurrency", 4),
         },
         # 小红书配置（原始 YAML 整段挂载，供订阅模式使用）
         "XHS": config_data.get("xhs", {}),
@@ -489,18 +516,14 @@ def check_version_update(
 ) -> Tuple[bool, Optional[str]]:
     """检查版本更新"""
     try:
-        proxies = None
-        if proxy_url:
-            proxies = {"http": proxy_url, "https": proxy_url}
-
         headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
             "Accept": "text/plain, */*",
             "Cache-Control": "no-cache",
         }
 
-        response = requests.get(
-            version_url, proxies=proxies, headers=headers, timeout=10
+        response = HTTP_CLIENT.get(
+            version_url, proxy_url=proxy_url, headers=headers, timeout=10
         )
         response.raise_for_status()
 
@@ -657,15 +680,213 @@ class PushRecordManager:
         return result
 
 
+# === HTTP 客户端 ===
+class HttpClient:
+    """共享的出站 HTTP 客户端
+
+    数据源、AI 搜索、小红书和各推送渠道的请求共用一个 Session，按主机保持连接池和长连接，
+    同一主机的后续请求不必重新进行 TCP 与 TLS 握手。与 DataFetcher 原有做法一致，
+    不读取环境变量中的代理，只使用调用方显式传入的 proxy_url。
+
+    失败重试带随机抖动的指数退避。GET 等幂等请求在连接错误、超时和 429/5xx 时重试；
+    POST 只在连接未建立（连接超时）或服务端返回 429 时重试，避免推送消息重复发送。
+    已有自己重试逻辑的调用方传入 retries=0。
+    """
+
+    IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+    RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+    MAX_RETRY_AFTER = 30
+
+    def __init__(self, pool_size: int = 16, max_retries: int = 2, backoff: float = 0.5):
+        """
+        Args:
+            pool_size: 保留连接池的主机数，以及每个主机保持的连接数
+            max_retries: 默认重试次数
+            backoff: 退避基数（秒），第 n 次重试前等待约 backoff * 2^n 秒
+        """
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.session = requests.Session()
+        self.session.trust_env = False  # 完全禁用环境变量的代理读取
+        self._adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", self._adapter)
+        self.session.mount("https://", self._adapter)
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._retries = 0
+        self._errors = 0
+
+    def _retry_delay(self, attempt: int, response: Optional[requests.Response] = None) -> float:
+        """第 attempt 次重试前的等待时间（429 时优先使用 Retry-After）"""
+        if response is not None:
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                return min(float(retry_after), self.MAX_RETRY_AFTER)
+        return self.backoff * (2 ** attempt) * random.uniform(0.5, 1.5)
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        proxy_url: Optional[str] = None,
+        retries: Optional[int] = None,
+        **kwargs,
+    ) -> requests.Response:
+        """
+        发送请求
+
+        Args:
+            method: HTTP 方法
+            url: 请求地址
+            proxy_url: 代理地址，为空时直连
+            retries: 重试次数，默认使用 max_retries
+            **kwargs: 传给 requests.Session.request 的其他参数
+
+        Returns:
+            最后一次请求的响应（重试用尽时可能是非 2xx 响应）
+
+        Raises:
+            requests.RequestException: 重试用尽后仍然失败
+        """
+        method = method.upper()
+        retries = self.max_retries if retries is None else retries
+        idempotent = method in self.IDEMPOTENT_METHODS
+        if proxy_url:
+            kwargs["proxies"] = {"http": proxy_url, "https": proxy_url}
+
+        attempt = 0
+        while True:
+            with self._lock:
+                self._requests += 1
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except requests.RequestException as e:
+                retryable = isinstance(e, requests.ConnectTimeout) or (
+                    idempotent and isinstance(e, (requests.ConnectionError, requests.Timeout))
+                )
+                if not retryable or attempt >= retries:
+                    with self._lock:
+                        self._errors += 1
+                    raise
+                delay = self._retry_delay(attempt)
+            else:
+                retryable = response.status_code == 429 or (
+                    idempotent and response.status_code in self.RETRY_STATUSES
+                )
+                if not retryable or attempt >= retries:
+                    return response
+                delay = self._retry_delay(attempt, response)
+                response.close()
+
+            with self._lock:
+                self._retries += 1
+            attempt += 1
+            time.sleep(delay)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def get_stats(self) -> Dict:
+        """
+        连接复用统计
+
+        Returns:
+            requests/retries/errors 为请求计数；hosts 为各主机连接池的
+            {requests, connections, reused}，reused 为复用已有连接的请求数
+        """
+        pools = []
+        for manager in [self._adapter.poolmanager, *self._adapter.proxy_manager.values()]:
+            for key in manager.pools.keys():
+                pool = manager.pools.get(key)
+                if pool is not None:
+                    pools.append(pool)
+
+        hosts: Dict[str, Dict] = {}
+        for pool in pools:
+            host_stats = hosts.setdefault(
+                f"{pool.scheme}://{pool.host}:{pool.port}", {"requests": 0, "connections": 0, "reused": 0}
+            )
+            host_stats["requests"] += pool.num_requests
+            host_stats["connections"] += pool.num_connections
+            host_stats["reused"] += max(0, pool.num_requests - pool.num_connections)
+
+        with self._lock:
+            return {
+                "requests": self._requests,
+                "retries": self._retries,
+                "errors": self._errors,
+                "connections": sum(h["connections"] for h in hosts.values()),
+                "reused": sum(h["reused"] for h in hosts.values()),
+                "hosts": hosts,
+            }
+
+    def print_stats(self) -> None:
+        """输出连接复用统计"""
+        stats = self.get_stats()
+        if not stats["requests"]:
+            return
+        print(
+            f"[HTTP] 共 {stats['requests']} 次请求（重试 {stats['retries']} 次），"
+            f"新建 {stats['connections']} 个连接，复用连接 {stats['reused']} 次"
+        )
+
+
+HTTP_CLIENT = HttpClient(
+    CONFIG["HTTP_POOL_SIZE"], CONFIG["HTTP_MAX_RETRIES"], CONFIG["HTTP_RETRY_BACKOFF"]
+)
+if AI_SEARCH_AVAILABLE:
+    set_ai_search_http_client(HTTP_CLIENT)
+
+
 # === 数据获取 ===
+class HostRateLimiter:
+    """按主机限速器（令牌桶）
+
+    同一主机的长期请求速率不超过 1 次 / interval，允许最多 burst 个请求并发起步。
+    线程安全，供并发爬取时多个工作线程共享。
+    """
+
+    def __init__(self, interval_ms: int, burst: int = 1):
+        self.interval_ms = interval_ms
+        self.burst = max(1, burst)
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+
+    def _next_interval(self) -> float:
+        # 与原串行爬取保持一致的随机抖动
+        actual_interval = self.interval_ms + random.randint(-10, 20)
+        return max(50, actual_interval) / 1000
+
+    def acquire(self, host: str) -> None:
+        """阻塞直到该主机可以发起下一个请求"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                tokens, updated = self._buckets.get(host, (float(self.burst), now))
+                interval = self._next_interval()
+                tokens = min(float(self.burst), tokens + (now - updated) / interval)
+                if tokens >= 1:
+                    self._buckets[host] = (tokens - 1, now)
+                    return
+                self._buckets[host] = (tokens, now)
+                wait_time = (1 - tokens) * interval
+            time.sleep(wait_time)
+
+
 class DataFetcher:
     """数据获取器"""
 
-    def __init__(self, proxy_url: Optional[str] = None):
+    API_HOST = "newsnow.busiyi.world"
+
+    def __init__(self, proxy_url: Optional[str] = None, http_client: Optional[HttpClient] = None):
         self.proxy_url = proxy_url
-        # 创建一个 Session 对象，禁用环境变量代理
-        self.session = requests.Session()
-        self.session.trust_env = False  # 完全禁用环境变量的代理读取
+        # 共享连接池的 HTTP 客户端（不读取环境变量代理）
+        self.http = http_client or HTTP_CLIENT
+        # 并发爬取时由 crawl_websites 设置，所有请求（含重试）都经过限速
+        self.rate_limiter: Optional[HostRateLimiter] = None
 
     def fetch_data(
         self,
@@ -681,11 +902,7 @@ class DataFetcher:
             id_value = id_info
             alias = id_value
 
-        url = f"https://newsnow.busiyi.world/api/s?id={id_value}&latest"
-
-        proxies = None
-        if self.proxy_url:
-            proxies = {"http": self.proxy_url, "https": self.proxy_url}
+        url = f"https://{self.API_HOST}/api/s?id={id_value}&latest"
 
         headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
@@ -698,8 +915,11 @@ class DataFetcher:
         retries = 0
         while retries <= max_retries:
             try:
-                response = self.session.get(
-                    url, proxies=proxies, headers=headers, timeout=10
+                if self.rate_limiter:
+                    self.rate_limiter.acquire(self.API_HOST)
+                # 重试由下方循环负责（带限速和随机等待）
+                response = self.http.get(
+                    url, proxy_url=self.proxy_url, headers=headers, timeout=10, retries=0
                 )
                 response.raise_for_status()
 
@@ -727,97 +947,485 @@ class DataFetcher:
                     return None, id_value, alias
         return None, id_value, alias
 
+    def _parse_response(self, id_value: str, response: str) -> Optional[Dict]:
+        """解析单个平台响应，返回 {title: {ranks, url, mobileUrl}}，失败返回 None"""
+        try:
+            data = json.loads(response)
+            titles = {}
+            for index, item in enumerate(data.get("items", []), 1):
+                title = item.get("title")
+                # 跳过无效标题（None、float、空字符串）
+                if title is None or isinstance(title, float) or not str(title).strip():
+                    continue
+                title = str(title).strip()
+                url = item.get("url", "")
+                mobile_url = item.get("mobileUrl", "")
+
+                if title in titles:
+                    titles[title]["ranks"].append(index)
+                else:
+                    titles[title] = {
+                        "ranks": [index],
+                        "url": url,
+                        "mobileUrl": mobile_url,
+                    }
+            return titles
+        except json.JSONDecodeError:
+            print(f"解析 {id_value} 响应失败")
+        except Exception as e:
+            print(f"处理 {id_value} 数据出错: {e}")
+        return None
+
     def crawl_websites(
         self,
         ids_list: List[Union[str, Tuple[str, str]]],
         request_interval: int = CONFIG["REQUEST_INTERVAL"],
+        max_workers: int = CONFIG["CRAWLER_MAX_WORKERS"],
+        host_burst: int = CONFIG["CRAWLER_HOST_BURST"],
     ) -> Tuple[Dict, Dict, List]:
-        """爬取多个网站数据"""
+        """爬取多个网站数据
+
+        使用线程池并发请求，max_workers 为全局并发上限；同一主机的请求经
+        HostRateLimiter 限速，长期速率仍为每 request_interval 毫秒一次，
+        最多 host_burst 个请求同时起步。max_workers=1 时退化为原串行行为。
+        结果按 ids_list 顺序汇总，返回值与串行版本一致。
+        """
         results = {}
         id_to_name = {}
         failed_ids = []
 
-        for i, id_info in enumerate(ids_list):
+        id_values = []
+        for id_info in ids_list:
             if isinstance(id_info, tuple):
                 id_value, name = id_info
             else:
                 id_value = id_info
                 name = id_value
-
             id_to_name[id_value] = name
-            response, _, _ = self.fetch_data(id_info)
+            id_values.append(id_value)
 
-            if response:
-                try:
-                    data = json.loads(response)
-                    results[id_value] = {}
-                    for index, item in enumerate(data.get("items", []), 1):
-                        title = item.get("title")
-                        # 跳过无效标题（None、float、空字符串）
-                        if title is None or isinstance(title, float) or not str(title).strip():
-                            continue
-                        title = str(title).strip()
-                        url = item.get("url", "")
-                        mobile_url = item.get("mobileUrl", "")
-
-                        if title in results[id_value]:
-                            results[id_value][title]["ranks"].append(index)
-                        else:
-                            results[id_value][title] = {
-                                "ranks": [index],
-                                "url": url,
-                                "mobileUrl": mobile_url,
-                            }
-                except json.JSONDecodeError:
-                    print(f"解析 {id_value} 响应失败")
-                    failed_ids.append(id_value)
-                except Exception as e:
-                    print(f"处理 {id_value} 数据出错: {e}")
-                    failed_ids.append(id_value)
-            else:
-                failed_ids.append(id_value)
+        if not ids_list:
+            print(f"成功: [], 失败: []")
+            return results, id_to_name, failed_ids
 
-            if i < len(ids_list) - 1:
-                actual_interval = request_interval + random.randint(-10, 20)
-                actual_interval = max(50, actual_interval)
-                time.sleep(actual_interval / 1000)
+        workers = max(1, min(max_workers, len(ids_list)))
+        self.rate_limiter = HostRateLimiter(
+            request_interval, host_burst if workers > 1 else 1
+        )
+        try:
+            with ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="crawler"
+            ) as executor:
+                responses = list(executor.map(self.fetch_data, ids_list))
+        finally:
+            self.rate_limiter = None
+
+        for id_value, (response, _, _) in zip(id_values, responses):
+            titles = self._parse_response(id_value, response) if response else None
+            if titles is None:
+                failed_ids.append(id_value)
+            else:
+                results[id_value] = titles
 
         print(f"成功: {list(results.keys())}, 失败: {failed_ids}")
         return results, id_to_name, failed_ids
 
 
+# === 快照存储 ===
+SNAPSHOT_FILENAME = "snapshots.bin"
+SNAPSHOT_INDEX_FILENAME = "snapshot_index.json"
+
+
+def file_fingerprint(file_path: Path) -> Tuple[int, int]:
+    """文件指纹 (大小, crc32)，用于判断数据文件是否被修改"""
+    with open(file_path, "rb") as f:
+        data = f.read()
+    return len(data), zlib.crc32(data)
+
+
+class SnapshotStore:
+    """当日爬取快照存储（追加写二进制文件）
+
+    文件结构：8 字节魔数 + 若干记录帧，每帧为 <类型 u8, 负载长度 u32, crc32 u32> + 负载。
+    - 字符串帧：追加新出现的字符串（标题、URL、平台 ID 等），按出现顺序编号
+    - 爬取帧：一次爬取的快照，标题条目为定长 <rank, title, url, mobileUrl> 字符串编号数组，
+      并记录对应 txt 文件的大小和 crc32
+    - txt 状态帧：紧跟在爬取帧之后，记录写入时 txt 文件的 mtime_ns
+
+    读取时顺序扫描一次即可还原每次爬取的数据，无需文本切分；末尾残缺的帧（写入中断）
+    会被忽略，并在下次追加前截断。同一 time_info 出现多次时以最后一次为准，
+    与同一分钟 txt 文件被覆盖的语义一致。txt 文件被修改后与记录不符的快照会被跳过，
+    由调用方改为解析 txt。
+
+    读取时 txt 文件的大小和 mtime 与记录一致即视为未修改，只有不一致时才计算 crc32。
+
+    旁路索引 snapshot_index.json 只记录有效数据末尾偏移和字符串数：追加时据此跳过
+    校验和爬取帧，只读出字符串帧，写入量与已有数据无关。索引与快照文件的大小或 mtime
+    不符时忽略索引，按原方式完整扫描。
+    """
+
+    MAGIC = b"TRSNAP02"
+    RECORD_STRINGS = 1
+    RECORD_CRAWL = 2
+    RECORD_TXT_STAT = 3
+
+    _FRAME = struct.Struct("<BII")
+    _U32 = struct.Struct("<I")
+    _CRAWL_HEAD = struct.Struct("<IHHII")
+    _PLATFORM_HEAD = struct.Struct("<III")
+    _ITEM = struct.Struct("<IIII")
+    _TXT_STAT = struct.Struct("<IQ")
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.index_path = self.path.with_name(SNAPSHOT_INDEX_FILENAME)
+
+    def _load_index(self) -> Optional[Dict]:
+        """读取旁路索引；索引缺失或与快照文件不一致时返回 None"""
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+            st = self.path.stat()
+        except (OSError, ValueError):
+            return None
+        if (
+            index.get("magic") != self.MAGIC.decode("ascii")
+            or index.get("store_size") != st.st_size
+            or index.get("store_mtime_ns") != st.st_mtime_ns
+        ):
+            return None
+        return index
+
+    def _save_index(self, string_count: int) -> None:
+        st = self.path.stat()
+        tmp_path = self.index_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "magic": self.MAGIC.decode("ascii"),
+                    "store_size": st.st_size,
+                    "store_mtime_ns": st.st_mtime_ns,
+                    "string_count": string_count,
+                },
+                f,
+            )
+        os.replace(tmp_path, self.index_path)
+
+    def _read_indexed_strings(self, valid_end: int, string_count: int) -> Optional[List[str]]:
+        """按旁路索引只读出字符串帧（跳过爬取帧、不做校验）；与索引不符时返回 None"""
+        strings: List[str] = []
+        frame_size = self._FRAME.size
+        with open(self.path, "rb") as f:
+            if f.read(len(self.MAGIC)) != self.MAGIC:
+                return None
+            offset = len(self.MAGIC)
+            while offset < valid_end:
+                header = f.read(frame_size)
+                if len(header) < frame_size:
+                    return None
+                record_type, length, _ = self._FRAME.unpack(header)
+                offset += frame_size + length
+                if offset > valid_end:
+                    return None
+                if record_type == self.RECORD_STRINGS:
+                    self._parse_strings(memoryview(f.read(length)), strings)
+                else:
+                    f.seek(offset)
+        return strings if len(strings) == string_count else None
+
+    def _parse_strings(self, payload: memoryview, strings: List[str]) -> None:
+        """解析字符串帧，追加到字符串表"""
+        (count,) = self._U32.unpack_from(payload, 0)
+        pos = 4
+        for _ in range(count):
+            (size,) = self._U32.unpack_from(payload, pos)
+            pos += 4
+            strings.append(str(payload[pos:pos + size], "utf-8"))
+            pos += size
+
+    def _scan(self, data: bytes) -> Tuple[List[str], List[Tuple[int, bytes]], int]:
+        """扫描文件内容，返回 (字符串表, [(帧类型, 负载)], 有效数据末尾偏移)"""
+        strings: List[str] = []
+        records: List[Tuple[int, bytes]] = []
+
+        if not data.startswith(self.MAGIC):
+            return strings, records, 0
+
+        view = memoryview(data)
+        offset = len(self.MAGIC)
+        frame_size = self._FRAME.size
+        while offset + frame_size <= len(data):
+            record_type, length, checksum = self._FRAME.unpack_from(data, offset)
+            start = offset + frame_size
+            end = start + length
+            if end > len(data):
+                break
+            payload = view[start:end]
+            if zlib.crc32(payload) != checksum:
+                break
+
+            if record_type == self.RECORD_STRINGS:
+                self._parse_strings(payload, strings)
+            elif record_type in (self.RECORD_CRAWL, self.RECORD_TXT_STAT):
+                records.append((record_type, payload))
+            offset = end
+
+        return strings, records, offset
+
+    def _read_bytes(self) -> bytes:
+        if not self.path.exists():
+            return b""
+        with open(self.path, "rb") as f:
+            return f.read()
+
+    def append(
+        self,
+        time_info: str,
+        sections: List[Tuple[str, str, List[Tuple[int, str, str, str]]]],
+        failed_ids: List[str],
+        txt_path: Optional[Union[str, Path]] = None,
+    ) -> None:
+        """追加一次爬取快照，sections 格式同 _prepare_title_sections 返回值"""
+        txt_size, txt_crc = file_fingerprint(Path(txt_path)) if txt_path else (0, 0)
+        strings = None
+        snapshot_index = self._load_index()
+        if snapshot_index is not None:
+            valid_end = snapshot_index["store_size"]
+            strings = self._read_indexed_strings(valid_end, snapshot_index.get("string_count"))
+        if strings is None:
+            strings, _, valid_end = self._scan(self._read_bytes())
+        string_ids = {value: index for index, value in enumerate(strings)}
+        new_strings: List[str] = []
+
+        def sid(value: str) -> int:
+            value = value or ""
+            index = string_ids.get(value)
+            if index is None:
+                index = len(string_ids)
+                string_ids[value] = index
+                new_strings.append(value)
+            return index
+
+        crawl_parts = [
+            self._CRAWL_HEAD.pack(
+                sid(time_info), len(sections), len(failed_ids), txt_size, txt_crc
+            )
+        ]
+        crawl_parts.extend(self._U32.pack(sid(id_value)) for id_value in failed_ids)
+        for id_value, name, sorted_titles in sections:
+            crawl_parts.append(
+                self._PLATFORM_HEAD.pack(sid(id_value), sid(name), len(sorted_titles))
+            )
+            for rank, title, url, mobile_url in sorted_titles:
+                crawl_parts.append(
+                    self._ITEM.pack(rank, sid(title), sid(url), sid(mobile_url))
+                )
+
+        frames = []
+        if new_strings:
+            string_parts = [self._U32.pack(len(new_strings))]
+            for value in new_strings:
+                encoded = value.encode("utf-8")
+                string_parts.append(self._U32.pack(len(encoded)))
+                string_parts.append(encoded)
+            frames.append(self._frame(self.RECORD_STRINGS, b"".join(string_parts)))
+        frames.append(self._frame(self.RECORD_CRAWL, b"".join(crawl_parts)))
+        if txt_path:
+            frames.append(
+                self._frame(
+                    self.RECORD_TXT_STAT,
+                    self._TXT_STAT.pack(sid(time_info), Path(txt_path).stat().st_mtime_ns),
+                )
+            )
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "r+b" if self.path.exists() else "wb") as f:
+            if valid_end == 0:
+                f.truncate(0)
+                f.write(self.MAGIC)
+            else:
+                f.truncate(valid_end)
+                f.seek(valid_end)
+            f.write(b"".join(frames))
+
+        try:
+            self._save_index(len(strings) + len(new_strings))
+        except OSError as e:
+            print(f"[警告] 写入快照索引失败（下次追加时重新扫描）: {e}")
+
+    def _frame(self, record_type: int, payload: bytes) -> bytes:
+        return self._FRAME.pack(record_type, len(payload), zlib.crc32(payload)) + payload
+
+    def read(
+        self, txt_dir: Optional[Path] = None
+    ) -> Dict[str, Tuple[Dict, Dict, List[str]]]:
+        """
+        读取全部快照，返回 {time_info: (titles_by_id, id_to_name, failed_ids)}
+
+        指定 txt_dir 时，对应 txt 文件存在但内容与记录不符（被修改过）的快照会被跳过
+        """
+        strings, records, _ = self._scan(self._read_bytes())
+        snapshots = {}
+        latest_fingerprints = {}
+        txt_mtimes = {}
+
+        for record_type, payload in records:
+            if record_type == self.RECORD_TXT_STAT:
+                time_sid, mtime_ns = self._TXT_STAT.unpack_from(payload, 0)
+                txt_mtimes[strings[time_sid]] = mtime_ns
+                continue
+            (
+                time_sid,
+                platform_count,
+                failed_count,
+                txt_size,
+                txt_crc,
+            ) = self._CRAWL_HEAD.unpack_from(payload, 0)
+            latest_fingerprints[strings[time_sid]] = (txt_size, txt_crc)
+            txt_mtimes.pop(strings[time_sid], None)
+            pos = self._CRAWL_HEAD.size
+            failed_ids = [
+                strings[index]
+                for (index,) in self._U32.iter_unpack(payload[pos:pos + 4 * failed_count])
+            ]
+            pos += 4 * failed_count
+
+            titles_by_id = {}
+            id_to_name = {}
+            for _ in range(platform_count):
+                id_sid, name_sid, item_count = self._PLATFORM_HEAD.unpack_from(
+                    payload, pos
+                )
+                pos += self._PLATFORM_HEAD.size
+                items_end = pos + item_count * self._ITEM.size
+                # 与 parse_file_titles 一致：没有标题的平台不计入
+                if item_count:
+                    source_id = strings[id_sid]
+                    id_to_name[source_id] = strings[name_sid]
+                    titles = {}
+                    for rank, title_sid, url_sid, mobile_sid in self._ITEM.iter_unpack(
+                        payload[pos:items_end]
+                    ):
+                        titles[strings[title_sid]] = {
+                            "ranks": [rank],
+                            "url": strings[url_sid],
+                            "mobileUrl": strings[mobile_sid],
+                        }
+                    titles_by_id[source_id] = titles
+                pos = items_end
+
+            snapshots[strings[time_sid]] = (titles_by_id, id_to_name, failed_ids)
+
+        if txt_dir is not None:
+            for time_info, fingerprint in latest_fingerprints.items():
+                txt_path = txt_dir / f"{time_info}.txt"
+                try:
+                    st = txt_path.stat()
+                except OSError:
+                    continue
+                if st.st_size != fingerprint[0]:
+                    del snapshots[time_info]
+                elif txt_mtimes.get(time_info) == st.st_mtime_ns:
+                    continue
+                elif file_fingerprint(txt_path) != fingerprint:
+                    del snapshots[time_info]
+
+        return snapshots
+
+
+def load_day_snapshots(
+    date_folder: Optional[str] = None,
+    current_platform_ids: Optional[List[str]] = None,
+) -> List[Tuple[str, Dict, Dict]]:
+    """
+    按时间顺序读取某天每次爬取的数据
+
+    优先使用快照存储；不在快照存储中或被修改过的 txt 文件（如旧数据、手工放入
+    或编辑过的文件）回退到 parse_file_titles 解析后合并。
+
+    Returns:
+        [(time_info, titles_by_id, id_to_name)]，time_info 形如 "HH时MM分"
+    """
+    day_dir = Path("output") / (date_folder or format_date_folder())
+    txt_dir = day_dir / "txt"
+
+    try:
+        stored = SnapshotStore(day_dir / SNAPSHOT_FILENAME).read(txt_dir)
+    except Exception as e:
+        print(f"[警告] 读取快照存储失败，回退到 txt 解析: {e}")
+        stored = {}
+
+    snapshots = {
+        time_info: (titles_by_id, id_to_name)
+        for time_info, (titles_by_id, id_to_name, _) in stored.items()
+    }
+    if txt_dir.exists():
+        for file_path in txt_dir.iterdir():
+            if file_path.suffix == ".txt" and file_path.stem not in snapshots:
+                snapshots[file_path.stem] = parse_file_titles(file_path)
+
+    day_snapshots = []
+    for time_info in sorted(snapshots):
+        titles_by_id, id_to_name = snapshots[time_info]
+        if current_platform_ids is not None:
+            titles_by_id = {
+                source_id: title_data
+                for source_id, title_data in titles_by_id.items()
+                if source_id in current_platform_ids
+            }
+            id_to_name = {
+                source_id: name
+                for source_id, name in id_to_name.items()
+                if source_id in titles_by_id
+            }
+        day_snapshots.append((time_info, titles_by_id, id_to_name))
+
+    return day_snapshots
+
+
 # === 数据处理 ===
+def _prepare_title_sections(
+    results: Dict, id_to_name: Dict
+) -> List[Tuple[str, str, List[Tuple[int, str, str, str]]]]:
+    """整理待落盘的标题，返回 [(id, name, [(rank, title, url, mobileUrl)])]，按排名排序"""
+    sections = []
+    for id_value, title_data in results.items():
+        name = id_to_name.get(id_value) or id_value
+
+        sorted_titles = []
+        for title, info in title_data.items():
+            cleaned_title = clean_title(title)
+            if isinstance(info, dict):
+                ranks = info.get("ranks", [])
+                url = info.get("url", "")
+                mobile_url = info.get("mobileUrl", "")
+            else:
+                ranks = info if isinstance(info, list) else []
+                url = ""
+                mobile_url = ""
+
+            rank = ranks[0] if ranks else 1
+            sorted_titles.append((rank, cleaned_title, url, mobile_url))
+
+        sorted_titles.sort(key=lambda x: x[0])
+        sections.append((id_value, name, sorted_titles))
+    return sections
+
+
 def save_titles_to_file(results: Dict, id_to_name: Dict, failed_ids: List) -> str:
-    """保存标题到文件"""
-    file_path = get_output_path("txt", f"{format_time_filename()}.txt")
+    """保存标题到文件（txt 文本 + 当日快照存储）"""
+    time_info = format_time_filename()
+    file_path = get_output_path("txt", f"{time_info}.txt")
+    sections = _prepare_title_sections(results, id_to_name)
 
     with open(file_path, "w", encoding="utf-8") as f:
-        for id_value, title_data in results.items():
+        for id_value, name, sorted_titles in sections:
             # id | name 或 id
-            name = id_to_name.get(id_value)
-            if name and name != id_value:
+            if name != id_value:
                 f.write(f"{id_value} | {name}\n")
             else:
                 f.write(f"{id_value}\n")
 
-            # 按排名排序标题
-            sorted_titles = []
-            for title, info in title_data.items():
-                cleaned_title = clean_title(title)
-                if isinstance(info, dict):
-                    ranks = info.get("ranks", [])
-                    url = info.get("url", "")
-                    mobile_url = info.get("mobileUrl", "")
-                else:
-                    ranks = info if isinstance(info, list) else []
-                    url = ""
-                    mobile_url = ""
-
-                rank = ranks[0] if ranks else 1
-                sorted_titles.append((rank, cleaned_title, url, mobile_url))
-
-            sorted_titles.sort(key=lambda x: x[0])
-
             for rank, cleaned_title, url, mobile_url in sorted_titles:
                 line = f"{rank}. {cleaned_title}"
 
@@ -834,6 +1442,28 @@ def save_titles_to_file(results: Dict, id_to_name: Dict, failed_ids: List) -> st
             for id_value in failed_ids:
                 f.write(f"{id_value}\n")
 
+    try:
+        SnapshotStore(get_output_path("", SNAPSHOT_FILENAME)).append(
+            time_info, sections, failed_ids, file_path
+        )
+    except Exception as e:
+        print(f"[警告] 写入快照存储失败（不影响 txt 数据）: {e}")
+
+    try:
+        titles_by_id = {}
+        file_id_to_name = {}
+        for id_value, name, sorted_titles in sections:
+            if not sorted_titles:
+                continue
+            file_id_to_name[id_value] = name
+            titles_by_id[id_value] = {
+                title: {"ranks": [rank], "url": url, "mobileUrl": mobile_url}
+                for rank, title, url, mobile_url in sorted_titles
+            }
+        DailyAggregate().update(time_info, titles_by_id, file_id_to_name)
+    except Exception as e:
+        print(f"[警告] 更新当日汇总失败（读取时将自动重建）: {e}")
+
     return file_path
 
 
@@ -1007,45 +1637,11 @@ def parse_file_titles(file_path: Path) -> Tuple[Dict, Dict]:
 def read_all_today_titles(
     current_platform_ids: Optional[List[str]] = None,
 ) -> Tuple[Dict, Dict, Dict]:
-    """读取当天所有标题文件，支持按当前监控平台过滤"""
-    date_folder = format_date_folder()
-    txt_dir = Path("output") / date_folder / "txt"
-
-    if not txt_dir.exists():
-        return {}, {}, {}
-
-    all_results = {}
-    final_id_to_name = {}
-    title_info = {}
-
-    files = sorted([f for f in txt_dir.iterdir() if f.suffix == ".txt"])
-
-    for file_path in files:
-        time_info = file_path.stem
-
-        titles_by_id, file_id_to_name = parse_file_titles(file_path)
-
-        if current_platform_ids is not None:
-            filtered_titles_by_id = {}
-            filtered_id_to_name = {}
-
-            for source_id, title_data in titles_by_id.items():
-                if source_id in current_platform_ids:
-                    filtered_titles_by_id[source_id] = title_data
-                    if source_id in file_id_to_name:
-                        filtered_id_to_name[source_id] = file_id_to_name[source_id]
-
-            titles_by_id = filtered_titles_by_id
-            file_id_to_name = filtered_id_to_name
-
-        final_id_to_name.update(file_id_to_name)
-
-        for source_id, title_data in titles_by_id.items():
-            process_source_data(
-                source_id, title_data, time_info, all_results, title_info
-            )
-
-    return all_results, final_id_to_name, title_info
+    """读取当天所有标题（来自增量汇总），支持按当前监控平台过滤"""
+    all_results, id_to_name, title_info, _ = DailyAggregate().load(
+        current_platform_ids
+    )
+    return all_results, id_to_name, title_info
 
 
 def process_source_data(
@@ -1121,151 +1717,811 @@ def process_source_data(
                     title_info[source_id][title]["mobileUrl"] = mobile_url
 
 
-def detect_latest_new_titles(current_platform_ids: Optional[List[str]] = None) -> Dict:
-    """检测当日最新批次的新增标题，支持按当前监控平台过滤"""
-    date_folder = format_date_folder()
-    txt_dir = Path("output") / date_folder / "txt"
+class TitleSearchIndex:
+    """当日标题倒排索引（output/<日期>/search_index.json）
 
-    if not txt_dir.exists():
-        return {}
+    供 MCP 服务的关键词搜索使用，由 DailyAggregate 在每次合并快照时增量维护。
+    每个标题（按平台去重）是一个文档，文档 id 按首次出现的顺序递增；
+    倒排表以小写标题的字符二元组为键，查询时取各二元组倒排表的交集再做子串校验。
+    文档中的 ranks 记录标题每次出现时的排名（不去重），与 MCP 按天合并的结果一致。
 
-    files = sorted([f for f in txt_dir.iterdir() if f.suffix == ".txt"])
-    if len(files) < 2:
-        return {}
+    MCP 服务中的 DayIndex（mcp_server/services/search_index.py）是同一格式的读取端，
+    索引文件不可用时也用它在内存中重建索引。爬虫按单文件部署（镜像中没有 mcp_server 包），
+    MCP 服务单独打包、不依赖 main.py，两边无法共用代码，因此二元组切分和文档格式
+    各有一份实现，修改时需同步修改两处；test_search_index.py 比对两者由同一份数据建立的索引。
+    """
 
-    # 解析最新文件
-    latest_file = files[-1]
-    latest_titles, _ = parse_file_titles(latest_file)
+    VERSION = 1
+    FILENAME = "search_index.json"
 
-    # 如果指定了当前平台列表，过滤最新文件数据
-    if current_platform_ids is not None:
-        filtered_latest_titles = {}
-        for source_id, title_data in latest_titles.items():
-            if source_id in current_platform_ids:
-                filtered_latest_titles[source_id] = title_data
-        latest_titles = filtered_latest_titles
+    def __init__(self):
+        self.platforms: List[str] = []
+        self.docs: List[list] = []  # [平台下标, 标题, ranks, url, mobileUrl]
+        self.postings: Dict[str, List[int]] = {}
+        self._doc_ids: Dict[Tuple[str, str], int] = {}
+        self._platform_index: Dict[str, int] = {}
+
+    @staticmethod
+    def grams(text: str) -> set:
+        """小写文本的字符二元组集合"""
+        text = text.lower()
+        return {text[i:i + 2] for i in range(len(text) - 1)}
+
+    def add_snapshot(self, titles_by_id: Dict) -> None:
+        """合并一次爬取的数据：已有标题追加排名，新标题建立文档和倒排"""
+        for platform_id, titles in titles_by_id.items():
+            platform_index = self._platform_index.get(platform_id)
+            if platform_index is None:
+                platform_index = len(self.platforms)
+                self._platform_index[platform_id] = platform_index
+                self.platforms.append(platform_id)
+
+            for title, info in titles.items():
+                ranks = info.get("ranks", [])
+                doc_id = self._doc_ids.get((platform_id, title))
+                if doc_id is not None:
+                    self.docs[doc_id][2].extend(ranks)
+                    continue
 
-    # 汇总历史标题（按平台过滤）
-    historical_titles = {}
-    for file_path in files[:-1]:
-        historical_data, _ = parse_file_titles(file_path)
+                doc_id = len(self.docs)
+                self._doc_ids[(platform_id, title)] = doc_id
+                self.docs.append(
+                    [
+                        platform_index,
+                        title,
+                        list(ranks),
+                        info.get("url", ""),
+                        info.get("mobileUrl", ""),
+                    ]
+                )
+                for gram in self.grams(title):
+                    self.postings.setdefault(gram, []).append(doc_id)
+
+    @classmethod
+    def load(cls, day_dir: Path, sources: Dict) -> Optional["TitleSearchIndex"]:
+        """读取索引文件，数据源与汇总记录不一致时返回 None"""
+        path = day_dir / cls.FILENAME
+        if not path.exists():
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"[警告] 读取搜索索引失败，将重建: {e}")
+            return None
+        if data.get("version") != cls.VERSION or data.get("sources") != sources:
+            return None
 
-        # 过滤历史数据
-        if current_platform_ids is not None:
-            filtered_historical_data = {}
-            for source_id, title_data in historical_data.items():
-                if source_id in current_platform_ids:
-                    filtered_historical_data[source_id] = title_data
-            historical_data = filtered_historical_data
+        index = cls()
+        index.platforms = data["platforms"]
+        index.docs = data["docs"]
+        index.postings = data["postings"]
+        index._platform_index = {
+            platform_id: i for i, platform_id in enumerate(index.platforms)
+        }
+        index._doc_ids = {
+            (index.platforms[doc[0]], doc[1]): doc_id
+            for doc_id, doc in enumerate(index.docs)
+        }
+        return index
 
-        for source_id, titles_data in historical_data.items():
-            if source_id not in historical_titles:
-                historical_titles[source_id] = set()
-            for title in titles_data.keys():
-                historical_titles[source_id].add(title)
+    def save(self, day_dir: Path, sources: Dict, id_to_name: Dict) -> None:
+        path = day_dir / self.FILENAME
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "version": self.VERSION,
+                    "sources": sources,
+                    "id_to_name": id_to_name,
+                    "platforms": self.platforms,
+                    "docs": self.docs,
+                    "postings": self.postings,
+                },
+                f,
+                ensure_ascii=False,
+                separators=(",", ":"),
+            )
+        os.replace(tmp_path, path)
 
-    # 找出新增标题
-    new_titles = {}
-    for source_id, latest_source_titles in latest_titles.items():
-        historical_set = historical_titles.get(source_id, set())
-        source_new_titles = {}
 
-        for title, title_data in latest_source_titles.items():
-            if title not in historical_set:
-                source_new_titles[title] = title_data
+class KeywordRollup:
+    """当日关键词统计汇总（output/<日期>/keyword_rollup.json）
 
-        if source_new_titles:
-            new_titles[source_id] = source_new_titles
+    供 MCP 服务的热度检测、话题预测、关键词共现和平台活跃度统计使用，
+    每次爬取后由 DailyAggregate 更新一次，MCP 端只需查表而不必对全部标题分词。
+    按天统计以合并后的标题（按平台去重，顺序同 MCP 按天合并的结果）为单位；
+    按次统计记录每次爬取中各关键词的出现次数。
 
-    return new_titles
+    分词规则和停用词需与 mcp_server/services/keyword_rollup.py 中的 extract_keywords 保持一致，
+    统计表的计算需与其中的 DayRollup.from_titles（统计文件不可用时的回退路径）一致。
+    爬虫按单文件部署（镜像中没有 mcp_server 包），MCP 服务单独打包、不依赖 main.py，
+    两边无法共用代码；test_keyword_rollup.py 比对两者由同一份数据得到的结果。
+    """
 
+    VERSION = 1
+    FILENAME = "keyword_rollup.json"
+    STOPWORDS = {
+        "的", "了", "在", "是", "我", "有", "和", "就", "不", "人", "都", "一", "一个",
+        "上", "也", "很", "到", "说", "要", "去", "你", "会", "着", "没有", "看", "好",
+        "自己", "这",
+    }
+    SAMPLE_SIZE = 3
 
-# === 统计和分析 ===
-def calculate_news_weight(
-    title_data: Dict, rank_threshold: int = CONFIG["RANK_THRESHOLD"]
-) -> float:
-    """计算新闻权重，用于排序"""
-    ranks = title_data.get("ranks", [])
-    if not ranks:
-        return 0.0
+    def __init__(self):
+        self.crawls: Dict[str, Dict[str, int]] = {}
+
+    @classmethod
+    def extract_keywords(cls, title: str, min_length: int = 2) -> List[str]:
+        """从标题中提取关键词（按空白和标点切分，过滤停用词和短词）"""
+        title = re.sub(r"http[s]?://\S+", "", title)
+        title = re.sub(r"[^\w\s]", " ", title)
+        words = re.split(r"[\s，。！？、]+", title)
+        return [
+            word.strip()
+            for word in words
+            if word.strip()
+            and len(word.strip()) >= min_length
+            and word.strip() not in cls.STOPWORDS
+        ]
+
+    def add_snapshot(self, time_info: str, titles_by_id: Dict) -> None:
+        """记录一次爬取的关键词出现次数"""
+        counts = Counter()
+        for titles in titles_by_id.values():
+            for title in titles:
+                counts.update(self.extract_keywords(title))
+        self.crawls[time_info] = dict(counts)
+
+    def _day_tables(self, search_index: "TitleSearchIndex") -> Dict:
+        """由合并后的标题计算按天统计表"""
+        docs = sorted(search_index.docs, key=lambda doc: doc[0])
+        titles: List[str] = []
+        title_ids: Dict[str, int] = {}
+
+        def title_id(title: str) -> int:
+            if title not in title_ids:
+                title_ids[title] = len(titles)
+                titles.append(title)
+            return title_ids[title]
+
+        keyword_counts = Counter()
+        keyword_samples: Dict[str, List[int]] = {}
+        pair_counts = Counter()
+        platform_counts = {platform_id: 0 for platform_id in search_index.platforms}
+        doc_keywords = []
+
+        for platform_index, title, *_ in docs:
+            platform_counts[search_index.platforms[platform_index]] += 1
+            keywords = self.extract_keywords(title)
+            doc_keywords.append((title, keywords))
+            keyword_counts.update(keywords)
+            for keyword in keywords:
+                samples = keyword_samples.setdefault(keyword, [])
+                if len(samples) < self.SAMPLE_SIZE:
+                    samples.append(title_id(title))
+            for i, first in enumerate(keywords):
+                for second in keywords[i + 1:]:
+                    pair_counts[tuple(sorted((first, second)))] += 1
+
+        # 共现样本：含第一个词的标题（按其出现次数重复）中同时含第二个词的前几条
+        pair_samples: Dict[Tuple[str, str], List[int]] = {}
+        for title, keywords in doc_keywords:
+            if not keywords:
+                continue
+            multiplicity = Counter(keywords)
+            for first, repeat in multiplicity.items():
+                for second in multiplicity:
+                    pair = (first, second)
+                    if first > second or pair not in pair_counts:
+                        continue
+                    samples = pair_samples.setdefault(pair, [])
+                    if len(samples) < self.SAMPLE_SIZE:
+                        samples.extend(
+                            [title_id(title)] * min(repeat, self.SAMPLE_SIZE - len(samples))
+                        )
 
-    count = title_data.get("count", len(ranks))
-    weight_config = CONFIG["WEIGHT_CONFIG"]
+        keyword_index = {keyword: i for i, keyword in enumerate(keyword_counts)}
+        return {
+            "titles": titles,
+            "keywords": [
+                [keyword, count, keyword_samples[keyword]]
+                for keyword, count in keyword_counts.items()
+            ],
+            "pairs": [
+                [keyword_index[first], keyword_index[second], count, pair_samples[(first, second)]]
+                for (first, second), count in pair_counts.items()
+            ],
+            "platforms": platform_counts,
+            "crawls": {
+                time_info: [
+                    value
+                    for keyword, count in counts.items()
+                    for value in (keyword_index[keyword], count)
+                ]
+                for time_info, counts in self.crawls.items()
+            },
+        }
 
-    # 排名权重：Σ(11 - min(rank, 10)) / 出现次数
-    rank_scores = []
-    for rank in ranks:
-        score = 11 - min(rank, 10)
-        rank_scores.append(score)
+    @classmethod
+    def load(cls, day_dir: Path, sources: Dict) -> Optional["KeywordRollup"]:
+        """读取统计文件，数据源与汇总记录不一致时返回 None"""
+        path = day_dir / cls.FILENAME
+        if not path.exists():
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"[警告] 读取关键词统计失败，将重建: {e}")
+            return None
+        if data.get("version") != cls.VERSION or data.get("sources") != sources:
+            return None
 
-    rank_weight = sum(rank_scores) / len(ranks) if ranks else 0
+        keywords = [entry[0] for entry in data["keywords"]]
+        rollup = cls()
+        rollup.crawls = {
+            time_info: {
+                keywords[flat[i]]: flat[i + 1] for i in range(0, len(flat), 2)
+            }
+            for time_info, flat in data["crawls"].items()
+        }
+        return rollup
 
-    # 频次权重：min(出现次数, 10) × 10
-    frequency_weight = min(count, 10) * 10
+    def save(
+        self,
+        day_dir: Path,
+        sources: Dict,
+        id_to_name: Dict,
+        search_index: "TitleSearchIndex",
+    ) -> None:
+        path = day_dir / self.FILENAME
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "version": self.VERSION,
+                    "sources": sources,
+                    "id_to_name": id_to_name,
+                    **self._day_tables(search_index),
+                },
+                f,
+                ensure_ascii=False,
+                separators=(",", ":"),
+            )
+        os.replace(tmp_path, path)
 
-    # 热度加成：高排名次数 / 总出现次数 × 100
-    high_rank_count = sum(1 for rank in ranks if rank <= rank_threshold)
-    hotness_ratio = high_rank_count / len(ranks) if ranks else 0
-    hotness_weight = hotness_ratio * 100
 
-    total_weight = (
-        rank_weight * weight_config["RANK_WEIGHT"]
-        + frequency_weight * weight_config["FREQUENCY_WEIGHT"]
-        + hotness_weight * weight_config["HOTNESS_WEIGHT"]
-    )
+class DayPack:
+    """当日合并数据的紧凑二进制文件（output/<日期>/day_pack.bin）
 
-    return total_weight
+    供 MCP 服务的多个工作进程以只读 mmap 共享同一天的合并结果，各进程不必各自解析、
+    各自在内存中保留一份。内容即 TitleSearchIndex 的文档（顺序与 MCP 按天合并的结果一致），
+    由 DailyAggregate 每次保存时整体重写（先写临时文件再替换，已映射的旧文件不受影响；
+    Windows 上读取方不保持映射，替换失败时跳过本次更新）。
 
+    文件结构（小端 u32 数组，均按 4 字节对齐）：
+    8 字节魔数 + 元数据长度 + 元数据 JSON（补齐到 4 字节）+
+    平台结束下标[P] + 标题记录[N × (标题, url, mobileUrl 字符串编号, 排名结束下标)] +
+    排名[R] + 字符串结束偏移[S] + UTF-8 字符串数据。
+    格式需与 mcp_server/services/day_pack.py 保持一致。
+    """
 
-def matches_word_groups(
-    title: str, word_groups: List[Dict], filter_words: List[str], global_filters: Optional[List[str]] = None
-) -> bool:
-    """检查标题是否匹配词组规则"""
-    # 防御性类型检查：确保 title 是有效字符串
-    if not isinstance(title, str):
-        title = str(title) if title is not None else ""
-    if not title.strip():
-        return False
+    VERSION = 1
+    FILENAME = "day_pack.bin"
+    MAGIC = b"TRPACK01"
 
-    title_lower = title.lower()
+    @classmethod
+    def save(
+        cls,
+        day_dir: Path,
+        sources: Dict,
+        id_to_name: Dict,
+        search_index: "TitleSearchIndex",
+    ) -> None:
+        # 文档按平台分组，组内保持首次出现顺序
+        docs = sorted(search_index.docs, key=lambda doc: doc[0])
+
+        string_ids: Dict[str, int] = {}
+        blob = bytearray()
+        string_ends = array("I")
+
+        def intern(value: str) -> int:
+            string_id = string_ids.get(value)
+            if string_id is None:
+                string_id = string_ids[value] = len(string_ends)
+                blob.extend(value.encode("utf-8"))
+                string_ends.append(len(blob))
+            return string_id
+
+        platform_ends = array("I", [0] * len(search_index.platforms))
+        records = array("I")
+        ranks = array("I")
+        for platform_index, title, title_ranks, url, mobile_url in docs:
+            ranks.extend(title_ranks)
+            records.extend((intern(title), intern(url), intern(mobile_url), len(ranks)))
+            platform_ends[platform_index] = len(records) // 4
+        # 没有标题的平台沿用前一个平台的结束下标
+        for i in range(1, len(platform_ends)):
+            platform_ends[i] = max(platform_ends[i], platform_ends[i - 1])
+
+        meta = json.dumps(
+            {
+                "version": cls.VERSION,
+                "sources": sources,
+                "id_to_name": id_to_name,
+                "platforms": search_index.platforms,
+                "title_count": len(docs),
+                "rank_count": len(ranks),
+                "string_count": len(string_ends),
+            },
+            ensure_ascii=False,
+            separators=(",", ":"),
+        ).encode("utf-8")
+        meta += b" " * (-(len(cls.MAGIC) + 4 + len(meta)) % 4)
+
+        arrays = [platform_ends, records, ranks, string_ends]
+        if sys.byteorder != "little":
+            for values in arrays:
+                values.byteswap()
+
+        path = day_dir / cls.FILENAME
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(cls.MAGIC)
+            f.write(struct.pack("<I", len(meta)))
+            f.write(meta)
+            for values in arrays:
+                f.write(values.tobytes())
+            f.write(blob)
+        try:
+            os.replace(tmp_path, path)
+        except PermissionError as e:
+            # Windows 上旧文件仍被读取方打开时无法替换；旧文件记录的数据源与 txt 不符，
+            # 读取方会自动改为解析 txt，下次保存时再替换
+            tmp_path.unlink(missing_ok=True)
+            print(f"[警告] 合并数据文件正被占用，本次未更新: {e}")
+
+
+class DailyAggregate:
+    """当日增量汇总（all_results / id_to_name / title_info 的持久化结果）
+
+    每次爬取后只合并最新一次快照，报告读取时直接加载汇总结果，
+    不再随当天爬取次数线性增长。汇总记录了每个 txt 文件的大小、mtime 和 crc32
+    以及快照存储的大小；检测到文件被修改、删除或插入了更早的数据时，
+    从全部快照完整重建。
+
+    title_info 的键即当天已出现标题集合，合并新快照时顺带得到最新批次的新增标题，
+    同时写入 new_titles.json 供 MCP 服务等其他读取方使用；
+    标题倒排索引 search_index.json、关键词统计 keyword_rollup.json
+    和合并数据文件 day_pack.bin 也随每次合并更新。
+    """
 
-    # 全局过滤检查（优先级最高）
-    if global_filters:
-        if any(global_word.lower() in title_lower for global_word in global_filters):
-            return False
+    VERSION = 2
+    FILENAME = "aggregate.json"
+    NEW_TITLES_FILENAME = "new_titles.json"
+
+    def __init__(self, date_folder: Optional[str] = None):
+        self.date_folder = date_folder or format_date_folder()
+        self.day_dir = Path("output") / self.date_folder
+        self.path = self.day_dir / self.FILENAME
+
+    def _store_size(self) -> int:
+        store_path = self.day_dir / SNAPSHOT_FILENAME
+        return store_path.stat().st_size if store_path.exists() else 0
+
+    def _txt_stats(self) -> Dict[str, Tuple[Path, int, int]]:
+        txt_dir = self.day_dir / "txt"
+        if not txt_dir.exists():
+            return {}
+        stats = {}
+        for file_path in txt_dir.iterdir():
+            if file_path.suffix == ".txt":
+                st = file_path.stat()
+                stats[file_path.stem] = (file_path, st.st_size, st.st_mtime_ns)
+        return stats
+
+    def _load_file(self) -> Optional[Dict]:
+        if not self.path.exists():
+            return None
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != self.VERSION:
+                return None
+            search_index = TitleSearchIndex.load(self.day_dir, data["sources"])
+            if search_index is None:
+                return None
+            keyword_rollup = KeywordRollup.load(self.day_dir, data["sources"])
+            if keyword_rollup is None:
+                return None
+            data["search_index"] = search_index
+            data["keyword_rollup"] = keyword_rollup
+            data["all_results"] = self._derive_results(data["title_info"])
+            return data
+        except Exception as e:
+            print(f"[警告] 读取当日汇总失败，将重建: {e}")
+            return None
 
-    # 如果没有配置词组，则匹配所有标题（支持显示全部新闻）
-    if not word_groups:
-        return True
+    @staticmethod
+    def _derive_results(title_info: Dict) -> Dict:
+        """all_results 的 ranks/url/mobileUrl 与 title_info 一致，无需重复落盘"""
+        return {
+            source_id: {
+                title: {
+                    "ranks": info["ranks"],
+                    "url": info["url"],
+                    "mobileUrl": info["mobileUrl"],
+                }
+                for title, info in titles.items()
+            }
+            for source_id, titles in title_info.items()
+        }
 
-    # 过滤词检查
-    if any(filter_word.lower() in title_lower for filter_word in filter_words):
-        return False
+    def _save_file(self, data: Dict) -> None:
+        self.day_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        persisted = {
+            k: v
+            for k, v in data.items()
+            if k not in ("all_results", "search_index", "keyword_rollup")
+        }
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(persisted, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, self.path)
 
-    # 词组匹配检查
-    for group in word_groups:
-        required_words = group["required"]
-        normal_words = group["normal"]
+        data["search_index"].save(self.day_dir, data["sources"], data["id_to_name"])
+        data["keyword_rollup"].save(
+            self.day_dir, data["sources"], data["id_to_name"], data["search_index"]
+        )
+        DayPack.save(
+            self.day_dir, data["sources"], data["id_to_name"], data["search_index"]
+        )
 
-        # 必须词检查
-        if required_words:
-            all_required_present = all(
-                req_word.lower() in title_lower for req_word in required_words
+        latest_time = data.get("latest_time")
+        new_titles_path = self.day_dir / self.NEW_TITLES_FILENAME
+        tmp_path = new_titles_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "version": self.VERSION,
+                    "latest_time": latest_time,
+                    "crawl_count": len(data["sources"]),
+                    "latest_source": data["sources"].get(latest_time, {}),
+                    "id_to_name": data["id_to_name"],
+                    # 当天第一次爬取时全部标题都未出现过，不算新增（同 load）
+                    "new_titles": (
+                        data.get("latest_new_titles", {})
+                        if len(data["sources"]) >= 2 else {}
+                    ),
+                },
+                f,
+                ensure_ascii=False,
+                separators=(",", ":"),
             )
-            if not all_required_present:
+        os.replace(tmp_path, new_titles_path)
+
+    def _check_sources(self, data: Dict) -> Optional[List[str]]:
+        """
+        校验汇总记录的数据源
+
+        Returns:
+            尚未合并的 txt time_info 列表（均晚于已合并数据）；需要完整重建时返回 None
+        """
+        sources = data.get("sources", {})
+        txt_stats = self._txt_stats()
+
+        for time_info, source in sources.items():
+            if time_info not in txt_stats:
+                if source.get("size") is not None:
+                    return None
+                continue
+            file_path, size, mtime_ns = txt_stats[time_info]
+            if source.get("size") == size and source.get("mtime_ns") == mtime_ns:
                 continue
+            if file_fingerprint(file_path) != (size, source.get("crc")):
+                return None
+            source["size"] = size
+            source["mtime_ns"] = mtime_ns
+
+        pending = sorted(t for t in txt_stats if t not in sources)
+        if pending and sources and pending[0] < max(sources):
+            return None
+        if not pending and data.get("store_size") != self._store_size():
+            return None
+        return pending
+
+    def _source_entry(self, time_info: str) -> Dict:
+        file_path = self.day_dir / "txt" / f"{time_info}.txt"
+        if not file_path.exists():
+            return {"size": None, "mtime_ns": None, "crc": None}
+        size, crc = file_fingerprint(file_path)
+        return {
+            "size": size,
+            "mtime_ns": file_path.stat().st_mtime_ns,
+            "crc": crc,
+        }
+
+    def rebuild(self) -> Dict:
+        """从当天全部快照完整重建汇总"""
+        data = {
+            "version": self.VERSION,
+            "sources": {},
+            "store_size": 0,
+            "all_results": {},
+            "id_to_name": {},
+            "title_info": {},
+            "latest_time": None,
+            "latest_new_titles": {},
+            "search_index": TitleSearchIndex(),
+            "keyword_rollup": KeywordRollup(),
+        }
+
+        for time_info, titles_by_id, file_id_to_name in load_day_snapshots(
+            self.date_folder
+        ):
+            self._merge(data, time_info, titles_by_id, file_id_to_name)
+
+        data["store_size"] = self._store_size()
+        if data["sources"]:
+            self._save_file(data)
+        return data
 
-        # 普通词检查
-        if normal_words:
-            any_normal_present = any(
-                normal_word.lower() in title_lower for normal_word in normal_words
+    def _merge(
+        self, data: Dict, time_info: str, titles_by_id: Dict, file_id_to_name: Dict
+    ) -> None:
+        title_info = data["title_info"]
+
+        # 合并前不在已出现集合中的标题即本批次新增
+        latest_new_titles = {}
+        for source_id, title_data in titles_by_id.items():
+            seen_titles = title_info.get(source_id, {})
+            source_new_titles = {
+                title: info
+                for title, info in title_data.items()
+                if title not in seen_titles
+            }
+            if source_new_titles:
+                latest_new_titles[source_id] = source_new_titles
+
+        data["id_to_name"].update(file_id_to_name)
+        for source_id, title_data in titles_by_id.items():
+            process_source_data(
+                source_id, title_data, time_info, data["all_results"], title_info
             )
-            if not any_normal_present:
+        data["search_index"].add_snapshot(titles_by_id)
+        data["keyword_rollup"].add_snapshot(time_info, titles_by_id)
+        data["sources"][time_info] = self._source_entry(time_info)
+        data["latest_time"] = time_info
+        data["latest_new_titles"] = latest_new_titles
+
+    def update(
+        self, time_info: str, titles_by_id: Dict, file_id_to_name: Dict
+    ) -> None:
+        """爬取保存后调用，只合并本次快照"""
+        data = self._load_file()
+        if data is None:
+            self.rebuild()
+            return
+
+        sources = data["sources"]
+        if time_info in sources:
+            # 同一分钟重复保存：内容未变只刷新文件指纹，否则重建
+            entry = self._source_entry(time_info)
+            if entry["crc"] != sources[time_info].get("crc"):
+                self.rebuild()
+                return
+            sources[time_info] = entry
+        else:
+            pending = self._check_sources(data)
+            if pending != [time_info]:
+                self.rebuild()
+                return
+            self._merge(data, time_info, titles_by_id, file_id_to_name)
+
+        data["store_size"] = self._store_size()
+        self._save_file(data)
+
+    def load(
+        self, current_platform_ids: Optional[List[str]] = None
+    ) -> Tuple[Dict, Dict, Dict, Dict]:
+        """
+        读取汇总结果
+
+        Returns:
+            (all_results, id_to_name, title_info, new_titles)
+            new_titles 为最新批次的新增标题，当天不足两次爬取时为空
+        """
+        data = self._load_file()
+        pending = self._check_sources(data) if data is not None else None
+
+        if pending is None:
+            data = self.rebuild()
+        elif pending:
+            for time_info in pending:
+                titles_by_id, file_id_to_name = parse_file_titles(
+                    self.day_dir / "txt" / f"{time_info}.txt"
+                )
+                self._merge(data, time_info, titles_by_id, file_id_to_name)
+            data["store_size"] = self._store_size()
+            self._save_file(data)
+
+        all_results = data["all_results"]
+        id_to_name = data["id_to_name"]
+        title_info = data["title_info"]
+        new_titles = (
+            data.get("latest_new_titles", {}) if len(data["sources"]) >= 2 else {}
+        )
+
+        if current_platform_ids is not None:
+            all_results = {
+                k: v for k, v in all_results.items() if k in current_platform_ids
+            }
+            title_info = {
+                k: v for k, v in title_info.items() if k in current_platform_ids
+            }
+            new_titles = {
+                k: v for k, v in new_titles.items() if k in current_platform_ids
+            }
+            id_to_name = {k: v for k, v in id_to_name.items() if k in all_results}
+
+        return all_results, id_to_name, title_info, new_titles
+
+
+def detect_latest_new_titles(current_platform_ids: Optional[List[str]] = None) -> Dict:
+    """检测当日最新批次的新增标题，支持按当前监控平台过滤
+
+    基于当日汇总中持久化的已出现标题集合，无需重新解析历史数据。
+    """
+    return DailyAggregate().load(current_platform_ids)[3]
+
+
+# === 统计和分析 ===
+def calculate_news_weight(
+    title_data: Dict, rank_threshold: int = CONFIG["RANK_THRESHOLD"]
+) -> float:
+    """计算新闻权重，用于排序"""
+    ranks = title_data.get("ranks", [])
+    if not ranks:
+        return 0.0
+
+    count = title_data.get("count", len(ranks))
+    weight_config = CONFIG["WEIGHT_CONFIG"]
+
+    # 排名权重：Σ(11 - min(rank, 10)) / 出现次数
+    rank_scores = []
+    for rank in ranks:
+        score = 11 - min(rank, 10)
+        rank_scores.append(score)
+
+    rank_weight = sum(rank_scores) / len(ranks) if ranks else 0
+
+    # 频次权重：min(出现次数, 10) × 10
+    frequency_weight = min(count, 10) * 10
+
+    # 热度加成：高排名次数 / 总出现次数 × 100
+    high_rank_count = sum(1 for rank in ranks if rank <= rank_threshold)
+    hotness_ratio = high_rank_count / len(ranks) if ranks else 0
+    hotness_weight = hotness_ratio * 100
+
+    total_weight = (
+        rank_weight * weight_config["RANK_WEIGHT"]
+        + frequency_weight * weight_config["FREQUENCY_WEIGHT"]
+        + hotness_weight * weight_config["HOTNESS_WEIGHT"]
+    )
+
+    return total_weight
+
+
+class WordGroupMatcher:
+    """编译后的频率词匹配器
+
+    由 load_frequency_words 的输出构建一次，每个标题只做一次自动机扫描，
+    再按命中词找出候选词组，判定规则与逐词判断完全一致：
+    全局过滤词 > 无词组时全部匹配 > 过滤词 > 按配置顺序的第一个满足
+    “必须词全部出现且普通词至少出现一个”的词组。
+    """
+
+    def __init__(
+        self,
+        word_groups: List[Dict],
+        filter_words: List[str],
+        global_filters: Optional[List[str]] = None,
+    ):
+        self.word_groups = word_groups
+        word_ids: Dict[str, int] = {}
+
+        def intern(words: List[str]) -> frozenset:
+            ids = set()
+            for word in words:
+                ids.add(word_ids.setdefault(word.lower(), len(word_ids)))
+            return frozenset(ids)
+
+        self._global_ids = intern(global_filters or [])
+        self._filter_ids = intern(filter_words)
+        self._groups: List[Tuple[frozenset, frozenset]] = []
+        self._word_to_groups: Dict[int, List[int]] = {}
+        self._unconditional_groups: List[int] = []
+
+        for index, group in enumerate(word_groups):
+            required_ids = intern(group["required"])
+            normal_ids = intern(group["normal"])
+            self._groups.append((required_ids, normal_ids))
+            if not required_ids and not normal_ids:
+                self._unconditional_groups.append(index)
+            # 候选词组索引：必须词任取其一即可（全部出现时必然命中它），否则用普通词
+            for word_id in required_ids or normal_ids:
+                self._word_to_groups.setdefault(word_id, []).append(index)
+
+        self._automaton = KeywordAutomaton(list(word_ids))
+
+    def find_group_index(self, title: str) -> Optional[int]:
+        """
+        返回标题匹配的第一个词组下标
+
+        Returns:
+            词组下标；未配置词组但标题有效时返回 -1；不匹配返回 None
+        """
+        if not isinstance(title, str):
+            title = str(title) if title is not None else ""
+        if not title.strip():
+            return None
+
+        hits = self._automaton.find_ids(title.lower())
+
+        if hits & self._global_ids:
+            return None
+        if not self.word_groups:
+            return -1
+        if hits & self._filter_ids:
+            return None
+
+        candidates = set(self._unconditional_groups)
+        for word_id in hits:
+            candidates.update(self._word_to_groups.get(word_id, ()))
+
+        for index in sorted(candidates):
+            required_ids, normal_ids = self._groups[index]
+            if required_ids and not required_ids <= hits:
                 continue
+            if normal_ids and not normal_ids & hits:
+                continue
+            return index
+        return None
 
-        return True
+    def matches(self, title: str) -> bool:
+        """标题是否匹配词组规则"""
+        return self.find_group_index(title) is not None
+
+
+_word_group_matcher_cache: List[Tuple[tuple, WordGroupMatcher]] = []
 
-    return False
+
+def get_word_group_matcher(
+    word_groups: List[Dict],
+    filter_words: List[str],
+    global_filters: Optional[List[str]] = None,
+) -> WordGroupMatcher:
+    """获取编译后的匹配器，按输入列表对象缓存（词组配置加载后不会被原地修改）"""
+    key = (word_groups, filter_words, global_filters)
+    for cached_key, matcher in _word_group_matcher_cache:
+        if all(a is b for a, b in zip(cached_key, key)):
+            return matcher
+
+    matcher = WordGroupMatcher(word_groups, filter_words, global_filters)
+    _word_group_matcher_cache.append((key, matcher))
+    if len(_word_group_matcher_cache) > 8:
+        _word_group_matcher_cache.pop(0)
+    return matcher
+
+
+def matches_word_groups(
+    title: str, word_groups: List[Dict], filter_words: List[str], global_filters: Optional[List[str]] = None
+) -> bool:
+    """检查标题是否匹配词组规则"""
+    return get_word_group_matcher(word_groups, filter_words, global_filters).matches(
+        title
+    )
 
 
 def format_time_display(first_time: str, last_time: str) -> str:
@@ -1321,6 +2577,146 @@ def format_rank_display(ranks: List[int], rank_threshold: int, format_type: str)
             return f"[{min_rank} - {max_rank}]"
 
 
+class TitleClusterer:
+    """跨平台近似标题聚类
+
+    同一事件在不同平台的标题往往只差几个字。标题归一化后取字符二元组，
+    以 MinHash 签名分段建立 LSH 桶，只与同桶的聚类代表比较精确的 Jaccard 相似度，
+    达到阈值即并入该聚类。每个聚类中同一平台最多一条（同平台的相似标题通常是不同新闻），
+    聚类代表为最先加入的标题，不会因后续标题发生漂移。结果只取决于加入顺序，可复现。
+    """
+
+    NUM_PERM = 32
+    BAND_ROWS = 2
+    MIN_SHINGLES = 3
+    _PRIME = (1 << 61) - 1
+
+    def __init__(self, threshold: float = 0.5, seed: int = 20240601):
+        """
+        Args:
+            threshold: 并入聚类所需的最低 Jaccard 相似度
+            seed: 生成哈希函数的随机种子
+        """
+        self.threshold = threshold
+        rng = random.Random(seed)
+        self._perms = [
+            (rng.randrange(1, self._PRIME), rng.randrange(0, self._PRIME))
+            for _ in range(self.NUM_PERM)
+        ]
+        self._clusters: List[Tuple[frozenset, set]] = []
+        self._buckets: Dict[Tuple, List[int]] = {}
+        self._assigned: Dict[Tuple[str, str], int] = {}
+
+    @staticmethod
+    def normalize(title: str) -> str:
+        """与 deduplicate_news_items 相同的标题归一化：小写并去掉标点和空白"""
+        return re.sub(r"[^\w\u4e00-\u9fff]+", "", title.lower())
+
+    @staticmethod
+    def shingles(text: str) -> frozenset:
+        """字符二元组集合"""
+        return frozenset(text[i:i + 2] for i in range(len(text) - 1))
+
+    def _band_keys(self, shingles: frozenset) -> List[Tuple]:
+        """MinHash 签名按 BAND_ROWS 分段后的桶键"""
+        hashes = [zlib.crc32(shingle.encode("utf-8")) for shingle in shingles]
+        prime = self._PRIME
+        signature = [min((a * h + b) % prime for h in hashes) for a, b in self._perms]
+        rows = self.BAND_ROWS
+        return [
+            (band, tuple(signature[band * rows:(band + 1) * rows]))
+            for band in range(self.NUM_PERM // rows)
+        ]
+
+    def assign(self, title: str, source: str) -> int:
+        """
+        为标题分配聚类编号
+
+        Args:
+            title: 标题
+            source: 平台名（同一聚类中每个平台最多一条）
+
+        Returns:
+            聚类编号（从 0 开始，按聚类创建顺序递增）
+        """
+        key = (source, title)
+        if key in self._assigned:
+            return self._assigned[key]
+
+        shingles = self.shingles(self.normalize(title))
+        band_keys = None
+        cluster_id = None
+
+        if len(shingles) >= self.MIN_SHINGLES:
+            band_keys = self._band_keys(shingles)
+            candidates = set()
+            for band_key in band_keys:
+                candidates.update(self._buckets.get(band_key, ()))
+
+            best_score = self.threshold
+            for candidate in sorted(candidates):
+                rep_shingles, sources = self._clusters[candidate]
+                if source in sources:
+                    continue
+                score = len(shingles & rep_shingles) / len(shingles | rep_shingles)
+                if score >= best_score and (cluster_id is None or score > best_score):
+                    cluster_id, best_score = candidate, score
+
+        if cluster_id is None:
+            cluster_id = len(self._clusters)
+            self._clusters.append((shingles, {source}))
+            # 过短的标题只自成一类，不参与匹配
+            for band_key in band_keys or ():
+                self._buckets.setdefault(band_key, []).append(cluster_id)
+        else:
+            self._clusters[cluster_id][1].add(source)
+
+        self._assigned[key] = cluster_id
+        return cluster_id
+
+
+def merge_clustered_titles(
+    titles: List[Dict], clusterer: TitleClusterer, source_key: str = "source_name"
+) -> List[Dict]:
+    """
+    合并同一聚类的标题
+
+    每个聚类保留排在最前的一条（副本），附加 cluster_id 与 cluster_sources（其余平台名），
+    其余条目不再单独列出。
+
+    Args:
+        titles: 已排序的标题数据列表
+        clusterer: 聚类器（同一次运行内共享，使聚类编号在各词组间一致）
+        source_key: 平台名字段
+
+    Returns:
+        合并后的标题数据列表
+    """
+    merged = []
+    representatives: Dict[int, Dict] = {}
+    for title_data in titles:
+        source = title_data.get(source_key) or ""
+        cluster_id = clusterer.assign(title_data.get("title") or "", source)
+        representative = representatives.get(cluster_id)
+        if representative is None:
+            representative = dict(title_data, cluster_id=cluster_id, cluster_sources=[])
+            representatives[cluster_id] = representative
+            merged.append(representative)
+        elif source != representative.get(source_key) and source not in representative["cluster_sources"]:
+            representative["cluster_sources"].append(source)
+    return merged
+
+
+def format_cluster_sources(title_data: Dict, max_sources: int = 3) -> str:
+    """聚类合并的其他平台，如“另见: 知乎、百度热搜”；没有时返回空字符串"""
+    sources = title_data.get("cluster_sources")
+    if not sources:
+        return ""
+    if len(sources) > max_sources:
+        return f"另见: {'、'.join(sources[:max_sources])}等{len(sources)}个平台"
+    return f"另见: {'、'.join(sources)}"
+
+
 def count_word_frequency(
     results: Dict,
     word_groups: List[Dict],
@@ -1411,6 +2807,9 @@ def count_word_frequency(
         group_key = group["group_key"]
         word_stats[group_key] = {"count": 0, "titles": {}}
 
+    # 编译一次匹配器，每个标题只扫描一次即可同时得到是否匹配及所属词组
+    matcher = get_word_group_matcher(word_groups, filter_words, global_filters)
+
     for source_id, titles_data in results_to_process.items():
         total_titles += len(titles_data)
 
@@ -1422,11 +2821,9 @@ def count_word_frequency(
                 continue
 
             # 使用统一的匹配逻辑
-            matches_frequency_words = matches_word_groups(
-                title, word_groups, filter_words, global_filters
-            )
+            group_index = matcher.find_group_index(title)
 
-            if not matches_frequency_words:
+            if group_index is None:
                 continue
 
             # 如果是增量模式或 current 模式第一次，统计匹配的新增新闻数量
@@ -1439,115 +2836,85 @@ def count_word_frequency(
             source_url = title_data.get("url", "")
             source_mobile_url = title_data.get("mobileUrl", "")
 
-            # 找到匹配的词组（防御性转换确保类型安全）
-            title_lower = str(title).lower() if not isinstance(title, str) else title.lower()
-            for group in word_groups:
-                required_words = group["required"]
-                normal_words = group["normal"]
-
-                # 如果是"全部新闻"模式，所有标题都匹配第一个（唯一的）词组
-                if len(word_groups) == 1 and word_groups[0]["group_key"] == "全部新闻":
-                    group_key = group["group_key"]
-                    word_stats[group_key]["count"] += 1
-                    if source_id not in word_stats[group_key]["titles"]:
-                        word_stats[group_key]["titles"][source_id] = []
-                else:
-                    # 原有的匹配逻辑
-                    if required_words:
-                        all_required_present = all(
-                            req_word.lower() in title_lower
-                            for req_word in required_words
-                        )
-                        if not all_required_present:
-                            continue
-
-                    if normal_words:
-                        any_normal_present = any(
-                            normal_word.lower() in title_lower
-                            for normal_word in normal_words
-                        )
-                        if not any_normal_present:
-                            continue
-
-                    group_key = group["group_key"]
-                    word_stats[group_key]["count"] += 1
-                    if source_id not in word_stats[group_key]["titles"]:
-                        word_stats[group_key]["titles"][source_id] = []
-
-                first_time = ""
-                last_time = ""
-                count_info = 1
-                ranks = source_ranks if source_ranks else []
-                url = source_url
-                mobile_url = source_mobile_url
-
-                # 对于 current 模式，从历史统计信息中获取完整数据
-                if (
-                    mode == "current"
-                    and title_info
-                    and source_id in title_info
-                    and title in title_info[source_id]
-                ):
-                    info = title_info[source_id][title]
-                    first_time = info.get("first_time", "")
-                    last_time = info.get("last_time", "")
-                    count_info = info.get("count", 1)
-                    if "ranks" in info and info["ranks"]:
-                        ranks = info["ranks"]
-                    url = info.get("url", source_url)
-                    mobile_url = info.get("mobileUrl", source_mobile_url)
-                elif (
-                    title_info
-                    and source_id in title_info
-                    and title in title_info[source_id]
-                ):
-                    info = title_info[source_id][title]
-                    first_time = info.get("first_time", "")
-                    last_time = info.get("last_time", "")
-                    count_info = info.get("count", 1)
-                    if "ranks" in info and info["ranks"]:
-                        ranks = info["ranks"]
-                    url = info.get("url", source_url)
-                    mobile_url = info.get("mobileUrl", source_mobile_url)
-
-                if not ranks:
-                    ranks = [99]
-
-                time_display = format_time_display(first_time, last_time)
-
-                source_name = id_to_name.get(source_id, source_id)
-
-                # 判断是否为新增
-                is_new = False
-                if all_news_are_new:
-                    # 增量模式下所有处理的新闻都是新增，或者当天第一次的所有新闻都是新增
-                    is_new = True
-                elif new_titles and source_id in new_titles:
-                    # 检查是否在新增列表中
-                    new_titles_for_source = new_titles[source_id]
-                    is_new = title in new_titles_for_source
-
-                word_stats[group_key]["titles"][source_id].append(
-                    {
-                        "title": title,
-                        "source_name": source_name,
-                        "first_time": first_time,
-                        "last_time": last_time,
-                        "time_display": time_display,
-                        "count": count_info,
-                        "ranks": ranks,
-                        "rank_threshold": rank_threshold,
-                        "url": url,
-                        "mobileUrl": mobile_url,
-                        "is_new": is_new,
-                    }
-                )
-
-                if source_id not in processed_titles:
-                    processed_titles[source_id] = {}
-                processed_titles[source_id][title] = True
+            # 匹配的词组（"全部新闻"模式下只有一个虚拟词组）
+            group = word_groups[group_index]
+            group_key = group["group_key"]
+            word_stats[group_key]["count"] += 1
+            if source_id not in word_stats[group_key]["titles"]:
+                word_stats[group_key]["titles"][source_id] = []
+
+            first_time = ""
+            last_time = ""
+            count_info = 1
+            ranks = source_ranks if source_ranks else []
+            url = source_url
+            mobile_url = source_mobile_url
+
+            # 对于 current 模式，从历史统计信息中获取完整数据
+            if (
+                mode == "current"
+                and title_info
+                and source_id in title_info
+                and title in title_info[source_id]
+            ):
+                info = title_info[source_id][title]
+                first_time = info.get("first_time", "")
+                last_time = info.get("last_time", "")
+                count_info = info.get("count", 1)
+                if "ranks" in info and info["ranks"]:
+                    ranks = info["ranks"]
+                url = info.get("url", source_url)
+                mobile_url = info.get("mobileUrl", source_mobile_url)
+            elif (
+                title_info
+                and source_id in title_info
+                and title in title_info[source_id]
+            ):
+                info = title_info[source_id][title]
+                first_time = info.get("first_time", "")
+                last_time = info.get("last_time", "")
+                count_info = info.get("count", 1)
+                if "ranks" in info and info["ranks"]:
+                    ranks = info["ranks"]
+                url = info.get("url", source_url)
+                mobile_url = info.get("mobileUrl", source_mobile_url)
+
+            if not ranks:
+                ranks = [99]
+
+            time_display = format_time_display(first_time, last_time)
+
+            source_name = id_to_name.get(source_id, source_id)
+
+            # 判断是否为新增
+            is_new = False
+            if all_news_are_new:
+                # 增量模式下所有处理的新闻都是新增，或者当天第一次的所有新闻都是新增
+                is_new = True
+            elif new_titles and source_id in new_titles:
+                # 检查是否在新增列表中
+                new_titles_for_source = new_titles[source_id]
+                is_new = title in new_titles_for_source
+
+            word_stats[group_key]["titles"][source_id].append(
+                {
+                    "title": title,
+                    "source_name": source_name,
+                    "first_time": first_time,
+                    "last_time": last_time,
+                    "time_display": time_display,
+                    "count": count_info,
+                    "ranks": ranks,
+                    "rank_threshold": rank_threshold,
+                    "url": url,
+                    "mobileUrl": mobile_url,
+                    "is_new": is_new,
+                }
+            )
 
-                break
+            if source_id not in processed_titles:
+                processed_titles[source_id] = {}
+            processed_titles[source_id][title] = True
 
     # 最后统一打印汇总信息
     if mode == "incremental":
@@ -1607,6 +2974,12 @@ def count_word_frequency(
     group_key_to_max_count = {
         group["group_key"]: group.get("max_count", 0) for group in word_groups
     }
+    # 跨平台近似标题聚类（同一次统计内共享，聚类编号在各词组间一致）
+    clusterer = (
+        TitleClusterer(CONFIG.get("CLUSTER_THRESHOLD", 0.5))
+        if CONFIG.get("CLUSTER_SIMILAR_TITLES", True)
+        else None
+    )
 
     for group_key, data in word_stats.items():
         all_titles = []
@@ -1623,6 +2996,10 @@ def count_word_frequency(
             ),
         )
 
+        # 合并跨平台的同一事件，数量限制按合并后的条目计算
+        if clusterer is not None:
+            sorted_titles = merge_clustered_titles(sorted_titles, clusterer)
+
         # 应用最大显示数量限制（优先级：单独配置 > 全局配置）
         group_max_count = group_key_to_max_count.get(group_key, 0)
         if group_max_count == 0:
@@ -1733,6 +3110,8 @@ def prepare_report_data(
                 "url": title_data.get("url", ""),
                 "mobile_url": title_data.get("mobileUrl", ""),
                 "is_new": title_data.get("is_new", False),
+                "cluster_id": title_data.get("cluster_id"),
+                "cluster_sources": title_data.get("cluster_sources", []),
             }
             processed_titles.append(processed_title)
 
@@ -1766,6 +3145,7 @@ def format_title_for_platform(
     link_url = title_data["mobile_url"] or title_data["url"]
 
     cleaned_title = clean_title(title_data["title"])
+    cluster_display = format_cluster_sources(title_data)
 
     if platform == "feishu":
         if link_url:
@@ -1786,6 +3166,8 @@ def format_title_for_platform(
             result += f" <font color='grey'>- {title_data['time_display']}</font>"
         if title_data["count"] > 1:
             result += f" <font color='green'>({title_data['count']}次)</font>"
+        if cluster_display:
+            result += f" <font color='grey'>({cluster_display})</font>"
 
         return result
 
@@ -1808,6 +3190,8 @@ def format_title_for_platform(
             result += f" - {title_data['time_display']}"
         if title_data["count"] > 1:
             result += f" ({title_data['count']}次)"
+        if cluster_display:
+            result += f" ({cluster_display})"
 
         return result
 
@@ -1831,6 +3215,8 @@ def format_title_for_platform(
             result += f" - {title_data['time_display']}"
         if title_data["count"] > 1:
             result += f" ({title_data['count']}次)"
+        if cluster_display:
+            result += f" ({cluster_display})"
 
         return result
 
@@ -1853,6 +3239,8 @@ def format_title_for_platform(
             result += f" <code>- {title_data['time_display']}</code>"
         if title_data["count"] > 1:
             result += f" <code>({title_data['count']}次)</code>"
+        if cluster_display:
+            result += f" <code>({html_escape(cluster_display)})</code>"
 
         return result
 
@@ -1875,6 +3263,8 @@ def format_title_for_platform(
             result += f" `- {title_data['time_display']}`"
         if title_data["count"] > 1:
             result += f" `({title_data['count']}次)`"
+        if cluster_display:
+            result += f" `({cluster_display})`"
 
         return result
 
@@ -1903,6 +3293,8 @@ def format_title_for_platform(
             result += f" `- {title_data['time_display']}`"
         if title_data["count"] > 1:
             result += f" `({title_data['count']}次)`"
+        if cluster_display:
+            result += f" `({cluster_display})`"
 
         return result
 
@@ -1931,6 +3323,8 @@ def format_title_for_platform(
             formatted_title += f" <font color='grey'>- {escaped_time}</font>"
         if title_data["count"] > 1:
             formatted_title += f" <font color='green'>({title_data['count']}次)</font>"
+        if cluster_display:
+            formatted_title += f" <font color='grey'>({html_escape(cluster_display)})</font>"
 
         if title_data.get("is_new"):
             formatted_title = f"<div class='new-title'>🆕 {formatted_title}</div>"
@@ -1966,37 +3360,39 @@ def generate_html_report(
 
     report_data = prepare_report_data(stats, failed_ids, new_titles, id_to_name, mode)
 
-    html_content = render_html_content(
-        report_data, total_titles, is_daily_summary, mode, update_info
-    )
-
-    with open(file_path, "w", encoding="utf-8") as f:
-        f.write(html_content)
+    # 先写入临时文件再原子替换，读取方不会看到写了一半的报告
+    temp_path = f"{file_path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        write_html_content(
+            f, report_data, total_titles, is_daily_summary, mode, update_info
+        )
+    os.replace(temp_path, file_path)
 
     if is_daily_summary:
         # 生成到根目录（供 GitHub Pages 访问）
-        root_index_path = Path("index.html")
-        with open(root_index_path, "w", encoding="utf-8") as f:
-            f.write(html_content)
+        _publish_html_copy(file_path, Path("index.html"))
 
         # 同时生成到 output 目录（供 Docker Volume 挂载访问）
-        output_index_path = Path("output") / "index.html"
         ensure_directory_exists("output")
-        with open(output_index_path, "w", encoding="utf-8") as f:
-            f.write(html_content)
+        _publish_html_copy(file_path, Path("output") / "index.html")
 
     return file_path
 
 
-def render_html_content(
-    report_data: Dict,
-    total_titles: int,
-    is_daily_summary: bool = False,
-    mode: str = "daily",
-    update_info: Optional[Dict] = None,
-) -> str:
-    """渲染HTML内容"""
-    html = """
+def _publish_html_copy(source_path: str, target_path: Path) -> None:
+    """把已生成的报告发布到另一路径：优先硬链接，跨文件系统等情况退回复制，均原子替换"""
+    temp_path = target_path.with_name(f"{target_path.name}.tmp")
+    try:
+        if temp_path.exists():
+            temp_path.unlink()
+        os.link(source_path, temp_path)
+    except OSError:
+        shutil.copyfile(source_path, temp_path)
+    os.replace(temp_path, target_path)
+
+
+# HTML 报告的静态部分（样式、脚本）只构建一次，渲染时直接写出
+_HTML_REPORT_HEAD = """
     <!DOCTYPE html>
     <html>
     <head>
@@ -2241,6 +3637,11 @@ def render_html_content(
                 font-weight: 500;
             }
             
+            .cluster-info {
+                color: #999;
+                font-size: 11px;
+            }
+            
             .news-title {
                 font-size: 15px;
                 line-height: 1.4;
@@ -2440,255 +3841,7 @@ def render_html_content(
                         <span class="info-label">报告类型</span>
                         <span class="info-value">"""
 
-    # 处理报告类型显示
-    if is_daily_summary:
-        if mode == "current":
-            html += "当前榜单"
-        elif mode == "incremental":
-            html += "增量模式"
-        else:
-            html += "当日汇总"
-    else:
-        html += "实时分析"
-
-    html += """</span>
-                    </div>
-                    <div class="info-item">
-                        <span class="info-label">新闻总数</span>
-                        <span class="info-value">"""
-
-    html += f"{total_titles} 条"
-
-    # 计算筛选后的热点新闻数量
-    hot_news_count = sum(len(stat["titles"]) for stat in report_data["stats"])
-
-    html += """</span>
-                    </div>
-                    <div class="info-item">
-                        <span class="info-label">热点新闻</span>
-                        <span class="info-value">"""
-
-    html += f"{hot_news_count} 条"
-
-    html += """</span>
-                    </div>
-                    <div class="info-item">
-                        <span class="info-label">生成时间</span>
-                        <span class="info-value">"""
-
-    now = get_beijing_time()
-    html += now.strftime("%m-%d %H:%M")
-
-    html += """</span>
-                    </div>
-                </div>
-            </div>
-            
-            <div class="content">"""
-
-    # 处理失败ID错误信息
-    if report_data["failed_ids"]:
-        html += """
-                <div class="error-section">
-                    <div class="error-title">[警告] 请求失败的平台</div>
-                    <ul class="error-list">"""
-        for id_value in report_data["failed_ids"]:
-            html += f'<li class="error-item">{html_escape(id_value)}</li>'
-        html += """
-                    </ul>
-                </div>"""
-
-    # 生成热点词汇统计部分的HTML
-    stats_html = ""
-    if report_data["stats"]:
-        total_count = len(report_data["stats"])
-
-        for i, stat in enumerate(report_data["stats"], 1):
-            count = stat["count"]
-
-            # 确定热度等级
-            if count >= 10:
-                count_class = "hot"
-            elif count >= 5:
-                count_class = "warm"
-            else:
-                count_class = ""
-
-            escaped_word = html_escape(stat["word"])
-
-            stats_html += f"""
-                <div class="word-group">
-                    <div class="word-header">
-                        <div class="word-info">
-                            <div class="word-name">{escaped_word}</div>
-                            <div class="word-count {count_class}">{count} 条</div>
-                        </div>
-                        <div class="word-index">{i}/{total_count}</div>
-                    </div>"""
-
-            # 处理每个词组下的新闻标题，给每条新闻标上序号
-            for j, title_data in enumerate(stat["titles"], 1):
-                is_new = title_data.get("is_new", False)
-                new_class = "new" if is_new else ""
-
-                stats_html += f"""
-                    <div class="news-item {new_class}">
-                        <div class="news-number">{j}</div>
-                        <div class="news-content">
-                            <div class="news-header">
-                                <span class="source-name">{html_escape(title_data["source_name"])}</span>"""
-
-                # 处理排名显示
-                ranks = title_data.get("ranks", [])
-                if ranks:
-                    min_rank = min(ranks)
-                    max_rank = max(ranks)
-                    rank_threshold = title_data.get("rank_threshold", 10)
-
-                    # 确定排名等级
-                    if min_rank <= 3:
-                        rank_class = "top"
-                    elif min_rank <= rank_threshold:
-                        rank_class = "high"
-                    else:
-                        rank_class = ""
-
-                    if min_rank == max_rank:
-                        rank_text = str(min_rank)
-                    else:
-                        rank_text = f"{min_rank}-{max_rank}"
-
-                    stats_html += f'<span class="rank-num {rank_class}">{rank_text}</span>'
-
-                # 处理时间显示
-                time_display = title_data.get("time_display", "")
-                if time_display:
-                    # 简化时间显示格式，将波浪线替换为~
-                    simplified_time = (
-                        time_display.replace(" ~ ", "~")
-                        .replace("[", "")
-                        .replace("]", "")
-                    )
-                    stats_html += (
-                        f'<span class="time-info">{html_escape(simplified_time)}</span>'
-                    )
-
-                # 处理出现次数
-                count_info = title_data.get("count", 1)
-                if count_info > 1:
-                    stats_html += f'<span class="count-info">{count_info}次</span>'
-
-                stats_html += """
-                            </div>
-                            <div class="news-title">"""
-
-                # 处理标题和链接
-                escaped_title = html_escape(title_data["title"])
-                link_url = title_data.get("mobile_url") or title_data.get("url", "")
-
-                if link_url:
-                    escaped_url = html_escape(link_url)
-                    stats_html += f'<a href="{escaped_url}" target="_blank" class="news-link">{escaped_title}</a>'
-                else:
-                    stats_html += escaped_title
-
-                stats_html += """
-                            </div>
-                        </div>
-                    </div>"""
-
-            stats_html += """
-                </div>"""
-
-    # 生成新增新闻区域的HTML
-    new_titles_html = ""
-    if report_data["new_titles"]:
-        new_titles_html += f"""
-                <div class="new-section">
-                    <div class="new-section-title">本次新增热点 (共 {report_data['total_new_count']} 条)</div>"""
-
-        for source_data in report_data["new_titles"]:
-            escaped_source = html_escape(source_data["source_name"])
-            titles_count = len(source_data["titles"])
-
-            new_titles_html += f"""
-                    <div class="new-source-group">
-                        <div class="new-source-title">{escaped_source} · {titles_count}条</div>"""
-
-            # 为新增新闻也添加序号
-            for idx, title_data in enumerate(source_data["titles"], 1):
-                ranks = title_data.get("ranks", [])
-
-                # 处理新增新闻的排名显示
-                rank_class = ""
-                if ranks:
-                    min_rank = min(ranks)
-                    if min_rank <= 3:
-                        rank_class = "top"
-                    elif min_rank <= title_data.get("rank_threshold", 10):
-                        rank_class = "high"
-
-                    if len(ranks) == 1:
-                        rank_text = str(ranks[0])
-                    else:
-                        rank_text = f"{min(ranks)}-{max(ranks)}"
-                else:
-                    rank_text = "?"
-
-                new_titles_html += f"""
-                        <div class="new-item">
-                            <div class="new-item-number">{idx}</div>
-                            <div class="new-item-rank {rank_class}">{rank_text}</div>
-                            <div class="new-item-content">
-                                <div class="new-item-title">"""
-
-                # 处理新增新闻的链接
-                escaped_title = html_escape(title_data["title"])
-                link_url = title_data.get("mobile_url") or title_data.get("url", "")
-
-                if link_url:
-                    escaped_url = html_escape(link_url)
-                    new_titles_html += f'<a href="{escaped_url}" target="_blank" class="news-link">{escaped_title}</a>'
-                else:
-                    new_titles_html += escaped_title
-
-                new_titles_html += """
-                                </div>
-                            </div>
-                        </div>"""
-
-            new_titles_html += """
-                    </div>"""
-
-        new_titles_html += """
-                </div>"""
-
-    # 根据配置决定内容顺序
-    if CONFIG.get("REVERSE_CONTENT_ORDER", False):
-        # 新增热点在前，热点词汇统计在后
-        html += new_titles_html + stats_html
-    else:
-        # 默认：热点词汇统计在前，新增热点在后
-        html += stats_html + new_titles_html
-
-    html += """
-            </div>
-            
-            <div class="footer">
-                <div class="footer-content">
-                    由 <span class="project-name">TrendRadar</span> 生成 · 
-                    <a href="https://github.com/sansan0/TrendRadar" target="_blank" class="footer-link">
-                        GitHub 开源项目
-                    </a>"""
-
-    if update_info:
-        html += f"""
-                    <br>
-                    <span style="color: #ea580c; font-weight: 500;">
-                        发现新版本 {update_info['remote_version']}，当前版本 {update_info['current_version']}
-                    </span>"""
-
-    html += """
+_HTML_REPORT_TAIL = """
                 </div>
             </div>
         </div>
@@ -3004,76 +4157,362 @@ def render_html_content(
     </html>
     """
 
-    return html
-
 
-def render_feishu_content(
-    report_data: Dict, update_info: Optional[Dict] = None, mode: str = "daily"
+def render_html_content(
+    report_data: Dict,
+    total_titles: int,
+    is_daily_summary: bool = False,
+    mode: str = "daily",
+    update_info: Optional[Dict] = None,
 ) -> str:
-    """渲染飞书内容"""
-    # 生成热点词汇统计部分
-    stats_content = ""
-    if report_data["stats"]:
-        stats_content += f"📊 **热点词汇统计**\n\n"
+    """渲染HTML内容"""
+    buffer = io.StringIO()
+    write_html_content(
+        buffer, report_data, total_titles, is_daily_summary, mode, update_info
+    )
+    return buffer.getvalue()
 
-        total_count = len(report_data["stats"])
 
-        for i, stat in enumerate(report_data["stats"]):
-            word = stat["word"]
-            count = stat["count"]
+def write_html_content(
+    out,
+    report_data: Dict,
+    total_titles: int,
+    is_daily_summary: bool = False,
+    mode: str = "daily",
+    update_info: Optional[Dict] = None,
+) -> None:
+    """将HTML内容逐段写入文件对象，不在内存中拼接整页"""
+    write = out.write
+    write(_HTML_REPORT_HEAD)
 
-            sequence_display = f"<font color='grey'>[{i + 1}/{total_count}]</font>"
+    # 处理报告类型显示
+    if is_daily_summary:
+        if mode == "current":
+            write("当前榜单")
+        elif mode == "incremental":
+            write("增量模式")
+        else:
+            write("当日汇总")
+    else:
+        write("实时分析")
 
-            if count >= 10:
-                stats_content += f"🔥 {sequence_display} **{word}** : <font color='red'>{count}</font> 条\n\n"
-            elif count >= 5:
-                stats_content += f"📈 {sequence_display} **{word}** : <font color='orange'>{count}</font> 条\n\n"
-            else:
-                stats_content += f"📌 {sequence_display} **{word}** : {count} 条\n\n"
+    write("""</span>
+                    </div>
+                    <div class="info-item">
+                        <span class="info-label">新闻总数</span>
+                        <span class="info-value">""")
 
-            for j, title_data in enumerate(stat["titles"], 1):
-                formatted_title = format_title_for_platform(
-                    "feishu", title_data, show_source=True
-                )
-                stats_content += f"  {j}. {formatted_title}\n"
+    write(f"{total_titles} 条")
 
-                if j < len(stat["titles"]):
-                    stats_content += "\n"
+    # 计算筛选后的热点新闻数量
+    hot_news_count = sum(len(stat["titles"]) for stat in report_data["stats"])
 
-            if i < len(report_data["stats"]) - 1:
-                stats_content += f"\n{CONFIG['FEISHU_MESSAGE_SEPARATOR']}\n\n"
+    write("""</span>
+                    </div>
+                    <div class="info-item">
+                        <span class="info-label">热点新闻</span>
+                        <span class="info-value">""")
 
-    # 生成新增新闻部分
-    new_titles_content = ""
-    if report_data["new_titles"]:
-        new_titles_content += (
-            f"🆕 **本次新增热点新闻** (共 {report_data['total_new_count']} 条)\n\n"
-        )
+    write(f"{hot_news_count} 条")
 
-        for source_data in report_data["new_titles"]:
-            new_titles_content += (
-                f"**{source_data['source_name']}** ({len(source_data['titles'])} 条):\n"
-            )
+    write("""</span>
+                    </div>
+                    <div class="info-item">
+                        <span class="info-label">生成时间</span>
+                        <span class="info-value">""")
 
-            for j, title_data in enumerate(source_data["titles"], 1):
-                title_data_copy = title_data.copy()
-                title_data_copy["is_new"] = False
-                formatted_title = format_title_for_platform(
-                    "feishu", title_data_copy, show_source=False
-                )
-                new_titles_content += f"  {j}. {formatted_title}\n"
+    now = get_beijing_time()
+    write(now.strftime("%m-%d %H:%M"))
 
-            new_titles_content += "\n"
+    write("""</span>
+                    </div>
+                </div>
+            </div>
+            
+            <div class="content">""")
+
+    # 处理失败ID错误信息
+    if report_data["failed_ids"]:
+        write("""
+                <div class="error-section">
+                    <div class="error-title">[警告] 请求失败的平台</div>
+                    <ul class="error-list">""")
+        for id_value in report_data["failed_ids"]:
+            write(f'<li class="error-item">{html_escape(id_value)}</li>')
+        write("""
+                    </ul>
+                </div>""")
 
     # 根据配置决定内容顺序
-    text_content = ""
     if CONFIG.get("REVERSE_CONTENT_ORDER", False):
         # 新增热点在前，热点词汇统计在后
-        if new_titles_content:
-            text_content += new_titles_content
-            if stats_content:
-                text_content += f"\n{CONFIG['FEISHU_MESSAGE_SEPARATOR']}\n\n"
-        if stats_content:
+        _write_html_new_titles(write, report_data)
+        _write_html_stats(write, report_data)
+    else:
+        # 默认：热点词汇统计在前，新增热点在后
+        _write_html_stats(write, report_data)
+        _write_html_new_titles(write, report_data)
+
+
+    write("""
+            </div>
+            
+            <div class="footer">
+                <div class="footer-content">
+                    由 <span class="project-name">TrendRadar</span> 生成 · 
+                    <a href="https://github.com/sansan0/TrendRadar" target="_blank" class="footer-link">
+                        GitHub 开源项目
+                    </a>""")
+
+    if update_info:
+        write(f"""
+                    <br>
+                    <span style="color: #ea580c; font-weight: 500;">
+                        发现新版本 {update_info['remote_version']}，当前版本 {update_info['current_version']}
+                    </span>""")
+
+    write(_HTML_REPORT_TAIL)
+
+
+def _write_html_stats(write, report_data: Dict) -> None:
+    """写出热点词汇统计部分的HTML"""
+    if report_data["stats"]:
+        total_count = len(report_data["stats"])
+
+        for i, stat in enumerate(report_data["stats"], 1):
+            count = stat["count"]
+
+            # 确定热度等级
+            if count >= 10:
+                count_class = "hot"
+            elif count >= 5:
+                count_class = "warm"
+            else:
+                count_class = ""
+
+            escaped_word = html_escape(stat["word"])
+
+            write(f"""
+                <div class="word-group">
+                    <div class="word-header">
+                        <div class="word-info">
+                            <div class="word-name">{escaped_word}</div>
+                            <div class="word-count {count_class}">{count} 条</div>
+                        </div>
+                        <div class="word-index">{i}/{total_count}</div>
+                    </div>""")
+
+            # 处理每个词组下的新闻标题，给每条新闻标上序号
+            for j, title_data in enumerate(stat["titles"], 1):
+                is_new = title_data.get("is_new", False)
+                new_class = "new" if is_new else ""
+
+                write(f"""
+                    <div class="news-item {new_class}">
+                        <div class="news-number">{j}</div>
+                        <div class="news-content">
+                            <div class="news-header">
+                                <span class="source-name">{html_escape(title_data["source_name"])}</span>""")
+
+                # 处理排名显示
+                ranks = title_data.get("ranks", [])
+                if ranks:
+                    min_rank = min(ranks)
+                    max_rank = max(ranks)
+                    rank_threshold = title_data.get("rank_threshold", 10)
+
+                    # 确定排名等级
+                    if min_rank <= 3:
+                        rank_class = "top"
+                    elif min_rank <= rank_threshold:
+                        rank_class = "high"
+                    else:
+                        rank_class = ""
+
+                    if min_rank == max_rank:
+                        rank_text = str(min_rank)
+                    else:
+                        rank_text = f"{min_rank}-{max_rank}"
+
+                    write(f'<span class="rank-num {rank_class}">{rank_text}</span>')
+
+                # 处理时间显示
+                time_display = title_data.get("time_display", "")
+                if time_display:
+                    # 简化时间显示格式，将波浪线替换为~
+                    simplified_time = (
+                        time_display.replace(" ~ ", "~")
+                        .replace("[", "")
+                        .replace("]", "")
+                    )
+                    write(
+                        f'<span class="time-info">{html_escape(simplified_time)}</span>'
+                    )
+
+                # 处理出现次数
+                count_info = title_data.get("count", 1)
+                if count_info > 1:
+                    write(f'<span class="count-info">{count_info}次</span>')
+
+                # 处理聚类合并的其他平台
+                cluster_display = format_cluster_sources(title_data)
+                if cluster_display:
+                    write(f'<span class="cluster-info">{html_escape(cluster_display)}</span>')
+
+                write("""
+                            </div>
+                            <div class="news-title">""")
+
+                # 处理标题和链接
+                escaped_title = html_escape(title_data["title"])
+                link_url = title_data.get("mobile_url") or title_data.get("url", "")
+
+                if link_url:
+                    escaped_url = html_escape(link_url)
+                    write(f'<a href="{escaped_url}" target="_blank" class="news-link">{escaped_title}</a>')
+                else:
+                    write(escaped_title)
+
+                write("""
+                            </div>
+                        </div>
+                    </div>""")
+
+            write("""
+                </div>""")
+
+
+def _write_html_new_titles(write, report_data: Dict) -> None:
+    """写出新增新闻区域的HTML"""
+    if report_data["new_titles"]:
+        write(f"""
+                <div class="new-section">
+                    <div class="new-section-title">本次新增热点 (共 {report_data['total_new_count']} 条)</div>""")
+
+        for source_data in report_data["new_titles"]:
+            escaped_source = html_escape(source_data["source_name"])
+            titles_count = len(source_data["titles"])
+
+            write(f"""
+                    <div class="new-source-group">
+                        <div class="new-source-title">{escaped_source} · {titles_count}条</div>""")
+
+            # 为新增新闻也添加序号
+            for idx, title_data in enumerate(source_data["titles"], 1):
+                ranks = title_data.get("ranks", [])
+
+                # 处理新增新闻的排名显示
+                rank_class = ""
+                if ranks:
+                    min_rank = min(ranks)
+                    if min_rank <= 3:
+                        rank_class = "top"
+                    elif min_rank <= title_data.get("rank_threshold", 10):
+                        rank_class = "high"
+
+                    if len(ranks) == 1:
+                        rank_text = str(ranks[0])
+                    else:
+                        rank_text = f"{min(ranks)}-{max(ranks)}"
+                else:
+                    rank_text = "?"
+
+                write(f"""
+                        <div class="new-item">
+                            <div class="new-item-number">{idx}</div>
+                            <div class="new-item-rank {rank_class}">{rank_text}</div>
+                            <div class="new-item-content">
+                                <div class="new-item-title">""")
+
+                # 处理新增新闻的链接
+                escaped_title = html_escape(title_data["title"])
+                link_url = title_data.get("mobile_url") or title_data.get("url", "")
+
+                if link_url:
+                    escaped_url = html_escape(link_url)
+                    write(f'<a href="{escaped_url}" target="_blank" class="news-link">{escaped_title}</a>')
+                else:
+                    write(escaped_title)
+
+                write("""
+                                </div>
+                            </div>
+                        </div>""")
+
+            write("""
+                    </div>""")
+
+        write("""
+                </div>""")
+
+
+def render_feishu_content(
+    report_data: Dict, update_info: Optional[Dict] = None, mode: str = "daily"
+) -> str:
+    """渲染飞书内容"""
+    # 生成热点词汇统计部分
+    stats_content = ""
+    if report_data["stats"]:
+        stats_content += f"📊 **热点词汇统计**\n\n"
+
+        total_count = len(report_data["stats"])
+
+        for i, stat in enumerate(report_data["stats"]):
+            word = stat["word"]
+            count = stat["count"]
+
+            sequence_display = f"<font color='grey'>[{i + 1}/{total_count}]</font>"
+
+            if count >= 10:
+                stats_content += f"🔥 {sequence_display} **{word}** : <font color='red'>{count}</font> 条\n\n"
+            elif count >= 5:
+                stats_content += f"📈 {sequence_display} **{word}** : <font color='orange'>{count}</font> 条\n\n"
+            else:
+                stats_content += f"📌 {sequence_display} **{word}** : {count} 条\n\n"
+
+            for j, title_data in enumerate(stat["titles"], 1):
+                formatted_title = format_title_for_platform(
+                    "feishu", title_data, show_source=True
+                )
+                stats_content += f"  {j}. {formatted_title}\n"
+
+                if j < len(stat["titles"]):
+                    stats_content += "\n"
+
+            if i < len(report_data["stats"]) - 1:
+                stats_content += f"\n{CONFIG['FEISHU_MESSAGE_SEPARATOR']}\n\n"
+
+    # 生成新增新闻部分
+    new_titles_content = ""
+    if report_data["new_titles"]:
+        new_titles_content += (
+            f"🆕 **本次新增热点新闻** (共 {report_data['total_new_count']} 条)\n\n"
+        )
+
+        for source_data in report_data["new_titles"]:
+            new_titles_content += (
+                f"**{source_data['source_name']}** ({len(source_data['titles'])} 条):\n"
+            )
+
+            for j, title_data in enumerate(source_data["titles"], 1):
+                title_data_copy = title_data.copy()
+                title_data_copy["is_new"] = False
+                formatted_title = format_title_for_platform(
+                    "feishu", title_data_copy, show_source=False
+                )
+                new_titles_content += f"  {j}. {formatted_title}\n"
+
+            new_titles_content += "\n"
+
+    # 根据配置决定内容顺序
+    text_content = ""
+    if CONFIG.get("REVERSE_CONTENT_ORDER", False):
+        # 新增热点在前，热点词汇统计在后
+        if new_titles_content:
+            text_content += new_titles_content
+            if stats_content:
+                text_content += f"\n{CONFIG['FEISHU_MESSAGE_SEPARATOR']}\n\n"
+        if stats_content:
             text_content += stats_content
     else:
         # 默认：热点词汇统计在前，新增热点在后
@@ -3252,23 +4691,18 @@ def _truncate_to_bytes(text: str, max_bytes: int) -> str:
     text_bytes = text.encode("utf-8")
     if len(text_bytes) <= max_bytes:
         return text
+    if max_bytes <= 0:
+        return ""
 
-    # 截断到指定字节数
-    truncated = text_bytes[:max_bytes]
-
-    # 处理可能的不完整 UTF-8 字符
-    for i in range(min(4, len(truncated))):
-        try:
-            return truncated[: len(truncated) - i].decode("utf-8")
-        except UnicodeDecodeError:
-            continue
-
-    # 极端情况：返回空字符串
-    return ""
+    # 截断点落在多字节字符中间（续字节 10xxxxxx）时回退到该字符起始处
+    end = max_bytes
+    while end > 0 and (text_bytes[end] & 0xC0) == 0x80:
+        end -= 1
+    return text_bytes[:end].decode("utf-8")
 
 
 def add_batch_headers(
-    batches: List[str], format_type: str, max_bytes: int
+    batches: List[str], format_type: str, max_bytes: int, log: Callable[..., None] = print
 ) -> List[str]:
     """为批次添加头部，动态计算确保总大小不超过限制
 
@@ -3276,6 +4710,7 @@ def add_batch_headers(
         batches: 原始批次列表
         format_type: 推送类型（bark, telegram, feishu 等）
         max_bytes: 该推送类型的最大字节限制
+        log: 日志输出函数（并行发送时写入各任务自己的缓冲）
 
     Returns:
         添加头部后的批次列表
@@ -3297,7 +4732,7 @@ def add_batch_headers(
 
         # 如果超出，截断到安全大小
         if content_size > max_content_size:
-            print(
+            log(
                 f"警告：{format_type} 第 {i}/{total} 批次内容({content_size}字节) + 头部({header_size}字节) 超出限制({max_bytes}字节)，截断到 {max_content_size} 字节"
             )
             content = _truncate_to_bytes(content, max_content_size)
@@ -3307,6 +4742,286 @@ def add_batch_headers(
     return result
 
 
+# 分批片段类型：放不下时开启新批次 / 放不下时直接丢弃 / 无条件追加
+_FRAGMENT_ITEM = 0
+_FRAGMENT_OPTIONAL = 1
+_FRAGMENT_ALWAYS = 2
+
+# 各推送类型的标题格式（统计区 / 新增区第一条 / 新增区其余条目），未列出的使用原始标题
+_STATS_TITLE_PLATFORMS = {
+    "wework": "wework",
+    "bark": "wework",
+    "telegram": "telegram",
+    "ntfy": "ntfy",
+    "feishu": "feishu",
+    "dingtalk": "dingtalk",
+    "slack": "slack",
+}
+_NEW_FIRST_TITLE_PLATFORMS = {
+    "wework": "wework",
+    "bark": "wework",
+    "telegram": "telegram",
+    "feishu": "feishu",
+    "dingtalk": "dingtalk",
+    "slack": "slack",
+}
+_NEW_TITLE_PLATFORMS = {
+    "wework": "wework",
+    "telegram": "telegram",
+    "feishu": "feishu",
+    "dingtalk": "dingtalk",
+    "slack": "slack",
+}
+
+
+def _utf8_len(text: str) -> int:
+    return len(text.encode("utf-8"))
+
+
+class RenderedReport:
+    """渲染一次、多处复用的报告模型
+
+    按推送类型把 report_data 渲染成带字节长度的片段序列并缓存，
+    同一次推送中各渠道、各账号共用，分批时只需按缓存的长度装箱，无需重复格式化和编码。
+    片段为 (类型, 文本, 字节数, 新批次前缀, 前缀字节数)：
+    追加后超出上限时，ITEM 片段以“基础头部 + 前缀 + 自身”开启新批次，
+    从而保证词组标题与其第一条新闻不被拆开。
+    """
+
+    def __init__(self, report_data: Dict):
+        self.report_data = report_data
+        self.total_titles = sum(
+            len(stat["titles"]) for stat in report_data["stats"] if stat["count"] > 0
+        )
+        self._lock = threading.Lock()
+        self._sections: Dict[str, Dict[str, List[Tuple]]] = {}
+
+    def sections(self, format_type: str) -> Dict[str, List[Tuple]]:
+        """返回该推送类型的片段：{"stats": [...], "new_titles": [...], "failed": [...]}"""
+        sections = self._sections.get(format_type)
+        if sections is None:
+            sections = {
+                "stats": self._render_stats(format_type),
+                "new_titles": self._render_new_titles(format_type),
+                "failed": self._render_failed(format_type),
+            }
+            with self._lock:
+                sections = self._sections.setdefault(format_type, sections)
+        return sections
+
+    @staticmethod
+    def _item(text: str, prefix: str = "") -> Tuple:
+        return (_FRAGMENT_ITEM, text, _utf8_len(text), prefix, _utf8_len(prefix))
+
+    @staticmethod
+    def _format_title(platforms: Dict[str, str], format_type: str, title_data: Dict, show_source: bool) -> str:
+        platform = platforms.get(format_type)
+        if platform is None:
+            return f"{title_data['title']}"
+        return format_title_for_platform(platform, title_data, show_source=show_source)
+
+    def _render_stats(self, format_type: str) -> List[Tuple]:
+        """热点词汇统计"""
+        stats = self.report_data["stats"]
+        if not stats:
+            return []
+
+        stats_header = ""
+        if format_type in ("wework", "bark"):
+            stats_header = f"📊 **热点词汇统计**\n\n"
+        elif format_type == "telegram":
+            stats_header = f"📊 热点词汇统计\n\n"
+        elif format_type == "ntfy":
+            stats_header = f"📊 **热点词汇统计**\n\n"
+        elif format_type == "feishu":
+            stats_header = f"📊 **热点词汇统计**\n\n"
+        elif format_type == "dingtalk":
+            stats_header = f"📊 **热点词汇统计**\n\n"
+        elif format_type == "slack":
+            stats_header = f"📊 *热点词汇统计*\n\n"
+
+        separator = ""
+        if format_type in ("wework", "bark"):
+            separator = f"\n\n\n\n"
+        elif format_type == "telegram":
+            separator = f"\n\n"
+        elif format_type == "ntfy":
+            separator = f"\n\n"
+        elif format_type == "feishu":
+            separator = f"\n{CONFIG['FEISHU_MESSAGE_SEPARATOR']}\n\n"
+        elif format_type == "dingtalk":
+            separator = f"\n---\n\n"
+        elif format_type == "slack":
+            separator = f"\n\n"
+
+        fragments = [self._item(stats_header)]
+        total_count = len(stats)
+
+        # 逐个处理词组（确保词组标题+第一条新闻的原子性）
+        for i, stat in enumerate(stats):
+            word = stat["word"]
+            count = stat["count"]
+            sequence_display = f"[{i + 1}/{total_count}]"
+
+            # 构建词组标题
+            word_header = ""
+            if format_type in ("wework", "bark", "ntfy", "dingtalk"):
+                if count >= 10:
+                    word_header = (
+                        f"🔥 {sequence_display} **{word}** : **{count}** 条\n\n"
+                    )
+                elif count >= 5:
+                    word_header = (
+                        f"📈 {sequence_display} **{word}** : **{count}** 条\n\n"
+                    )
+                else:
+                    word_header = f"📌 {sequence_display} **{word}** : {count} 条\n\n"
+            elif format_type == "telegram":
+                if count >= 10:
+                    word_header = f"🔥 {sequence_display} {word} : {count} 条\n\n"
+                elif count >= 5:
+                    word_header = f"📈 {sequence_display} {word} : {count} 条\n\n"
+                else:
+                    word_header = f"📌 {sequence_display} {word} : {count} 条\n\n"
+            elif format_type == "feishu":
+                if count >= 10:
+                    word_header = f"🔥 <font color='grey'>{sequence_display}</font> **{word}** : <font color='red'>{count}</font> 条\n\n"
+                elif count >= 5:
+                    word_header = f"📈 <font color='grey'>{sequence_display}</font> **{word}** : <font color='orange'>{count}</font> 条\n\n"
+                else:
+                    word_header = f"📌 <font color='grey'>{sequence_display}</font> **{word}** : {count} 条\n\n"
+            elif format_type == "slack":
+                if count >= 10:
+                    word_header = (
+                        f"🔥 {sequence_display} *{word}* : *{count}* 条\n\n"
+                    )
+                elif count >= 5:
+                    word_header = (
+                        f"📈 {sequence_display} *{word}* : *{count}* 条\n\n"
+                    )
+                else:
+                    word_header = f"📌 {sequence_display} *{word}* : {count} 条\n\n"
+
+            titles = stat["titles"]
+            news_lines = []
+            for j, title_data in enumerate(titles):
+                formatted_title = self._format_title(
+                    _STATS_TITLE_PLATFORMS, format_type, title_data, True
+                )
+                news_line = f"  {j + 1}. {formatted_title}\n"
+                if j < len(titles) - 1:
+                    news_line += "\n"
+                news_lines.append(news_line)
+
+            # 词组标题+第一条新闻作为一个整体
+            first_news_line = news_lines[0] if news_lines else ""
+            fragments.append(self._item(word_header + first_news_line, stats_header))
+            group_prefix = stats_header + word_header
+            for news_line in news_lines[1:]:
+                fragments.append(self._item(news_line, group_prefix))
+
+            # 词组间分隔符（放不下则省略）
+            if i < total_count - 1:
+                fragments.append(
+                    (_FRAGMENT_OPTIONAL, separator, _utf8_len(separator), "", 0)
+                )
+
+        return fragments
+
+    def _render_new_titles(self, format_type: str) -> List[Tuple]:
+        """新增热点新闻"""
+        new_titles = self.report_data["new_titles"]
+        if not new_titles:
+            return []
+
+        total_new_count = self.report_data["total_new_count"]
+        new_header = ""
+        if format_type in ("wework", "bark"):
+            new_header = f"\n\n\n\n🆕 **本次新增热点新闻** (共 {total_new_count} 条)\n\n"
+        elif format_type == "telegram":
+            new_header = f"\n\n🆕 本次新增热点新闻 (共 {total_new_count} 条)\n\n"
+        elif format_type == "ntfy":
+            new_header = f"\n\n🆕 **本次新增热点新闻** (共 {total_new_count} 条)\n\n"
+        elif format_type == "feishu":
+            new_header = f"\n{CONFIG['FEISHU_MESSAGE_SEPARATOR']}\n\n🆕 **本次新增热点新闻** (共 {total_new_count} 条)\n\n"
+        elif format_type == "dingtalk":
+            new_header = f"\n---\n\n🆕 **本次新增热点新闻** (共 {total_new_count} 条)\n\n"
+        elif format_type == "slack":
+            new_header = f"\n\n🆕 *本次新增热点新闻* (共 {total_new_count} 条)\n\n"
+
+        fragments = [self._item(new_header)]
+
+        # 逐个处理新增新闻来源
+        for source_data in new_titles:
+            source_name = source_data["source_name"]
+            titles = source_data["titles"]
+            source_header = ""
+            if format_type in ("wework", "bark", "ntfy", "feishu", "dingtalk"):
+                source_header = f"**{source_name}** ({len(titles)} 条):\n\n"
+            elif format_type == "telegram":
+                source_header = f"{source_name} ({len(titles)} 条):\n\n"
+            elif format_type == "slack":
+                source_header = f"*{source_name}* ({len(titles)} 条):\n\n"
+
+            news_lines = []
+            for j, title_data in enumerate(titles):
+                title_data_copy = title_data.copy()
+                title_data_copy["is_new"] = False
+                platforms = _NEW_FIRST_TITLE_PLATFORMS if j == 0 else _NEW_TITLE_PLATFORMS
+                formatted_title = self._format_title(
+                    platforms, format_type, title_data_copy, False
+                )
+                news_lines.append(f"  {j + 1}. {formatted_title}\n")
+
+            # 来源标题+第一条新闻作为一个整体
+            first_news_line = news_lines[0] if news_lines else ""
+            fragments.append(self._item(source_header + first_news_line, new_header))
+            source_prefix = new_header + source_header
+            for news_line in news_lines[1:]:
+                fragments.append(self._item(news_line, source_prefix))
+
+            fragments.append((_FRAGMENT_ALWAYS, "\n", 1, "", 0))
+
+        return fragments
+
+    def _render_failed(self, format_type: str) -> List[Tuple]:
+        """数据获取失败的平台"""
+        failed_ids = self.report_data["failed_ids"]
+        if not failed_ids:
+            return []
+
+        failed_header = ""
+        if format_type == "wework":
+            failed_header = f"\n\n\n\n[警告] **数据获取失败的平台：**\n\n"
+        elif format_type == "telegram":
+            failed_header = f"\n\n[警告] 数据获取失败的平台：\n\n"
+        elif format_type == "ntfy":
+            failed_header = f"\n\n[警告] **数据获取失败的平台：**\n\n"
+        elif format_type == "feishu":
+            failed_header = f"\n{CONFIG['FEISHU_MESSAGE_SEPARATOR']}\n\n[警告] **数据获取失败的平台：**\n\n"
+        elif format_type == "dingtalk":
+            failed_header = f"\n---\n\n[警告] **数据获取失败的平台：**\n\n"
+
+        fragments = [self._item(failed_header)]
+        for id_value in failed_ids:
+            if format_type == "feishu":
+                failed_line = f"  • <font color='red'>{id_value}</font>\n"
+            elif format_type == "dingtalk":
+                failed_line = f"  • **{id_value}**\n"
+            else:
+                failed_line = f"  • {id_value}\n"
+            fragments.append(self._item(failed_line, failed_header))
+        return fragments
+
+
+def get_rendered_report(report_data: Dict) -> RenderedReport:
+    """获取 report_data 对应的渲染模型（首次调用时创建并挂在 report_data 上）"""
+    rendered = report_data.get("_rendered")
+    if rendered is None:
+        rendered = report_data.setdefault("_rendered", RenderedReport(report_data))
+    return rendered
+
+
 def split_content_into_batches(
     report_data: Dict,
     format_type: str,
@@ -3325,11 +5040,8 @@ def split_content_into_batches(
         else:
             max_bytes = CONFIG.get("MESSAGE_BATCH_SIZE", 4000)
 
-    batches = []
-
-    total_titles = sum(
-        len(stat["titles"]) for stat in report_data["stats"] if stat["count"] > 0
-    )
+    rendered = get_rendered_report(report_data)
+    total_titles = rendered.total_titles
     now = get_beijing_time()
 
     base_header = ""
@@ -3375,24 +5087,6 @@ def split_content_into_batches(
         if update_info:
             base_footer += f"\n_TrendRadar 发现新版本 *{update_info['remote_version']}*，当前 *{update_info['current_version']}_"
 
-    stats_header = ""
-    if report_data["stats"]:
-        if format_type in ("wework", "bark"):
-            stats_header = f"📊 **热点词汇统计**\n\n"
-        elif format_type == "telegram":
-            stats_header = f"📊 热点词汇统计\n\n"
-        elif format_type == "ntfy":
-            stats_header = f"📊 **热点词汇统计**\n\n"
-        elif format_type == "feishu":
-            stats_header = f"📊 **热点词汇统计**\n\n"
-        elif format_type == "dingtalk":
-            stats_header = f"📊 **热点词汇统计**\n\n"
-        elif format_type == "slack":
-            stats_header = f"📊 *热点词汇统计*\n\n"
-
-    current_batch = base_header
-    current_batch_has_content = False
-
     if (
         not report_data["stats"]
         and not report_data["new_titles"]
@@ -3405,444 +5099,194 @@ def split_content_into_batches(
         else:
             mode_text = "暂无匹配的热点词汇"
         simple_content = f"📭 {mode_text}\n\n"
-        final_content = base_header + simple_content + base_footer
-        batches.append(final_content)
-        return batches
+        return [base_header + simple_content + base_footer]
 
-    # 定义处理热点词汇统计的函数
-    def process_stats_section(current_batch, current_batch_has_content, batches):
-        """处理热点词汇统计"""
-        if not report_data["stats"]:
-            return current_batch, current_batch_has_content, batches
+    sections = rendered.sections(format_type)
+    # 根据配置决定处理顺序
+    if CONFIG.get("REVERSE_CONTENT_ORDER", False):
+        # 新增热点在前，热点词汇统计在后
+        order = ("new_titles", "stats", "failed")
+    else:
+        # 默认：热点词汇统计在前，新增热点在后
+        order = ("stats", "new_titles", "failed")
 
-        total_count = len(report_data["stats"])
+    return pack_fragments_into_batches(
+        [sections[section] for section in order], base_header, base_footer, max_bytes
+    )
 
-        # 添加统计标题
-        test_content = current_batch + stats_header
-        if (
-            len(test_content.encode("utf-8")) + len(base_footer.encode("utf-8"))
-            < max_bytes
-        ):
-            current_batch = test_content
-            current_batch_has_content = True
-        else:
-            if current_batch_has_content:
-                batches.append(current_batch + base_footer)
-            current_batch = base_header + stats_header
-            current_batch_has_content = True
 
-        # 逐个处理词组（确保词组标题+第一条新闻的原子性）
-        for i, stat in enumerate(report_data["stats"]):
-            word = stat["word"]
-            count = stat["count"]
-            sequence_display = f"[{i + 1}/{total_count}]"
+def pack_fragments_into_batches(
+    fragment_sections: List[List[Tuple]],
+    base_header: str,
+    base_footer: str,
+    max_bytes: int,
+) -> List[str]:
+    """按缓存的字节数把片段装入批次
 
-            # 构建词组标题
-            word_header = ""
-            if format_type in ("wework", "bark"):
-                if count >= 10:
-                    word_header = (
-                        f"🔥 {sequence_display} **{word}** : **{count}** 条\n\n"
-                    )
-                elif count >= 5:
-                    word_header = (
-                        f"📈 {sequence_display} **{word}** : **{count}** 条\n\n"
-                    )
-                else:
-                    word_header = f"📌 {sequence_display} **{word}** : {count} 条\n\n"
-            elif format_type == "telegram":
-                if count >= 10:
-                    word_header = f"🔥 {sequence_display} {word} : {count} 条\n\n"
-                elif count >= 5:
-                    word_header = f"📈 {sequence_display} {word} : {count} 条\n\n"
-                else:
-                    word_header = f"📌 {sequence_display} {word} : {count} 条\n\n"
-            elif format_type == "ntfy":
-                if count >= 10:
-                    word_header = (
-                        f"🔥 {sequence_display} **{word}** : **{count}** 条\n\n"
-                    )
-                elif count >= 5:
-                    word_header = (
-                        f"📈 {sequence_display} **{word}** : **{count}** 条\n\n"
-                    )
-                else:
-                    word_header = f"📌 {sequence_display} **{word}** : {count} 条\n\n"
-            elif format_type == "feishu":
-                if count >= 10:
-                    word_header = f"🔥 <font color='grey'>{sequence_display}</font> **{word}** : <font color='red'>{count}</font> 条\n\n"
-                elif count >= 5:
-                    word_header = f"📈 <font color='grey'>{sequence_display}</font> **{word}** : <font color='orange'>{count}</font> 条\n\n"
-                else:
-                    word_header = f"📌 <font color='grey'>{sequence_display}</font> **{word}** : {count} 条\n\n"
-            elif format_type == "dingtalk":
-                if count >= 10:
-                    word_header = (
-                        f"🔥 {sequence_display} **{word}** : **{count}** 条\n\n"
-                    )
-                elif count >= 5:
-                    word_header = (
-                        f"📈 {sequence_display} **{word}** : **{count}** 条\n\n"
-                    )
-                else:
-                    word_header = f"📌 {sequence_display} **{word}** : {count} 条\n\n"
-            elif format_type == "slack":
-                if count >= 10:
-                    word_header = (
-                        f"🔥 {sequence_display} *{word}* : *{count}* 条\n\n"
-                    )
-                elif count >= 5:
-                    word_header = (
-                        f"📈 {sequence_display} *{word}* : *{count}* 条\n\n"
-                    )
-                else:
-                    word_header = f"📌 {sequence_display} *{word}* : {count} 条\n\n"
+    每个批次为 基础头部 + 片段 + 基础尾部，字节数随片段累加，
+    每批只在完成时拼接一次，整体为线性时间。
+    ITEM 片段放不下时以“基础头部 + 前缀 + 自身”开启新批次，
+    因此新批次总是以分组标题开头、且至少包含一条内容。
 
-            # 构建第一条新闻
-            first_news_line = ""
-            if stat["titles"]:
-                first_title_data = stat["titles"][0]
-                if format_type in ("wework", "bark"):
-                    formatted_title = format_title_for_platform(
-                        "wework", first_title_data, show_source=True
-                    )
-                elif format_type == "telegram":
-                    formatted_title = format_title_for_platform(
-                        "telegram", first_title_data, show_source=True
-                    )
-                elif format_type == "ntfy":
-                    formatted_title = format_title_for_platform(
-                        "ntfy", first_title_data, show_source=True
-                    )
-                elif format_type == "feishu":
-                    formatted_title = format_title_for_platform(
-                        "feishu", first_title_data, show_source=True
-                    )
-                elif format_type == "dingtalk":
-                    formatted_title = format_title_for_platform(
-                        "dingtalk", first_title_data, show_source=True
-                    )
-                elif format_type == "slack":
-                    formatted_title = format_title_for_platform(
-                        "slack", first_title_data, show_source=True
-                    )
-                else:
-                    formatted_title = f"{first_title_data['title']}"
+    Args:
+        fragment_sections: 按顺序处理的片段列表（见 RenderedReport）
+        base_header: 每个批次的头部
+        base_footer: 每个批次的尾部
+        max_bytes: 单个批次的字节上限
 
-                first_news_line = f"  1. {formatted_title}\n"
-                if len(stat["titles"]) > 1:
-                    first_news_line += "\n"
+    Returns:
+        批次列表
+    """
+    header_bytes = _utf8_len(base_header)
+    # 片段追加后加上尾部仍小于上限才放得下
+    limit = max_bytes - _utf8_len(base_footer)
 
-            # 原子性检查：词组标题+第一条新闻必须一起处理
-            word_with_first_news = word_header + first_news_line
-            test_content = current_batch + word_with_first_news
+    batches = []
+    current_parts = [base_header]
+    current_bytes = header_bytes
+    current_batch_has_content = False
 
-            if (
-                len(test_content.encode("utf-8")) + len(base_footer.encode("utf-8"))
-                >= max_bytes
-            ):
+    for fragments in fragment_sections:
+        for kind, text, size, prefix, prefix_size in fragments:
+            if kind == _FRAGMENT_ALWAYS:
+                current_parts.append(text)
+                current_bytes += size
+            elif current_bytes + size < limit:
+                current_parts.append(text)
+                current_bytes += size
+                if kind == _FRAGMENT_ITEM:
+                    current_batch_has_content = True
+            elif kind == _FRAGMENT_ITEM:
                 # 当前批次容纳不下，开启新批次
                 if current_batch_has_content:
-                    batches.append(current_batch + base_footer)
-                current_batch = base_header + stats_header + word_with_first_news
-                current_batch_has_content = True
-                start_index = 1
-            else:
-                current_batch = test_content
+                    current_parts.append(base_footer)
+                    batches.append("".join(current_parts))
+                current_parts = [base_header, prefix, text]
+                current_bytes = header_bytes + prefix_size + size
                 current_batch_has_content = True
-                start_index = 1
-
-            # 处理剩余新闻条目
-            for j in range(start_index, len(stat["titles"])):
-                title_data = stat["titles"][j]
-                if format_type in ("wework", "bark"):
-                    formatted_title = format_title_for_platform(
-                        "wework", title_data, show_source=True
-                    )
-                elif format_type == "telegram":
-                    formatted_title = format_title_for_platform(
-                        "telegram", title_data, show_source=True
-                    )
-                elif format_type == "ntfy":
-                    formatted_title = format_title_for_platform(
-                        "ntfy", title_data, show_source=True
-                    )
-                elif format_type == "feishu":
-                    formatted_title = format_title_for_platform(
-                        "feishu", title_data, show_source=True
-                    )
-                elif format_type == "dingtalk":
-                    formatted_title = format_title_for_platform(
-                        "dingtalk", title_data, show_source=True
-                    )
-                elif format_type == "slack":
-                    formatted_title = format_title_for_platform(
-                        "slack", title_data, show_source=True
-                    )
-                else:
-                    formatted_title = f"{title_data['title']}"
-
-                news_line = f"  {j + 1}. {formatted_title}\n"
-                if j < len(stat["titles"]) - 1:
-                    news_line += "\n"
-
-                test_content = current_batch + news_line
-                if (
-                    len(test_content.encode("utf-8")) + len(base_footer.encode("utf-8"))
-                    >= max_bytes
-                ):
-                    if current_batch_has_content:
-                        batches.append(current_batch + base_footer)
-                    current_batch = base_header + stats_header + word_header + news_line
-                    current_batch_has_content = True
-                else:
-                    current_batch = test_content
-                    current_batch_has_content = True
-
-            # 词组间分隔符
-            if i < len(report_data["stats"]) - 1:
-                separator = ""
-                if format_type in ("wework", "bark"):
-                    separator = f"\n\n\n\n"
-                elif format_type == "telegram":
-                    separator = f"\n\n"
-                elif format_type == "ntfy":
-                    separator = f"\n\n"
-                elif format_type == "feishu":
-                    separator = f"\n{CONFIG['FEISHU_MESSAGE_SEPARATOR']}\n\n"
-                elif format_type == "dingtalk":
-                    separator = f"\n---\n\n"
-                elif format_type == "slack":
-                    separator = f"\n\n"
-
-                test_content = current_batch + separator
-                if (
-                    len(test_content.encode("utf-8")) + len(base_footer.encode("utf-8"))
-                    < max_bytes
-                ):
-                    current_batch = test_content
-
-        return current_batch, current_batch_has_content, batches
-
-    # 定义处理新增新闻的函数
-    def process_new_titles_section(current_batch, current_batch_has_content, batches):
-        """处理新增新闻"""
-        if not report_data["new_titles"]:
-            return current_batch, current_batch_has_content, batches
-
-        new_header = ""
-        if format_type in ("wework", "bark"):
-            new_header = f"\n\n\n\n🆕 **本次新增热点新闻** (共 {report_data['total_new_count']} 条)\n\n"
-        elif format_type == "telegram":
-            new_header = (
-                f"\n\n🆕 本次新增热点新闻 (共 {report_data['total_new_count']} 条)\n\n"
-            )
-        elif format_type == "ntfy":
-            new_header = f"\n\n🆕 **本次新增热点新闻** (共 {report_data['total_new_count']} 条)\n\n"
-        elif format_type == "feishu":
-            new_header = f"\n{CONFIG['FEISHU_MESSAGE_SEPARATOR']}\n\n🆕 **本次新增热点新闻** (共 {report_data['total_new_count']} 条)\n\n"
-        elif format_type == "dingtalk":
-            new_header = f"\n---\n\n🆕 **本次新增热点新闻** (共 {report_data['total_new_count']} 条)\n\n"
-        elif format_type == "slack":
-            new_header = f"\n\n🆕 *本次新增热点新闻* (共 {report_data['total_new_count']} 条)\n\n"
-
-        test_content = current_batch + new_header
-        if (
-            len(test_content.encode("utf-8")) + len(base_footer.encode("utf-8"))
-            >= max_bytes
-        ):
-            if current_batch_has_content:
-                batches.append(current_batch + base_footer)
-            current_batch = base_header + new_header
-            current_batch_has_content = True
-        else:
-            current_batch = test_content
-            current_batch_has_content = True
 
-        # 逐个处理新增新闻来源
-        for source_data in report_data["new_titles"]:
-            source_header = ""
-            if format_type in ("wework", "bark"):
-                source_header = f"**{source_data['source_name']}** ({len(source_data['titles'])} 条):\n\n"
-            elif format_type == "telegram":
-                source_header = f"{source_data['source_name']} ({len(source_data['titles'])} 条):\n\n"
-            elif format_type == "ntfy":
-                source_header = f"**{source_data['source_name']}** ({len(source_data['titles'])} 条):\n\n"
-            elif format_type == "feishu":
-                source_header = f"**{source_data['source_name']}** ({len(source_data['titles'])} 条):\n\n"
-            elif format_type == "dingtalk":
-                source_header = f"**{source_data['source_name']}** ({len(source_data['titles'])} 条):\n\n"
-            elif format_type == "slack":
-                source_header = f"*{source_data['source_name']}* ({len(source_data['titles'])} 条):\n\n"
+    # 完成最后批次
+    if current_batch_has_content:
+        current_parts.append(base_footer)
+        batches.append("".join(current_parts))
 
-            # 构建第一条新增新闻
-            first_news_line = ""
-            if source_data["titles"]:
-                first_title_data = source_data["titles"][0]
-                title_data_copy = first_title_data.copy()
-                title_data_copy["is_new"] = False
+    return batches
 
-                if format_type in ("wework", "bark"):
-                    formatted_title = format_title_for_platform(
-                        "wework", title_data_copy, show_source=False
-                    )
-                elif format_type == "telegram":
-                    formatted_title = format_title_for_platform(
-                        "telegram", title_data_copy, show_source=False
-                    )
-                elif format_type == "feishu":
-                    formatted_title = format_title_for_platform(
-                        "feishu", title_data_copy, show_source=False
-                    )
-                elif format_type == "dingtalk":
-                    formatted_title = format_title_for_platform(
-                        "dingtalk", title_data_copy, show_source=False
-                    )
-                elif format_type == "slack":
-                    formatted_title = format_title_for_platform(
-                        "slack", title_data_copy, show_source=False
-                    )
-                else:
-                    formatted_title = f"{title_data_copy['title']}"
 
-                first_news_line = f"  1. {formatted_title}\n"
+class WebhookRateLimiter:
+    """按 webhook 限速器
 
-            # 原子性检查：来源标题+第一条新闻
-            source_with_first_news = source_header + first_news_line
-            test_content = current_batch + source_with_first_news
+    同一 webhook（或接口地址）相邻两次请求的起始时间至少间隔 interval 秒，
+    不同 webhook 互不影响。每个 webhook 只由一个工作线程按顺序发送，
+    因此分批消息的先后顺序保持不变。线程安全。
+    """
 
-            if (
-                len(test_content.encode("utf-8")) + len(base_footer.encode("utf-8"))
-                >= max_bytes
-            ):
-                if current_batch_has_content:
-                    batches.append(current_batch + base_footer)
-                current_batch = base_header + new_header + source_with_first_news
-                current_batch_has_content = True
-                start_index = 1
-            else:
-                current_batch = test_content
-                current_batch_has_content = True
-                start_index = 1
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._next_time: Dict[str, float] = {}
 
-            # 处理剩余新增新闻
-            for j in range(start_index, len(source_data["titles"])):
-                title_data = source_data["titles"][j]
-                title_data_copy = title_data.copy()
-                title_data_copy["is_new"] = False
+    def wait(self, key: str, interval: Optional[float] = None) -> None:
+        """阻塞直到该 webhook 可以发送下一条消息，并预约下一次的最早时间"""
+        interval = self.interval if interval is None else interval
+        with self._lock:
+            now = time.monotonic()
+            ready = max(now, self._next_time.get(key, now))
+            self._next_time[key] = ready + interval
+        if ready > now:
+            time.sleep(ready - now)
 
-                if format_type == "wework":
-                    formatted_title = format_title_for_platform(
-                        "wework", title_data_copy, show_source=False
-                    )
-                elif format_type == "telegram":
-                    formatted_title = format_title_for_platform(
-                        "telegram", title_data_copy, show_source=False
-                    )
-                elif format_type == "feishu":
-                    formatted_title = format_title_for_platform(
-                        "feishu", title_data_copy, show_source=False
-                    )
-                elif format_type == "dingtalk":
-                    formatted_title = format_title_for_platform(
-                        "dingtalk", title_data_copy, show_source=False
-                    )
-                elif format_type == "slack":
-                    formatted_title = format_title_for_platform(
-                        "slack", title_data_copy, show_source=False
-                    )
-                else:
-                    formatted_title = f"{title_data_copy['title']}"
 
-                news_line = f"  {j + 1}. {formatted_title}\n"
+WEBHOOK_RATE_LIMITER = WebhookRateLimiter(CONFIG["BATCH_SEND_INTERVAL"])
 
-                test_content = current_batch + news_line
-                if (
-                    len(test_content.encode("utf-8")) + len(base_footer.encode("utf-8"))
-                    >= max_bytes
-                ):
-                    if current_batch_has_content:
-                        batches.append(current_batch + base_footer)
-                    current_batch = base_header + new_header + source_header + news_line
-                    current_batch_has_content = True
-                else:
-                    current_batch = test_content
-                    current_batch_has_content = True
 
-            current_batch += "\n"
+class NotificationDispatcher:
+    """通知并行分发器
 
-        return current_batch, current_batch_has_content, batches
+    每个渠道的每个账号在独立线程中发送，互不阻塞，总耗时接近最慢的单个渠道。
+    超过总超时仍未完成的任务记为失败（后台线程不会被强制中断）。
+    发送函数的日志通过 log 参数写入各任务自己的缓冲，任务结束后整段输出，
+    不会逐行交错，也不替换全局 sys.stdout。
+    """
 
-    # 根据配置决定处理顺序
-    if CONFIG.get("REVERSE_CONTENT_ORDER", False):
-        # 新增热点在前，热点词汇统计在后
-        current_batch, current_batch_has_content, batches = process_new_titles_section(
-            current_batch, current_batch_has_content, batches
-        )
-        current_batch, current_batch_has_content, batches = process_stats_section(
-            current_batch, current_batch_has_content, batches
-        )
-    else:
-        # 默认：热点词汇统计在前，新增热点在后
-        current_batch, current_batch_has_content, batches = process_stats_section(
-            current_batch, current_batch_has_content, batches
-        )
-        current_batch, current_batch_has_content, batches = process_new_titles_section(
-            current_batch, current_batch_has_content, batches
-        )
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+        self._jobs: List[Tuple[str, str, Callable[..., bool], tuple]] = []
+        self._output_lock = threading.Lock()
 
-    if report_data["failed_ids"]:
-        failed_header = ""
-        if format_type == "wework":
-            failed_header = f"\n\n\n\n[警告] **数据获取失败的平台：**\n\n"
-        elif format_type == "telegram":
-            failed_header = f"\n\n[警告] 数据获取失败的平台：\n\n"
-        elif format_type == "ntfy":
-            failed_header = f"\n\n[警告] **数据获取失败的平台：**\n\n"
-        elif format_type == "feishu":
-            failed_header = f"\n{CONFIG['FEISHU_MESSAGE_SEPARATOR']}\n\n[警告] **数据获取失败的平台：**\n\n"
-        elif format_type == "dingtalk":
-            failed_header = f"\n---\n\n[警告] **数据获取失败的平台：**\n\n"
+    def add(
+        self, channel: str, account_label: str, func: Callable[..., bool], *args
+    ) -> None:
+        """登记一个发送任务，func 须接受 log 关键字参数"""
+        self._jobs.append((channel, account_label, func, args))
 
-        test_content = current_batch + failed_header
-        if (
-            len(test_content.encode("utf-8")) + len(base_footer.encode("utf-8"))
-            >= max_bytes
-        ):
-            if current_batch_has_content:
-                batches.append(current_batch + base_footer)
-            current_batch = base_header + failed_header
-            current_batch_has_content = True
-        else:
-            current_batch = test_content
-            current_batch_has_content = True
+    def dispatch(self) -> Dict[str, Dict]:
+        """
+        并行执行全部任务
 
-        for i, id_value in enumerate(report_data["failed_ids"], 1):
-            if format_type == "feishu":
-                failed_line = f"  • <font color='red'>{id_value}</font>\n"
-            elif format_type == "dingtalk":
-                failed_line = f"  • **{id_value}**\n"
-            else:
-                failed_line = f"  • {id_value}\n"
+        Returns:
+            {channel: {"success": bool, "accounts": [
+                {"account", "success", "elapsed", "error"}, ...]}}
+            渠道内任一账号成功即视为成功，账号顺序与登记顺序一致
+        """
+        records = [
+            {"account": label, "success": False, "elapsed": 0.0, "error": "超时"}
+            for _, label, _, _ in self._jobs
+        ]
+
+        def run(index: int) -> None:
+            _, _, func, args = self._jobs[index]
+            buffer = io.StringIO()
+            start = time.monotonic()
+            try:
+                success = bool(func(*args, log=functools.partial(print, file=buffer)))
+                error = "" if success else "发送失败"
+            except Exception as e:
+                success, error = False, str(e)
+            finally:
+                # 任务结束（包括出错、超时后才结束）时整段输出
+                with self._output_lock:
+                    sys.stdout.write(buffer.getvalue())
+                    sys.stdout.flush()
+            records[index].update(
+                success=success, elapsed=time.monotonic() - start, error=error
+            )
 
-            test_content = current_batch + failed_line
-            if (
-                len(test_content.encode("utf-8")) + len(base_footer.encode("utf-8"))
-                >= max_bytes
-            ):
-                if current_batch_has_content:
-                    batches.append(current_batch + base_footer)
-                current_batch = base_header + failed_header + failed_line
-                current_batch_has_content = True
-            else:
-                current_batch = test_content
-                current_batch_has_content = True
+        threads = []
+        for index, (channel, label, _, _) in enumerate(self._jobs):
+            thread = threading.Thread(
+                target=run, args=(index,), name=f"notify-{channel}{label}", daemon=True
+            )
+            thread.start()
+            threads.append(thread)
+
+        deadline = time.monotonic() + self.timeout
+        for thread in threads:
+            thread.join(max(0.0, deadline - time.monotonic()))
+
+        results: Dict[str, Dict] = {}
+        for (channel, _, _, _), thread, record in zip(self._jobs, threads, records):
+            # 线程仍在运行时其记录可能随时被改写，超时任务一律按失败汇总
+            record = dict(record) if not thread.is_alive() else {
+                "account": record["account"],
+                "success": False,
+                "elapsed": self.timeout,
+                "error": "超时",
+            }
+            channel_result = results.setdefault(channel, {"success": False, "accounts": []})
+            channel_result["accounts"].append(record)
+            channel_result["success"] = channel_result["success"] or record["success"]
+        return results
 
-    # 完成最后批次
-    if current_batch_has_content:
-        batches.append(current_batch + base_footer)
 
-    return batches
+def print_dispatch_summary(channel_results: Dict[str, Dict]) -> None:
+    """打印各渠道推送结果汇总"""
+    for channel, channel_result in channel_results.items():
+        for record in channel_result["accounts"]:
+            status = "成功" if record["success"] else f"失败（{record['error']}）"
+            print(
+                f"推送结果：{channel}{record['account']} {status}，耗时 {record['elapsed']:.1f} 秒"
+            )
 
 
 def send_to_notifications(
@@ -3883,47 +5327,29 @@ def send_to_notifications(
 
     update_info_to_send = update_info if CONFIG["SHOW_VERSION_UPDATE"] else None
 
-    # 发送到飞书（多账号）
-    feishu_urls = parse_multi_account_config(CONFIG["FEISHU_WEBHOOK_URL"])
-    if feishu_urls:
-        feishu_urls = limit_accounts(feishu_urls, max_accounts, "飞书")
-        feishu_results = []
-        for i, url in enumerate(feishu_urls):
+    dispatcher = NotificationDispatcher(CONFIG["NOTIFICATION_DISPATCH_TIMEOUT"])
+
+    # 飞书、钉钉、企业微信、Bark、Slack（多账号）
+    webhook_channels = [
+        ("feishu", "飞书", "FEISHU_WEBHOOK_URL", send_to_feishu),
+        ("dingtalk", "钉钉", "DINGTALK_WEBHOOK_URL", send_to_dingtalk),
+        ("wework", "企业微信", "WEWORK_WEBHOOK_URL", send_to_wework),
+        ("bark", "Bark", "BARK_URL", send_to_bark),
+        ("slack", "Slack", "SLACK_WEBHOOK_URL", send_to_slack),
+    ]
+    for channel, channel_name, config_key, send_func in webhook_channels:
+        urls = parse_multi_account_config(CONFIG[config_key])
+        if not urls:
+            continue
+        urls = limit_accounts(urls, max_accounts, channel_name)
+        results[channel] = False
+        for i, url in enumerate(urls):
             if url:  # 跳过空值
-                account_label = f"账号{i+1}" if len(feishu_urls) > 1 else ""
-                result = send_to_feishu(
-                    url, report_data, report_type, update_info_to_send, proxy_url, mode, account_label
-                )
-                feishu_results.append(result)
-        results["feishu"] = any(feishu_results) if feishu_results else False
-
-    # 发送到钉钉（多账号）
-    dingtalk_urls = parse_multi_account_config(CONFIG["DINGTALK_WEBHOOK_URL"])
-    if dingtalk_urls:
-        dingtalk_urls = limit_accounts(dingtalk_urls, max_accounts, "钉钉")
-        dingtalk_results = []
-        for i, url in enumerate(dingtalk_urls):
-            if url:
-                account_label = f"账号{i+1}" if len(dingtalk_urls) > 1 else ""
-                result = send_to_dingtalk(
-                    url, report_data, report_type, update_info_to_send, proxy_url, mode, account_label
-                )
-                dingtalk_results.append(result)
-        results["dingtalk"] = any(dingtalk_results) if dingtalk_results else False
-
-    # 发送到企业微信（多账号）
-    wework_urls = parse_multi_account_config(CONFIG["WEWORK_WEBHOOK_URL"])
-    if wework_urls:
-        wework_urls = limit_accounts(wework_urls, max_accounts, "企业微信")
-        wework_results = []
-        for i, url in enumerate(wework_urls):
-            if url:
-                account_label = f"账号{i+1}" if len(wework_urls) > 1 else ""
-                result = send_to_wework(
+                account_label = f"账号{i+1}" if len(urls) > 1 else ""
+                dispatcher.add(
+                    channel, account_label, send_func,
                     url, report_data, report_type, update_info_to_send, proxy_url, mode, account_label
                 )
-                wework_results.append(result)
-        results["wework"] = any(wework_results) if wework_results else False
 
     # 发送到 Telegram（多账号，需验证配对）
     telegram_tokens = parse_multi_account_config(CONFIG["TELEGRAM_BOT_TOKEN"])
@@ -3937,18 +5363,17 @@ def send_to_notifications(
         if valid and count > 0:
             telegram_tokens = limit_accounts(telegram_tokens, max_accounts, "Telegram")
             telegram_chat_ids = telegram_chat_ids[:len(telegram_tokens)]  # 保持数量一致
-            telegram_results = []
+            results["telegram"] = False
             for i in range(len(telegram_tokens)):
                 token = telegram_tokens[i]
                 chat_id = telegram_chat_ids[i]
                 if token and chat_id:
                     account_label = f"账号{i+1}" if len(telegram_tokens) > 1 else ""
-                    result = send_to_telegram(
+                    dispatcher.add(
+                        "telegram", account_label, send_to_telegram,
                         token, chat_id, report_data, report_type,
                         update_info_to_send, proxy_url, mode, account_label
                     )
-                    telegram_results.append(result)
-            results["telegram"] = any(telegram_results) if telegram_results else False
 
     # 发送到 ntfy（多账号，需验证配对）
     ntfy_server_url = CONFIG["NTFY_SERVER_URL"]
@@ -3962,45 +5387,16 @@ def send_to_notifications(
             ntfy_topics = limit_accounts(ntfy_topics, max_accounts, "ntfy")
             if ntfy_tokens:
                 ntfy_tokens = ntfy_tokens[:len(ntfy_topics)]
-            ntfy_results = []
+            results["ntfy"] = False
             for i, topic in enumerate(ntfy_topics):
                 if topic:
                     token = get_account_at_index(ntfy_tokens, i, "") if ntfy_tokens else ""
                     account_label = f"账号{i+1}" if len(ntfy_topics) > 1 else ""
-                    result = send_to_ntfy(
+                    dispatcher.add(
+                        "ntfy", account_label, send_to_ntfy,
                         ntfy_server_url, topic, token, report_data, report_type,
                         update_info_to_send, proxy_url, mode, account_label
                     )
-                    ntfy_results.append(result)
-            results["ntfy"] = any(ntfy_results) if ntfy_results else False
-
-    # 发送到 Bark（多账号）
-    bark_urls = parse_multi_account_config(CONFIG["BARK_URL"])
-    if bark_urls:
-        bark_urls = limit_accounts(bark_urls, max_accounts, "Bark")
-        bark_results = []
-        for i, url in enumerate(bark_urls):
-            if url:
-                account_label = f"账号{i+1}" if len(bark_urls) > 1 else ""
-                result = send_to_bark(
-                    url, report_data, report_type, update_info_to_send, proxy_url, mode, account_label
-                )
-                bark_results.append(result)
-        results["bark"] = any(bark_results) if bark_results else False
-
-    # 发送到 Slack（多账号）
-    slack_urls = parse_multi_account_config(CONFIG["SLACK_WEBHOOK_URL"])
-    if slack_urls:
-        slack_urls = limit_accounts(slack_urls, max_accounts, "Slack")
-        slack_results = []
-        for i, url in enumerate(slack_urls):
-            if url:
-                account_label = f"账号{i+1}" if len(slack_urls) > 1 else ""
-                result = send_to_slack(
-                    url, report_data, report_type, update_info_to_send, proxy_url, mode, account_label
-                )
-                slack_results.append(result)
-        results["slack"] = any(slack_results) if slack_results else False
 
     # 发送邮件（保持原有逻辑，已支持多收件人）
     email_from = CONFIG["EMAIL_FROM"]
@@ -4009,7 +5405,9 @@ def send_to_notifications(
     email_smtp_server = CONFIG.get("EMAIL_SMTP_SERVER", "")
     email_smtp_port = CONFIG.get("EMAIL_SMTP_PORT", "")
     if email_from and email_password and email_to:
-        results["email"] = send_to_email(
+        results["email"] = False
+        dispatcher.add(
+            "email", "", send_to_email,
             email_from,
             email_password,
             email_to,
@@ -4019,6 +5417,12 @@ def send_to_notifications(
             email_smtp_port,
         )
 
+    # 各渠道、各账号并行发送
+    channel_results = dispatcher.dispatch()
+    for channel, channel_result in channel_results.items():
+        results[channel] = channel_result["success"]
+    print_dispatch_summary(channel_results)
+
     if not results:
         print("未配置任何通知渠道，跳过通知发送")
 
@@ -4042,13 +5446,10 @@ def send_to_feishu(
     proxy_url: Optional[str] = None,
     mode: str = "daily",
     account_label: str = "",
+    log: Callable[..., None] = print,
 ) -> bool:
     """发送到飞书（支持分批发送）"""
     headers = {"Content-Type": "application/json"}
-    proxies = None
-    if proxy_url:
-        proxies = {"http": proxy_url, "https": proxy_url}
-
     # 日志前缀
     log_prefix = f"飞书{account_label}" if account_label else "飞书"
 
@@ -4065,20 +5466,18 @@ def send_to_feishu(
     )
 
     # 统一添加批次头部（已预留空间，不会超限）
-    batches = add_batch_headers(batches, "feishu", feishu_batch_size)
+    batches = add_batch_headers(batches, "feishu", feishu_batch_size, log)
 
-    print(f"{log_prefix}消息分为 {len(batches)} 批次发送 [{report_type}]")
+    log(f"{log_prefix}消息分为 {len(batches)} 批次发送 [{report_type}]")
 
     # 逐批发送
     for i, batch_content in enumerate(batches, 1):
         batch_size = len(batch_content.encode("utf-8"))
-        print(
+        log(
             f"发送{log_prefix}第 {i}/{len(batches)} 批次，大小：{batch_size} 字节 [{report_type}]"
         )
 
-        total_titles = sum(
-            len(stat["titles"]) for stat in report_data["stats"] if stat["count"] > 0
-        )
+        total_titles = get_rendered_report(report_data).total_titles
         now = get_beijing_time()
 
         payload = {
@@ -4091,34 +5490,33 @@ def send_to_feishu(
             },
         }
 
+        # 同一 webhook 批次间限速
+        WEBHOOK_RATE_LIMITER.wait(webhook_url)
         try:
-            response = requests.post(
-                webhook_url, headers=headers, json=payload, proxies=proxies, timeout=30
+            response = HTTP_CLIENT.post(
+                webhook_url, headers=headers, json=payload, proxy_url=proxy_url, timeout=30
             )
             if response.status_code == 200:
                 result = response.json()
                 # 检查飞书的响应状态
                 if result.get("StatusCode") == 0 or result.get("code") == 0:
-                    print(f"{log_prefix}第 {i}/{len(batches)} 批次发送成功 [{report_type}]")
-                    # 批次间间隔
-                    if i < len(batches):
-                        time.sleep(CONFIG["BATCH_SEND_INTERVAL"])
+                    log(f"{log_prefix}第 {i}/{len(batches)} 批次发送成功 [{report_type}]")
                 else:
                     error_msg = result.get("msg") or result.get("StatusMessage", "未知错误")
-                    print(
+                    log(
                         f"{log_prefix}第 {i}/{len(batches)} 批次发送失败 [{report_type}]，错误：{error_msg}"
                     )
                     return False
             else:
-                print(
+                log(
                     f"{log_prefix}第 {i}/{len(batches)} 批次发送失败 [{report_type}]，状态码：{response.status_code}"
                 )
                 return False
         except Exception as e:
-            print(f"{log_prefix}第 {i}/{len(batches)} 批次发送出错 [{report_type}]：{e}")
+            log(f"{log_prefix}第 {i}/{len(batches)} 批次发送出错 [{report_type}]：{e}")
             return False
 
-    print(f"{log_prefix}所有 {len(batches)} 批次发送完成 [{report_type}]")
+    log(f"{log_prefix}所有 {len(batches)} 批次发送完成 [{report_type}]")
     return True
 
 
@@ -4130,13 +5528,10 @@ def send_to_dingtalk(
     proxy_url: Optional[str] = None,
     mode: str = "daily",
     account_label: str = "",
+    log: Callable[..., None] = print,
 ) -> bool:
     """发送到钉钉（支持分批发送）"""
     headers = {"Content-Type": "application/json"}
-    proxies = None
-    if proxy_url:
-        proxies = {"http": proxy_url, "https": proxy_url}
-
     # 日志前缀
     log_prefix = f"钉钉{account_label}" if account_label else "钉钉"
 
@@ -4153,14 +5548,14 @@ def send_to_dingtalk(
     )
 
     # 统一添加批次头部（已预留空间，不会超限）
-    batches = add_batch_headers(batches, "dingtalk", dingtalk_batch_size)
+    batches = add_batch_headers(batches, "dingtalk", dingtalk_batch_size, log)
 
-    print(f"{log_prefix}消息分为 {len(batches)} 批次发送 [{report_type}]")
+    log(f"{log_prefix}消息分为 {len(batches)} 批次发送 [{report_type}]")
 
     # 逐批发送
     for i, batch_content in enumerate(batches, 1):
         batch_size = len(batch_content.encode("utf-8"))
-        print(
+        log(
             f"发送{log_prefix}第 {i}/{len(batches)} 批次，大小：{batch_size} 字节 [{report_type}]"
         )
 
@@ -4172,32 +5567,31 @@ def send_to_dingtalk(
             },
         }
 
+        # 同一 webhook 批次间限速
+        WEBHOOK_RATE_LIMITER.wait(webhook_url)
         try:
-            response = requests.post(
-                webhook_url, headers=headers, json=payload, proxies=proxies, timeout=30
+            response = HTTP_CLIENT.post(
+                webhook_url, headers=headers, json=payload, proxy_url=proxy_url, timeout=30
             )
             if response.status_code == 200:
                 result = response.json()
                 if result.get("errcode") == 0:
-                    print(f"{log_prefix}第 {i}/{len(batches)} 批次发送成功 [{report_type}]")
-                    # 批次间间隔
-                    if i < len(batches):
-                        time.sleep(CONFIG["BATCH_SEND_INTERVAL"])
+                    log(f"{log_prefix}第 {i}/{len(batches)} 批次发送成功 [{report_type}]")
                 else:
-                    print(
+                    log(
                         f"{log_prefix}第 {i}/{len(batches)} 批次发送失败 [{report_type}]，错误：{result.get('errmsg')}"
                     )
                     return False
             else:
-                print(
+                log(
                     f"{log_prefix}第 {i}/{len(batches)} 批次发送失败 [{report_type}]，状态码：{response.status_code}"
                 )
                 return False
         except Exception as e:
-            print(f"{log_prefix}第 {i}/{len(batches)} 批次发送出错 [{report_type}]：{e}")
+            log(f"{log_prefix}第 {i}/{len(batches)} 批次发送出错 [{report_type}]：{e}")
             return False
 
-    print(f"{log_prefix}所有 {len(batches)} 批次发送完成 [{report_type}]")
+    log(f"{log_prefix}所有 {len(batches)} 批次发送完成 [{report_type}]")
     return True
 
 
@@ -4205,7 +5599,7 @@ def send_to_dingtalk(
 def send_wework_message(webhook_url: str, content: str) -> None:
     """企业微信群机器人简单推送（markdown）"""
     payload = {"msgtype": "markdown", "markdown": {"content": content}}
-    resp = requests.post(webhook_url, json=payload, timeout=15)
+    resp = HTTP_CLIENT.post(webhook_url, json=payload, timeout=15)
     resp.raise_for_status()
     data = resp.json()
     if data.get("errcode") not in (0, None):
@@ -4215,7 +5609,7 @@ def send_wework_message(webhook_url: str, content: str) -> None:
 def send_feishu_message(webhook_url: str, content: str) -> None:
     """飞书群机器人简单推送（text）"""
     payload = {"msg_type": "text", "content": {"text": content}}
-    resp = requests.post(webhook_url, json=payload, timeout=15)
+    resp = HTTP_CLIENT.post(webhook_url, json=payload, timeout=15)
     resp.raise_for_status()
     data = resp.json()
     code = data.get("code", data.get("StatusCode"))
@@ -4229,7 +5623,7 @@ def send_dingtalk_message(webhook_url: str, content: str) -> None:
         "msgtype": "markdown",
         "markdown": {"title": "通知", "text": content},
     }
-    resp = requests.post(webhook_url, json=payload, timeout=15)
+    resp = HTTP_CLIENT.post(webhook_url, json=payload, timeout=15)
     resp.raise_for_status()
     data = resp.json()
     if data.get("errcode") not in (0, None):
@@ -4288,13 +5682,10 @@ def send_to_wework(
     proxy_url: Optional[str] = None,
     mode: str = "daily",
     account_label: str = "",
+    log: Callable[..., None] = print,
 ) -> bool:
     """发送到企业微信（支持分批发送，支持 markdown 和 text 两种格式）"""
     headers = {"Content-Type": "application/json"}
-    proxies = None
-    if proxy_url:
-        proxies = {"http": proxy_url, "https": proxy_url}
-
     # 日志前缀
     log_prefix = f"企业微信{account_label}" if account_label else "企业微信"
 
@@ -4303,9 +5694,9 @@ def send_to_wework(
     is_text_mode = msg_type == "text"
 
     if is_text_mode:
-        print(f"{log_prefix}使用 text 格式（个人微信模式）[{report_type}]")
+        log(f"{log_prefix}使用 text 格式（个人微信模式）[{report_type}]")
     else:
-        print(f"{log_prefix}使用 markdown 格式（群机器人模式）[{report_type}]")
+        log(f"{log_prefix}使用 markdown 格式（群机器人模式）[{report_type}]")
 
     # text 模式使用 wework_text，markdown 模式使用 wework
     header_format_type = "wework_text" if is_text_mode else "wework"
@@ -4318,9 +5709,9 @@ def send_to_wework(
     )
 
     # 统一添加批次头部（已预留空间，不会超限）
-    batches = add_batch_headers(batches, header_format_type, wework_batch_size)
+    batches = add_batch_headers(batches, header_format_type, wework_batch_size, log)
 
-    print(f"{log_prefix}消息分为 {len(batches)} 批次发送 [{report_type}]")
+    log(f"{log_prefix}消息分为 {len(batches)} 批次发送 [{report_type}]")
 
     # 逐批发送
     for i, batch_content in enumerate(batches, 1):
@@ -4335,36 +5726,35 @@ def send_to_wework(
             payload = {"msgtype": "markdown", "markdown": {"content": batch_content}}
             batch_size = len(batch_content.encode("utf-8"))
 
-        print(
+        log(
             f"发送{log_prefix}第 {i}/{len(batches)} 批次，大小：{batch_size} 字节 [{report_type}]"
         )
 
+        # 同一 webhook 批次间限速
+        WEBHOOK_RATE_LIMITER.wait(webhook_url)
         try:
-            response = requests.post(
-                webhook_url, headers=headers, json=payload, proxies=proxies, timeout=30
+            response = HTTP_CLIENT.post(
+                webhook_url, headers=headers, json=payload, proxy_url=proxy_url, timeout=30
             )
             if response.status_code == 200:
                 result = response.json()
                 if result.get("errcode") == 0:
-                    print(f"{log_prefix}第 {i}/{len(batches)} 批次发送成功 [{report_type}]")
-                    # 批次间间隔
-                    if i < len(batches):
-                        time.sleep(CONFIG["BATCH_SEND_INTERVAL"])
+                    log(f"{log_prefix}第 {i}/{len(batches)} 批次发送成功 [{report_type}]")
                 else:
-                    print(
+                    log(
                         f"{log_prefix}第 {i}/{len(batches)} 批次发送失败 [{report_type}]，错误：{result.get('errmsg')}"
                     )
                     return False
             else:
-                print(
+                log(
                     f"{log_prefix}第 {i}/{len(batches)} 批次发送失败 [{report_type}]，状态码：{response.status_code}"
                 )
                 return False
         except Exception as e:
-            print(f"{log_prefix}第 {i}/{len(batches)} 批次发送出错 [{report_type}]：{e}")
+            log(f"{log_prefix}第 {i}/{len(batches)} 批次发送出错 [{report_type}]：{e}")
             return False
 
-    print(f"{log_prefix}所有 {len(batches)} 批次发送完成 [{report_type}]")
+    log(f"{log_prefix}所有 {len(batches)} 批次发送完成 [{report_type}]")
     return True
 
 
@@ -4377,15 +5767,12 @@ def send_to_telegram(
     proxy_url: Optional[str] = None,
     mode: str = "daily",
     account_label: str = "",
+    log: Callable[..., None] = print,
 ) -> bool:
     """发送到Telegram（支持分批发送）"""
     headers = {"Content-Type": "application/json"}
     url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
 
-    proxies = None
-    if proxy_url:
-        proxies = {"http": proxy_url, "https": proxy_url}
-
     # 日志前缀
     log_prefix = f"Telegram{account_label}" if account_label else "Telegram"
 
@@ -4397,14 +5784,14 @@ def send_to_telegram(
     )
 
     # 统一添加批次头部（已预留空间，不会超限）
-    batches = add_batch_headers(batches, "telegram", telegram_batch_size)
+    batches = add_batch_headers(batches, "telegram", telegram_batch_size, log)
 
-    print(f"{log_prefix}消息分为 {len(batches)} 批次发送 [{report_type}]")
+    log(f"{log_prefix}消息分为 {len(batches)} 批次发送 [{report_type}]")
 
     # 逐批发送
     for i, batch_content in enumerate(batches, 1):
         batch_size = len(batch_content.encode("utf-8"))
-        print(
+        log(
             f"发送{log_prefix}第 {i}/{len(batches)} 批次，大小：{batch_size} 字节 [{report_type}]"
         )
 
@@ -4415,32 +5802,31 @@ def send_to_telegram(
             "disable_web_page_preview": True,
         }
 
+        # 同一 webhook 批次间限速
+        WEBHOOK_RATE_LIMITER.wait(f"{url}#{chat_id}")
         try:
-            response = requests.post(
-                url, headers=headers, json=payload, proxies=proxies, timeout=30
+            response = HTTP_CLIENT.post(
+                url, headers=headers, json=payload, proxy_url=proxy_url, timeout=30
             )
             if response.status_code == 200:
                 result = response.json()
                 if result.get("ok"):
-                    print(f"{log_prefix}第 {i}/{len(batches)} 批次发送成功 [{report_type}]")
-                    # 批次间间隔
-                    if i < len(batches):
-                        time.sleep(CONFIG["BATCH_SEND_INTERVAL"])
+                    log(f"{log_prefix}第 {i}/{len(batches)} 批次发送成功 [{report_type}]")
                 else:
-                    print(
+                    log(
                         f"{log_prefix}第 {i}/{len(batches)} 批次发送失败 [{report_type}]，错误：{result.get('description')}"
                     )
                     return False
             else:
-                print(
+                log(
                     f"{log_prefix}第 {i}/{len(batches)} 批次发送失败 [{report_type}]，状态码：{response.status_code}"
                 )
                 return False
         except Exception as e:
-            print(f"{log_prefix}第 {i}/{len(batches)} 批次发送出错 [{report_type}]：{e}")
+            log(f"{log_prefix}第 {i}/{len(batches)} 批次发送出错 [{report_type}]：{e}")
             return False
 
-    print(f"{log_prefix}所有 {len(batches)} 批次发送完成 [{report_type}]")
+    log(f"{log_prefix}所有 {len(batches)} 批次发送完成 [{report_type}]")
     return True
 
 
@@ -4452,14 +5838,15 @@ def send_to_email(
     html_file_path: str,
     custom_smtp_server: Optional[str] = None,
     custom_smtp_port: Optional[int] = None,
+    log: Callable[..., None] = print,
 ) -> bool:
     """发送邮件通知"""
     try:
         if not html_file_path or not Path(html_file_path).exists():
-            print(f"错误：HTML文件不存在或未提供: {html_file_path}")
+            log(f"错误：HTML文件不存在或未提供: {html_file_path}")
             return False
 
-        print(f"使用HTML文件: {html_file_path}")
+        log(f"使用HTML文件: {html_file_path}")
         with open(html_file_path, "r", encoding="utf-8") as f:
             html_content = f.read()
 
@@ -4484,7 +5871,7 @@ def send_to_email(
             smtp_port = config["port"]
             use_tls = config["encryption"] == "TLS"
         else:
-            print(f"未识别的邮箱服务商: {domain}，使用通用 SMTP 配置")
+            log(f"未识别的邮箱服务商: {domain}，使用通用 SMTP 配置")
             smtp_server = f"smtp.{domain}"
             smtp_port = 587
             use_tls = True
@@ -4527,9 +5914,9 @@ TrendRadar 热点分析报告
         html_part = MIMEText(html_content, "html", "utf-8")
         msg.attach(html_part)
 
-        print(f"正在发送邮件到 {to_email}...")
-        print(f"SMTP 服务器: {smtp_server}:{smtp_port}")
-        print(f"发件人: {from_email}")
+        log(f"正在发送邮件到 {to_email}...")
+        log(f"SMTP 服务器: {smtp_server}:{smtp_port}")
+        log(f"发件人: {from_email}")
 
         try:
             if use_tls:
@@ -4552,32 +5939,32 @@ TrendRadar 热点分析报告
             server.send_message(msg)
             server.quit()
 
-            print(f"邮件发送成功 [{report_type}] -> {to_email}")
+            log(f"邮件发送成功 [{report_type}] -> {to_email}")
             return True
 
         except smtplib.SMTPServerDisconnected:
-            print(f"邮件发送失败：服务器意外断开连接，请检查网络或稍后重试")
+            log(f"邮件发送失败：服务器意外断开连接，请检查网络或稍后重试")
             return False
 
     except smtplib.SMTPAuthenticationError as e:
-        print(f"邮件发送失败：认证错误，请检查邮箱和密码/授权码")
-        print(f"详细错误: {str(e)}")
+        log(f"邮件发送失败：认证错误，请检查邮箱和密码/授权码")
+        log(f"详细错误: {str(e)}")
         return False
     except smtplib.SMTPRecipientsRefused as e:
-        print(f"邮件发送失败：收件人地址被拒绝 {e}")
+        log(f"邮件发送失败：收件人地址被拒绝 {e}")
         return False
     except smtplib.SMTPSenderRefused as e:
-        print(f"邮件发送失败：发件人地址被拒绝 {e}")
+        log(f"邮件发送失败：发件人地址被拒绝 {e}")
         return False
     except smtplib.SMTPDataError as e:
-        print(f"邮件发送失败：邮件数据错误 {e}")
+        log(f"邮件发送失败：邮件数据错误 {e}")
         return False
     except smtplib.SMTPConnectError as e:
-        print(f"邮件发送失败：无法连接到 SMTP 服务器 {smtp_server}:{smtp_port}")
-        print(f"详细错误: {str(e)}")
+        log(f"邮件发送失败：无法连接到 SMTP 服务器 {smtp_server}:{smtp_port}")
+        log(f"详细错误: {str(e)}")
         return False
     except Exception as e:
-        print(f"邮件发送失败 [{report_type}]：{e}")
+        log(f"邮件发送失败 [{report_type}]：{e}")
         import traceback
 
         traceback.print_exc()
@@ -4594,6 +5981,7 @@ def send_to_ntfy(
     proxy_url: Optional[str] = None,
     mode: str = "daily",
     account_label: str = "",
+    log: Callable[..., None] = print,
 ) -> bool:
     """发送到ntfy（支持分批发送，严格遵守4KB限制）"""
     # 日志前缀
@@ -4626,10 +6014,6 @@ def send_to_ntfy(
         base_url = f"https://{base_url}"
     url = f"{base_url}/{topic}"
 
-    proxies = None
-    if proxy_url:
-        proxies = {"http": proxy_url, "https": proxy_url}
-
     # 获取分批内容，使用ntfy专用的4KB限制，预留批次头部空间
     ntfy_batch_size = 3800
     header_reserve = _get_max_batch_header_size("ntfy")
@@ -4638,16 +6022,16 @@ def send_to_ntfy(
     )
 
     # 统一添加批次头部（已预留空间，不会超限）
-    batches = add_batch_headers(batches, "ntfy", ntfy_batch_size)
+    batches = add_batch_headers(batches, "ntfy", ntfy_batch_size, log)
 
     total_batches = len(batches)
-    print(f"{log_prefix}消息分为 {total_batches} 批次发送 [{report_type}]")
+    log(f"{log_prefix}消息分为 {total_batches} 批次发送 [{report_type}]")
 
     # 反转批次顺序，使得在ntfy客户端显示时顺序正确
     # ntfy显示最新消息在上面，所以我们从最后一批开始推送
     reversed_batches = list(reversed(batches))
 
-    print(f"{log_prefix}将按反向顺序推送（最后批次先推送），确保客户端显示顺序正确")
+    log(f"{log_prefix}将按反向顺序推送（最后批次先推送），确保客户端显示顺序正确")
 
     # 逐批发送（反向顺序）
     success_count = 0
@@ -4656,13 +6040,13 @@ def send_to_ntfy(
         actual_batch_num = total_batches - idx + 1
 
         batch_size = len(batch_content.encode("utf-8"))
-        print(
+        log(
             f"发送{log_prefix}第 {actual_batch_num}/{total_batches} 批次（推送顺序: {idx}/{total_batches}），大小：{batch_size} 字节 [{report_type}]"
         )
 
         # 检查消息大小，确保不超过4KB
         if batch_size > 4096:
-            print(f"警告：{log_prefix}第 {actual_batch_num} 批次消息过大（{batch_size} 字节），可能被拒绝")
+            log(f"警告：{log_prefix}第 {actual_batch_num} 批次消息过大（{batch_size} 字节），可能被拒绝")
 
         # 更新 headers 的批次标识
         current_headers = headers.copy()
@@ -4671,73 +6055,73 @@ def send_to_ntfy(
                 f"{report_type_en} ({actual_batch_num}/{total_batches})"
             )
 
+        # 同一 topic 批次间限速：公共服务器建议 2-3 秒，自托管可以更短
+        WEBHOOK_RATE_LIMITER.wait(url, 2 if "ntfy.sh" in server_url else 1)
         try:
-            response = requests.post(
+            response = HTTP_CLIENT.post(
                 url,
                 headers=current_headers,
                 data=batch_content.encode("utf-8"),
-                proxies=proxies,
+                proxy_url=proxy_url,
                 timeout=30,
+                retries=0,  # 429 在下方单独处理
             )
 
             if response.status_code == 200:
-                print(f"{log_prefix}第 {actual_batch_num}/{total_batches} 批次发送成功 [{report_type}]")
+                log(f"{log_prefix}第 {actual_batch_num}/{total_batches} 批次发送成功 [{report_type}]")
                 success_count += 1
-                if idx < total_batches:
-                    # 公共服务器建议 2-3 秒，自托管可以更短
-                    interval = 2 if "ntfy.sh" in server_url else 1
-                    time.sleep(interval)
             elif response.status_code == 429:
-                print(
+                log(
                     f"{log_prefix}第 {actual_batch_num}/{total_batches} 批次速率限制 [{report_type}]，等待后重试"
                 )
                 time.sleep(10)  # 等待10秒后重试
                 # 重试一次
-                retry_response = requests.post(
+                retry_response = HTTP_CLIENT.post(
                     url,
                     headers=current_headers,
                     data=batch_content.encode("utf-8"),
-                    proxies=proxies,
+                    proxy_url=proxy_url,
                     timeout=30,
+                    retries=0,  # 429 在下方单独处理
                 )
                 if retry_response.status_code == 200:
-                    print(f"{log_prefix}第 {actual_batch_num}/{total_batches} 批次重试成功 [{report_type}]")
+                    log(f"{log_prefix}第 {actual_batch_num}/{total_batches} 批次重试成功 [{report_type}]")
                     success_count += 1
                 else:
-                    print(
+                    log(
                         f"{log_prefix}第 {actual_batch_num}/{total_batches} 批次重试失败，状态码：{retry_response.status_code}"
                     )
             elif response.status_code == 413:
-                print(
+                log(
                     f"{log_prefix}第 {actual_batch_num}/{total_batches} 批次消息过大被拒绝 [{report_type}]，消息大小：{batch_size} 字节"
                 )
             else:
-                print(
+                log(
                     f"{log_prefix}第 {actual_batch_num}/{total_batches} 批次发送失败 [{report_type}]，状态码：{response.status_code}"
                 )
                 try:
-                    print(f"错误详情：{response.text}")
+                    log(f"错误详情：{response.text}")
                 except:
                     pass
 
         except requests.exceptions.ConnectTimeout:
-            print(f"{log_prefix}第 {actual_batch_num}/{total_batches} 批次连接超时 [{report_type}]")
+            log(f"{log_prefix}第 {actual_batch_num}/{total_batches} 批次连接超时 [{report_type}]")
         except requests.exceptions.ReadTimeout:
-            print(f"{log_prefix}第 {actual_batch_num}/{total_batches} 批次读取超时 [{report_type}]")
+            log(f"{log_prefix}第 {actual_batch_num}/{total_batches} 批次读取超时 [{report_type}]")
         except requests.exceptions.ConnectionError as e:
-            print(f"{log_prefix}第 {actual_batch_num}/{total_batches} 批次连接错误 [{report_type}]：{e}")
+            log(f"{log_prefix}第 {actual_batch_num}/{total_batches} 批次连接错误 [{report_type}]：{e}")
         except Exception as e:
-            print(f"{log_prefix}第 {actual_batch_num}/{total_batches} 批次发送异常 [{report_type}]：{e}")
+            log(f"{log_prefix}第 {actual_batch_num}/{total_batches} 批次发送异常 [{report_type}]：{e}")
 
     # 判断整体发送是否成功
     if success_count == total_batches:
-        print(f"{log_prefix}所有 {total_batches} 批次发送完成 [{report_type}]")
+        log(f"{log_prefix}所有 {total_batches} 批次发送完成 [{report_type}]")
         return True
     elif success_count > 0:
-        print(f"{log_prefix}部分发送成功：{success_count}/{total_batches} 批次 [{report_type}]")
+        log(f"{log_prefix}部分发送成功：{success_count}/{total_batches} 批次 [{report_type}]")
         return True  # 部分成功也视为成功
     else:
-        print(f"{log_prefix}发送完全失败 [{report_type}]")
+        log(f"{log_prefix}发送完全失败 [{report_type}]")
         return False
 
 
@@ -4749,15 +6133,12 @@ def send_to_bark(
     proxy_url: Optional[str] = None,
     mode: str = "daily",
     account_label: str = "",
+    log: Callable[..., None] = print,
 ) -> bool:
     """发送到Bark（支持分批发送，使用 markdown 格式）"""
     # 日志前缀
     log_prefix = f"Bark{account_label}" if account_label else "Bark"
 
-    proxies = None
-    if proxy_url:
-        proxies = {"http": proxy_url, "https": proxy_url}
-
     # 解析 Bark URL，提取 device_key 和 API 端点
     # Bark URL 格式: https://api.day.app/device_key 或 https://bark.day.app/device_key
     from urllib.parse import urlparse
@@ -4766,7 +6147,7 @@ def send_to_bark(
     device_key = parsed_url.path.strip('/').split('/')[0] if parsed_url.path else None
 
     if not device_key:
-        print(f"{log_prefix} URL 格式错误，无法提取 device_key: {bark_url}")
+        log(f"{log_prefix} URL 格式错误，无法提取 device_key: {bark_url}")
         return False
 
     # 构建正确的 API 端点
@@ -4780,16 +6161,16 @@ def send_to_bark(
     )
 
     # 统一添加批次头部（已预留空间，不会超限）
-    batches = add_batch_headers(batches, "bark", bark_batch_size)
+    batches = add_batch_headers(batches, "bark", bark_batch_size, log)
 
     total_batches = len(batches)
-    print(f"{log_prefix}消息分为 {total_batches} 批次发送 [{report_type}]")
+    log(f"{log_prefix}消息分为 {total_batches} 批次发送 [{report_type}]")
 
     # 反转批次顺序，使得在Bark客户端显示时顺序正确
     # Bark显示最新消息在上面，所以我们从最后一批开始推送
     reversed_batches = list(reversed(batches))
 
-    print(f"{log_prefix}将按反向顺序推送（最后批次先推送），确保客户端显示顺序正确")
+    log(f"{log_prefix}将按反向顺序推送（最后批次先推送），确保客户端显示顺序正确")
 
     # 逐批发送（反向顺序）
     success_count = 0
@@ -4798,13 +6179,13 @@ def send_to_bark(
         actual_batch_num = total_batches - idx + 1
 
         batch_size = len(batch_content.encode("utf-8"))
-        print(
+        log(
             f"发送{log_prefix}第 {actual_batch_num}/{total_batches} 批次（推送顺序: {idx}/{total_batches}），大小：{batch_size} 字节 [{report_type}]"
         )
 
         # 检查消息大小（Bark使用APNs，限制4KB）
         if batch_size > 4096:
-            print(
+            log(
                 f"警告：{log_prefix}第 {actual_batch_num}/{total_batches} 批次消息过大（{batch_size} 字节），可能被拒绝"
             )
 
@@ -4818,53 +6199,52 @@ def send_to_bark(
             "action": "none",  # 点击推送跳到 APP 不弹出弹框,方便阅读
         }
 
+        # 同一 webhook 批次间限速
+        WEBHOOK_RATE_LIMITER.wait(bark_url)
         try:
-            response = requests.post(
+            response = HTTP_CLIENT.post(
                 api_endpoint,
                 json=payload,
-                proxies=proxies,
+                proxy_url=proxy_url,
                 timeout=30,
             )
 
             if response.status_code == 200:
                 result = response.json()
                 if result.get("code") == 200:
-                    print(f"{log_prefix}第 {actual_batch_num}/{total_batches} 批次发送成功 [{report_type}]")
+                    log(f"{log_prefix}第 {actual_batch_num}/{total_batches} 批次发送成功 [{report_type}]")
                     success_count += 1
-                    # 批次间间隔
-                    if idx < total_batches:
-                        time.sleep(CONFIG["BATCH_SEND_INTERVAL"])
                 else:
-                    print(
+                    log(
                         f"{log_prefix}第 {actual_batch_num}/{total_batches} 批次发送失败 [{report_type}]，错误：{result.get('message', '未知错误')}"
                     )
             else:
-                print(
+                log(
                     f"{log_prefix}第 {actual_batch_num}/{total_batches} 批次发送失败 [{report_type}]，状态码：{response.status_code}"
                 )
                 try:
-                    print(f"错误详情：{response.text}")
+                    log(f"错误详情：{response.text}")
                 except:
                     pass
 
         except requests.exceptions.ConnectTimeout:
-            print(f"{log_prefix}第 {actual_batch_num}/{total_batches} 批次连接超时 [{report_type}]")
+            log(f"{log_prefix}第 {actual_batch_num}/{total_batches} 批次连接超时 [{report_type}]")
         except requests.exceptions.ReadTimeout:
-            print(f"{log_prefix}第 {actual_batch_num}/{total_batches} 批次读取超时 [{report_type}]")
+            log(f"{log_prefix}第 {actual_batch_num}/{total_batches} 批次读取超时 [{report_type}]")
         except requests.exceptions.ConnectionError as e:
-            print(f"{log_prefix}第 {actual_batch_num}/{total_batches} 批次连接错误 [{report_type}]：{e}")
+            log(f"{log_prefix}第 {actual_batch_num}/{total_batches} 批次连接错误 [{report_type}]：{e}")
         except Exception as e:
-            print(f"{log_prefix}第 {actual_batch_num}/{total_batches} 批次发送异常 [{report_type}]：{e}")
+            log(f"{log_prefix}第 {actual_batch_num}/{total_batches} 批次发送异常 [{report_type}]：{e}")
 
     # 判断整体发送是否成功
     if success_count == total_batches:
-        print(f"{log_prefix}所有 {total_batches} 批次发送完成 [{report_type}]")
+        log(f"{log_prefix}所有 {total_batches} 批次发送完成 [{report_type}]")
         return True
     elif success_count > 0:
-        print(f"{log_prefix}部分发送成功：{success_count}/{total_batches} 批次 [{report_type}]")
+        log(f"{log_prefix}部分发送成功：{success_count}/{total_batches} 批次 [{report_type}]")
         return True  # 部分成功也视为成功
     else:
-        print(f"{log_prefix}发送完全失败 [{report_type}]")
+        log(f"{log_prefix}发送完全失败 [{report_type}]")
         return False
 
 
@@ -4894,13 +6274,10 @@ def send_to_slack(
     proxy_url: Optional[str] = None,
     mode: str = "daily",
     account_label: str = "",
+    log: Callable[..., None] = print,
 ) -> bool:
     """发送到Slack（支持分批发送，使用 mrkdwn 格式）"""
     headers = {"Content-Type": "application/json"}
-    proxies = None
-    if proxy_url:
-        proxies = {"http": proxy_url, "https": proxy_url}
-
     # 日志前缀
     log_prefix = f"Slack{account_label}" if account_label else "Slack"
 
@@ -4912,9 +6289,9 @@ def send_to_slack(
     )
 
     # 统一添加批次头部（已预留空间，不会超限）
-    batches = add_batch_headers(batches, "slack", slack_batch_size)
+    batches = add_batch_headers(batches, "slack", slack_batch_size, log)
 
-    print(f"{log_prefix}消息分为 {len(batches)} 批次发送 [{report_type}]")
+    log(f"{log_prefix}消息分为 {len(batches)} 批次发送 [{report_type}]")
 
     # 逐批发送
     for i, batch_content in enumerate(batches, 1):
@@ -4922,7 +6299,7 @@ def send_to_slack(
         mrkdwn_content = convert_markdown_to_mrkdwn(batch_content)
 
         batch_size = len(mrkdwn_content.encode("utf-8"))
-        print(
+        log(
             f"发送{log_prefix}第 {i}/{len(batches)} 批次，大小：{batch_size} 字节 [{report_type}]"
         )
 
@@ -4931,28 +6308,27 @@ def send_to_slack(
             "text": mrkdwn_content
         }
 
+        # 同一 webhook 批次间限速
+        WEBHOOK_RATE_LIMITER.wait(webhook_url)
         try:
-            response = requests.post(
-                webhook_url, headers=headers, json=payload, proxies=proxies, timeout=30
+            response = HTTP_CLIENT.post(
+                webhook_url, headers=headers, json=payload, proxy_url=proxy_url, timeout=30
             )
 
             # Slack Incoming Webhooks 成功时返回 "ok" 文本
             if response.status_code == 200 and response.text == "ok":
-                print(f"{log_prefix}第 {i}/{len(batches)} 批次发送成功 [{report_type}]")
-                # 批次间间隔
-                if i < len(batches):
-                    time.sleep(CONFIG["BATCH_SEND_INTERVAL"])
+                log(f"{log_prefix}第 {i}/{len(batches)} 批次发送成功 [{report_type}]")
             else:
                 error_msg = response.text if response.text else f"状态码：{response.status_code}"
-                print(
+                log(
                     f"{log_prefix}第 {i}/{len(batches)} 批次发送失败 [{report_type}]，错误：{error_msg}"
                 )
                 return False
         except Exception as e:
-            print(f"{log_prefix}第 {i}/{len(batches)} 批次发送出错 [{report_type}]：{e}")
+            log(f"{log_prefix}第 {i}/{len(batches)} 批次发送出错 [{report_type}]：{e}")
             return False
 
-    print(f"{log_prefix}所有 {len(batches)} 批次发送完成 [{report_type}]")
+    log(f"{log_prefix}所有 {len(batches)} 批次发送完成 [{report_type}]")
     return True
 
 
@@ -5100,7 +6476,8 @@ class NewsAnalyzer:
 
             print(f"当前监控平台: {current_platform_ids}")
 
-            all_results, id_to_name, title_info = read_all_today_titles(
+            # 标题汇总与新增标题来自同一份当日汇总，只加载一次
+            all_results, id_to_name, title_info, new_titles = DailyAggregate().load(
                 current_platform_ids
             )
 
@@ -5111,7 +6488,6 @@ class NewsAnalyzer:
             total_titles = sum(len(titles) for titles in all_results.values())
             print(f"读取到 {total_titles} 个标题（已按当前监控平台过滤）")
 
-            new_titles = detect_latest_new_titles(current_platform_ids)
             word_groups, filter_words, global_filters = load_frequency_words()
 
             return (
@@ -5373,15 +6749,17 @@ class NewsAnalyzer:
 
         return False
 
-    def _generate_summary_report(self, mode_strategy: Dict) -> Optional[str]:
-        """生成汇总报告（带通知）"""
+    def _generate_summary_report(
+        self, mode_strategy: Dict, analysis_data: Optional[Tuple] = None
+    ) -> Optional[str]:
+        """生成汇总报告（带通知），analysis_data 为已加载的分析数据时直接复用"""
         summary_type = (
             "当前榜单汇总" if mode_strategy["summary_mode"] == "current" else "当日汇总"
         )
         print(f"生成{summary_type}报告...")
 
         # 加载分析数据
-        analysis_data = self._load_analysis_data()
+        analysis_data = analysis_data or self._load_analysis_data()
         if not analysis_data:
             return None
 
@@ -5417,13 +6795,15 @@ class NewsAnalyzer:
 
         return html_file
 
-    def _generate_summary_html(self, mode: str = "daily") -> Optional[str]:
-        """生成汇总HTML"""
+    def _generate_summary_html(
+        self, mode: str = "daily", analysis_data: Optional[Tuple] = None
+    ) -> Optional[str]:
+        """生成汇总HTML，analysis_data 为已加载的分析数据时直接复用"""
         summary_type = "当前榜单汇总" if mode == "current" else "当日汇总"
         print(f"生成{summary_type}HTML...")
 
         # 加载分析数据
-        analysis_data = self._load_analysis_data()
+        analysis_data = analysis_data or self._load_analysis_data()
         if not analysis_data:
             return None
 
@@ -5468,8 +6848,8 @@ class NewsAnalyzer:
         print(f"报告模式: {self.report_mode}")
         print(f"运行模式: {mode_strategy['description']}")
 
-    def _crawl_data(self) -> Tuple[Dict, Dict, List]:
-        """执行数据爬取"""
+    def _crawl_data(self) -> Tuple[Dict, Dict, List, str]:
+        """执行数据爬取并落盘，返回 (results, id_to_name, failed_ids, time_info)"""
         ids = []
         for platform in CONFIG["PLATFORMS"]:
             if "name" in platform:
@@ -5490,24 +6870,35 @@ class NewsAnalyzer:
         title_file = save_titles_to_file(results, id_to_name, failed_ids)
         print(f"标题已保存到: {title_file}")
 
-        return results, id_to_name, failed_ids
+        return results, id_to_name, failed_ids, Path(title_file).stem
 
     def _execute_mode_strategy(
-        self, mode_strategy: Dict, results: Dict, id_to_name: Dict, failed_ids: List
+        self,
+        mode_strategy: Dict,
+        results: Dict,
+        id_to_name: Dict,
+        failed_ids: List,
+        time_info: str,
     ) -> Optional[str]:
-        """执行模式特定逻辑"""
-        # 获取当前监控平台ID列表
-        current_platform_ids = [platform["id"] for platform in CONFIG["PLATFORMS"]]
-
-        new_titles = detect_latest_new_titles(current_platform_ids)
-        time_info = Path(save_titles_to_file(results, id_to_name, failed_ids)).stem
-        word_groups, filter_words, global_filters = load_frequency_words()
+        """执行模式特定逻辑（本次爬取已由 _crawl_data 落盘，time_info 为其批次时间）"""
+        # 当日汇总只加载一次：新增标题、current 模式的历史数据和汇总报告共用
+        analysis_data = self._load_analysis_data()
+        # 分析流水线会就地加入 AI 搜索结果，实时报告使用浅拷贝，原始数据留给汇总报告
+        realtime_data = (
+            tuple(dict(item) for item in analysis_data[:4]) + analysis_data[4:]
+            if analysis_data
+            else None
+        )
+        if realtime_data:
+            new_titles = realtime_data[3]
+            word_groups, filter_words, global_filters = realtime_data[4:]
+        else:
+            new_titles = {}
+            word_groups, filter_words, global_filters = load_frequency_words()
 
         # current模式下，实时推送需要使用完整的历史数据来保证统计信息的完整性
         if self.report_mode == "current":
-            # 加载完整的历史数据（已按当前平台过滤）
-            analysis_data = self._load_analysis_data()
-            if analysis_data:
+            if realtime_data:
                 (
                     all_results,
                     historical_id_to_name,
@@ -5516,7 +6907,7 @@ class NewsAnalyzer:
                     _,
                     _,
                     _,
-                ) = analysis_data
+                ) = realtime_data
 
                 print(
                     f"current模式：使用过滤后的历史数据，包含平台：{list(all_results.keys())}"
@@ -5587,11 +6978,11 @@ class NewsAnalyzer:
             if mode_strategy["should_send_realtime"]:
                 # 如果已经发送了实时通知，汇总只生成HTML不发送通知
                 summary_html = self._generate_summary_html(
-                    mode_strategy["summary_mode"]
+                    mode_strategy["summary_mode"], analysis_data
                 )
             else:
                 # daily模式：直接生成汇总报告并发送通知
-                summary_html = self._generate_summary_report(mode_strategy)
+                summary_html = self._generate_summary_report(mode_strategy, analysis_data)
 
         # 打开浏览器（仅在非容器环境）
         if self._should_open_browser() and html_file:
@@ -5618,9 +7009,11 @@ class NewsAnalyzer:
 
             mode_strategy = self._get_mode_strategy()
 
-            results, id_to_name, failed_ids = self._crawl_data()
+            results, id_to_name, failed_ids, time_info = self._crawl_data()
 
-            self._execute_mode_strategy(mode_strategy, results, id_to_name, failed_ids)
+            self._execute_mode_strategy(
+                mode_strategy, results, id_to_name, failed_ids, time_info
+            )
 
         except Exception as e:
             print(f"分析流程执行出错: {e}")
@@ -5632,6 +7025,7 @@ def deduplicate_news_items(news_list):
     对同一订阅内的新闻列表进行去重：
     1. 优先按 URL 精确去重
     2. 对没有 URL 或 URL 不同的新闻，再按归一化标题去重
+    3. 不同平台的近似标题按聚类合并，只保留排在最前的一条（见 TitleClusterer）
     仅作用于单次运行、单个订阅内的结果
     """
     if not news_list:
@@ -5663,12 +7057,21 @@ def deduplicate_news_items(news_list):
 
         deduped.append(item)
 
+    if CONFIG.get("CLUSTER_SIMILAR_TITLES", True):
+        deduped = merge_clustered_titles(
+            deduped,
+            TitleClusterer(CONFIG.get("CLUSTER_THRESHOLD", 0.5)),
+            source_key="platform",
+        )
+
     return deduped
 
 
-def fetch_xhs_hot_posts(keyword: str, limit: int, xhs_config: Dict) -> List[Dict]:
+def fetch_xhs_hot_posts(
+    keyword: str, limit: int, xhs_config: Dict, log: Callable[..., None] = print
+) -> List[Dict]:
     """
-    调用小红书热榜接口，按点赞数获取前 N 条数据
+    调用小红书热榜接口，按点赞数获取前 N 条数据（日志通过 log 输出）
     """
     base_url = xhs_config.get("base_url")
     timeout = xhs_config.get("timeout_seconds", 15)
@@ -5683,13 +7086,13 @@ def fetch_xhs_hot_posts(keyword: str, limit: int, xhs_config: Dict) -> List[Dict
     headers = {"Content-Type": "application/json"}
 
     try:
-        resp = requests.post(base_url, headers=headers, json=payload, timeout=timeout)
+        resp = HTTP_CLIENT.post(base_url, headers=headers, json=payload, timeout=timeout)
         if resp.status_code != 200:
-            print(f"   ⚠️ 小红书接口返回非200状态码: {resp.status_code}")
+            log(f"   ⚠️ 小红书接口返回非200状态码: {resp.status_code}")
             return []
         data = resp.json()
     except Exception as e:
-        print(f"   ⚠️ 调用小红书接口失败: {str(e)[:100]}")
+        log(f"   ⚠️ 调用小红书接口失败: {str(e)[:100]}")
         return []
 
     # 根据实际返回结构进行字段映射
@@ -5738,17 +7141,17 @@ def fetch_xhs_hot_posts(keyword: str, limit: int, xhs_config: Dict) -> List[Dict
 
     # 调试输出：展示前若干条小红书原始数据，方便核对 likes 是否一致
     if posts:
-        print(f"   [XHS] 接口成功返回并解析 {len(posts)} 条笔记")
+        log(f"   [XHS] 接口成功返回并解析 {len(posts)} 条笔记")
         for i, p in enumerate(posts[:3], 1):
             raw_item = p.get("raw", {})
             raw_likes = raw_item.get("likes") if isinstance(raw_item, dict) else None
-            print(
+            log(
                 f"      - #{i} 标题: {p.get('title', '')[:40]}... "
                 f"(解析后likes={p.get('likes')}, 原始likes={raw_likes}, url={p.get('url', '')[:60]}...)"
             )
             # 打印完整原始 item（仅前两条，避免日志过长）
             if i <= 2:
-                print(f"         [原始item] {json.dumps(raw_item, ensure_ascii=False)[:200]}...")
+                log(f"         [原始item] {json.dumps(raw_item, ensure_ascii=False)[:200]}...")
 
     return posts
 
@@ -5832,6 +7235,350 @@ def filter_xhs_posts_by_history(
     return filtered, history
 
 
+def build_subscription_ai_search_config(ai_config: Dict) -> Dict:
+    """
+    构建订阅的临时 AI 搜索配置（支持主关键字和备用关键字）
+
+    Args:
+        ai_config: SubscriptionManager.get_ai_search_config 返回的订阅 AI 搜索配置
+
+    Returns:
+        包含 AI_SEARCH 配置项的配置字典
+    """
+    return {
+        "AI_SEARCH": {
+            "ENABLED": True,
+            "PRIMARY_KEYWORDS": ai_config.get("primary_keywords", []),  # 主关键字（订阅关键字）
+            "FALLBACK_KEYWORDS": ai_config.get("fallback_keywords", []),  # 备用关键字（自定义关键字）
+            "TIME_RANGE_HOURS": ai_config.get("time_range_hours", 24),
+            "MAX_RESULTS": ai_config.get("max_results", 30),  # 增加到30条
+            "SERPER_API_KEY": CONFIG.get("AI_SEARCH", {}).get("SERPER_API_KEY"),
+            "AI_API_KEY": CONFIG.get("AI_SEARCH", {}).get("AI_API_KEY"),
+            "AI_MODEL": CONFIG.get("AI_SEARCH", {}).get("AI_MODEL", "deepseek-ai/DeepSeek-V3"),
+            "AI_API_BASE": CONFIG.get("AI_SEARCH", {}).get("AI_API_BASE", "https://api.siliconflow.cn/v1"),
+            "RELEVANCE_THRESHOLD": 5,
+            "SCORE_CACHE_TTL_HOURS": CONFIG.get("AI_SEARCH", {}).get("SCORE_CACHE_TTL_HOURS", 72),
+            "SCORE_CHUNK_SIZE": CONFIG.get("AI_SEARCH", {}).get("SCORE_CHUNK_SIZE", 10),
+            "SCORE_CONCURRENCY": CONFIG.get("AI_SEARCH", {}).get("SCORE_CONCURRENCY", 4),
+        }
+    }
+
+
+# 多订阅模式：XHS 历史文件的读改写需串行（各订阅并行处理时共用同一个文件）
+XHS_HISTORY_LOCK = threading.Lock()
+
+
+def collect_xhs_posts(
+    subscription: Dict,
+    sub_id: str,
+    timeout: Optional[float] = None,
+    log: Callable[..., None] = print,
+) -> List[Dict]:
+    """
+    获取订阅的小红书专栏内容（按历史记录去重）
+
+    Args:
+        subscription: 订阅配置
+        sub_id: 订阅 ID
+        timeout: 接口超时上限（秒），不超过配置的 timeout_seconds
+        log: 输出函数，默认 print
+
+    Returns:
+        本次展示的小红书帖子列表（未启用或没有数据时为空列表）
+    """
+    xhs_global = CONFIG.get("xhs", {}) or CONFIG.get("XHS", {})
+    if not xhs_global.get("enabled", False):
+        return []
+    sub_xhs = subscription.get("xhs", {})
+    if not sub_xhs.get("enabled", False):
+        return []
+
+    xhs_keywords = sub_xhs.get("keywords") or []
+    if not xhs_keywords:
+        # 若未配置单独关键词，则尝试使用订阅主关键词的第一个
+        normal_kws = subscription.get("keywords", {}).get("normal", [])
+        if normal_kws:
+            xhs_keywords = [normal_kws[0]]
+    if not xhs_keywords:
+        return []
+
+    xhs_keyword = xhs_keywords[0]
+    limit = sub_xhs.get("limit", xhs_global.get("default_limit", 20))
+    history_days = sub_xhs.get("history_days", 15)
+    push_limit = sub_xhs.get("push_limit", 10)
+
+    if timeout is not None:
+        xhs_global = dict(
+            xhs_global, timeout_seconds=min(xhs_global.get("timeout_seconds", 15), timeout)
+        )
+
+    log(f"   📎 小红书专栏启用，关键词: {xhs_keyword}，limit={limit}，history_days={history_days}")
+    raw_posts = fetch_xhs_hot_posts(xhs_keyword, limit, xhs_global, log)
+
+    if not raw_posts:
+        log("   ℹ️ 小红书接口未返回数据或调用失败")
+        return []
+
+    with XHS_HISTORY_LOCK:
+        history_path = Path("output") / "xhs_history.json"
+        history = load_xhs_history(history_path)
+        filtered_posts, new_history = filter_xhs_posts_by_history(
+            sub_id, xhs_keyword, raw_posts, history, history_days
+        )
+        save_xhs_history(history_path, new_history)
+
+    if not filtered_posts:
+        log("   ℹ️ 小红书数据在历史窗口内均已推送过，本次不展示")
+        return []
+
+    xhs_posts_for_report = filtered_posts[:push_limit]
+    log(
+        f"   📌 小红书原始 {len(raw_posts)} 条，"
+        f"历史去重后 {len(filtered_posts)} 条，"
+        f"本次展示 {len(xhs_posts_for_report)} 条"
+    )
+    return xhs_posts_for_report
+
+
+class SubscriptionPipeline:
+    """订阅并行处理流水线
+
+    各订阅在有界线程池中并行处理。AI 搜索补充由跨订阅计划在后台线程执行，
+    各订阅的小红书请求、webhook 推送与之重叠进行，一个订阅的慢请求不再阻塞其他订阅。
+    每个订阅从开始处理起有独立的截止时间：等待 AI 结果和小红书接口的时间不超过剩余时间，
+    开始推送前已超时则放弃推送并记为失败。各订阅的日志通过 log 参数写入各自的缓冲
+    （不替换全局 sys.stdout），处理结束后整段输出，不会逐行交错。
+    """
+
+    def __init__(self, sub_manager, max_workers: int = 4, deadline_seconds: float = 600):
+        """
+        Args:
+            sub_manager: 订阅管理器实例
+            max_workers: 同时处理的订阅数，1 = 逐个处理
+            deadline_seconds: 单个订阅的处理时限（秒）
+        """
+        self.sub_manager = sub_manager
+        self.max_workers = max(1, max_workers)
+        self.deadline_seconds = deadline_seconds
+        self._output_lock = threading.Lock()
+
+    def run(
+        self,
+        active_subs: List[Dict],
+        match_results: List[Tuple[List[Dict], int]],
+        ai_future=None,
+        ai_requested: Optional[set] = None,
+    ) -> Tuple[int, int]:
+        """
+        处理全部订阅
+
+        Args:
+            active_subs: 活跃订阅列表
+            match_results: 与 active_subs 对应的 (匹配新闻, 匹配总数)
+            ai_future: 跨订阅 AI 搜索计划的 Future，结果为 {订阅序号: 资讯列表}
+            ai_requested: 加入了 AI 搜索计划的订阅序号
+
+        Returns:
+            (成功订阅数, 失败订阅数)，跳过的订阅不计入
+        """
+        ai_requested = ai_requested or set()
+
+        def run_one(idx: int) -> Optional[bool]:
+            buffer = io.StringIO()
+            try:
+                return self._process(
+                    idx, len(active_subs), active_subs[idx - 1], match_results[idx - 1],
+                    ai_future if idx in ai_requested else None,
+                    functools.partial(print, file=buffer),
+                )
+            finally:
+                # 订阅处理结束（包括出错）时整段输出
+                with self._output_lock:
+                    sys.stdout.write(buffer.getvalue())
+                    sys.stdout.flush()
+
+        workers = min(self.max_workers, len(active_subs)) or 1
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="subscription") as pool:
+            outcomes = list(pool.map(run_one, range(1, len(active_subs) + 1)))
+
+        success_count = sum(1 for outcome in outcomes if outcome is True)
+        fail_count = sum(1 for outcome in outcomes if outcome is False)
+        return success_count, fail_count
+
+    def _remaining(self, deadline: float, stage: str) -> float:
+        """距截止时间的剩余秒数；已超时时抛出 TimeoutError"""
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError(f"超过处理时限（{self.deadline_seconds} 秒），放弃{stage}")
+        return remaining
+
+    def _wait_ai_news(
+        self, ai_future, idx: int, deadline: float, log: Callable[..., None]
+    ) -> List[Dict]:
+        """等待跨订阅 AI 搜索计划的结果（最多等到截止时间）"""
+        if ai_future is None:
+            return []
+        try:
+            return ai_future.result(timeout=self._remaining(deadline, "AI搜索补充")).get(idx) or []
+        except (FutureTimeoutError, TimeoutError):
+            # Python 3.10 及以前 Future.result 超时抛出的不是内置 TimeoutError
+            log("   ⚠️ AI搜索超过处理时限，跳过补充")
+        except Exception as e:
+            log(f"   ⚠️ AI搜索失败: {e}")
+        return []
+
+    def _process(
+        self,
+        idx: int,
+        total: int,
+        subscription: Dict,
+        match_result: Tuple[List[Dict], int],
+        ai_future,
+        log: Callable[..., None] = print,
+    ) -> Optional[bool]:
+        """
+        处理单个订阅，日志写入 log（各订阅各自的缓冲，处理结束后整段输出）
+
+        Returns:
+            True 推送成功，False 失败，None 跳过（没有匹配的新闻或没有 webhook）
+        """
+        sub_manager = self.sub_manager
+        sub_name = subscription.get("name", f"订阅{idx}")
+        sub_id = subscription.get("id", f"sub_{idx}")
+        deadline = time.monotonic() + self.deadline_seconds
+
+        log(f"\n{'─'*80}")
+        log(f"[{idx}/{total}] 处理订阅: {sub_name}")
+        log(f"ID: {sub_id}")
+        log(f"{'─'*80}")
+
+        try:
+            # 筛选匹配的新闻（已在阶段2开始时批量完成）
+            matched_news, matched_total = match_result
+            matched_news = list(matched_news)
+            sub_manager.print_match_summary(subscription, len(matched_news), matched_total, log)
+
+            # 已有匹配新闻时必然会推送，小红书请求先行，与后台的 AI 搜索重叠进行
+            xhs_posts_for_report: Optional[List[Dict]] = None
+            if matched_news:
+                xhs_posts_for_report = collect_xhs_posts(
+                    subscription, sub_id, self._remaining(deadline, "小红书专栏"), log
+                )
+
+            # AI搜索补充（跨订阅计划在后台执行）
+            ai_news = self._wait_ai_news(ai_future, idx, deadline, log)
+            if ai_news:
+                # 转换AI新闻格式
+                for ai_item in ai_news:
+                    matched_news.append({
+                        "title": ai_item.get("title", ""),
+                        "platform": ai_item.get("source", "AI智能搜索"),
+                        "platform_id": "ai_search",
+                        "rank": 0,
+                        "url": ai_item.get("url", ""),
+                        "mobileUrl": ai_item.get("mobileUrl", ""),
+                        "ranks": []
+                    })
+                log(f"   🤖 AI搜索补充了 {len(ai_news)} 条新闻")
+
+            # 订阅内去重：先按 URL，再按标题归一化
+            if matched_news:
+                before_count = len(matched_news)
+                matched_news = deduplicate_news_items(matched_news)
+                after_count = len(matched_news)
+                if after_count < before_count:
+                    log(f"   ℹ️ 去重后新闻数: {after_count}/{before_count}")
+
+            if not matched_news:
+                log(f"   ⚠️ 没有匹配的新闻，跳过推送")
+                return None
+
+            # 小红书专栏（按订阅配置；只有 AI 补充的新闻时此时才请求）
+            if xhs_posts_for_report is None:
+                xhs_posts_for_report = collect_xhs_posts(
+                    subscription, sub_id, self._remaining(deadline, "小红书专栏"), log
+                )
+
+            # 生成报告
+            report_content = generate_subscription_report(subscription, matched_news, xhs_posts_for_report)
+
+            # 推送到所有配置的webhook
+            webhooks = sub_manager.get_webhooks(subscription)
+
+            if not webhooks:
+                log(f"   ⚠️ 没有配置webhook，跳过推送")
+                return None
+
+            # 截止时间只在推送开始前检查：开始后全部 webhook 都会推送，不会只推送一部分
+            self._remaining(deadline, "推送")
+
+            log(f"\n   📤 开始推送到 {len(webhooks)} 个webhook...")
+            log(f"   [调试] 订阅 [{sub_name}] 的webhook配置:")
+            for wh_idx, wh in enumerate(webhooks, 1):
+                log(f"      {wh_idx}. {wh.get('name', '未命名')} ({wh.get('type', 'wework')})")
+                # 只显示webhook URL的关键部分（key参数）用于调试
+                url = wh.get("url", "")
+                if "key=" in url:
+                    key_part = url.split("key=")[1].split("&")[0] if "key=" in url else "未找到key"
+                    log(f"         URL key: ...{key_part[-8:]}")  # 显示最后8位
+
+            push_success = 0
+            push_fail = 0
+
+            for webhook in webhooks:
+                webhook_name = webhook.get("name", "未命名群组")
+                webhook_url = webhook.get("url")
+                webhook_type = webhook.get("type", "wework")
+
+                if not webhook_url:
+                    log(f"      ⚠️ {webhook_name}: webhook URL为空，跳过")
+                    push_fail += 1
+                    continue
+
+                try:
+                    # 发送推送
+                    # 提取并显示webhook key用于验证
+                    webhook_key_display = "未知"
+                    if "key=" in webhook_url:
+                        key_part = webhook_url.split("key=")[1].split("&")[0]
+                        webhook_key_display = f"...{key_part[-12:]}"  # 显示最后12位
+
+                    log(f"      [推送] 正在推送到: {webhook_name} ({webhook_type})")
+                    log(f"      [调试] Webhook URL key: {webhook_key_display}")
+                    if webhook_type == "wework":
+                        send_wework_message(webhook_url, report_content)
+                    elif webhook_type == "feishu":
+                        send_feishu_message(webhook_url, report_content)
+                    elif webhook_type == "dingtalk":
+                        send_dingtalk_message(webhook_url, report_content)
+                    else:
+                        log(f"      ⚠️ 不支持的webhook类型: {webhook_type}")
+                        push_fail += 1
+                        continue
+
+                    log(f"      ✅ {webhook_name} 推送成功")
+                    push_success += 1
+
+                except Exception as e:
+                    log(f"      ❌ {webhook_name}: {str(e)[:100]}")
+                    push_fail += 1
+
+            if push_success > 0:
+                log(f"\n   ✅ 订阅 [{sub_name}] 完成 ({push_success} 成功, {push_fail} 失败)")
+                return True
+            log(f"\n   ❌ 订阅 [{sub_name}] 全部推送失败")
+            return False
+
+        except TimeoutError as e:
+            log(f"\n   ❌ 订阅 [{sub_name}] 处理超时: {e}")
+            return False
+        except Exception as e:
+            log(f"\n   ❌ 订阅 [{sub_name}] 处理失败: {e}")
+            import traceback
+            log(traceback.format_exc(), end="")
+            return False
+
+
 def run_subscription_mode(sub_manager):
     """
     多订阅模式执行
@@ -5875,7 +7622,7 @@ def run_subscription_mode(sub_manager):
     try:
         analyzer = NewsAnalyzer()
         # 仅执行爬虫获取原始数据，不走原有推送流程
-        results, id_to_name, failed_ids = analyzer._crawl_data()
+        results, id_to_name, failed_ids, _ = analyzer._crawl_data()
 
         all_news_data = []
 
@@ -5905,192 +7652,36 @@ def run_subscription_mode(sub_manager):
     print("📋 阶段2: 处理各订阅分组")
     print("="*80 + "\n")
     
-    success_count = 0
-    fail_count = 0
-    
-    for idx, subscription in enumerate(active_subs, 1):
-        sub_name = subscription.get("name", f"订阅{idx}")
-        sub_id = subscription.get("id", f"sub_{idx}")
-        
-        print(f"\n{'─'*80}")
-        print(f"[{idx}/{len(active_subs)}] 处理订阅: {sub_name}")
-        print(f"ID: {sub_id}")
-        print(f"{'─'*80}")
-        
-        try:
-            # 筛选匹配的新闻
-            matched_news = sub_manager.match_news_for_subscription(
-                subscription, all_news_data
-            )
-            
-            # AI搜索补充（如果需要）
-            if AI_SEARCH_AVAILABLE and sub_manager.should_enable_ai_search(
-                subscription, len(matched_news)
-            ):
+    # 所有订阅共用一个编译后的匹配器，单次扫描新闻即得到全部订阅的匹配结果
+    match_results = sub_manager.match_news_for_subscriptions(active_subs, all_news_data)
+
+    # AI搜索补充：先收集所有需要补充的订阅，合并相同的搜索和评分后在后台统一执行
+    ai_future = None
+    ai_requested = set()
+    ai_executor = None
+    if AI_SEARCH_AVAILABLE:
+        planner = AISearchPlanner()
+        for idx, subscription in enumerate(active_subs, 1):
+            if sub_manager.should_enable_ai_search(subscription, len(match_results[idx - 1][0])):
                 ai_config = sub_manager.get_ai_search_config(subscription)
-                try:
-                    # 构建临时AI配置（支持主关键字和备用关键字）
-                    temp_config = {
-                        "AI_SEARCH": {
-                            "ENABLED": True,
-                            "PRIMARY_KEYWORDS": ai_config.get("primary_keywords", []),  # 主关键字（订阅关键字）
-                            "FALLBACK_KEYWORDS": ai_config.get("fallback_keywords", []),  # 备用关键字（自定义关键字）
-                            "TIME_RANGE_HOURS": ai_config.get("time_range_hours", 24),
-                            "MAX_RESULTS": ai_config.get("max_results", 30),  # 增加到30条
-                            "SERPER_API_KEY": CONFIG.get("AI_SEARCH", {}).get("SERPER_API_KEY"),
-                            "AI_API_KEY": CONFIG.get("AI_SEARCH", {}).get("AI_API_KEY"),
-                            "AI_MODEL": CONFIG.get("AI_SEARCH", {}).get("AI_MODEL", "deepseek-ai/DeepSeek-V3"),
-                            "AI_API_BASE": CONFIG.get("AI_SEARCH", {}).get("AI_API_BASE", "https://api.siliconflow.cn/v1"),
-                            "RELEVANCE_THRESHOLD": 5
-                        }
-                    }
-                    
-                    ai_news = search_pension_news_with_ai(temp_config)
-                    
-                    if ai_news:
-                        # 转换AI新闻格式
-                        for ai_item in ai_news:
-                            matched_news.append({
-                                "title": ai_item.get("title", ""),
-                                "platform": ai_item.get("source", "AI智能搜索"),
-                                "platform_id": "ai_search",
-                                "rank": 0,
-                                "url": ai_item.get("url", ""),
-                                "mobileUrl": ai_item.get("mobileUrl", ""),
-                                "ranks": []
-                            })
-                        print(f"   🤖 AI搜索补充了 {len(ai_news)} 条新闻")
-                        
-                except Exception as e:
-                    print(f"   ⚠️ AI搜索失败: {e}")
-
-            # 订阅内去重：先按 URL，再按标题归一化
-            if matched_news:
-                before_count = len(matched_news)
-                matched_news = deduplicate_news_items(matched_news)
-                after_count = len(matched_news)
-                if after_count < before_count:
-                    print(f"   ℹ️ 去重后新闻数: {after_count}/{before_count}")
-            
-            if not matched_news:
-                print(f"   ⚠️ 没有匹配的新闻，跳过推送")
-                continue
-
-            # 小红书专栏（按订阅配置）
-            xhs_global = CONFIG.get("xhs", {}) or CONFIG.get("XHS", {})
-            xhs_posts_for_report: List[Dict] = []
-            if xhs_global.get("enabled", False):
-                sub_xhs = subscription.get("xhs", {})
-                if sub_xhs.get("enabled", False):
-                    xhs_keywords = sub_xhs.get("keywords") or []
-                    if not xhs_keywords:
-                        # 若未配置单独关键词，则尝试使用订阅主关键词的第一个
-                        normal_kws = subscription.get("keywords", {}).get("normal", [])
-                        if normal_kws:
-                            xhs_keywords = [normal_kws[0]]
-                    if xhs_keywords:
-                        xhs_keyword = xhs_keywords[0]
-                        limit = sub_xhs.get("limit", xhs_global.get("default_limit", 20))
-                        history_days = sub_xhs.get("history_days", 15)
-                        push_limit = sub_xhs.get("push_limit", 10)
-
-                        print(f"   📎 小红书专栏启用，关键词: {xhs_keyword}，limit={limit}，history_days={history_days}")
-                        raw_posts = fetch_xhs_hot_posts(xhs_keyword, limit, xhs_global)
-
-                        if raw_posts:
-                            history_path = Path("output") / "xhs_history.json"
-                            history = load_xhs_history(history_path)
-                            filtered_posts, new_history = filter_xhs_posts_by_history(
-                                sub_id, xhs_keyword, raw_posts, history, history_days
-                            )
-                            save_xhs_history(history_path, new_history)
-
-                            if filtered_posts:
-                                xhs_posts_for_report = filtered_posts[:push_limit]
-                                print(
-                                    f"   📌 小红书原始 {len(raw_posts)} 条，"
-                                    f"历史去重后 {len(filtered_posts)} 条，"
-                                    f"本次展示 {len(xhs_posts_for_report)} 条"
-                                )
-                            else:
-                                print("   ℹ️ 小红书数据在历史窗口内均已推送过，本次不展示")
-                        else:
-                            print("   ℹ️ 小红书接口未返回数据或调用失败")
-            
-            # 生成报告
-            report_content = generate_subscription_report(subscription, matched_news, xhs_posts_for_report)
-            
-            # 推送到所有配置的webhook
-            webhooks = sub_manager.get_webhooks(subscription)
-            
-            if not webhooks:
-                print(f"   ⚠️ 没有配置webhook，跳过推送")
-                continue
-            
-            print(f"\n   📤 开始推送到 {len(webhooks)} 个webhook...")
-            print(f"   [调试] 订阅 [{sub_name}] 的webhook配置:")
-            for idx, wh in enumerate(webhooks, 1):
-                print(f"      {idx}. {wh.get('name', '未命名')} ({wh.get('type', 'wework')})")
-                # 只显示webhook URL的关键部分（key参数）用于调试
-                url = wh.get("url", "")
-                if "key=" in url:
-                    key_part = url.split("key=")[1].split("&")[0] if "key=" in url else "未找到key"
-                    print(f"         URL key: ...{key_part[-8:]}")  # 显示最后8位
-            
-            push_success = 0
-            push_fail = 0
-            
-            for webhook in webhooks:
-                webhook_name = webhook.get("name", "未命名群组")
-                webhook_url = webhook.get("url")
-                webhook_type = webhook.get("type", "wework")
-                
-                if not webhook_url:
-                    print(f"      ⚠️ {webhook_name}: webhook URL为空，跳过")
-                    push_fail += 1
-                    continue
-                
-                try:
-                    # 发送推送
-                    # 提取并显示webhook key用于验证
-                    webhook_key_display = "未知"
-                    if "key=" in webhook_url:
-                        key_part = webhook_url.split("key=")[1].split("&")[0]
-                        webhook_key_display = f"...{key_part[-12:]}"  # 显示最后12位
-                    
-                    print(f"      [推送] 正在推送到: {webhook_name} ({webhook_type})")
-                    print(f"      [调试] Webhook URL key: {webhook_key_display}")
-                    if webhook_type == "wework":
-                        send_wework_message(webhook_url, report_content)
-                    elif webhook_type == "feishu":
-                        send_feishu_message(webhook_url, report_content)
-                    elif webhook_type == "dingtalk":
-                        send_dingtalk_message(webhook_url, report_content)
-                    else:
-                        print(f"      ⚠️ 不支持的webhook类型: {webhook_type}")
-                        push_fail += 1
-                        continue
-                    
-                    print(f"      ✅ {webhook_name} 推送成功")
-                    push_success += 1
-                    
-                except Exception as e:
-                    print(f"      ❌ {webhook_name}: {str(e)[:100]}")
-                    push_fail += 1
-            
-            if push_success > 0:
-                print(f"\n   ✅ 订阅 [{sub_name}] 完成 ({push_success} 成功, {push_fail} 失败)")
-                success_count += 1
-            else:
-                print(f"\n   ❌ 订阅 [{sub_name}] 全部推送失败")
-                fail_count += 1
-                
-        except Exception as e:
-            print(f"\n   ❌ 订阅 [{sub_name}] 处理失败: {e}")
-            import traceback
-            traceback.print_exc()
-            fail_count += 1
-            continue
+                if planner.add(idx, build_subscription_ai_search_config(ai_config)):
+                    ai_requested.add(idx)
+        if len(planner):
+            ai_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ai-search")
+            ai_future = ai_executor.submit(planner.run)
+
+    # 各订阅并行处理（小红书、推送与 AI 搜索重叠进行）
+    global_settings = sub_manager.get_global_settings()
+    pipeline = SubscriptionPipeline(
+        sub_manager,
+        max_workers=global_settings.get("max_workers", 4),
+        deadline_seconds=global_settings.get("subscription_deadline_seconds", 600),
+    )
+    try:
+        success_count, fail_count = pipeline.run(active_subs, match_results, ai_future, ai_requested)
+    finally:
+        if ai_executor is not None:
+            ai_executor.shutdown(wait=False)
     
     # 总结
     print(f"\n{'='*80}")
@@ -6197,6 +7788,7 @@ def generate_subscription_report(
             "time_display": "",  # 订阅模式不显示时间
             "count": 1,  # 默认出现1次
             "is_new": False,  # 订阅模式不区分新旧
+            "cluster_sources": news.get("cluster_sources", []),
         }
         
         # 使用 format_title_for_platform 格式化标题（和之前格式一致）
@@ -6276,6 +7868,8 @@ def main():
         import traceback
         traceback.print_exc()
         return 1
+    finally:
+        HTTP_CLIENT.print_stats()
 
 
 if __name__ == "__main__":
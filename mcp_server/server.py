@@ -15,6 +15,7 @@ from .tools.analytics import AnalyticsTools
 from .tools.search_tools import SearchTools
 from .tools.config_mgmt import ConfigManagementTools
 from .tools.system import SystemManagementTools
+from .services.tool_executor import get_tool_executor
 from .utils.date_parser import DateParser
 from .utils.errors import MCPError
 
@@ -25,6 +26,9 @@ mcp = FastMCP('trendradar-news')
 # 全局工具实例（在第一次请求时初始化）
 _tools_instances = {}
 
+# 不合并相同参数并发调用的工具（有副作用或结果随调用时刻变化）
+_UNSHARED_TOOLS = {'get_system_status', 'trigger_crawl'}
+
 
 def _get_tools(project_root: Optional[str] = None):
     """获取或创建工具实例（单例模式）"""
@@ -37,6 +41,39 @@ def _get_tools(project_root: Optional[str] = None):
     return _tools_instances
 
 
+async def _run_tool(tool_name: str, func, **kwargs) -> Dict:
+    """
+    在工具执行线程池中调用同步的工具方法，避免阻塞事件循环；
+    查询类工具参数相同的并发调用合并为一次执行
+
+    Args:
+        tool_name: 工具名（决定并发数和超时）
+        func: 工具方法
+        **kwargs: 工具参数
+
+    Returns:
+        工具结果字典；排队过多、超时或异常时返回 success=False 的错误字典
+    """
+    try:
+        executor = get_tool_executor()
+        if tool_name in _UNSHARED_TOOLS:
+            return await executor.run(tool_name, func, **kwargs)
+        return await executor.run_shared(tool_name, func, **kwargs)
+    except MCPError as e:
+        return {
+            "success": False,
+            "error": e.to_dict()
+        }
+    except Exception as e:
+        return {
+            "success": False,
+            "error": {
+                "code": "INTERNAL_ERROR",
+                "message": str(e)
+            }
+        }
+
+
 # ==================== 日期解析工具（优先调用）====================
 
 @mcp.tool
@@ -114,7 +151,8 @@ async def resolve_date_range(
 async def get_latest_news(
     platforms: Optional[List[str]] = None,
     limit: int = 50,
-    include_url: bool = False
+    include_url: bool = False,
+    only_new: bool = False
 ) -> str:
     """
     获取最新一批爬取的新闻数据，快速了解当前热点
@@ -127,6 +165,7 @@ async def get_latest_news(
         limit: 返回条数限制，默认50，最大1000
                注意：实际返回数量可能少于请求值，取决于当前可用的新闻总数
         include_url: 是否包含URL链接，默认False（节省token）
+        only_new: 是否只返回最新一批爬取中首次出现的新闻（当天新增），默认False
 
     Returns:
         JSON格式的新闻列表
@@ -144,7 +183,11 @@ async def get_latest_news(
     **注意**：如果用户询问"为什么只显示了部分"，说明他们需要完整数据
     """
     tools = _get_tools()
-    result = tools['data'].get_latest_news(platforms=platforms, limit=limit, include_url=include_url)
+    result = await _run_tool(
+        'get_latest_news',
+        tools['data'].get_latest_news,
+        platforms=platforms, limit=limit, include_url=include_url, only_new=only_new
+    )
     return json.dumps(result, ensure_ascii=False, indent=2)
 
 
@@ -169,7 +212,12 @@ async def get_trending_topics(
         JSON格式的关注词频率统计列表
     """
     tools = _get_tools()
-    result = tools['data'].get_trending_topics(top_n=top_n, mode=mode)
+    result = await _run_tool(
+        'get_trending_topics',
+        tools['data'].get_trending_topics,
+        top_n=top_n,
+        mode=mode
+    )
     return json.dumps(result, ensure_ascii=False, indent=2)
 
 
@@ -212,7 +260,9 @@ async def get_news_by_date(
     **注意**：如果用户询问"为什么只显示了部分"，说明他们需要完整数据
     """
     tools = _get_tools()
-    result = tools['data'].get_news_by_date(
+    result = await _run_tool(
+        'get_news_by_date',
+        tools['data'].get_news_by_date,
         date_query=date_query,
         platforms=platforms,
         limit=limit,
@@ -275,7 +325,9 @@ async def analyze_topic_trend(
         2. analyze_topic_trend(topic="特斯拉", analysis_type="lifecycle", date_range=...)
     """
     tools = _get_tools()
-    result = tools['analytics'].analyze_topic_trend_unified(
+    result = await _run_tool(
+        'analyze_topic_trend',
+        tools['analytics'].analyze_topic_trend_unified,
         topic=topic,
         analysis_type=analysis_type,
         date_range=date_range,
@@ -321,7 +373,9 @@ async def analyze_data_insights(
         - analyze_data_insights(insight_type="keyword_cooccur", min_frequency=5, top_n=15)
     """
     tools = _get_tools()
-    result = tools['analytics'].analyze_data_insights_unified(
+    result = await _run_tool(
+        'analyze_data_insights',
+        tools['analytics'].analyze_data_insights_unified,
         insight_type=insight_type,
         topic=topic,
         date_range=date_range,
@@ -384,7 +438,9 @@ async def analyze_sentiment(
     - 仅在用户明确要求"总结"或"挑重点"时才进行筛选
     """
     tools = _get_tools()
-    result = tools['analytics'].analyze_sentiment(
+    result = await _run_tool(
+        'analyze_sentiment',
+        tools['analytics'].analyze_sentiment,
         topic=topic,
         platforms=platforms,
         date_range=date_range,
@@ -422,7 +478,9 @@ async def find_similar_news(
     - 仅在用户明确要求"总结"或"挑重点"时才进行筛选
     """
     tools = _get_tools()
-    result = tools['analytics'].find_similar_news(
+    result = await _run_tool(
+        'find_similar_news',
+        tools['analytics'].find_similar_news,
         reference_title=reference_title,
         threshold=threshold,
         limit=limit,
@@ -450,7 +508,9 @@ async def generate_summary_report(
         JSON格式的摘要报告，包含Markdown格式内容
     """
     tools = _get_tools()
-    result = tools['analytics'].generate_summary_report(
+    result = await _run_tool(
+        'generate_summary_report',
+        tools['analytics'].generate_summary_report,
         report_type=report_type,
         date_range=date_range
     )
@@ -525,7 +585,9 @@ async def search_news(
     - 仅在用户明确要求"总结"或"挑重点"时才进行筛选
     """
     tools = _get_tools()
-    result = tools['search'].search_news_unified(
+    result = await _run_tool(
+        'search_news',
+        tools['search'].search_news_unified,
         query=query,
         search_mode=search_mode,
         date_range=date_range,
@@ -572,7 +634,9 @@ async def search_related_news_history(
     - 仅在用户明确要求"总结"或"挑重点"时才进行筛选
     """
     tools = _get_tools()
-    result = tools['search'].search_related_news_history(
+    result = await _run_tool(
+        'search_related_news_history',
+        tools['search'].search_related_news_history,
         reference_text=reference_text,
         time_preset=time_preset,
         threshold=threshold,
@@ -603,7 +667,11 @@ async def get_current_config(
         JSON格式的配置信息
     """
     tools = _get_tools()
-    result = tools['config'].get_current_config(section=section)
+    result = await _run_tool(
+        'get_current_config',
+        tools['config'].get_current_config,
+        section=section
+    )
     return json.dumps(result, ensure_ascii=False, indent=2)
 
 
@@ -612,13 +680,14 @@ async def get_system_status() -> str:
     """
     获取系统运行状态和健康检查信息
 
-    返回系统版本、数据统计、缓存状态等信息
+    返回系统版本、数据统计、缓存状态、工具执行队列等信息
 
     Returns:
         JSON格式的系统状态信息
     """
     tools = _get_tools()
-    result = tools['system'].get_system_status()
+    result = await _run_tool('get_system_status', tools['system'].get_system_status)
+    result["tool_executor"] = get_tool_executor().get_stats()
     return json.dumps(result, ensure_ascii=False, indent=2)
 
 
@@ -653,7 +722,13 @@ async def trigger_crawl(
         - 使用默认平台: trigger_crawl()  # 爬取config.yaml中配置的所有平台
     """
     tools = _get_tools()
-    result = tools['system'].trigger_crawl(platforms=platforms, save_to_local=save_to_local, include_url=include_url)
+    result = await _run_tool(
+        'trigger_crawl',
+        tools['system'].trigger_crawl,
+        platforms=platforms,
+        save_to_local=save_to_local,
+        include_url=include_url
+    )
     return json.dumps(result, ensure_ascii=False, indent=2)
 
 
@@ -663,7 +738,9 @@ def run_server(
     project_root: Optional[str] = None,
     transport: str = 'stdio',
     host: str = '0.0.0.0',
-    port: int = 3333
+    port: int = 3333,
+    max_workers: int = 8,
+    tool_timeout: float = 120
 ):
     """
     启动 MCP 服务器
@@ -673,9 +750,12 @@ def run_server(
         transport: 传输模式，'stdio' 或 'http'
         host: HTTP模式的监听地址，默认 0.0.0.0
         port: HTTP模式的监听端口，默认 3333
+        max_workers: 工具执行线程数，默认 8
+        tool_timeout: 工具默认超时（秒），默认 120
     """
-    # 初始化工具实例
+    # 初始化工具实例和执行线程池
     _get_tools(project_root)
+    get_tool_executor(max_workers=max_workers, default_timeout=tool_timeout)
 
     # 打印启动信息
     print()
@@ -690,6 +770,7 @@ def run_server(
     elif transport == 'http':
         print(f"  协议: MCP over HTTP (生产环境)")
         print(f"  服务器监听: {host}:{port}")
+    print(f"  工具执行: {max_workers} 个线程，默认超时 {tool_timeout:g} 秒")
 
     if project_root:
         print(f"  项目目录: {project_root}")
@@ -770,6 +851,18 @@ if __name__ == '__main__':
         '--project-root',
         help='项目根目录路径'
     )
+    parser.add_argument(
+        '--max-workers',
+        type=int,
+        default=8,
+        help='工具执行线程数，默认 8'
+    )
+    parser.add_argument(
+        '--tool-timeout',
+        type=float,
+        default=120,
+        help='工具默认超时（秒），默认 120'
+    )
 
     args = parser.parse_args()
 
@@ -777,5 +870,7 @@ if __name__ == '__main__':
         project_root=args.project_root,
         transport=args.transport,
         host=args.host,
-        port=args.port
+        port=args.port,
+        max_workers=args.max_workers,
+        tool_timeout=args.tool_timeout
     )
@@ -1,56 +1,308 @@
 """
 缓存服务
 
-实现TTL缓存机制，提升数据访问性能。
+实现按条目数与内存占用限额的 LRU 缓存，支持 TTL 过期和数据签名失效，提升数据访问性能。
+同一键的并发计算合并为一次（single-flight），按时间过期的条目可在刷新期间继续提供旧值
+（stale-while-revalidate）。
 """
 
+import sys
+import threading
 import time
-from typing import Any, Optional
+from collections import OrderedDict
+from itertools import islice
+from typing import Any, Callable, Dict, Hashable, Optional
 from threading import Lock
 
 
-class CacheService:
-    """缓存服务类"""
+# 默认容量：最多 512 个条目、约 256MB
+DEFAULT_MAX_ENTRIES = 512
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def estimate_size(value: Any, sample: int = 32) -> int:
+    """
+    估算对象占用的内存字节数
+
+    递归统计容器内容；元素较多的容器只统计前 sample 个元素再按数量折算，
+    使估算开销与数据规模基本无关。
+
+    Args:
+        value: 任意对象
+        sample: 每个容器最多统计的元素数
+
+    Returns:
+        估算的字节数
+    """
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        items = list(islice(value.items(), sample))
+        if items:
+            measured = sum(
+                estimate_size(key, sample) + estimate_size(item, sample)
+                for key, item in items
+            )
+            size += measured * len(value) // len(items)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        items = list(islice(value, sample))
+        if items:
+            measured = sum(estimate_size(item, sample) for item in items)
+            size += measured * len(value) // len(items)
+    return size
+
+
+class _CacheEntry:
+    """缓存条目"""
+
+    __slots__ = ("value", "timestamp", "signature", "size")
+
+    def __init__(self, value: Any, signature: Optional[Hashable], size: int):
+        self.value = value
+        self.timestamp = time.time()
+        self.signature = signature
+        self.size = size
+
+
+class _Flight:
+    """一次进行中的计算，供同一键的并发请求等待"""
+
+    __slots__ = ("done", "value", "error")
 
     def __init__(self):
-        """初始化缓存服务"""
-        self._cache = {}
-        self._timestamps = {}
+        self.done = threading.Event()
+        self.value = None
+        self.error: Optional[BaseException] = None
+
+
+class CacheService:
+    """缓存服务类
+
+    条目按最近使用顺序保存，超出条目数或字节数限额时淘汰最久未使用的条目。
+    写入时可附带数据签名（如 txt 文件列表及 mtime），读取时签名不一致即视为失效，
+    这样历史数据可以长期缓存，而当天数据在新文件落盘后立即刷新。
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES
+    ):
+        """
+        初始化缓存服务
+
+        Args:
+            max_entries: 最大条目数
+            max_bytes: 最大内存占用（字节，按 estimate_size 估算）
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._cache: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._total_bytes = 0
         self._lock = Lock()
+        self._flights: Dict[str, _Flight] = {}
 
-    def get(self, key: str, ttl: int = 900) -> Optional[Any]:
+        # 统计计数
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._invalidations = 0
+        self._coalesced = 0
+        self._stale_hits = 0
+        self._refreshes = 0
+
+    def get(
+        self,
+        key: str,
+        ttl: Optional[int] = 900,
+        signature: Optional[Hashable] = None
+    ) -> Optional[Any]:
         """
         获取缓存数据
 
         Args:
             key: 缓存键
-            ttl: 存活时间（秒），默认15分钟
+            ttl: 存活时间（秒），默认15分钟；None 表示不按时间过期
+            signature: 当前数据签名，与写入时的签名不一致则视为失效
 
         Returns:
-            缓存的值，如果不存在或已过期则返回None
+            缓存的值，如果不存在、已过期或已失效则返回None
         """
         with self._lock:
-            if key in self._cache:
-                # 检查是否过期
-                if time.time() - self._timestamps[key] < ttl:
-                    return self._cache[key]
-                else:
-                    # 已过期，删除缓存
-                    del self._cache[key]
-                    del self._timestamps[key]
-        return None
+            entry = self._cache.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
 
-    def set(self, key: str, value: Any) -> None:
+            if ttl is not None and time.time() - entry.timestamp >= ttl:
+                # 已过期，删除缓存
+                self._remove(key)
+                self._expirations += 1
+                self._misses += 1
+                return None
+
+            if signature is not None and entry.signature != signature:
+                # 底层数据已变化
+                self._remove(key)
+                self._invalidations += 1
+                self._misses += 1
+                return None
+
+            self._cache.move_to_end(key)
+            self._hits += 1
+            return entry.value
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        signature: Optional[Hashable] = None,
+        size: Optional[int] = None
+    ) -> None:
         """
         设置缓存数据
 
         Args:
             key: 缓存键
             value: 缓存值
+            signature: 数据签名，供 get 时判断是否失效
+            size: 条目字节数，None 时自动估算
         """
+        if size is None:
+            size = estimate_size(value)
+
         with self._lock:
-            self._cache[key] = value
-            self._timestamps[key] = time.time()
+            if key in self._cache:
+                self._remove(key)
+
+            if size > self.max_bytes:
+                # 单个条目超过总限额，不缓存
+                return
+
+            self._cache[key] = _CacheEntry(value, signature, size)
+            self._total_bytes += size
+
+            while (
+                len(self._cache) > self.max_entries
+                or self._total_bytes > self.max_bytes
+            ):
+                oldest_key = next(iter(self._cache))
+                self._remove(oldest_key)
+                self._evictions += 1
+
+    def get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Any],
+        ttl: Optional[int] = 900,
+        signature: Optional[Hashable] = None,
+        stale_ttl: int = 0,
+        size: Optional[int] = None
+    ) -> Any:
+        """
+        获取缓存数据，未命中时调用 loader 计算并写入缓存
+
+        同一键同时只有一个线程执行 loader，其余线程等待并共享其结果（或异常）。
+        条目超过 ttl 但未超过 ttl + stale_ttl 且签名一致时，直接返回旧值并在后台刷新；
+        签名不一致说明底层数据已变化，总是同步重新计算。
+
+        Args:
+            key: 缓存键
+            loader: 无参数的计算函数
+            ttl: 存活时间（秒）；None 表示不按时间过期
+            signature: 当前数据签名
+            stale_ttl: 过期后仍可返回旧值的时长（秒）
+            size: 条目字节数，None 时自动估算
+
+        Returns:
+            缓存的值或 loader 的返回值
+
+        Raises:
+            loader 抛出的异常
+        """
+        stale_value = None
+        refresh = False
+        leader = False
+
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None and signature is not None and entry.signature != signature:
+                # 底层数据已变化
+                self._remove(key)
+                self._invalidations += 1
+                entry = None
+
+            if entry is not None:
+                age = time.time() - entry.timestamp
+                if ttl is None or age < ttl:
+                    self._cache.move_to_end(key)
+                    self._hits += 1
+                    return entry.value
+                if age < ttl + stale_ttl:
+                    self._cache.move_to_end(key)
+                    self._hits += 1
+                    self._stale_hits += 1
+                    stale_value = entry.value
+                    if key not in self._flights:
+                        flight = self._flights[key] = _Flight()
+                        refresh = True
+                        self._refreshes += 1
+                else:
+                    self._remove(key)
+                    self._expirations += 1
+                    entry = None
+
+            if entry is None:
+                self._misses += 1
+                flight = self._flights.get(key)
+                if flight is None:
+                    flight = self._flights[key] = _Flight()
+                    leader = True
+                else:
+                    self._coalesced += 1
+
+        if entry is not None:
+            if refresh:
+                threading.Thread(
+                    target=self._run_flight,
+                    args=(key, flight, loader, signature, size, True),
+                    name=f"cache-refresh:{key}",
+                    daemon=True
+                ).start()
+            return stale_value
+
+        if leader:
+            self._run_flight(key, flight, loader, signature, size, False)
+        else:
+            flight.done.wait()
+
+        if flight.error is not None:
+            raise flight.error
+        return flight.value
+
+    def _run_flight(
+        self,
+        key: str,
+        flight: _Flight,
+        loader: Callable[[], Any],
+        signature: Optional[Hashable],
+        size: Optional[int],
+        background: bool
+    ) -> None:
+        """执行计算、写入缓存并唤醒等待的线程"""
+        try:
+            flight.value = loader()
+            self.set(key, flight.value, signature=signature, size=size)
+        except BaseException as e:
+            flight.error = e
+            if background:
+                # 刷新失败时保留旧值，过期后由下一次请求同步重新计算
+                print(f"Warning: 后台刷新缓存 {key} 失败: {e}")
+        finally:
+            with self._lock:
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+            flight.done.set()
 
     def delete(self, key: str) -> bool:
         """
@@ -64,8 +316,7 @@ class CacheService:
         """
         with self._lock:
             if key in self._cache:
-                del self._cache[key]
-                del self._timestamps[key]
+                self._remove(key)
                 return True
         return False
 
@@ -73,7 +324,7 @@ class CacheService:
         """清空所有缓存"""
         with self._lock:
             self._cache.clear()
-            self._timestamps.clear()
+            self._total_bytes = 0
 
     def cleanup_expired(self, ttl: int = 900) -> int:
         """
@@ -88,13 +339,13 @@ class CacheService:
         with self._lock:
             current_time = time.time()
             expired_keys = [
-                key for key, timestamp in self._timestamps.items()
-                if current_time - timestamp >= ttl
+                key for key, entry in self._cache.items()
+                if current_time - entry.timestamp >= ttl
             ]
 
             for key in expired_keys:
-                del self._cache[key]
-                del self._timestamps[key]
+                self._remove(key)
+            self._expirations += len(expired_keys)
 
             return len(expired_keys)
 
@@ -106,21 +357,40 @@ class CacheService:
             统计信息字典
         """
         with self._lock:
+            timestamps = [entry.timestamp for entry in self._cache.values()]
+            lookups = self._hits + self._misses
             return {
                 "total_entries": len(self._cache),
+                "max_entries": self.max_entries,
+                "total_bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "invalidations": self._invalidations,
+                "coalesced": self._coalesced,
+                "stale_hits": self._stale_hits,
+                "refreshes": self._refreshes,
+                "loading": len(self._flights),
                 "oldest_entry_age": (
-                    time.time() - min(self._timestamps.values())
-                    if self._timestamps else 0
+                    time.time() - min(timestamps) if timestamps else 0
                 ),
                 "newest_entry_age": (
-                    time.time() - max(self._timestamps.values())
-                    if self._timestamps else 0
+                    time.time() - max(timestamps) if timestamps else 0
                 )
             }
 
+    def _remove(self, key: str) -> None:
+        """删除条目并更新占用（调用方需持有锁）"""
+        entry = self._cache.pop(key)
+        self._total_bytes -= entry.size
+
 
-# 全局缓存实例
+# 全局缓存实例（工具在线程池中并发执行，创建时加锁，保证全进程只有一个实例）
 _global_cache = None
+_global_cache_lock = Lock()
 
 
 def get_cache() -> CacheService:
@@ -131,6 +401,7 @@ def get_cache() -> CacheService:
         全局缓存服务实例
     """
     global _global_cache
-    if _global_cache is None:
-        _global_cache = CacheService()
-    return _global_cache
+    with _global_cache_lock:
+        if _global_cache is None:
+            _global_cache = CacheService()
+        return _global_cache
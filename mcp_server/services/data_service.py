@@ -6,11 +6,15 @@
 
 import re
 from collections import Counter
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 
 from .cache_service import get_cache
 from .parser_service import ParserService
+from .keyword_rollup import get_keyword_rollup
+from .range_loader import iter_date_range
+from .search_index import get_search_index
+from .similarity import get_similarity_service
 from ..utils.errors import DataNotFoundError
 
 
@@ -26,12 +30,16 @@ class DataService:
         """
         self.parser = ParserService(project_root)
         self.cache = get_cache()
+        self.search_index = get_search_index(self.parser)
+        self.keyword_rollup = get_keyword_rollup(self.parser)
+        self.similarity = get_similarity_service(self.parser)
 
     def get_latest_news(
         self,
         platforms: Optional[List[str]] = None,
         limit: int = 50,
-        include_url: bool = False
+        include_url: bool = False,
+        only_new: bool = False
     ) -> List[Dict]:
         """
         获取最新一批爬取的新闻数据
@@ -40,6 +48,7 @@ class DataService:
             platforms: 平台ID列表,None表示所有平台
             limit: 返回条数限制
             include_url: 是否包含URL链接,默认False(节省token)
+            only_new: 是否只返回最新一批中首次出现的新闻,默认False
 
         Returns:
             新闻列表
@@ -48,23 +57,43 @@ class DataService:
             DataNotFoundError: 数据不存在
         """
         # 尝试从缓存获取
-        cache_key = f"latest_news:{','.join(platforms or [])}:{limit}:{include_url}"
-        cached = self.cache.get(cache_key, ttl=900)  # 15分钟缓存
-        if cached:
-            return cached
-
-        # 读取今天的数据
-        all_titles, id_to_name, timestamps = self.parser.read_all_titles_for_date(
-            date=None,
-            platform_ids=platforms
+        cache_key = f"latest_news:{','.join(platforms or [])}:{limit}:{include_url}:{only_new}"
+        signature = self.parser.get_data_signature()  # 有新一批数据时失效
+        # 同一时刻的相同请求只计算一次
+        return self.cache.get_or_load(
+            cache_key,
+            lambda: self._load_latest_news(platforms, limit, include_url, only_new),
+            ttl=None,
+            signature=signature
         )
 
-        # 获取最新的文件时间
-        if timestamps:
-            latest_timestamp = max(timestamps.values())
+    def _load_latest_news(
+        self,
+        platforms: Optional[List[str]],
+        limit: int,
+        include_url: bool,
+        only_new: bool
+    ) -> List[Dict]:
+        """读取最新一批新闻并整理为列表（get_latest_news 缓存未命中时调用）"""
+        if only_new:
+            # 新增标题由爬虫维护的已出现标题索引提供，只需读取最新一批
+            all_titles, id_to_name, latest_timestamp = self.parser.read_latest_new_titles(
+                platform_ids=platforms
+            )
             fetch_time = datetime.fromtimestamp(latest_timestamp)
         else:
-            fetch_time = datetime.now()
+            # 读取今天的数据
+            all_titles, id_to_name, timestamps = self.parser.read_all_titles_for_date(
+                date=None,
+                platform_ids=platforms
+            )
+
+            # 获取最新的文件时间
+            if timestamps:
+                latest_timestamp = max(timestamps.values())
+                fetch_time = datetime.fromtimestamp(latest_timestamp)
+            else:
+                fetch_time = datetime.now()
 
         # 转换为新闻列表
         news_list = []
@@ -94,12 +123,7 @@ class DataService:
         news_list.sort(key=lambda x: x["rank"])
 
         # 限制返回数量
-        result = news_list[:limit]
-
-        # 缓存结果
-        self.cache.set(cache_key, result)
-
-        return result
+        return news_list[:limit]
 
     def get_news_by_date(
         self,
@@ -134,9 +158,24 @@ class DataService:
         # 尝试从缓存获取
         date_str = target_date.strftime("%Y-%m-%d")
         cache_key = f"news_by_date:{date_str}:{','.join(platforms or [])}:{limit}:{include_url}"
-        cached = self.cache.get(cache_key, ttl=1800)  # 30分钟缓存
-        if cached:
-            return cached
+        signature = self.parser.get_data_signature(target_date)  # 当天数据更新时失效
+        # 历史数据签名不变，长期有效
+        return self.cache.get_or_load(
+            cache_key,
+            lambda: self._load_news_by_date(target_date, platforms, limit, include_url),
+            ttl=None,
+            signature=signature
+        )
+
+    def _load_news_by_date(
+        self,
+        target_date: datetime,
+        platforms: Optional[List[str]],
+        limit: int,
+        include_url: bool
+    ) -> List[Dict]:
+        """读取指定日期的新闻并整理为列表（get_news_by_date 缓存未命中时调用）"""
+        date_str = target_date.strftime("%Y-%m-%d")
 
         # 读取指定日期的数据
         all_titles, id_to_name, timestamps = self.parser.read_all_titles_for_date(
@@ -174,12 +213,7 @@ class DataService:
         news_list.sort(key=lambda x: x["rank"])
 
         # 限制返回数量
-        result = news_list[:limit]
-
-        # 缓存结果(历史数据缓存更久)
-        self.cache.set(cache_key, result)
-
-        return result
+        return news_list[:limit]
 
     def search_news_by_keyword(
         self,
@@ -214,44 +248,39 @@ class DataService:
         results = []
         platform_distribution = Counter()
 
-        # 遍历日期范围
-        current_date = start_date
-        while current_date <= end_date:
-            try:
-                all_titles, id_to_name, _ = self.parser.read_all_titles_for_date(
-                    date=current_date,
-                    platform_ids=platforms
-                )
-
-                # 搜索包含关键词的标题
-                for platform_id, titles in all_titles.items():
-                    platform_name = id_to_name.get(platform_id, platform_id)
-
-                    for title, info in titles.items():
-                        if keyword.lower() in title.lower():
-                            # 计算平均排名
-                            avg_rank = sum(info["ranks"]) / len(info["ranks"]) if info["ranks"] else 0
-
-                            results.append({
-                                "title": title,
-                                "platform": platform_id,
-                                "platform_name": platform_name,
-                                "ranks": info["ranks"],
-                                "count": len(info["ranks"]),
-                                "avg_rank": round(avg_rank, 2),
-                                "url": info.get("url", ""),
-                                "mobileUrl": info.get("mobileUrl", ""),
-                                "date": current_date.strftime("%Y-%m-%d")
-                            })
-
-                            platform_distribution[platform_id] += 1
-
-            except DataNotFoundError:
+        # 并发加载日期范围内各天，通过标题倒排索引查找包含关键词的标题
+        def search_day(current_date):
+            return self.search_index.search(
+                keyword,
+                date=current_date,
+                platform_ids=platforms
+            )
+
+        for current_date, day_result in iter_date_range(start_date, end_date, search_day):
+            if day_result is None:
                 # 该日期没有数据,继续下一天
-                pass
+                continue
 
-            # 下一天
-            current_date += timedelta(days=1)
+            matches, id_to_name = day_result
+            for platform_id, title, info in matches:
+                platform_name = id_to_name.get(platform_id, platform_id)
+
+                # 计算平均排名
+                avg_rank = sum(info["ranks"]) / len(info["ranks"]) if info["ranks"] else 0
+
+                results.append({
+                    "title": title,
+                    "platform": platform_id,
+                    "platform_name": platform_name,
+                    "ranks": info["ranks"],
+                    "count": len(info["ranks"]),
+                    "avg_rank": round(avg_rank, 2),
+                    "url": info.get("url", ""),
+                    "mobileUrl": info.get("mobileUrl", ""),
+                    "date": current_date.strftime("%Y-%m-%d")
+                })
+
+                platform_distribution[platform_id] += 1
 
         if not results:
             raise DataNotFoundError(
@@ -305,10 +334,18 @@ class DataService:
         """
         # 尝试从缓存获取
         cache_key = f"trending_topics:{top_n}:{mode}"
-        cached = self.cache.get(cache_key, ttl=1800)  # 30分钟缓存
-        if cached:
-            return cached
+        signature = self.parser.get_data_signature()  # 有新一批数据时失效
+        # 30分钟缓存（关注词可能被修改），过期后的30分钟内先返回旧结果并在后台刷新
+        return self.cache.get_or_load(
+            cache_key,
+            lambda: self._load_trending_topics(top_n, mode),
+            ttl=1800,
+            signature=signature,
+            stale_ttl=1800
+        )
 
+    def _load_trending_topics(self, top_n: int, mode: str) -> Dict:
+        """统计关注词出现频率（get_trending_topics 缓存未命中时调用）"""
         # 读取今天的数据
         all_titles, id_to_name, timestamps = self.parser.read_all_titles_for_date()
 
@@ -395,9 +432,6 @@ class DataService:
             "description": self._get_mode_description(mode)
         }
 
-        # 缓存结果
-        self.cache.set(cache_key, result)
-
         return result
 
     def _get_mode_description(self, mode: str) -> str:
@@ -423,10 +457,16 @@ class DataService:
         """
         # 尝试从缓存获取
         cache_key = f"config:{section}"
-        cached = self.cache.get(cache_key, ttl=3600)  # 1小时缓存
-        if cached:
-            return cached
+        # 1小时缓存，过期后的1小时内先返回旧配置并在后台刷新
+        return self.cache.get_or_load(
+            cache_key,
+            lambda: self._load_current_config(section),
+            ttl=3600,
+            stale_ttl=3600
+        )
 
+    def _load_current_config(self, section: str) -> Dict:
+        """解析配置文件并按配置节组装（get_current_config 缓存未命中时调用）"""
         # 解析配置文件
         config_data = self.parser.parse_yaml_config()
         word_groups = self.parser.parse_frequency_words()
@@ -490,9 +530,6 @@ class DataService:
         else:
             result = {}
 
-        # 缓存结果
-        self.cache.set(cache_key, result)
-
         return result
 
     def get_available_date_range(self) -> Tuple[Optional[datetime], Optional[datetime]]:
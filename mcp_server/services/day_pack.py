@@ -0,0 +1,273 @@
+"""
+单日合并数据共享服务
+
+读取爬虫（main.py 中的 DayPack）写入的 output/<日期>/day_pack.bin。文件以只读 mmap 映射，
+标题、URL 和排名在访问时才从映射中解码，多个 MCP 工作进程共享操作系统页缓存中的同一份数据，
+不必各自解析 txt 文件、各自在内存中保留整天的合并结果。
+
+Windows 上已映射的文件不能被替换（爬虫的 os.replace 会失败），因此在 Windows 上
+改为一次性读入内存，不保持文件打开。
+"""
+
+import json
+import mmap
+import struct
+import sys
+from array import array
+from collections import OrderedDict
+from collections.abc import ItemsView, Mapping, ValuesView
+from pathlib import Path
+from threading import Lock
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .snapshot_store import sources_match
+
+
+DAY_PACK_FILENAME = "day_pack.bin"
+
+# 保持映射的文件数（映射本身只占虚拟地址空间，实际内存由页缓存共享）
+MAX_OPEN_PACKS = 64
+
+# 是否以 mmap 打开文件（Windows 上映射期间文件无法被替换）
+USE_MMAP = sys.platform != "win32"
+
+
+class DayPack:
+    """已映射的单日合并数据
+
+    格式需与 main.py 中的 DayPack 保持一致。
+    """
+
+    MAGIC = b"TRPACK01"
+    VERSION = 1
+
+    def __init__(self, path: Path, buffer, meta: Dict, arrays_offset: int):
+        self.path = path
+        self.sources: Dict = meta["sources"]
+        self.id_to_name: Dict[str, str] = meta["id_to_name"]
+        self.platforms: List[str] = meta["platforms"]
+
+        view = memoryview(buffer)
+        offset = arrays_offset
+
+        def take(count: int):
+            nonlocal offset
+            section = view[offset:offset + count * 4]
+            offset += count * 4
+            if sys.byteorder == "little":
+                return section.cast("I")
+            # 大端机器上复制一份并转换字节序
+            values = array("I", section.tobytes())
+            values.byteswap()
+            return values
+
+        self._platform_ends = take(len(self.platforms))
+        self._records = take(meta["title_count"] * 4)
+        self._ranks = take(meta["rank_count"])
+        self._string_ends = take(meta["string_count"])
+        self._blob = view[offset:]
+        # 平台视图按需创建后保留，按标题查找的索引只建一次
+        self._platform_titles: Dict[int, "PackedTitles"] = {}
+
+    @classmethod
+    def open(cls, path: Path) -> Optional["DayPack"]:
+        """映射文件（Windows 上读入内存）；文件不存在或格式不符时返回 None"""
+        try:
+            with open(path, "rb") as f:
+                if USE_MMAP:
+                    buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                else:
+                    buffer = f.read()
+        except (OSError, ValueError):
+            return None
+
+        head_size = len(cls.MAGIC) + 4
+        if len(buffer) < head_size or buffer[:len(cls.MAGIC)] != cls.MAGIC:
+            return None
+        (meta_length,) = struct.unpack_from("<I", buffer, len(cls.MAGIC))
+        try:
+            meta = json.loads(buffer[head_size:head_size + meta_length].decode("utf-8"))
+        except ValueError:
+            return None
+        if meta.get("version") != cls.VERSION:
+            return None
+
+        expected = (
+            head_size + meta_length
+            + 4 * (len(meta["platforms"]) + meta["title_count"] * 4
+                   + meta["rank_count"] + meta["string_count"])
+        )
+        if len(buffer) < expected:
+            return None
+        return cls(path, buffer, meta, head_size + meta_length)
+
+    def string(self, string_id: int) -> str:
+        """按编号解码字符串"""
+        start = self._string_ends[string_id - 1] if string_id else 0
+        return str(self._blob[start:self._string_ends[string_id]], "utf-8")
+
+    def title(self, record: int) -> str:
+        """标题记录的标题"""
+        return self.string(self._records[record * 4])
+
+    def info(self, record: int) -> Dict:
+        """标题记录的 {ranks, url, mobileUrl}（每次返回新的字典）"""
+        base = record * 4
+        rank_start = self._records[base - 1] if record else 0
+        return {
+            "ranks": self._ranks[rank_start:self._records[base + 3]].tolist(),
+            "url": self.string(self._records[base + 1]),
+            "mobileUrl": self.string(self._records[base + 2]),
+        }
+
+    def platform_range(self, platform_index: int) -> Tuple[int, int]:
+        """平台的标题记录下标范围 [start, end)"""
+        start = self._platform_ends[platform_index - 1] if platform_index else 0
+        return start, self._platform_ends[platform_index]
+
+    def platform_titles(self, platform_index: int) -> "PackedTitles":
+        """平台的标题视图（同一平台总是返回同一个视图）"""
+        titles = self._platform_titles.get(platform_index)
+        if titles is None:
+            titles = PackedTitles(self, *self.platform_range(platform_index))
+            # 并发访问时可能重复创建，setdefault 保证之后都使用同一个视图
+            titles = self._platform_titles.setdefault(platform_index, titles)
+        return titles
+
+    def all_titles(self, platform_ids: Optional[List[str]] = None) -> "PackedDayTitles":
+        """与按天合并结果同结构的只读视图 {platform_id: {title: info}}"""
+        return PackedDayTitles(self, platform_ids)
+
+
+class PackedTitles(Mapping):
+    """单个平台的标题视图 {title: {ranks, url, mobileUrl}}"""
+
+    __slots__ = ("_pack", "_start", "_end", "_lookup")
+
+    def __init__(self, pack: DayPack, start: int, end: int):
+        self._pack = pack
+        self._start = start
+        self._end = end
+        self._lookup: Optional[Dict[str, int]] = None
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    def __iter__(self) -> Iterator[str]:
+        title = self._pack.title
+        for record in range(self._start, self._end):
+            yield title(record)
+
+    def __getitem__(self, title: str) -> Dict:
+        if self._lookup is None:
+            # 按标题查找时才建立索引（遍历不需要）
+            self._lookup = {
+                self._pack.title(record): record
+                for record in range(self._start, self._end)
+            }
+        return self._pack.info(self._lookup[title])
+
+    def items(self) -> ItemsView:
+        return _PackedItems(self)
+
+    def values(self) -> ValuesView:
+        return _PackedValues(self)
+
+    def iter_items(self) -> Iterator[Tuple[str, Dict]]:
+        """按顺序产出 (title, info)，无需查找"""
+        pack = self._pack
+        for record in range(self._start, self._end):
+            yield pack.title(record), pack.info(record)
+
+
+class _PackedItems(ItemsView):
+    def __iter__(self):
+        return self._mapping.iter_items()
+
+
+class _PackedValues(ValuesView):
+    def __iter__(self):
+        pack = self._mapping._pack
+        for record in range(self._mapping._start, self._mapping._end):
+            yield pack.info(record)
+
+
+class PackedDayTitles(Mapping):
+    """单日全部平台的标题视图 {platform_id: PackedTitles}，平台顺序同按天合并结果"""
+
+    def __init__(self, pack: DayPack, platform_ids: Optional[List[str]] = None):
+        self._pack = pack
+        self._platforms: "OrderedDict[str, int]" = OrderedDict(
+            (platform_id, index)
+            for index, platform_id in enumerate(pack.platforms)
+            if not platform_ids or platform_id in platform_ids
+        )
+
+    def __len__(self) -> int:
+        return len(self._platforms)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._platforms)
+
+    def __getitem__(self, platform_id: str) -> PackedTitles:
+        return self._pack.platform_titles(self._platforms[platform_id])
+
+
+class DayPackStore:
+    """按文件状态缓存已映射的合并数据文件"""
+
+    def __init__(self):
+        self._lock = Lock()
+        self._packs: "OrderedDict[str, Tuple[tuple, DayPack]]" = OrderedDict()
+
+    def get(
+        self, day_dir: Path, txt_stats: Dict[str, Tuple[int, int]]
+    ) -> Optional[DayPack]:
+        """
+        获取与当前 txt 文件一致的合并数据
+
+        Args:
+            day_dir: output/<日期> 目录
+            txt_stats: 当前 txt 文件的 {time_info: (大小, mtime_ns)}
+
+        Returns:
+            DayPack；文件不存在、格式不符或落后于 txt 文件时返回 None
+        """
+        path = day_dir / DAY_PACK_FILENAME
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        file_state = (st.st_ino, st.st_size, st.st_mtime_ns)
+        key = str(path)
+
+        with self._lock:
+            cached = self._packs.get(key)
+            if cached and cached[0] == file_state:
+                self._packs.move_to_end(key)
+                pack = cached[1]
+            else:
+                pack = None
+
+        if pack is None:
+            pack = DayPack.open(path)
+            if pack is None:
+                return None
+            with self._lock:
+                self._packs[key] = (file_state, pack)
+                self._packs.move_to_end(key)
+                while len(self._packs) > MAX_OPEN_PACKS:
+                    self._packs.popitem(last=False)
+
+        if not sources_match(pack.sources, day_dir / "txt", txt_stats):
+            return None
+        return pack
+
+
+# 全局实例（映射按文件路径区分，可在各解析服务间共享）
+_pack_store = DayPackStore()
+
+
+def get_day_pack_store() -> DayPackStore:
+    """获取全局合并数据文件缓存"""
+    return _pack_store
@@ -0,0 +1,257 @@
+"""
+关键词统计汇总服务
+
+读取爬虫（main.py 中的 KeywordRollup）每次爬取后写入的 output/<日期>/keyword_rollup.json，
+热度检测、话题预测、关键词共现和平台活跃度统计据此查表，不再对全部标题重新分词。
+统计文件缺失或与 txt 文件不一致时，退回按天读取数据并在内存中计算同样的统计表。
+"""
+
+import json
+import re
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+
+from .parser_service import ParserService
+from .search_index import sources_match, txt_file_stats
+
+
+KEYWORD_ROLLUP_FILENAME = "keyword_rollup.json"
+
+STOPWORDS = {
+    '的', '了', '在', '是', '我', '有', '和', '就', '不', '人', '都', '一', '一个',
+    '上', '也', '很', '到', '说', '要', '去', '你', '会', '着', '没有', '看', '好',
+    '自己', '这'
+}
+
+# 每个关键词/关键词对保留的样本标题数
+SAMPLE_SIZE = 3
+
+
+def extract_keywords(title: str, min_length: int = 2) -> List[str]:
+    """
+    从标题中提取关键词（简单实现）
+
+    分词规则和停用词需与 main.py 中的 KeywordRollup.extract_keywords 保持一致：
+    爬虫按单文件部署，MCP 服务单独打包、不依赖 main.py，两边无法共用代码。
+    test_keyword_rollup.py 比对两者的分词结果和统计表。
+
+    Args:
+        title: 标题文本
+        min_length: 最小关键词长度
+
+    Returns:
+        关键词列表
+    """
+    # 移除URL和特殊字符
+    title = re.sub(r'http[s]?://\S+', '', title)
+    title = re.sub(r'[^\w\s]', ' ', title)
+
+    # 简单分词（按空格和常见分隔符）
+    words = re.split(r'[\s，。！？、]+', title)
+
+    # 过滤停用词和短词
+    return [
+        word.strip() for word in words
+        if word.strip() and len(word.strip()) >= min_length and word.strip() not in STOPWORDS
+    ]
+
+
+class DayRollup:
+    """单日关键词统计表
+
+    - keyword_counts: {关键词: 出现次数}，顺序为首次出现顺序
+    - keyword_samples: {关键词: 前几条包含该词的标题}
+    - pairs: [(关键词1, 关键词2, 共现次数, 样本标题)]，关键词对按字典序排列
+    - platform_counts: {platform_id: 标题数}
+    - crawl_keyword_counts: {time_info: {关键词: 出现次数}}（仅统计文件提供）
+    """
+
+    def __init__(
+        self,
+        keyword_counts: Dict[str, int],
+        keyword_samples: Dict[str, List[str]],
+        pairs: List[Tuple[str, str, int, List[str]]],
+        platform_counts: Dict[str, int],
+        id_to_name: Dict[str, str],
+        crawl_files: List[str],
+        crawl_keyword_counts: Optional[Dict[str, Dict[str, int]]] = None
+    ):
+        self.keyword_counts = keyword_counts
+        self.keyword_samples = keyword_samples
+        self.pairs = pairs
+        self.platform_counts = platform_counts
+        self.id_to_name = id_to_name
+        self.crawl_files = crawl_files
+        self.crawl_keyword_counts = crawl_keyword_counts or {}
+
+    @classmethod
+    def from_file_data(cls, data: Dict) -> "DayRollup":
+        """由统计文件内容还原"""
+        titles = data["titles"]
+        keywords = [entry[0] for entry in data["keywords"]]
+        return cls(
+            keyword_counts={keyword: count for keyword, count, _ in data["keywords"]},
+            keyword_samples={
+                keyword: [titles[i] for i in samples]
+                for keyword, _, samples in data["keywords"]
+            },
+            pairs=[
+                (keywords[first], keywords[second], count, [titles[i] for i in samples])
+                for first, second, count, samples in data["pairs"]
+            ],
+            platform_counts=data["platforms"],
+            id_to_name=data["id_to_name"],
+            crawl_files=[f"{time_info}.txt" for time_info in sorted(data["sources"])],
+            crawl_keyword_counts={
+                time_info: {
+                    keywords[flat[i]]: flat[i + 1] for i in range(0, len(flat), 2)
+                }
+                for time_info, flat in data["crawls"].items()
+            }
+        )
+
+    @classmethod
+    def from_titles(cls, all_titles: Dict, id_to_name: Dict, timestamps: Dict) -> "DayRollup":
+        """由 read_all_titles_for_date 的结果计算（统计文件不可用时的回退路径）"""
+        keyword_counts = Counter()
+        keyword_samples: Dict[str, List[str]] = {}
+        pair_counts = Counter()
+        platform_counts = {}
+        title_keywords = []
+
+        for platform_id, titles in all_titles.items():
+            platform_counts[platform_id] = len(titles)
+            for title in titles.keys():
+                keywords = extract_keywords(title)
+                title_keywords.append((title, keywords))
+                keyword_counts.update(keywords)
+                for keyword in keywords:
+                    samples = keyword_samples.setdefault(keyword, [])
+                    if len(samples) < SAMPLE_SIZE:
+                        samples.append(title)
+                for i, first in enumerate(keywords):
+                    for second in keywords[i + 1:]:
+                        pair_counts[tuple(sorted([first, second]))] += 1
+
+        # 共现样本：含第一个词的标题（按其出现次数重复）中同时含第二个词的前几条
+        pair_samples: Dict[Tuple[str, str], List[str]] = {}
+        for title, keywords in title_keywords:
+            multiplicity = Counter(keywords)
+            for first, repeat in multiplicity.items():
+                for second in multiplicity:
+                    pair = (first, second)
+                    if first > second or pair not in pair_counts:
+                        continue
+                    samples = pair_samples.setdefault(pair, [])
+                    if len(samples) < SAMPLE_SIZE:
+                        samples.extend([title] * min(repeat, SAMPLE_SIZE - len(samples)))
+
+        return cls(
+            keyword_counts=dict(keyword_counts),
+            keyword_samples=keyword_samples,
+            pairs=[
+                (first, second, count, pair_samples[(first, second)])
+                for (first, second), count in pair_counts.items()
+            ],
+            platform_counts=platform_counts,
+            id_to_name=id_to_name,
+            crawl_files=sorted(timestamps)
+        )
+
+
+class KeywordRollupService:
+    """按天读取关键词统计表
+
+    按天缓存已加载的统计表，以 txt 文件列表及其大小、mtime 作为失效依据。
+    """
+
+    def __init__(self, parser: ParserService):
+        """
+        初始化统计服务
+
+        Args:
+            parser: 解析服务（提供项目根目录，并在统计文件不可用时读取数据）
+        """
+        self.parser = parser
+        self._lock = Lock()
+        self._rollups: Dict[str, Tuple[tuple, DayRollup]] = {}
+
+    def get_day_rollup(self, date: datetime = None) -> DayRollup:
+        """
+        获取单日统计表（内存缓存 → 统计文件 → 按天读取数据计算）
+
+        Args:
+            date: 日期对象，默认为今天
+
+        Raises:
+            DataNotFoundError: 该日期没有数据
+        """
+        date_folder = self.parser.get_date_folder_name(date)
+        day_dir = self.parser.project_root / "output" / date_folder
+        txt_stats = txt_file_stats(day_dir / "txt")
+        rollup_path = day_dir / KEYWORD_ROLLUP_FILENAME
+        signature = (
+            tuple(sorted(txt_stats.items())),
+            rollup_path.stat().st_mtime_ns if rollup_path.exists() else None,
+        )
+
+        with self._lock:
+            cached = self._rollups.get(date_folder)
+        if cached and cached[0] == signature:
+            return cached[1]
+
+        rollup = self._load_rollup_file(rollup_path, day_dir / "txt", txt_stats)
+        if rollup is None:
+            all_titles, id_to_name, timestamps = self.parser.read_all_titles_for_date(date)
+            rollup = DayRollup.from_titles(all_titles, id_to_name, timestamps)
+
+        with self._lock:
+            self._rollups[date_folder] = (signature, rollup)
+        return rollup
+
+    @staticmethod
+    def _load_rollup_file(
+        rollup_path: Path, txt_dir: Path, txt_stats: Dict[str, Tuple[int, int]]
+    ) -> Optional[DayRollup]:
+        """读取统计文件，与当前 txt 文件不一致时返回 None"""
+        if not rollup_path.exists():
+            return None
+        try:
+            with open(rollup_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"Warning: 读取关键词统计 {rollup_path} 失败: {e}")
+            return None
+
+        if data.get("version") != 1:
+            return None
+        if not sources_match(data.get("sources", {}), txt_dir, txt_stats):
+            return None
+        return DayRollup.from_file_data(data)
+
+
+# 全局统计服务实例（按项目根目录区分）
+_rollup_services: Dict[str, KeywordRollupService] = {}
+_rollup_services_lock = Lock()
+
+
+def get_keyword_rollup(parser: ParserService) -> KeywordRollupService:
+    """
+    获取与解析服务共享项目根目录的全局统计服务实例
+
+    Args:
+        parser: 解析服务
+
+    Returns:
+        统计服务实例
+    """
+    key = str(parser.project_root)
+    with _rollup_services_lock:
+        service = _rollup_services.get(key)
+        if service is None:
+            service = KeywordRollupService(parser)
+            _rollup_services[key] = service
+        return service
@@ -4,8 +4,11 @@
 提供txt格式新闻数据和YAML配置文件的解析功能。
 """
 
+import json
 import re
+from collections import OrderedDict
 from pathlib import Path
+from threading import Lock
 from typing import Dict, List, Tuple, Optional
 from datetime import datetime
 
@@ -13,6 +16,80 @@ import yaml
 
 from ..utils.errors import FileParseError, DataNotFoundError
 from .cache_service import get_cache
+from .day_pack import DayPack, get_day_pack_store
+from .snapshot_store import SnapshotReader, SNAPSHOT_FILENAME
+
+
+NEW_TITLES_FILENAME = "new_titles.json"
+
+# 保留合并状态的日期数（按最近使用淘汰，通常只有今天会增量更新）
+MAX_DAY_MERGES = 4
+
+
+class _DayMerge:
+    """单日合并状态
+
+    记录已合并的数据来源（txt 为 (大小, mtime_ns)，仅存在于快照存储中的为 None）
+    及合并结果，新的一批 txt 文件落盘后只需解析并合并新增的文件。
+    """
+
+    __slots__ = ("sources", "all_titles", "id_to_name", "timestamps")
+
+    def __init__(self):
+        self.sources: Dict[str, Optional[Tuple[int, int]]] = {}
+        self.all_titles: Dict[str, Dict] = {}
+        self.id_to_name: Dict[str, str] = {}
+        self.timestamps: Dict[str, float] = {}
+
+    def add(
+        self,
+        time_info: str,
+        source: Optional[Tuple[int, int]],
+        titles_by_id: Dict,
+        id_to_name: Dict,
+        timestamp: float,
+        copy_on_write: bool = False
+    ) -> None:
+        """
+        按时间顺序合并一次爬取的数据
+
+        Args:
+            copy_on_write: 为 True 时替换而非原地修改已有标题的 info，
+                避免影响已经返回给调用方的结果
+        """
+        self.sources[time_info] = source
+        self.id_to_name.update(id_to_name)
+
+        for platform_id, titles in titles_by_id.items():
+            platform_titles = self.all_titles.setdefault(platform_id, {})
+            for title, info in titles.items():
+                existing = platform_titles.get(title)
+                if existing is None:
+                    platform_titles[title] = {**info, "ranks": list(info["ranks"])}
+                elif copy_on_write:
+                    platform_titles[title] = {
+                        **existing, "ranks": existing["ranks"] + info["ranks"]
+                    }
+                else:
+                    existing["ranks"].extend(info["ranks"])
+
+        if timestamp is not None:
+            self.timestamps[f"{time_info}.txt"] = timestamp
+
+    def result(self, platform_ids: Optional[List[str]] = None) -> Tuple[Dict, Dict, Dict]:
+        """复制出 (all_titles, id_to_name, all_timestamps)，后续合并不会修改返回的容器"""
+        all_titles = {
+            platform_id: dict(titles)
+            for platform_id, titles in self.all_titles.items()
+            if not platform_ids or platform_id in platform_ids
+        }
+        return all_titles, dict(self.id_to_name), dict(self.timestamps)
+
+
+# 全局合并状态（按 项目根目录 + 日期 区分）；不同日期各自加锁，可以并发合并
+_day_merges: "OrderedDict[Tuple[str, str], _DayMerge]" = OrderedDict()
+_day_locks: Dict[Tuple[str, str], Lock] = {}
+_day_merges_lock = Lock()
 
 
 class ParserService:
@@ -157,6 +234,40 @@ class ParserService:
             date = datetime.now()
         return date.strftime("%Y年%m月%d日")
 
+    def get_data_signature(self, date: datetime = None) -> tuple:
+        """
+        获取指定日期数据的签名，用于判断缓存是否失效
+
+        签名由 txt 目录的文件列表及各文件大小、mtime 以及快照存储文件的状态组成，
+        爬虫写入新的一批数据后签名随之变化；历史日期的签名保持不变。
+
+        Args:
+            date: 日期对象，默认为今天
+
+        Returns:
+            可比较、可哈希的签名元组
+        """
+        day_dir = self.project_root / "output" / self.get_date_folder_name(date)
+        txt_dir = day_dir / "txt"
+        txt_files = []
+        if txt_dir.exists():
+            for file_path in txt_dir.glob("*.txt"):
+                try:
+                    st = file_path.stat()
+                except OSError:
+                    continue
+                txt_files.append((file_path.name, st.st_size, st.st_mtime_ns))
+        txt_files.sort()
+
+        snapshot_path = day_dir / SNAPSHOT_FILENAME
+        try:
+            st = snapshot_path.stat()
+            snapshot_state = (st.st_size, st.st_mtime_ns)
+        except OSError:
+            snapshot_state = None
+
+        return tuple(txt_files), snapshot_state
+
     def read_all_titles_for_date(
         self,
         date: datetime = None,
@@ -184,80 +295,308 @@ class ParserService:
         cache_key = f"read_all_titles:{date_str}:{platform_key}"
 
         # 尝试从缓存获取
-        # 对于历史数据（非今天），使用更长的缓存时间（1小时）
-        # 对于今天的数据，使用较短的缓存时间（15分钟），因为可能有新数据
-        is_today = (date is None) or (date.date() == datetime.now().date())
-        ttl = 900 if is_today else 3600  # 15分钟 vs 1小时
+        # 不按时间过期，而是以数据签名判断：历史数据长期有效，
+        # 今天的数据在爬虫写入新文件后立即失效
+        signature = self.get_data_signature(date)
+
+        def load():
+            # 缓存未命中，增量合并当天数据
+            all_titles, id_to_name, all_timestamps = self._read_day(
+                date_str, platform_ids
+            )
+
+            if not all_titles:
+                raise DataNotFoundError(
+                    f"{date_str} 没有有效的数据",
+                    suggestion="请检查数据文件格式或重新运行爬虫"
+                )
+            return all_titles, id_to_name, all_timestamps
+
+        # 同一天的并发读取只合并一次
+        return self.cache.get_or_load(cache_key, load, ttl=None, signature=signature)
 
-        cached = self.cache.get(cache_key, ttl=ttl)
-        if cached:
-            return cached
+    def _read_day(
+        self,
+        date_folder: str,
+        platform_ids: Optional[List[str]] = None
+    ) -> Tuple[Dict, Dict, Dict]:
+        """
+        读取单日合并结果
 
-        # 缓存未命中，读取文件
-        date_folder = self.get_date_folder_name(date)
-        txt_dir = self.project_root / "output" / date_folder / "txt"
+        爬虫写入的合并数据文件（day_pack.bin）与 txt 文件一致时，直接返回其只读映射视图；
+        否则在内存中合并：已合并过的 txt 文件（路径、大小、mtime 均未变）不再解析，
+        只有新增的、时间更晚的文件需要解析并追加合并，其余变化时整天重建。
+        """
+        day_dir = self.project_root / "output" / date_folder
+        txt_dir = day_dir / "txt"
+        txt_files = {f.stem: f for f in txt_dir.glob("*.txt")} if txt_dir.exists() else {}
+        txt_stats = {time_info: f.stat() for time_info, f in txt_files.items()}
+        key = (str(self.project_root), date_folder)
+
+        pack = get_day_pack_store().get(
+            day_dir,
+            {time_info: (st.st_size, st.st_mtime_ns) for time_info, st in txt_stats.items()}
+        )
+        if pack is not None:
+            return self._pack_result(pack, day_dir, txt_stats, platform_ids)
+
+        with _day_merges_lock:
+            day_lock = _day_locks.setdefault(key, Lock())
+
+        with day_lock:
+            with _day_merges_lock:
+                merge = _day_merges.get(key)
+            if merge is not None:
+                current = {
+                    time_info: source
+                    for time_info, source in merge.sources.items()
+                    if source is None and time_info not in txt_stats
+                }
+                current.update(
+                    (time_info, (st.st_size, st.st_mtime_ns))
+                    for time_info, st in txt_stats.items()
+                )
+                ordered = sorted(current)
+                merged = list(merge.sources)
+
+                if ordered[:len(merged)] == merged and all(
+                    current[time_info] == merge.sources[time_info]
+                    for time_info in merged
+                ):
+                    for time_info in ordered[len(merged):]:
+                        self._merge_txt_file(
+                            merge, time_info, txt_files[time_info],
+                            txt_stats[time_info], date_folder, copy_on_write=True
+                        )
+                    with _day_merges_lock:
+                        if key in _day_merges:
+                            _day_merges.move_to_end(key)
+                    return merge.result(platform_ids)
+
+            merge = self._build_day_merge(day_dir, txt_files, txt_stats)
+            with _day_merges_lock:
+                _day_merges[key] = merge
+                _day_merges.move_to_end(key)
+                while len(_day_merges) > MAX_DAY_MERGES:
+                    _day_merges.popitem(last=False)
+            return merge.result(platform_ids)
 
-        if not txt_dir.exists():
+    @staticmethod
+    def _pack_result(
+        pack: DayPack,
+        day_dir: Path,
+        txt_stats: Dict,
+        platform_ids: Optional[List[str]]
+    ) -> Tuple[Dict, Dict, Dict]:
+        """由合并数据文件得到 (all_titles, id_to_name, all_timestamps)，时间戳规则同 _build_day_merge"""
+        snapshot_path = day_dir / SNAPSHOT_FILENAME
+        timestamps = {}
+        for time_info in sorted(pack.sources):
+            st = txt_stats.get(time_info)
+            if st is not None:
+                timestamps[f"{time_info}.txt"] = st.st_mtime
+            elif snapshot_path.exists():
+                timestamps[f"{time_info}.txt"] = snapshot_path.stat().st_mtime
+        return pack.all_titles(platform_ids), dict(pack.id_to_name), timestamps
+
+    def _build_day_merge(
+        self,
+        day_dir: Path,
+        txt_files: Dict[str, Path],
+        txt_stats: Dict
+    ) -> _DayMerge:
+        """整天重建合并状态（优先读取快照存储，未收录的 txt 文件再逐个解析）"""
+        date_folder = day_dir.name
+        snapshot_reader = SnapshotReader(day_dir / SNAPSHOT_FILENAME)
+
+        if not (day_dir / "txt").exists() and not snapshot_reader.exists():
             raise DataNotFoundError(
                 f"未找到 {date_folder} 的数据目录",
                 suggestion="请先运行爬虫或检查日期是否正确"
             )
 
-        all_titles = {}
-        id_to_name = {}
-        all_timestamps = {}
-
-        # 读取所有txt文件
-        txt_files = sorted(txt_dir.glob("*.txt"))
+        try:
+            stored = snapshot_reader.read(day_dir / "txt")
+        except Exception as e:
+            print(f"Warning: 读取快照存储 {snapshot_reader.path} 失败: {e}")
+            stored = {}
 
-        if not txt_files:
+        if not stored and not txt_files:
             raise DataNotFoundError(
                 f"{date_folder} 没有数据文件",
                 suggestion="请等待爬虫任务完成"
             )
 
-        for txt_file in txt_files:
-            try:
-                titles_by_id, file_id_to_name = self.parse_txt_file(txt_file)
+        merge = _DayMerge()
+        for time_info in sorted(set(stored) | set(txt_files)):
+            if time_info not in stored:
+                self._merge_txt_file(
+                    merge, time_info, txt_files[time_info],
+                    txt_stats[time_info], date_folder
+                )
+                continue
 
-                # 更新id_to_name
-                id_to_name.update(file_id_to_name)
+            titles_by_id, file_id_to_name, _ = stored[time_info]
+            st = txt_stats.get(time_info)
+            if st is not None:
+                source = (st.st_size, st.st_mtime_ns)
+                timestamp = st.st_mtime
+            else:
+                source = None
+                timestamp = snapshot_reader.path.stat().st_mtime
+            merge.add(time_info, source, titles_by_id, file_id_to_name, timestamp)
 
-                # 合并标题数据
-                for platform_id, titles in titles_by_id.items():
-                    # 如果指定了平台过滤
-                    if platform_ids and platform_id not in platform_ids:
-                        continue
+        return merge
 
-                    if platform_id not in all_titles:
-                        all_titles[platform_id] = {}
+    def _merge_txt_file(
+        self,
+        merge: _DayMerge,
+        time_info: str,
+        txt_file: Path,
+        st,
+        date_folder: str,
+        copy_on_write: bool = False
+    ) -> None:
+        """解析单个 txt 文件并合并；解析失败时记录来源但不合并数据"""
+        source = (st.st_size, st.st_mtime_ns)
+        try:
+            titles_by_id, file_id_to_name = self.parse_txt_file(txt_file)
+        except Exception as e:
+            # 忽略单个文件的解析错误，继续处理其他文件
+            print(f"Warning: 解析 {date_folder} {time_info} 的数据失败: {e}")
+            merge.sources[time_info] = source
+            return
+        merge.add(
+            time_info, source, titles_by_id, file_id_to_name, st.st_mtime,
+            copy_on_write=copy_on_write
+        )
+
+    def read_latest_new_titles(
+        self,
+        platform_ids: Optional[List[str]] = None
+    ) -> Tuple[Dict, Dict, float]:
+        """
+        读取今天最新一批爬取中的新增标题
 
-                    for title, info in titles.items():
-                        if title in all_titles[platform_id]:
-                            # 合并排名
-                            all_titles[platform_id][title]["ranks"].extend(info["ranks"])
-                        else:
-                            all_titles[platform_id][title] = info.copy()
+        优先读取爬虫维护的已出现标题索引（output/<日期>/new_titles.json），
+        只有索引缺失或与最新 txt 文件不一致时才回退到逐次快照比对。
 
-                # 记录文件时间戳
-                all_timestamps[txt_file.name] = txt_file.stat().st_mtime
+        Args:
+            platform_ids: 平台ID列表，None表示所有平台
 
+        Returns:
+            (new_titles, id_to_name, fetch_timestamp) 元组
+            - new_titles: {platform_id: {title: {ranks, url, mobileUrl}}}
+            - fetch_timestamp: 最新一批数据的文件时间戳
+
+        Raises:
+            DataNotFoundError: 数据不存在
+        """
+        date_folder = self.get_date_folder_name()
+        day_dir = self.project_root / "output" / date_folder
+        txt_dir = day_dir / "txt"
+        index_path = day_dir / NEW_TITLES_FILENAME
+
+        txt_files = sorted(txt_dir.glob("*.txt")) if txt_dir.exists() else []
+        index = None
+        if index_path.exists() and txt_files:
+            try:
+                with open(index_path, "r", encoding="utf-8") as f:
+                    index = json.load(f)
+                latest_file = txt_files[-1]
+                latest_source = index.get("latest_source", {})
+                st = latest_file.stat()
+                if (
+                    index.get("latest_time") != latest_file.stem
+                    or index.get("crawl_count") != len(txt_files)
+                    or st.st_size != latest_source.get("size")
+                ):
+                    index = None
+                elif (
+                    st.st_mtime_ns != latest_source.get("mtime_ns")
+                    and SnapshotReader.file_fingerprint(latest_file)
+                    != (latest_source.get("size"), latest_source.get("crc"))
+                ):
+                    # 仅 mtime 变化（如被复制）时按内容校验
+                    index = None
             except Exception as e:
-                # 忽略单个文件的解析错误，继续处理其他文件
-                print(f"Warning: 解析文件 {txt_file} 失败: {e}")
-                continue
+                print(f"Warning: 读取新增标题索引 {index_path} 失败: {e}")
+                index = None
+
+        if index is not None:
+            # 当天不足两次爬取时没有新增标题（与爬虫端一致）
+            new_titles = index.get("new_titles", {}) if index.get("crawl_count", 0) >= 2 else {}
+            id_to_name = index.get("id_to_name", {})
+            fetch_timestamp = txt_files[-1].stat().st_mtime
+        else:
+            new_titles, id_to_name, fetch_timestamp = self._diff_latest_snapshot(
+                day_dir
+            )
 
-        if not all_titles:
+        if platform_ids:
+            new_titles = {
+                platform_id: titles
+                for platform_id, titles in new_titles.items()
+                if platform_id in platform_ids
+            }
+
+        return new_titles, id_to_name, fetch_timestamp
+
+    def _diff_latest_snapshot(self, day_dir: Path) -> Tuple[Dict, Dict, float]:
+        """逐次比对当天快照，找出最新一批的新增标题（索引不可用时的回退路径）"""
+        txt_dir = day_dir / "txt"
+        snapshot_reader = SnapshotReader(day_dir / SNAPSHOT_FILENAME)
+
+        if not txt_dir.exists() and not snapshot_reader.exists():
             raise DataNotFoundError(
-                f"{date_folder} 没有有效的数据",
-                suggestion="请检查数据文件格式或重新运行爬虫"
+                f"未找到 {day_dir.name} 的数据目录",
+                suggestion="请先运行爬虫或检查日期是否正确"
             )
 
-        # 缓存结果
-        result = (all_titles, id_to_name, all_timestamps)
-        self.cache.set(cache_key, result)
+        snapshots = {
+            time_info: (titles_by_id, file_id_to_name)
+            for time_info, (titles_by_id, file_id_to_name, _)
+            in snapshot_reader.read(txt_dir).items()
+        }
+        txt_files = {f.stem: f for f in txt_dir.glob("*.txt")} if txt_dir.exists() else {}
+        for time_info, txt_file in txt_files.items():
+            if time_info not in snapshots:
+                snapshots[time_info] = self.parse_txt_file(txt_file)
+
+        if not snapshots:
+            raise DataNotFoundError(
+                f"{day_dir.name} 没有数据文件",
+                suggestion="请等待爬虫任务完成"
+            )
 
-        return result
+        ordered = sorted(snapshots)
+        latest_time = ordered[-1]
+        latest_titles, _ = snapshots[latest_time]
+        latest_file = txt_files.get(latest_time, snapshot_reader.path)
+        fetch_timestamp = latest_file.stat().st_mtime
+
+        id_to_name = {}
+        for time_info in ordered:
+            id_to_name.update(snapshots[time_info][1])
+
+        if len(ordered) < 2:
+            return {}, id_to_name, fetch_timestamp
+
+        seen_titles = {}
+        for time_info in ordered[:-1]:
+            for platform_id, titles in snapshots[time_info][0].items():
+                seen_titles.setdefault(platform_id, set()).update(titles)
+
+        new_titles = {}
+        for platform_id, titles in latest_titles.items():
+            seen = seen_titles.get(platform_id, set())
+            platform_new = {
+                title: info for title, info in titles.items() if title not in seen
+            }
+            if platform_new:
+                new_titles[platform_id] = platform_new
+
+        return new_titles, id_to_name, fetch_timestamp
 
     def parse_yaml_config(self, config_path: str = None) -> dict:
         """
@@ -0,0 +1,100 @@
+"""
+日期范围并发加载服务
+
+跨日期的查询（关键词搜索、话题趋势、平台对比等）需要逐日读取数据，
+这里用线程池并发加载各天，并逐日产出结果，供调用方流式聚合。
+所有查询共用一个模块级的有界线程池：这些查询本身运行在 ToolExecutor 的工作线程中，
+多个工具并发时线程总数仍不超过 MAX_POOL_WORKERS。
+"""
+
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timedelta
+from typing import Any, Callable, Iterator, Tuple
+
+from ..utils.errors import DataNotFoundError
+
+
+# 单次查询默认并发加载的天数
+DEFAULT_MAX_WORKERS = 4
+
+# 全部查询共用的加载线程数
+MAX_POOL_WORKERS = 8
+
+_executor = ThreadPoolExecutor(max_workers=MAX_POOL_WORKERS, thread_name_prefix="date-range")
+
+
+def iter_date_range(
+    start_date: datetime,
+    end_date: datetime,
+    load: Callable[[datetime], Any],
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    ordered: bool = True
+) -> Iterator[Tuple[datetime, Any]]:
+    """
+    并发加载日期范围内每一天的数据
+
+    Args:
+        start_date: 开始日期（包含）
+        end_date: 结束日期（包含）
+        load: 单日加载函数 load(date)，抛出 DataNotFoundError 表示该日没有数据；
+            可以在其中完成单日的统计，只把较小的中间结果交给调用方合并
+        max_workers: 本次查询同时提交到共享线程池的最大天数
+        ordered: True 时按日期顺序产出（先完成的结果暂存），False 时按完成顺序产出
+
+    Yields:
+        (date, result) 元组，该日没有数据时 result 为 None
+
+    Raises:
+        load 抛出的其他异常在产出对应日期时重新抛出
+    """
+    dates = []
+    current_date = start_date
+    while current_date <= end_date:
+        dates.append(current_date)
+        current_date += timedelta(days=1)
+
+    if not dates:
+        return
+
+    def load_day(date: datetime) -> Tuple[datetime, Any]:
+        try:
+            return date, load(date)
+        except DataNotFoundError:
+            return date, None
+
+    if len(dates) == 1 or max_workers <= 1:
+        for date in dates:
+            yield load_day(date)
+        return
+
+    # 每完成一天再提交下一天，本次查询占用的线程不超过 max_workers
+    remaining = iter(dates)
+    pending = deque()
+
+    def submit_next() -> None:
+        date = next(remaining, None)
+        if date is not None:
+            pending.append(_executor.submit(load_day, date))
+
+    for _ in range(max_workers):
+        submit_next()
+
+    try:
+        if ordered:
+            while pending:
+                result = pending.popleft().result()
+                submit_next()
+                yield result
+        else:
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    pending.remove(future)
+                    submit_next()
+                for future in done:
+                    yield future.result()
+    finally:
+        # 调用方提前结束迭代时取消尚未开始的加载
+        for future in pending:
+            future.cancel()
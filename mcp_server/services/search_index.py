@@ -0,0 +1,243 @@
+"""
+标题搜索索引服务
+
+读取爬虫（main.py 中的 TitleSearchIndex）维护的 output/<日期>/search_index.json，
+以字符二元组倒排表回答关键词查询，避免逐日读取全部标题再做子串匹配。
+索引缺失或与 txt 文件不一致时，退回按天读取数据并在内存中建立同样的索引。
+"""
+
+import json
+from datetime import datetime
+from pathlib import Path
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+
+from .cache_service import estimate_size, get_cache
+from .parser_service import ParserService
+from .snapshot_store import sources_match, txt_file_stats
+
+
+SEARCH_INDEX_FILENAME = "search_index.json"
+
+
+class DayIndex:
+    """单日标题倒排索引
+
+    文档为 [平台下标, 标题, ranks, url, mobileUrl]，文档 id 按首次出现顺序递增；
+    倒排表以小写标题的字符二元组为键。
+
+    格式和二元组切分需与 main.py 中的 TitleSearchIndex 保持一致：爬虫按单文件部署，
+    MCP 服务单独打包、不依赖 main.py，两边无法共用代码。test_search_index.py 比对两者
+    由同一份数据建立的索引。
+    """
+
+    def __init__(
+        self,
+        platforms: List[str],
+        docs: List[list],
+        postings: Dict[str, List[int]],
+        id_to_name: Dict[str, str]
+    ):
+        self.platforms = platforms
+        self.docs = docs
+        self.postings = postings
+        self.id_to_name = id_to_name
+        self._lower_titles = None
+
+    def memory_size(self) -> int:
+        """估算索引占用的内存字节数（供缓存按容量淘汰）"""
+        return estimate_size(self.docs) + estimate_size(self.postings)
+
+    @staticmethod
+    def grams(text: str) -> set:
+        """小写文本的字符二元组集合"""
+        text = text.lower()
+        return {text[i:i + 2] for i in range(len(text) - 1)}
+
+    @classmethod
+    def from_titles(cls, all_titles: Dict, id_to_name: Dict) -> "DayIndex":
+        """由 read_all_titles_for_date 的结果建立索引"""
+        platforms = list(all_titles)
+        docs = []
+        postings = {}
+        for platform_index, titles in enumerate(all_titles.values()):
+            for title, info in titles.items():
+                doc_id = len(docs)
+                docs.append([
+                    platform_index,
+                    title,
+                    info["ranks"],
+                    info.get("url", ""),
+                    info.get("mobileUrl", "")
+                ])
+                for gram in cls.grams(title):
+                    postings.setdefault(gram, []).append(doc_id)
+        return cls(platforms, docs, postings, id_to_name)
+
+    def search(
+        self,
+        keyword: str,
+        platform_ids: Optional[List[str]] = None
+    ) -> List[Tuple[str, str, Dict]]:
+        """
+        查找标题中包含关键词（不区分大小写）的文档
+
+        Returns:
+            [(platform_id, title, {ranks, url, mobileUrl})]，
+            顺序与按天合并结果的遍历顺序一致（先平台、后标题首次出现顺序）
+        """
+        keyword_lower = keyword.lower()
+        grams = self.grams(keyword_lower)
+
+        if grams:
+            candidates = None
+            for gram in sorted(grams, key=lambda g: len(self.postings.get(g, ()))):
+                posting = self.postings.get(gram)
+                if not posting:
+                    return []
+                candidates = set(posting) if candidates is None else candidates.intersection(posting)
+                if not candidates:
+                    return []
+            doc_ids = sorted(candidates)
+        else:
+            # 单字符或空关键词没有二元组，直接扫描
+            doc_ids = range(len(self.docs))
+
+        if self._lower_titles is None:
+            self._lower_titles = [doc[1].lower() for doc in self.docs]
+
+        allowed = None
+        if platform_ids:
+            allowed = {
+                index for index, platform_id in enumerate(self.platforms)
+                if platform_id in platform_ids
+            }
+
+        matched = [
+            doc_id for doc_id in doc_ids
+            if (allowed is None or self.docs[doc_id][0] in allowed)
+            and keyword_lower in self._lower_titles[doc_id]
+        ]
+        matched.sort(key=lambda doc_id: self.docs[doc_id][0])
+
+        results = []
+        for doc_id in matched:
+            platform_index, title, ranks, url, mobile_url = self.docs[doc_id]
+            results.append((
+                self.platforms[platform_index],
+                title,
+                {"ranks": ranks, "url": url, "mobileUrl": mobile_url}
+            ))
+        return results
+
+
+class SearchIndexService:
+    """跨日期标题搜索服务
+
+    已加载的单日索引存放在全局 LRU 缓存中，与其他数据共享条目数和内存限额，
+    以 txt 文件列表及其大小、mtime 作为失效依据。
+    """
+
+    def __init__(self, parser: ParserService):
+        """
+        初始化搜索服务
+
+        Args:
+            parser: 解析服务（提供项目根目录，并在索引不可用时读取数据）
+        """
+        self.parser = parser
+        self.cache = get_cache()
+
+    def search(
+        self,
+        keyword: str,
+        date: datetime = None,
+        platform_ids: Optional[List[str]] = None
+    ) -> Tuple[List[Tuple[str, str, Dict]], Dict]:
+        """
+        在指定日期的标题中搜索关键词
+
+        Args:
+            keyword: 关键词（不区分大小写的子串匹配）
+            date: 日期对象，默认为今天
+            platform_ids: 平台ID列表，None表示所有平台
+
+        Returns:
+            (matches, id_to_name) 元组，matches 为 [(platform_id, title, info)]
+
+        Raises:
+            DataNotFoundError: 该日期没有数据
+        """
+        index = self.get_day_index(date)
+        return index.search(keyword, platform_ids), index.id_to_name
+
+    def get_day_index(self, date: datetime = None) -> DayIndex:
+        """获取单日索引（内存缓存 → 索引文件 → 按天读取数据重建）"""
+        date_folder = self.parser.get_date_folder_name(date)
+        day_dir = self.parser.project_root / "output" / date_folder
+        txt_stats = txt_file_stats(day_dir / "txt")
+        index_path = day_dir / SEARCH_INDEX_FILENAME
+        signature = (
+            tuple(sorted(txt_stats.items())),
+            index_path.stat().st_mtime_ns if index_path.exists() else None,
+        )
+
+        cache_key = f"search_index:{self.parser.project_root}:{date_folder}"
+        cached = self.cache.get(cache_key, ttl=None, signature=signature)
+        if cached is not None:
+            return cached
+
+        index = self._load_index_file(index_path, day_dir / "txt", txt_stats)
+        if index is None:
+            all_titles, id_to_name, _ = self.parser.read_all_titles_for_date(date)
+            index = DayIndex.from_titles(all_titles, id_to_name)
+
+        self.cache.set(cache_key, index, signature=signature, size=index.memory_size())
+        return index
+
+    @staticmethod
+    def _load_index_file(
+        index_path: Path, txt_dir: Path, txt_stats: Dict[str, Tuple[int, int]]
+    ) -> Optional[DayIndex]:
+        """读取索引文件，与当前 txt 文件不一致时返回 None"""
+        if not index_path.exists():
+            return None
+        try:
+            with open(index_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"Warning: 读取搜索索引 {index_path} 失败: {e}")
+            return None
+
+        if data.get("version") != 1:
+            return None
+        if not sources_match(data.get("sources", {}), txt_dir, txt_stats):
+            return None
+
+        return DayIndex(
+            data["platforms"], data["docs"], data["postings"], data["id_to_name"]
+        )
+
+
+# 全局搜索服务实例（按项目根目录区分）
+_search_services: Dict[str, SearchIndexService] = {}
+_search_services_lock = Lock()
+
+
+def get_search_index(parser: ParserService) -> SearchIndexService:
+    """
+    获取与解析服务共享项目根目录的全局搜索服务实例
+
+    Args:
+        parser: 解析服务
+
+    Returns:
+        搜索服务实例
+    """
+    key = str(parser.project_root)
+    with _search_services_lock:
+        service = _search_services.get(key)
+        if service is None:
+            service = SearchIndexService(parser)
+            _search_services[key] = service
+        return service
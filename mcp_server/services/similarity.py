@@ -0,0 +1,217 @@
+"""
+标题相似度服务
+
+相似搜索按 difflib.SequenceMatcher 的 ratio 计分。逐条计算 ratio 开销很大，
+这里为每天的标题建立字符倒排索引：先用字符多重集的重合数算出 ratio 的上界
+（同 SequenceMatcher.quick_ratio），只对上界达到阈值的候选标题计算精确的 ratio。
+结果与逐条计算完全一致。安装了 NumPy 时，上界以数组运算批量计算。
+"""
+
+from collections import Counter
+from datetime import datetime
+from difflib import SequenceMatcher
+from threading import Lock
+from typing import Dict, Iterable, Optional, Tuple
+
+from .cache_service import estimate_size, get_cache
+from .parser_service import ParserService
+
+try:
+    import numpy as np
+except ImportError:  # NumPy 为可选依赖
+    np = None
+
+
+# 浮点比较容差
+_EPSILON = 1e-9
+
+
+class TitleProfiles:
+    """一组标题的字符倒排索引"""
+
+    def __init__(self, titles: Iterable[str], lowercase: bool = False):
+        """
+        建立索引
+
+        Args:
+            titles: 标题（重复的只保留一次）
+            lowercase: 是否按小写比较（与调用方计算 ratio 时的处理一致）
+        """
+        self.lowercase = lowercase
+        self.titles = list(dict.fromkeys(titles))
+        self.title_set = set(self.titles)
+
+        postings: Dict[str, Tuple[list, list]] = {}
+        lengths = []
+        for doc_id, title in enumerate(self.titles):
+            text = title.lower() if lowercase else title
+            lengths.append(len(text))
+            for char, count in Counter(text).items():
+                doc_ids, counts = postings.setdefault(char, ([], []))
+                doc_ids.append(doc_id)
+                counts.append(count)
+
+        if np is not None:
+            # 所有倒排表拼接为两个数组，按字符记录切片位置
+            self._lengths = np.array(lengths, dtype=np.int32)
+            self._slices = {}
+            all_doc_ids = []
+            all_counts = []
+            for char, (doc_ids, counts) in postings.items():
+                start = len(all_doc_ids)
+                all_doc_ids.extend(doc_ids)
+                all_counts.extend(counts)
+                self._slices[char] = (start, len(all_doc_ids))
+            self._doc_ids = np.array(all_doc_ids, dtype=np.int32)
+            self._counts = np.array(all_counts, dtype=np.int32)
+        else:
+            self._lengths = lengths
+            self._postings = postings
+
+    def memory_size(self) -> int:
+        """估算索引占用的内存字节数（供缓存按容量淘汰）"""
+        size = estimate_size(self.titles) + estimate_size(self.title_set)
+        if np is not None:
+            return (
+                size + estimate_size(self._slices)
+                + self._lengths.nbytes + self._doc_ids.nbytes + self._counts.nbytes
+            )
+        return size + estimate_size(self._lengths) + estimate_size(self._postings)
+
+    def upper_bounds(self, query: str) -> Dict[str, float]:
+        """
+        计算查询与各标题 ratio 的上界
+
+        Returns:
+            {标题: 上界}，只包含与查询有公共字符的标题（其余标题的 ratio 为 0）
+        """
+        text = query.lower() if self.lowercase else query
+        query_counts = Counter(text)
+        query_length = len(text)
+
+        if np is not None:
+            overlap = np.zeros(len(self.titles), dtype=np.int32)
+            for char, count in query_counts.items():
+                posting = self._slices.get(char)
+                if posting is not None:
+                    start, end = posting
+                    overlap[self._doc_ids[start:end]] += np.minimum(
+                        self._counts[start:end], count
+                    )
+            doc_ids = np.flatnonzero(overlap)
+            bounds = 2.0 * overlap[doc_ids] / (self._lengths[doc_ids] + query_length)
+            return {
+                self.titles[doc_id]: bound
+                for doc_id, bound in zip(doc_ids.tolist(), bounds.tolist())
+            }
+
+        overlap: Dict[int, int] = {}
+        for char, count in query_counts.items():
+            posting = self._postings.get(char)
+            if posting is not None:
+                for doc_id, doc_count in zip(*posting):
+                    overlap[doc_id] = overlap.get(doc_id, 0) + min(doc_count, count)
+        return {
+            self.titles[doc_id]: 2.0 * common / (self._lengths[doc_id] + query_length)
+            for doc_id, common in overlap.items()
+        }
+
+    def scorer(self, query: str) -> "SimilarityScorer":
+        """创建针对某个查询的计分器"""
+        return SimilarityScorer(query, self, self.upper_bounds(query))
+
+
+class SimilarityScorer:
+    """单个查询的相似度计分器"""
+
+    def __init__(self, query: str, profiles: TitleProfiles, bounds: Dict[str, float]):
+        self.lowercase = profiles.lowercase
+        self.query = query.lower() if self.lowercase else query
+        self._title_set = profiles.title_set
+        self._bounds = bounds
+
+    def score(self, title: str, min_score: float = 0.0) -> Optional[float]:
+        """
+        计算查询与标题的 SequenceMatcher ratio
+
+        Args:
+            title: 标题
+            min_score: 调用方关心的最低分数
+
+        Returns:
+            精确的 ratio；上界已低于 min_score 时返回 None（ratio 必然低于 min_score）
+        """
+        bound = self._bounds.get(title)
+        if bound is None and title in self._title_set:
+            # 没有公共字符
+            return 0.0 if self.query or title else 1.0
+        if bound is not None and bound < min_score - _EPSILON:
+            return None
+        text = title.lower() if self.lowercase else title
+        return SequenceMatcher(None, self.query, text).ratio()
+
+
+class SimilarityService:
+    """按天缓存标题字符索引（存放在全局 LRU 缓存中，与其他按天数据共用容量限额）"""
+
+    def __init__(self, parser: ParserService):
+        """
+        初始化相似度服务
+
+        Args:
+            parser: 解析服务
+        """
+        self.parser = parser
+        self.cache = get_cache()
+
+    def get_day_profiles(self, date: datetime = None, lowercase: bool = False) -> TitleProfiles:
+        """
+        获取单日全部标题的字符索引
+
+        Args:
+            date: 日期对象，默认为今天
+            lowercase: 是否按小写比较
+
+        Raises:
+            DataNotFoundError: 该日期没有数据
+        """
+        date_folder = self.parser.get_date_folder_name(date)
+        cache_key = f"similarity:{self.parser.project_root}:{date_folder}:{int(lowercase)}"
+        signature = self.parser.get_data_signature(date)
+
+        cached = self.cache.get(cache_key, ttl=None, signature=signature)
+        if cached is not None:
+            return cached
+
+        all_titles, _, _ = self.parser.read_all_titles_for_date(date)
+        profiles = TitleProfiles(
+            (title for titles in all_titles.values() for title in titles),
+            lowercase=lowercase
+        )
+
+        self.cache.set(cache_key, profiles, signature=signature, size=profiles.memory_size())
+        return profiles
+
+
+# 全局相似度服务实例（按项目根目录区分）
+_similarity_services: Dict[str, SimilarityService] = {}
+_similarity_services_lock = Lock()
+
+
+def get_similarity_service(parser: ParserService) -> SimilarityService:
+    """
+    获取与解析服务共享项目根目录的全局相似度服务实例
+
+    Args:
+        parser: 解析服务
+
+    Returns:
+        相似度服务实例
+    """
+    key = str(parser.project_root)
+    with _similarity_services_lock:
+        service = _similarity_services.get(key)
+        if service is None:
+            service = SimilarityService(parser)
+            _similarity_services[key] = service
+        return service
@@ -0,0 +1,221 @@
+"""
+快照存储读取服务
+
+读取爬虫（main.py 中的 SnapshotStore）写入的 output/<日期>/snapshots.bin。
+文件为追加写的二进制格式，顺序扫描一次即可还原当天每次爬取的数据，
+避免逐个解析 txt 文件时的字符串切分开销。
+"""
+
+import struct
+import zlib
+from pathlib import Path
+from typing import Dict, List, Tuple, Union
+
+
+SNAPSHOT_FILENAME = "snapshots.bin"
+
+
+class SnapshotReader:
+    """快照存储读取器
+
+    文件结构：8 字节魔数 + 若干记录帧，每帧为 <类型 u8, 负载长度 u32, crc32 u32> + 负载。
+    格式需与 main.py 中的 SnapshotStore 保持一致。校验 txt 文件时优先比对 txt 状态帧
+    记录的 mtime_ns，大小一致而 mtime 不一致时才计算 crc32。
+    """
+
+    MAGIC = b"TRSNAP02"
+    RECORD_STRINGS = 1
+    RECORD_CRAWL = 2
+    RECORD_TXT_STAT = 3
+
+    _FRAME = struct.Struct("<BII")
+    _U32 = struct.Struct("<I")
+    _CRAWL_HEAD = struct.Struct("<IHHII")
+    _PLATFORM_HEAD = struct.Struct("<III")
+    _ITEM = struct.Struct("<IIII")
+    _TXT_STAT = struct.Struct("<IQ")
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        初始化读取器
+
+        Args:
+            path: snapshots.bin 文件路径
+        """
+        self.path = Path(path)
+
+    def exists(self) -> bool:
+        """快照文件是否存在"""
+        return self.path.exists()
+
+    def read(self, txt_dir: Path = None) -> Dict[str, Tuple[Dict, Dict, List[str]]]:
+        """
+        读取全部快照
+
+        Args:
+            txt_dir: 当天的 txt 目录；指定时，对应 txt 文件存在但内容与记录
+                不符（被修改过）的快照会被跳过，由调用方改为解析 txt
+
+        Returns:
+            {time_info: (titles_by_id, id_to_name, failed_ids)}
+            - time_info: 爬取时间，格式同 txt 文件名，如 "08时30分"
+            - titles_by_id: {platform_id: {title: {ranks, url, mobileUrl}}}
+            同一 time_info 出现多次时以最后一次为准；末尾残缺的帧会被忽略
+        """
+        if not self.path.exists():
+            return {}
+
+        with open(self.path, "rb") as f:
+            data = f.read()
+
+        if not data.startswith(self.MAGIC):
+            return {}
+
+        strings: List[str] = []
+        snapshots = {}
+        fingerprints = {}
+        txt_mtimes = {}
+        view = memoryview(data)
+        offset = len(self.MAGIC)
+        frame_size = self._FRAME.size
+
+        while offset + frame_size <= len(data):
+            record_type, length, checksum = self._FRAME.unpack_from(data, offset)
+            start = offset + frame_size
+            end = start + length
+            if end > len(data):
+                break
+            payload = view[start:end]
+            if zlib.crc32(payload) != checksum:
+                break
+
+            if record_type == self.RECORD_STRINGS:
+                self._read_strings(payload, strings)
+            elif record_type == self.RECORD_CRAWL:
+                time_info, fingerprint, snapshot = self._read_crawl(payload, strings)
+                snapshots[time_info] = snapshot
+                fingerprints[time_info] = fingerprint
+                txt_mtimes.pop(time_info, None)
+            elif record_type == self.RECORD_TXT_STAT:
+                time_sid, mtime_ns = self._TXT_STAT.unpack_from(payload, 0)
+                txt_mtimes[strings[time_sid]] = mtime_ns
+            offset = end
+
+        if txt_dir is not None:
+            for time_info, fingerprint in fingerprints.items():
+                txt_path = txt_dir / f"{time_info}.txt"
+                try:
+                    st = txt_path.stat()
+                except OSError:
+                    continue
+                if st.st_size != fingerprint[0]:
+                    del snapshots[time_info]
+                elif txt_mtimes.get(time_info) == st.st_mtime_ns:
+                    continue
+                elif self.file_fingerprint(txt_path) != fingerprint:
+                    del snapshots[time_info]
+
+        return snapshots
+
+    @staticmethod
+    def file_fingerprint(file_path: Path) -> Tuple[int, int]:
+        """文件指纹 (大小, crc32)"""
+        with open(file_path, "rb") as f:
+            data = f.read()
+        return len(data), zlib.crc32(data)
+
+    def _read_strings(self, payload: memoryview, strings: List[str]) -> None:
+        """解析字符串帧，追加到字符串表"""
+        (count,) = self._U32.unpack_from(payload, 0)
+        pos = 4
+        for _ in range(count):
+            (size,) = self._U32.unpack_from(payload, pos)
+            pos += 4
+            strings.append(str(payload[pos:pos + size], "utf-8"))
+            pos += size
+
+    def _read_crawl(
+        self, payload: memoryview, strings: List[str]
+    ) -> Tuple[str, Tuple[int, int], Tuple[Dict, Dict, List[str]]]:
+        """解析爬取帧，返回 (time_info, txt 文件指纹, 快照数据)"""
+        (
+            time_sid,
+            platform_count,
+            failed_count,
+            txt_size,
+            txt_crc,
+        ) = self._CRAWL_HEAD.unpack_from(payload, 0)
+        pos = self._CRAWL_HEAD.size
+        failed_ids = [
+            strings[index]
+            for (index,) in self._U32.iter_unpack(payload[pos:pos + 4 * failed_count])
+        ]
+        pos += 4 * failed_count
+
+        titles_by_id = {}
+        id_to_name = {}
+        for _ in range(platform_count):
+            id_sid, name_sid, item_count = self._PLATFORM_HEAD.unpack_from(payload, pos)
+            pos += self._PLATFORM_HEAD.size
+            items_end = pos + item_count * self._ITEM.size
+            # 与 txt 解析一致：没有标题的平台不计入
+            if item_count:
+                platform_id = strings[id_sid]
+                id_to_name[platform_id] = strings[name_sid]
+                titles = {}
+                for rank, title_sid, url_sid, mobile_sid in self._ITEM.iter_unpack(
+                    payload[pos:items_end]
+                ):
+                    titles[strings[title_sid]] = {
+                        "ranks": [rank],
+                        "url": strings[url_sid],
+                        "mobileUrl": strings[mobile_sid],
+                    }
+                titles_by_id[platform_id] = titles
+            pos = items_end
+
+        return (
+            strings[time_sid],
+            (txt_size, txt_crc),
+            (titles_by_id, id_to_name, failed_ids),
+        )
+
+
+def txt_file_stats(txt_dir: Path) -> Dict[str, Tuple[int, int]]:
+    """当天 txt 文件的 {time_info: (大小, mtime_ns)}"""
+    if not txt_dir.exists():
+        return {}
+    stats = {}
+    for file_path in txt_dir.glob("*.txt"):
+        st = file_path.stat()
+        stats[file_path.stem] = (st.st_size, st.st_mtime_ns)
+    return stats
+
+
+def sources_match(
+    sources: Dict, txt_dir: Path, txt_stats: Dict[str, Tuple[int, int]]
+) -> bool:
+    """
+    爬虫写入的派生文件记录的数据源是否与当前 txt 文件一致
+
+    Args:
+        sources: 文件中记录的 {time_info: {size, mtime_ns, crc}}（仅存在于快照存储的 size 为 None）
+        txt_dir: 当天的 txt 目录
+        txt_stats: 当前 txt 文件的 {time_info: (大小, mtime_ns)}
+    """
+    recorded = {
+        time_info for time_info, source in sources.items()
+        if source.get("size") is not None
+    }
+    if recorded != set(txt_stats):
+        return False
+    for time_info in recorded:
+        source = sources[time_info]
+        size, mtime_ns = txt_stats[time_info]
+        if source["size"] == size and source.get("mtime_ns") == mtime_ns:
+            continue
+        # 仅 mtime 变化（如被复制）时按内容校验
+        fingerprint = SnapshotReader.file_fingerprint(txt_dir / f"{time_info}.txt")
+        if fingerprint != (source["size"], source.get("crc")):
+            return False
+    return True
@@ -0,0 +1,307 @@
+"""
+工具执行服务
+
+MCP 工具函数是 async def，但工具实现是同步的文件读取和统计，直接调用会阻塞事件循环，
+一个长时间的跨月查询就会卡住 HTTP 传输上的所有客户端。这里把工具调用交给有界线程池执行，
+并按工具限制并发数和超时时间，统计排队深度，供系统状态查询。
+参数相同的并发调用合并为一次执行，共享同一个结果。
+"""
+
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import Any, Callable, Dict, Optional
+
+from ..utils.errors import ServerBusyError, ToolTimeoutError
+
+
+# 线程池大小
+DEFAULT_MAX_WORKERS = 8
+
+# 单个工具的默认并发数与超时（秒）
+DEFAULT_TOOL_LIMIT = 4
+DEFAULT_TOOL_TIMEOUT = 120
+
+# 等待中（排队 + 执行中）的调用总数上限，超过时直接拒绝
+DEFAULT_MAX_PENDING = 64
+
+# 跨日期读取和全量统计的工具并发较低，避免占满线程池；爬取任务串行执行
+TOOL_LIMITS = {
+    "analyze_topic_trend": 2,
+    "analyze_data_insights": 2,
+    "analyze_sentiment": 2,
+    "find_similar_news": 2,
+    "generate_summary_report": 2,
+    "search_related_news_history": 2,
+    "trigger_crawl": 1,
+}
+
+TOOL_TIMEOUTS = {
+    "trigger_crawl": 300,
+}
+
+
+class _ToolStats:
+    """单个工具的执行统计"""
+
+    __slots__ = (
+        "waiting", "queued", "running", "calls", "completed", "failed",
+        "timeouts", "rejected", "coalesced", "total_seconds", "max_seconds"
+    )
+
+    def __init__(self):
+        self.waiting = 0    # 等待工具并发名额
+        self.queued = 0     # 已提交线程池、尚未开始执行
+        self.running = 0
+        self.calls = 0
+        self.completed = 0
+        self.failed = 0
+        self.timeouts = 0
+        self.rejected = 0
+        self.coalesced = 0  # 并入相同参数的进行中调用
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+
+class ToolExecutor:
+    """工具执行器
+
+    每次调用先获取该工具的并发名额，再提交到共享线程池执行。超时后调用方立即收到
+    ToolTimeoutError，但线程中的工作无法中断，会继续执行到结束，
+    期间仍占用该工具的并发名额，避免超时请求不断堆积新的线程。
+    """
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        default_limit: int = DEFAULT_TOOL_LIMIT,
+        default_timeout: float = DEFAULT_TOOL_TIMEOUT,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        tool_limits: Optional[Dict[str, int]] = None,
+        tool_timeouts: Optional[Dict[str, float]] = None
+    ):
+        """
+        初始化工具执行器
+
+        Args:
+            max_workers: 线程池大小
+            default_limit: 单个工具的默认并发数
+            default_timeout: 默认超时（秒）
+            max_pending: 等待中的调用总数上限
+            tool_limits: {工具名: 并发数}，覆盖默认值
+            tool_timeouts: {工具名: 超时秒数}，覆盖默认值
+        """
+        self.max_workers = max_workers
+        self.default_limit = default_limit
+        self.default_timeout = default_timeout
+        self.max_pending = max_pending
+        self.tool_limits = dict(TOOL_LIMITS if tool_limits is None else tool_limits)
+        self.tool_timeouts = dict(TOOL_TIMEOUTS if tool_timeouts is None else tool_timeouts)
+
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="mcp-tool")
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._stats: Dict[str, _ToolStats] = {}
+        self._inflight: Dict[tuple, asyncio.Future] = {}
+        self._pending = 0
+        # 计数在事件循环和工作线程中都会更新
+        self._lock = Lock()
+
+    def get_limit(self, tool_name: str) -> int:
+        """工具的并发数"""
+        return max(1, min(self.tool_limits.get(tool_name, self.default_limit), self.max_workers))
+
+    def get_timeout(self, tool_name: str) -> float:
+        """工具的超时（秒）"""
+        return self.tool_timeouts.get(tool_name, self.default_timeout)
+
+    async def run(self, tool_name: str, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        在线程池中执行工具函数
+
+        Args:
+            tool_name: 工具名（决定并发数和超时）
+            func: 同步的工具函数
+            *args, **kwargs: 传给 func 的参数
+
+        Returns:
+            func 的返回值
+
+        Raises:
+            ServerBusyError: 等待中的调用过多
+            ToolTimeoutError: 排队加执行超过该工具的超时
+            func 抛出的异常
+        """
+        loop = asyncio.get_running_loop()
+        timeout = self.get_timeout(tool_name)
+        deadline = loop.time() + timeout
+        semaphore = self._semaphores.get(tool_name)
+        if semaphore is None:
+            semaphore = self._semaphores[tool_name] = asyncio.Semaphore(self.get_limit(tool_name))
+
+        with self._lock:
+            stats = self._stats.setdefault(tool_name, _ToolStats())
+            stats.calls += 1
+            if self._pending >= self.max_pending:
+                stats.rejected += 1
+                raise ServerBusyError(f"当前有 {self._pending} 个工具调用正在等待，暂不接受新的调用")
+            self._pending += 1
+            stats.waiting += 1
+
+        try:
+            await asyncio.wait_for(semaphore.acquire(), timeout)
+        except asyncio.TimeoutError:
+            with self._lock:
+                stats.waiting -= 1
+                stats.timeouts += 1
+                self._pending -= 1
+            raise ToolTimeoutError(tool_name, timeout)
+        except BaseException:
+            with self._lock:
+                stats.waiting -= 1
+                self._pending -= 1
+            raise
+
+        with self._lock:
+            stats.waiting -= 1
+            stats.queued += 1
+
+        def call():
+            with self._lock:
+                stats.queued -= 1
+                stats.running += 1
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - started
+                with self._lock:
+                    stats.running -= 1
+                    stats.total_seconds += elapsed
+                    stats.max_seconds = max(stats.max_seconds, elapsed)
+
+        def on_done(future: asyncio.Future) -> None:
+            # 线程中的工作真正结束后才释放名额（超时后也会等到此时）
+            semaphore.release()
+            with self._lock:
+                self._pending -= 1
+                if future.cancelled() or future.exception() is not None:
+                    stats.failed += 1
+                else:
+                    stats.completed += 1
+
+        future = loop.run_in_executor(self._pool, call)
+        future.add_done_callback(on_done)
+
+        try:
+            return await asyncio.wait_for(
+                asyncio.shield(future), max(deadline - loop.time(), 0)
+            )
+        except asyncio.TimeoutError:
+            with self._lock:
+                stats.timeouts += 1
+            raise ToolTimeoutError(tool_name, timeout)
+
+    @staticmethod
+    def normalize_arguments(kwargs: Dict) -> str:
+        """把工具参数序列化为与关键字顺序无关的字符串，作为合并调用的键"""
+        return json.dumps(kwargs, sort_keys=True, ensure_ascii=False, default=str)
+
+    async def run_shared(self, tool_name: str, func: Callable[..., Any], **kwargs) -> Any:
+        """
+        执行工具函数，与正在进行的相同调用（工具名和参数均相同）合并
+
+        先到的调用按 run 正常执行，其后到达的相同调用直接等待它的结果（或异常），
+        不再占用并发名额。只适用于无副作用的查询工具；返回的结果对象被所有调用方共享。
+
+        Args:
+            tool_name: 工具名
+            func: 同步的工具函数
+            **kwargs: 传给 func 的参数（须可 JSON 序列化或可转为字符串）
+
+        Returns:
+            func 的返回值
+        """
+        key = (tool_name, self.normalize_arguments(kwargs))
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self.run(tool_name, func, **kwargs))
+            self._inflight[key] = task
+
+            def on_done(finished: asyncio.Future) -> None:
+                if self._inflight.get(key) is finished:
+                    del self._inflight[key]
+                if not finished.cancelled():
+                    # 所有调用方都已取消时避免“异常未被读取”的警告
+                    finished.exception()
+
+            task.add_done_callback(on_done)
+        else:
+            with self._lock:
+                self._stats.setdefault(tool_name, _ToolStats()).coalesced += 1
+
+        # 单个调用方取消（如客户端断开）不影响其他等待同一结果的调用
+        return await asyncio.shield(task)
+
+    def get_stats(self) -> Dict:
+        """
+        获取执行统计
+
+        Returns:
+            统计信息字典，queue_depth 为等待名额与等待线程的调用数之和
+        """
+        with self._lock:
+            tools = {}
+            for tool_name, stats in sorted(self._stats.items()):
+                finished = stats.completed + stats.failed
+                tools[tool_name] = {
+                    "limit": self.get_limit(tool_name),
+                    "timeout": self.get_timeout(tool_name),
+                    "waiting": stats.waiting,
+                    "queued": stats.queued,
+                    "running": stats.running,
+                    "calls": stats.calls,
+                    "completed": stats.completed,
+                    "failed": stats.failed,
+                    "timeouts": stats.timeouts,
+                    "rejected": stats.rejected,
+                    "coalesced": stats.coalesced,
+                    "avg_seconds": round(stats.total_seconds / finished, 3) if finished else 0,
+                    "max_seconds": round(stats.max_seconds, 3),
+                }
+            return {
+                "max_workers": self.max_workers,
+                "max_pending": self.max_pending,
+                "pending": self._pending,
+                "inflight_shared": len(self._inflight),
+                "queue_depth": sum(s.waiting + s.queued for s in self._stats.values()),
+                "running": sum(s.running for s in self._stats.values()),
+                "tools": tools,
+            }
+
+    def shutdown(self, wait: bool = False) -> None:
+        """关闭线程池"""
+        self._pool.shutdown(wait=wait)
+
+
+# 全局执行器实例
+_global_executor: Optional[ToolExecutor] = None
+_global_executor_lock = Lock()
+
+
+def get_tool_executor(**kwargs) -> ToolExecutor:
+    """
+    获取全局工具执行器实例
+
+    Args:
+        **kwargs: 首次创建时传给 ToolExecutor 的参数，之后忽略
+
+    Returns:
+        全局工具执行器实例
+    """
+    global _global_executor
+    with _global_executor_lock:
+        if _global_executor is None:
+            _global_executor = ToolExecutor(**kwargs)
+        return _global_executor
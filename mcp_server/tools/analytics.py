@@ -11,6 +11,8 @@ from typing import Dict, List, Optional
 from difflib import SequenceMatcher
 
 from ..services.data_service import DataService
+from ..services.keyword_rollup import extract_keywords
+from ..services.range_loader import iter_date_range
 from ..utils.validators import (
     validate_platforms,
     validate_limit,
@@ -306,41 +308,23 @@ class AnalyticsTools:
                 end_date = datetime.now()
                 start_date = end_date - timedelta(days=6)
 
-            # 收集趋势数据
+            # 收集趋势数据（并发加载各天，通过标题倒排索引统计话题出现次数）
             trend_data = []
-            current_date = start_date
-
-            while current_date <= end_date:
-                try:
-                    all_titles, _, _ = self.data_service.parser.read_all_titles_for_date(
-                        date=current_date
-                    )
 
-                    # 统计该时间点的话题出现次数
-                    count = 0
-                    matched_titles = []
-
-                    for _, titles in all_titles.items():
-                        for title in titles.keys():
-                            if topic.lower() in title.lower():
-                                count += 1
-                                matched_titles.append(title)
-
-                    trend_data.append({
-                        "date": current_date.strftime("%Y-%m-%d"),
-                        "count": count,
-                        "sample_titles": matched_titles[:3]  # 只保留前3个样本
-                    })
-
-                except DataNotFoundError:
-                    trend_data.append({
-                        "date": current_date.strftime("%Y-%m-%d"),
-                        "count": 0,
-                        "sample_titles": []
-                    })
-
-                # 按天增加时间
-                current_date += timedelta(days=1)
+            def search_day(current_date):
+                matches, _ = self.data_service.search_index.search(
+                    topic,
+                    date=current_date
+                )
+                return matches
+
+            for current_date, matches in iter_date_range(start_date, end_date, search_day):
+                matches = matches or []
+                trend_data.append({
+                    "date": current_date.strftime("%Y-%m-%d"),
+                    "count": len(matches),
+                    "sample_titles": [title for _, title, _ in matches[:3]]  # 只保留前3个样本
+                })
 
             # 计算趋势指标
             counts = [item["count"] for item in trend_data]
@@ -448,33 +432,36 @@ class AnalyticsTools:
                 "top_keywords": Counter()
             })
 
-            # 遍历日期范围
-            current_date = start_date
-            while current_date <= end_date:
-                try:
-                    all_titles, id_to_name, _ = self.data_service.parser.read_all_titles_for_date(
-                        date=current_date
-                    )
-
-                    for platform_id, titles in all_titles.items():
-                        platform_name = id_to_name.get(platform_id, platform_id)
+            def collect_day(current_date):
+                """统计单日各平台数据，返回 [(platform_name, titles, topic_mentions, keywords)]"""
+                all_titles, id_to_name, _ = self.data_service.parser.read_all_titles_for_date(
+                    date=current_date
+                )
 
-                        for title in titles.keys():
-                            platform_stats[platform_name]["total_news"] += 1
-                            platform_stats[platform_name]["unique_titles"].add(title)
+                day_stats = []
+                for platform_id, titles in all_titles.items():
+                    platform_name = id_to_name.get(platform_id, platform_id)
+                    topic_mentions = 0
+                    keywords = Counter()
 
-                            # 如果指定了话题，统计包含话题的新闻
-                            if topic and topic.lower() in title.lower():
-                                platform_stats[platform_name]["topic_mentions"] += 1
+                    for title in titles.keys():
+                        # 如果指定了话题，统计包含话题的新闻
+                        if topic and topic.lower() in title.lower():
+                            topic_mentions += 1
 
-                            # 提取关键词（简单分词）
-                            keywords = self._extract_keywords(title)
-                            platform_stats[platform_name]["top_keywords"].update(keywords)
+                        # 提取关键词（简单分词）
+                        keywords.update(self._extract_keywords(title))
 
-                except DataNotFoundError:
-                    pass
+                    day_stats.append((platform_name, list(titles), topic_mentions, keywords))
+                return day_stats
 
-                current_date += timedelta(days=1)
+            # 并发加载日期范围内各天，按日期顺序合并
+            for _, day_stats in iter_date_range(start_date, end_date, collect_day):
+                for platform_name, titles, topic_mentions, keywords in day_stats or []:
+                    platform_stats[platform_name]["total_news"] += len(titles)
+                    platform_stats[platform_name]["unique_titles"].update(titles)
+                    platform_stats[platform_name]["topic_mentions"] += topic_mentions
+                    platform_stats[platform_name]["top_keywords"].update(keywords)
 
             # 转换为可序列化的格式
             result_stats = {}
@@ -557,53 +544,26 @@ class AnalyticsTools:
             min_frequency = validate_limit(min_frequency, default=3, max_limit=100)
             top_n = validate_top_n(top_n, default=20)
 
-            # 读取今天的数据
-            all_titles, _, _ = self.data_service.parser.read_all_titles_for_date()
-
-            # 关键词共现统计
-            cooccurrence = Counter()
-            keyword_titles = defaultdict(list)
-
-            for platform_id, titles in all_titles.items():
-                for title in titles.keys():
-                    # 提取关键词
-                    keywords = self._extract_keywords(title)
-
-                    # 记录每个关键词出现的标题
-                    for kw in keywords:
-                        keyword_titles[kw].append(title)
-
-                    # 计算两两共现
-                    if len(keywords) >= 2:
-                        for i, kw1 in enumerate(keywords):
-                            for kw2 in keywords[i+1:]:
-                                # 统一排序，避免重复
-                                pair = tuple(sorted([kw1, kw2]))
-                                cooccurrence[pair] += 1
+            # 读取今天的关键词统计表（共现次数与样本标题已按次爬取预先计算）
+            rollup = self.data_service.keyword_rollup.get_day_rollup()
 
             # 过滤低频共现
             filtered_pairs = [
-                (pair, count) for pair, count in cooccurrence.items()
-                if count >= min_frequency
+                pair for pair in rollup.pairs
+                if pair[2] >= min_frequency
             ]
 
             # 排序并取TOP N
-            top_pairs = sorted(filtered_pairs, key=lambda x: x[1], reverse=True)[:top_n]
+            top_pairs = sorted(filtered_pairs, key=lambda x: x[2], reverse=True)[:top_n]
 
             # 构建结果
             result_pairs = []
-            for (kw1, kw2), count in top_pairs:
-                # 找出同时包含两个关键词的标题样本
-                titles_with_both = [
-                    title for title in keyword_titles[kw1]
-                    if kw2 in self._extract_keywords(title)
-                ]
-
+            for kw1, kw2, count, sample_titles in top_pairs:
                 result_pairs.append({
                     "keyword1": kw1,
                     "keyword2": kw2,
                     "cooccurrence_count": count,
-                    "sample_titles": titles_with_both[:3]
+                    "sample_titles": sample_titles[:3]
                 })
 
             return {
@@ -956,8 +916,9 @@ class AnalyticsTools:
             # 读取数据
             all_titles, id_to_name, _ = self.data_service.parser.read_all_titles_for_date()
 
-            # 计算相似度
+            # 计算相似度（字符索引排除上界低于阈值的标题，其余精确计算）
             similar_items = []
+            scorer = self.data_service.similarity.get_day_profiles().scorer(reference_title)
 
             for platform_id, titles in all_titles.items():
                 platform_name = id_to_name.get(platform_id, platform_id)
@@ -967,9 +928,9 @@ class AnalyticsTools:
                         continue
 
                     # 计算相似度
-                    similarity = self._calculate_similarity(reference_title, title)
+                    similarity = scorer.score(title, threshold)
 
-                    if similarity >= threshold:
+                    if similarity is not None and similarity >= threshold:
                         news_item = {
                             "title": title,
                             "platform": platform_id,
@@ -1379,35 +1340,29 @@ class AnalyticsTools:
                 "hourly_distribution": Counter()
             })
 
-            # 遍历日期范围
-            current_date = start_date
-            while current_date <= end_date:
-                try:
-                    all_titles, id_to_name, timestamps = self.data_service.parser.read_all_titles_for_date(
-                        date=current_date
-                    )
-
-                    for platform_id, titles in all_titles.items():
-                        platform_name = id_to_name.get(platform_id, platform_id)
+            # 并发读取各天的关键词统计表（含各平台标题数和当天的爬取文件）
+            for current_date, rollup in iter_date_range(
+                start_date, end_date, self.data_service.keyword_rollup.get_day_rollup
+            ):
+                if rollup is None:
+                    continue
 
-                        platform_activity[platform_name]["news_count"] += len(titles)
-                        platform_activity[platform_name]["days_active"].add(current_date.strftime("%Y-%m-%d"))
+                for platform_id, news_count in rollup.platform_counts.items():
+                    platform_name = rollup.id_to_name.get(platform_id, platform_id)
 
-                        # 统计更新次数（基于文件数量）
-                        platform_activity[platform_name]["total_updates"] += len(timestamps)
+                    platform_activity[platform_name]["news_count"] += news_count
+                    platform_activity[platform_name]["days_active"].add(current_date.strftime("%Y-%m-%d"))
 
-                        # 统计时间分布（基于文件名中的时间）
-                        for filename in timestamps.keys():
-                            # 解析文件名中的小时（格式：HHMM.txt）
-                            match = re.match(r'(\d{2})(\d{2})\.txt', filename)
-                            if match:
-                                hour = int(match.group(1))
-                                platform_activity[platform_name]["hourly_distribution"][hour] += 1
+                    # 统计更新次数（基于文件数量）
+                    platform_activity[platform_name]["total_updates"] += len(rollup.crawl_files)
 
-                except DataNotFoundError:
-                    pass
-
-                current_date += timedelta(days=1)
+                    # 统计时间分布（基于文件名中的时间）
+                    for filename in rollup.crawl_files:
+                        # 解析文件名中的小时（格式：HHMM.txt）
+                        match = re.match(r'(\d{2})(\d{2})\.txt', filename)
+                        if match:
+                            hour = int(match.group(1))
+                            platform_activity[platform_name]["hourly_distribution"][hour] += 1
 
             # 转换为可序列化的格式
             result_activity = {}
@@ -1507,34 +1462,21 @@ class AnalyticsTools:
                 end_date = datetime.now()
                 start_date = end_date - timedelta(days=6)
 
-            # 收集话题历史数据
+            # 收集话题历史数据（并发加载各天，通过标题倒排索引统计话题出现次数）
             lifecycle_data = []
-            current_date = start_date
-            while current_date <= end_date:
-                try:
-                    all_titles, _, _ = self.data_service.parser.read_all_titles_for_date(
-                        date=current_date
-                    )
-
-                    # 统计该日的话题出现次数
-                    count = 0
-                    for _, titles in all_titles.items():
-                        for title in titles.keys():
-                            if topic.lower() in title.lower():
-                                count += 1
-
-                    lifecycle_data.append({
-                        "date": current_date.strftime("%Y-%m-%d"),
-                        "count": count
-                    })
 
-                except DataNotFoundError:
-                    lifecycle_data.append({
-                        "date": current_date.strftime("%Y-%m-%d"),
-                        "count": 0
-                    })
+            def count_day(current_date):
+                matches, _ = self.data_service.search_index.search(
+                    topic,
+                    date=current_date
+                )
+                return len(matches)
 
-                current_date += timedelta(days=1)
+            for current_date, count in iter_date_range(start_date, end_date, count_day):
+                lifecycle_data.append({
+                    "date": current_date.strftime("%Y-%m-%d"),
+                    "count": count or 0
+                })
 
             # 计算分析天数
             total_days = (end_date - start_date).days + 1
@@ -1659,37 +1601,19 @@ class AnalyticsTools:
 
             time_window = validate_limit(time_window, default=24, max_limit=72)
 
-            # 读取当前和之前的数据
-            current_all_titles, _, _ = self.data_service.parser.read_all_titles_for_date()
+            # 读取当前的关键词统计表
+            current_rollup = self.data_service.keyword_rollup.get_day_rollup()
+            current_keywords = current_rollup.keyword_counts
+            current_keyword_titles = current_rollup.keyword_samples
 
-            # 读取昨天的数据作为基准
+            # 读取昨天的统计表作为基准
             yesterday = datetime.now() - timedelta(days=1)
             try:
-                previous_all_titles, _, _ = self.data_service.parser.read_all_titles_for_date(
+                previous_keywords = self.data_service.keyword_rollup.get_day_rollup(
                     date=yesterday
-                )
+                ).keyword_counts
             except DataNotFoundError:
-                previous_all_titles = {}
-
-            # 统计当前的关键词频率
-            current_keywords = Counter()
-            current_keyword_titles = defaultdict(list)
-
-            for _, titles in current_all_titles.items():
-                for title in titles.keys():
-                    keywords = self._extract_keywords(title)
-                    current_keywords.update(keywords)
-
-                    for kw in keywords:
-                        current_keyword_titles[kw].append(title)
-
-            # 统计之前的关键词频率
-            previous_keywords = Counter()
-
-            for _, titles in previous_all_titles.items():
-                for title in titles.keys():
-                    keywords = self._extract_keywords(title)
-                    previous_keywords.update(keywords)
+                previous_keywords = {}
 
             # 检测异常热度
             viral_topics = []
@@ -1802,16 +1726,9 @@ class AnalyticsTools:
                 date = datetime.now() - timedelta(days=days_ago)
 
                 try:
-                    all_titles, _, _ = self.data_service.parser.read_all_titles_for_date(
+                    keywords_count = self.data_service.keyword_rollup.get_day_rollup(
                         date=date
-                    )
-
-                    # 统计关键词
-                    keywords_count = Counter()
-                    for _, titles in all_titles.items():
-                        for title in titles.keys():
-                            keywords = self._extract_keywords(title)
-                            keywords_count.update(keywords)
+                    ).keyword_counts
 
                     # 记录每个关键词的历史数据
                     for keyword, count in keywords_count.items():
@@ -1822,18 +1739,9 @@ class AnalyticsTools:
 
             # 添加今天的数据
             try:
-                all_titles, _, _ = self.data_service.parser.read_all_titles_for_date()
-
-                keywords_count = Counter()
-                keyword_titles = defaultdict(list)
-
-                for _, titles in all_titles.items():
-                    for title in titles.keys():
-                        keywords = self._extract_keywords(title)
-                        keywords_count.update(keywords)
-
-                        for kw in keywords:
-                            keyword_titles[kw].append(title)
+                rollup = self.data_service.keyword_rollup.get_day_rollup()
+                keywords_count = rollup.keyword_counts
+                keyword_titles = rollup.keyword_samples
 
                 for keyword, count in keywords_count.items():
                     keyword_trends[keyword].append(count)
@@ -1931,22 +1839,7 @@ class AnalyticsTools:
         Returns:
             关键词列表
         """
-        # 移除URL和特殊字符
-        title = re.sub(r'http[s]?://\S+', '', title)
-        title = re.sub(r'[^\w\s]', ' ', title)
-
-        # 简单分词（按空格和常见分隔符）
-        words = re.split(r'[\s，。！？、]+', title)
-
-        # 过滤停用词和短词
-        stopwords = {'的', '了', '在', '是', '我', '有', '和', '就', '不', '人', '都', '一', '一个', '上', '也', '很', '到', '说', '要', '去', '你', '会', '着', '没有', '看', '好', '自己', '这'}
-
-        keywords = [
-            word.strip() for word in words
-            if word.strip() and len(word.strip()) >= min_length and word.strip() not in stopwords
-        ]
-
-        return keywords
+        return extract_keywords(title, min_length)
 
     def _calculate_similarity(self, text1: str, text2: str) -> float:
         """
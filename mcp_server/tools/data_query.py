@@ -35,7 +35,8 @@ class DataQueryTools:
         self,
         platforms: Optional[List[str]] = None,
         limit: Optional[int] = None,
-        include_url: bool = False
+        include_url: bool = False,
+        only_new: bool = False
     ) -> Dict:
         """
         获取最新一批爬取的新闻数据
@@ -44,6 +45,7 @@ class DataQueryTools:
             platforms: 平台ID列表，如 ['zhihu', 'weibo']
             limit: 返回条数限制，默认20
             include_url: 是否包含URL链接，默认False（节省token）
+            only_new: 是否只返回最新一批中首次出现的新闻，默认False
 
         Returns:
             新闻列表字典
@@ -63,7 +65,8 @@ class DataQueryTools:
             news_list = self.data_service.get_latest_news(
                 platforms=platforms,
                 limit=limit,
-                include_url=include_url
+                include_url=include_url,
+                only_new=only_new
             )
 
             return {
@@ -11,6 +11,8 @@ from difflib import SequenceMatcher
 from typing import Dict, List, Optional, Tuple
 
 from ..services.data_service import DataService
+from ..services.range_loader import iter_date_range
+from ..services.similarity import SimilarityScorer
 from ..utils.validators import validate_keyword, validate_limit
 from ..utils.errors import MCPError, InvalidParameterError, DataNotFoundError
 
@@ -126,17 +128,27 @@ class SearchTools:
 
             while current_date <= end_date:
                 try:
+                    # 根据搜索模式执行不同的搜索逻辑
+                    if search_mode == "keyword":
+                        # 关键词模式直接查询标题倒排索引
+                        index_matches, id_to_name = self.data_service.search_index.search(
+                            query,
+                            date=current_date,
+                            platform_ids=platforms
+                        )
+                        matches = self._search_by_keyword_mode(
+                            query, index_matches, id_to_name, current_date, include_url
+                        )
+                        all_matches.extend(matches)
+                        current_date += timedelta(days=1)
+                        continue
+
                     all_titles, id_to_name, timestamps = self.data_service.parser.read_all_titles_for_date(
                         date=current_date,
                         platform_ids=platforms
                     )
 
-                    # 根据搜索模式执行不同的搜索逻辑
-                    if search_mode == "keyword":
-                        matches = self._search_by_keyword_mode(
-                            query, all_titles, id_to_name, current_date, include_url
-                        )
-                    elif search_mode == "fuzzy":
+                    if search_mode == "fuzzy":
                         matches = self._search_by_fuzzy_mode(
                             query, all_titles, id_to_name, current_date, threshold, include_url
                         )
@@ -242,7 +254,7 @@ class SearchTools:
     def _search_by_keyword_mode(
         self,
         query: str,
-        all_titles: Dict,
+        index_matches: List[Tuple[str, str, Dict]],
         id_to_name: Dict,
         current_date: datetime,
         include_url: bool
@@ -252,7 +264,7 @@ class SearchTools:
 
         Args:
             query: 搜索关键词
-            all_titles: 所有标题字典
+            index_matches: 标题倒排索引返回的命中列表 [(platform_id, title, info)]
             id_to_name: 平台ID到名称映射
             current_date: 当前日期
 
@@ -260,31 +272,26 @@ class SearchTools:
             匹配的新闻列表
         """
         matches = []
-        query_lower = query.lower()
 
-        for platform_id, titles in all_titles.items():
+        for platform_id, title, info in index_matches:
             platform_name = id_to_name.get(platform_id, platform_id)
+            news_item = {
+                "title": title,
+                "platform": platform_id,
+                "platform_name": platform_name,
+                "date": current_date.strftime("%Y-%m-%d"),
+                "similarity_score": 1.0,  # 精确匹配，相似度为1
+                "ranks": info.get("ranks", []),
+                "count": len(info.get("ranks", [])),
+                "rank": info["ranks"][0] if info["ranks"] else 999
+            }
 
-            for title, info in titles.items():
-                # 精确包含判断
-                if query_lower in title.lower():
-                    news_item = {
-                        "title": title,
-                        "platform": platform_id,
-                        "platform_name": platform_name,
-                        "date": current_date.strftime("%Y-%m-%d"),
-                        "similarity_score": 1.0,  # 精确匹配，相似度为1
-                        "ranks": info.get("ranks", []),
-                        "count": len(info.get("ranks", [])),
-                        "rank": info["ranks"][0] if info["ranks"] else 999
-                    }
-
-                    # 条件性添加 URL 字段
-                    if include_url:
-                        news_item["url"] = info.get("url", "")
-                        news_item["mobileUrl"] = info.get("mobileUrl", "")
+            # 条件性添加 URL 字段
+            if include_url:
+                news_item["url"] = info.get("url", "")
+                news_item["mobileUrl"] = info.get("mobileUrl", "")
 
-                    matches.append(news_item)
+            matches.append(news_item)
 
         return matches
 
@@ -311,13 +318,16 @@ class SearchTools:
             匹配的新闻列表
         """
         matches = []
+        scorer = self.data_service.similarity.get_day_profiles(
+            current_date, lowercase=True
+        ).scorer(query)
 
         for platform_id, titles in all_titles.items():
             platform_name = id_to_name.get(platform_id, platform_id)
 
             for title, info in titles.items():
                 # 模糊匹配
-                is_match, similarity = self._fuzzy_match(query, title, threshold)
+                is_match, similarity = self._fuzzy_match(query, title, threshold, scorer)
 
                 if is_match:
                     news_item = {
@@ -402,7 +412,13 @@ class SearchTools:
         # 使用 difflib.SequenceMatcher 计算序列相似度
         return SequenceMatcher(None, text1.lower(), text2.lower()).ratio()
 
-    def _fuzzy_match(self, query: str, text: str, threshold: float = 0.3) -> Tuple[bool, float]:
+    def _fuzzy_match(
+        self,
+        query: str,
+        text: str,
+        threshold: float = 0.3,
+        scorer: Optional[SimilarityScorer] = None
+    ) -> Tuple[bool, float]:
         """
         模糊匹配函数
 
@@ -410,6 +426,7 @@ class SearchTools:
             query: 查询文本
             text: 待匹配文本
             threshold: 匹配阈值
+            scorer: 当天标题的相似度计分器（可选，用于跳过不可能达到阈值的计算）
 
         Returns:
             (是否匹配, 相似度分数)
@@ -419,7 +436,12 @@ class SearchTools:
             return True, 1.0
 
         # 计算整体相似度
-        similarity = self._calculate_similarity(query, text)
+        if scorer is not None:
+            similarity = scorer.score(text, threshold)
+            if similarity is None:
+                similarity = 0.0
+        else:
+            similarity = self._calculate_similarity(query, text)
         if similarity >= threshold:
             return True, similarity
 
@@ -572,23 +594,21 @@ class SearchTools:
                     suggestion="请提供更详细的文本内容"
                 )
 
-            # 收集所有相关新闻
-            all_related_news = []
-            current_date = search_start
-
-            while current_date <= search_end:
+            def search_day(current_date):
+                """在单日数据中查找相关新闻"""
+                day_news = []
                 try:
                     # 读取该日期的数据
                     all_titles, id_to_name, _ = self.data_service.parser.read_all_titles_for_date(current_date)
+                    scorer = self.data_service.similarity.get_day_profiles(
+                        current_date, lowercase=True
+                    ).scorer(reference_text)
 
                     # 搜索相关新闻
                     for platform_id, titles in all_titles.items():
                         platform_name = id_to_name.get(platform_id, platform_id)
 
                         for title, info in titles.items():
-                            # 计算标题相似度
-                            title_similarity = self._calculate_similarity(reference_text, title)
-
                             # 提取标题关键词
                             title_keywords = self._extract_keywords(title)
 
@@ -598,6 +618,13 @@ class SearchTools:
                                 title_keywords
                             )
 
+                            # 计算标题相似度（文本相似度达不到综合阈值所需的最低值时跳过）
+                            title_similarity = scorer.score(
+                                title, (threshold - keyword_overlap * 0.7) / 0.3
+                            )
+                            if title_similarity is None:
+                                continue
+
                             # 综合相似度 (70% 关键词重合 + 30% 文本相似度)
                             combined_score = keyword_overlap * 0.7 + title_similarity * 0.3
 
@@ -619,17 +646,22 @@ class SearchTools:
                                     news_item["url"] = info.get("url", "")
                                     news_item["mobileUrl"] = info.get("mobileUrl", "")
 
-                                all_related_news.append(news_item)
+                                day_news.append(news_item)
 
                 except DataNotFoundError:
-                    # 该日期没有数据，继续下一天
-                    pass
+                    # 该日期没有数据，由加载器跳过
+                    raise
                 except Exception as e:
                     # 记录错误但继续处理其他日期
                     print(f"Warning: 处理日期 {current_date.strftime('%Y-%m-%d')} 时出错: {e}")
 
-                # 移动到下一天
-                current_date += timedelta(days=1)
+                return day_news
+
+            # 收集所有相关新闻（并发加载日期范围内各天，按日期顺序合并）
+            all_related_news = []
+            for _, day_news in iter_date_range(search_start, search_end, search_day):
+                if day_news:
+                    all_related_news.extend(day_news)
 
             if not all_related_news:
                 return {
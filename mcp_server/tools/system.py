@@ -146,80 +146,81 @@ class SystemManagementTools:
             results = {}
             id_to_name = {}
             failed_ids = []
+            # 各平台请求同一主机，共用一个 Session 复用连接
+            with requests.Session() as session:
+                for i, id_info in enumerate(ids):
+                    if isinstance(id_info, tuple):
+                        id_value, name = id_info
+                    else:
+                        id_value = id_info
+                        name = id_value
+
+                    id_to_name[id_value] = name
+
+                    # 构建请求URL
+                    url = f"https://newsnow.busiyi.world/api/s?id={id_value}&latest"
+
+                    headers = {
+                        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+                        "Accept": "application/json, text/plain, */*",
+                        "Accept-Language": "zh-CN,zh;q=0.9,en;q=0.8",
+                        "Connection": "keep-alive",
+                        "Cache-Control": "no-cache",
+                    }
 
-            for i, id_info in enumerate(ids):
-                if isinstance(id_info, tuple):
-                    id_value, name = id_info
-                else:
-                    id_value = id_info
-                    name = id_value
-
-                id_to_name[id_value] = name
-
-                # 构建请求URL
-                url = f"https://newsnow.busiyi.world/api/s?id={id_value}&latest"
-
-                headers = {
-                    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
-                    "Accept": "application/json, text/plain, */*",
-                    "Accept-Language": "zh-CN,zh;q=0.9,en;q=0.8",
-                    "Connection": "keep-alive",
-                    "Cache-Control": "no-cache",
-                }
-
-                # 重试机制
-                max_retries = 2
-                retries = 0
-                success = False
+                    # 重试机制
+                    max_retries = 2
+                    retries = 0
+                    success = False
 
-                while retries <= max_retries and not success:
-                    try:
-                        response = requests.get(url, headers=headers, timeout=10)
-                        response.raise_for_status()
+                    while retries <= max_retries and not success:
+                        try:
+                            response = session.get(url, headers=headers, timeout=10)
+                            response.raise_for_status()
 
-                        data_text = response.text
-                        data_json = json.loads(data_text)
+                            data_text = response.text
+                            data_json = json.loads(data_text)
 
-                        status = data_json.get("status", "未知")
-                        if status not in ["success", "cache"]:
-                            raise ValueError(f"响应状态异常: {status}")
+                            status = data_json.get("status", "未知")
+                            if status not in ["success", "cache"]:
+                                raise ValueError(f"响应状态异常: {status}")
 
-                        status_info = "最新数据" if status == "success" else "缓存数据"
-                        print(f"获取 {id_value} 成功（{status_info}）")
+                            status_info = "最新数据" if status == "success" else "缓存数据"
+                            print(f"获取 {id_value} 成功（{status_info}）")
 
-                        # 解析数据
-                        results[id_value] = {}
-                        for index, item in enumerate(data_json.get("items", []), 1):
-                            title = item["title"]
-                            url_link = item.get("url", "")
-                            mobile_url = item.get("mobileUrl", "")
+                            # 解析数据
+                            results[id_value] = {}
+                            for index, item in enumerate(data_json.get("items", []), 1):
+                                title = item["title"]
+                                url_link = item.get("url", "")
+                                mobile_url = item.get("mobileUrl", "")
 
-                            if title in results[id_value]:
-                                results[id_value][title]["ranks"].append(index)
+                                if title in results[id_value]:
+                                    results[id_value][title]["ranks"].append(index)
+                                else:
+                                    results[id_value][title] = {
+                                        "ranks": [index],
+                                        "url": url_link,
+                                        "mobileUrl": mobile_url,
+                                    }
+
+                            success = True
+
+                        except Exception as e:
+                            retries += 1
+                            if retries <= max_retries:
+                                wait_time = random.uniform(3, 5)
+                                print(f"请求 {id_value} 失败: {e}. {wait_time:.2f}秒后重试...")
+                                time.sleep(wait_time)
                             else:
-                                results[id_value][title] = {
-                                    "ranks": [index],
-                                    "url": url_link,
-                                    "mobileUrl": mobile_url,
-                                }
-
-                        success = True
-
-                    except Exception as e:
-                        retries += 1
-                        if retries <= max_retries:
-                            wait_time = random.uniform(3, 5)
-                            print(f"请求 {id_value} 失败: {e}. {wait_time:.2f}秒后重试...")
-                            time.sleep(wait_time)
-                        else:
-                            print(f"请求 {id_value} 失败: {e}")
-                            failed_ids.append(id_value)
-
-                # 请求间隔
-                if i < len(ids) - 1:
-                    actual_interval = request_interval + random.randint(-10, 20)
-                    actual_interval = max(50, actual_interval)
-                    time.sleep(actual_interval / 1000)
+                                print(f"请求 {id_value} 失败: {e}")
+                                failed_ids.append(id_value)
+
+                    # 请求间隔
+                    if i < len(ids) - 1:
+                        actual_interval = request_interval + random.randint(-10, 20)
+                        actual_interval = max(50, actual_interval)
+                        time.sleep(actual_interval / 1000)
 
             # 格式化返回数据
             news_data = []
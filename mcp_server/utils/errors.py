@@ -91,3 +91,25 @@ class FileParseError(MCPError):
             code="FILE_PARSE_ERROR",
             suggestion="请检查文件格式是否正确"
         )
+
+
+class ToolTimeoutError(MCPError):
+    """工具执行超时错误"""
+
+    def __init__(self, tool_name: str, timeout: float):
+        super().__init__(
+            message=f"工具 {tool_name} 执行超过 {timeout:g} 秒",
+            code="TOOL_TIMEOUT",
+            suggestion="请缩小日期范围或减少平台数量后重试"
+        )
+
+
+class ServerBusyError(MCPError):
+    """服务器繁忙错误"""
+
+    def __init__(self, message: str, suggestion: Optional[str] = None):
+        super().__init__(
+            message=message,
+            code="SERVER_BUSY",
+            suggestion=suggestion or "请稍后重试"
+        )
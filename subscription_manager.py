@@ -12,9 +12,90 @@
 
 import json
 import os
-from typing import List, Dict, Any, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from datetime import datetime
 
+from keyword_automaton import KeywordAutomaton
+
+
+class SubscriptionMatcher:
+    """多订阅关键词匹配引擎
+
+    将所有订阅的普通词、必须词、排除词编译进同一个自动机，
+    对每条新闻只做一次扫描，即可同时得到所有订阅的匹配结果。
+    匹配规则与 SubscriptionManager.match_news_for_subscription 一致。
+    """
+
+    def __init__(self, subscriptions: List[Dict]):
+        """
+        编译订阅关键词
+
+        Args:
+            subscriptions: 订阅配置列表
+        """
+        word_ids: Dict[str, int] = {}
+
+        def intern(words: List[str]) -> frozenset:
+            return frozenset(
+                word_ids.setdefault(word.lower(), len(word_ids)) for word in words
+            )
+
+        self._rules: List[Tuple[frozenset, frozenset, frozenset, int]] = []
+        self._word_to_subs: Dict[int, List[int]] = {}
+        self._unconditional_subs: List[int] = []
+
+        for index, subscription in enumerate(subscriptions):
+            keywords = subscription.get("keywords", {})
+            normal_ids = intern(keywords.get("normal", []))
+            required_ids = intern(keywords.get("required", []))
+            excluded_ids = intern(keywords.get("excluded", []))
+            self._rules.append(
+                (excluded_ids, normal_ids, required_ids, keywords.get("limit", 0))
+            )
+
+            # 候选索引：命中任一普通词（或必须词）才可能匹配
+            index_ids = normal_ids or required_ids
+            if not index_ids:
+                self._unconditional_subs.append(index)
+            for word_id in index_ids:
+                self._word_to_subs.setdefault(word_id, []).append(index)
+
+        self._automaton = KeywordAutomaton(list(word_ids))
+
+    def match_all(self, news_data: List[Dict]) -> List[Tuple[List[Dict], int]]:
+        """
+        单次遍历新闻，为每个订阅筛选匹配结果
+
+        Args:
+            news_data: 新闻数据列表
+
+        Returns:
+            与订阅顺序一致的 [(匹配新闻列表（已应用数量限制）, 限制前匹配总数)]
+        """
+        matched: List[List[Dict]] = [[] for _ in self._rules]
+        totals = [0] * len(self._rules)
+
+        for news in news_data:
+            hits = self._automaton.find_ids(news.get("title", "").lower())
+
+            candidates = set(self._unconditional_subs)
+            for word_id in hits:
+                candidates.update(self._word_to_subs.get(word_id, ()))
+
+            for index in candidates:
+                excluded_ids, normal_ids, required_ids, limit = self._rules[index]
+                if excluded_ids & hits:
+                    continue
+                if normal_ids and not normal_ids & hits:
+                    continue
+                if required_ids and not required_ids <= hits:
+                    continue
+                totals[index] += 1
+                if limit <= 0 or len(matched[index]) < limit:
+                    matched[index].append(news)
+
+        return list(zip(matched, totals))
+
 
 class SubscriptionManager:
     """订阅管理器"""
@@ -107,52 +188,59 @@ class SubscriptionManager:
         Returns:
             匹配的新闻列表
         """
+        matched_news, total = SubscriptionMatcher([subscription]).match_all(news_data)[0]
+        self.print_match_summary(subscription, len(matched_news), total)
+        return matched_news
+
+    def match_news_for_subscriptions(
+        self,
+        subscriptions: List[Dict],
+        news_data: List[Dict]
+    ) -> List[Tuple[List[Dict], int]]:
+        """
+        单次遍历新闻，同时为多个订阅筛选匹配的新闻
+
+        所有订阅的关键词编译为一个自动机，每条新闻只扫描一次，
+        结果与逐个调用 match_news_for_subscription 相同。
+
+        Args:
+            subscriptions: 订阅配置列表
+            news_data: 新闻数据列表
+
+        Returns:
+            与 subscriptions 顺序一致的 [(匹配新闻列表（已应用数量限制）, 限制前匹配总数)]
+        """
+        results = SubscriptionMatcher(subscriptions).match_all(news_data)
+        print(f"[匹配] 单次扫描 {len(news_data)} 条新闻，完成 {len(subscriptions)} 个订阅的匹配")
+        return results
+
+    def print_match_summary(
+        self, subscription: Dict, matched_count: int, total: int, log: Callable[..., None] = print
+    ):
+        """
+        输出订阅的匹配规则与匹配结果
+
+        Args:
+            subscription: 订阅配置
+            matched_count: 应用数量限制后的匹配数
+            total: 应用数量限制前的匹配数
+            log: 输出函数，默认 print（并行处理订阅时传入各订阅自己的日志缓冲）
+        """
         sub_name = subscription.get("name", "未命名订阅")
         keywords = subscription.get("keywords", {})
-        
-        normal_kws = keywords.get("normal", [])
-        required_kws = keywords.get("required", [])
-        excluded_kws = keywords.get("excluded", [])
         limit = keywords.get("limit", 0)
-        
-        print(f"\n[匹配] [{sub_name}] 开始匹配新闻...")
-        print(f"   普通关键词: {normal_kws}")
-        print(f"   必须包含: {required_kws}")
-        print(f"   排除词: {excluded_kws}")
-        print(f"   数量限制: {limit if limit > 0 else '不限制'}")
-        
-        matched_news = []
-        
-        for news in news_data:
-            title = news.get("title", "").lower()
-            
-            # 规则1: 检查过滤词（优先级最高）
-            if excluded_kws:
-                if any(ex.lower() in title for ex in excluded_kws):
-                    continue
-            
-            # 规则2: 检查普通关键词（至少匹配一个）
-            if normal_kws:
-                if not any(kw.lower() in title for kw in normal_kws):
-                    continue
-            
-            # 规则3: 检查必须词（必须全部匹配）
-            if required_kws:
-                if not all(req.lower() in title for req in required_kws):
-                    continue
-            
-            # 通过所有规则，添加到结果
-            matched_news.append(news)
-        
-        # 规则4: 应用数量限制
-        if limit > 0 and len(matched_news) > limit:
-            matched_news = matched_news[:limit]
-            print(f"   [警告] 结果超过限制，截取前 {limit} 条")
-        
-        print(f"   [OK] 匹配到 {len(matched_news)} 条新闻")
-        
-        return matched_news
-    
+
+        log(f"\n[匹配] [{sub_name}] 匹配规则:")
+        log(f"   普通关键词: {keywords.get('normal', [])}")
+        log(f"   必须包含: {keywords.get('required', [])}")
+        log(f"   排除词: {keywords.get('excluded', [])}")
+        log(f"   数量限制: {limit if limit > 0 else '不限制'}")
+
+        if limit > 0 and total > limit:
+            log(f"   [警告] 结果超过限制，截取前 {limit} 条")
+
+        log(f"   [OK] 匹配到 {matched_count} 条新闻")
+
     def get_webhooks(self, subscription: Dict) -> List[Dict]:
         """
         获取订阅的所有webhook配置
@@ -361,7 +449,9 @@ def create_sample_config(output_path: str = "config/subscriptions_sample.json"):
                 "rank_weight": 0.6,
                 "frequency_weight": 0.3,
                 "hotness_weight": 0.1
-            }
+            },
+            "max_workers": 4,
+            "subscription_deadline_seconds": 600
         }
     }
     
@@ -0,0 +1,307 @@
+# coding=utf-8
+
+"""
+AI 评分缓存测试脚本
+用本地桩服务模拟 chat/completions 与 Serper 接口，检查已评分的新闻不再重复发送给 AI，
+分块并发评分时单个分块失败不影响其他分块，以及跨订阅搜索计划合并重复的查询和评分
+"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubAIHandler(BaseHTTPRequestHandler):
+    """模拟 OpenAI 兼容接口：标题含“养老”的新闻评 8 分，其余不返回"""
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        server = self.server
+        if self.path.endswith("/news"):
+            self.send_json(serper_news(server, body))
+            return
+        if server.fail:
+            self.send_response(500)
+            self.end_headers()
+            self.wfile.write(b"stub error")
+            return
+
+        prompt = body["messages"][0]["content"]
+        news_json = prompt.split("**新闻列表：**")[1].split("**要求：**")[0]
+        news = json.loads(news_json)
+        titles = [item["title"] for item in news]
+        with server.lock:
+            server.requests.append({"model": body["model"], "titles": titles})
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+        time.sleep(server.delay)
+        with server.lock:
+            server.active -= 1
+
+        if server.fail_titles & set(titles):
+            self.send_response(500)
+            self.end_headers()
+            self.wfile.write(b"stub chunk error")
+            return
+
+        filtered = [
+            {"id": item["id"], "score": 8, "reason": "相关"}
+            for item in news if "养老" in item["title"]
+        ]
+        content = "```json\n" + json.dumps({"filtered_news": filtered}, ensure_ascii=False) + "\n```"
+        self.send_json({"choices": [{"message": {"content": content}}]})
+
+    def send_json(self, payload):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serper_news(server, body):
+    """模拟 Serper：每个关键字返回 4 条新闻，其中一半标题含“养老”"""
+    with server.lock:
+        server.queries.append(body["q"])
+    time.sleep(server.delay)
+    news = []
+    for keyword in body["q"].split(" OR "):
+        for i in range(4):
+            title = f"{keyword}政策解读{i}" if i % 2 == 0 else f"娱乐八卦{keyword[-1]}{i}"
+            news.append({
+                "title": title,
+                "link": f"https://news.example.com/{keyword}/{i}",
+                "snippet": "",
+                "source": "示例",
+                "date": "1 hour ago",
+            })
+    return {"news": news}
+
+
+def start_stub():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubAIHandler)
+    server.requests = []
+    server.queries = []
+    server.fail = False
+    server.fail_titles = set()
+    server.delay = 0
+    server.active = 0
+    server.max_active = 0
+    server.lock = threading.Lock()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def make_manager(server, cache_dir, model="stub-model", ttl_hours=72, chunk_size=10, concurrency=4):
+    from ai_search import AISearchManager
+
+    manager = AISearchManager({
+        "AI_SEARCH": {
+            "SERPER_API_KEY": "test",
+            "AI_API_KEY": "test",
+            "PRIMARY_KEYWORDS": ["养老金", "养老保险"],
+            "AI_MODEL": model,
+            "AI_API_BASE": f"http://127.0.0.1:{server.server_port}/v1",
+            "SERPER_API_URL": f"http://127.0.0.1:{server.server_port}/news",
+            "SCORE_CACHE_PATH": os.path.join(cache_dir, "ai_score_cache.json"),
+            "SCORE_CACHE_TTL_HOURS": ttl_hours,
+            "SCORE_CHUNK_SIZE": chunk_size,
+            "SCORE_CONCURRENCY": concurrency,
+        }
+    })
+    # 测试中重试不等待
+    manager.score_retry_backoff = 0
+    return manager
+
+
+def make_news(indexes):
+    return [
+        {
+            "title": f"养老金调整新闻{i}" if i % 2 == 0 else f"体育赛事新闻{i}",
+            "link": f"https://news.example.com/a/{i}",
+            "snippet": "",
+            "source": "示例",
+        }
+        for i in indexes
+    ]
+
+
+def test_only_unseen_sent():
+    """第二次运行只发送新出现的新闻，结果与全部重新评分一致"""
+    server = start_stub()
+    with tempfile.TemporaryDirectory() as cache_dir:
+        first = make_manager(server, cache_dir)._filter_with_ai(make_news(range(0, 10)))
+        assert [n["title"] for n in first] == [f"养老金调整新闻{i}" for i in range(0, 10, 2)]
+        assert len(server.requests[-1]["titles"]) == 10
+
+        news = make_news(range(6, 16))
+        second = make_manager(server, cache_dir)._filter_with_ai(news)
+        assert server.requests[-1]["titles"] == [n["title"] for n in make_news(range(10, 16))]
+        assert [n["title"] for n in second] == [n["title"] for n in news if "养老" in n["title"]]
+
+        # 全部命中时不再调用 AI
+        count = len(server.requests)
+        make_manager(server, cache_dir)._filter_with_ai(make_news(range(0, 16)))
+        assert len(server.requests) == count
+    server.shutdown()
+
+
+def test_cache_key_context():
+    """模型变化或条目过期时重新评分，URL 只差跟踪参数时视为同一篇"""
+    server = start_stub()
+    with tempfile.TemporaryDirectory() as cache_dir:
+        make_manager(server, cache_dir)._filter_with_ai(make_news(range(4)))
+
+        variant = make_news(range(4))
+        for item in variant:
+            item["link"] = item["link"].replace("example.com", "EXAMPLE.com") + "/?utm_source=feed#top"
+        count = len(server.requests)
+        make_manager(server, cache_dir)._filter_with_ai(variant)
+        assert len(server.requests) == count
+
+        make_manager(server, cache_dir, model="other-model")._filter_with_ai(make_news(range(4)))
+        assert server.requests[-1]["model"] == "other-model"
+        assert len(server.requests[-1]["titles"]) == 4
+
+        expired = make_manager(server, cache_dir, ttl_hours=1e-9)
+        expired._filter_with_ai(make_news(range(4)))
+        assert len(server.requests[-1]["titles"]) == 4
+    server.shutdown()
+
+
+def test_failure_not_cached():
+    """AI 调用失败时保留未评分的新闻且不写入缓存"""
+    server = start_stub()
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            make_manager(server, cache_dir)._filter_with_ai(make_news(range(2)))
+
+            server.fail = True
+            result = make_manager(server, cache_dir)._filter_with_ai(make_news(range(4)))
+            # 已缓存：0 保留、1 过滤；未评分的 2、3 全部保留
+            assert [n["title"] for n in result] == [
+                "养老金调整新闻0", "养老金调整新闻2", "体育赛事新闻3"
+            ]
+
+            server.fail = False
+            make_manager(server, cache_dir)._filter_with_ai(make_news(range(4)))
+            assert server.requests[-1]["titles"] == ["养老金调整新闻2", "体育赛事新闻3"]
+    finally:
+        server.shutdown()
+
+
+def test_chunked_scoring():
+    """分块并发评分，结果与不分块一致，失败分块只影响块内新闻"""
+    server = start_stub()
+    try:
+        news = make_news(range(23))
+        with tempfile.TemporaryDirectory() as cache_dir:
+            whole = make_manager(server, cache_dir, ttl_hours=0, chunk_size=100)._filter_with_ai(news)
+
+            server.requests.clear()
+            server.delay = 0.2
+            chunked = make_manager(server, cache_dir, ttl_hours=0, chunk_size=5, concurrency=3)._filter_with_ai(news)
+            assert chunked == whole
+            assert sorted(len(r["titles"]) for r in server.requests) == [3, 5, 5, 5, 5]
+            assert server.max_active > 1, server.max_active
+
+            server.delay = 0
+            server.fail_titles = {"体育赛事新闻7"}
+            result = make_manager(server, cache_dir, chunk_size=5)._filter_with_ai(news)
+            # 第 2 块（5-9）失败，块内新闻全部保留，其他块正常筛选
+            expected = [n for i, n in enumerate(news) if 5 <= i <= 9 or "养老" in n["title"]]
+            assert result == expected
+
+            # 失败的分块未写入缓存，恢复后只重新评分这一块
+            server.fail_titles = set()
+            server.requests.clear()
+            assert make_manager(server, cache_dir, chunk_size=5)._filter_with_ai(news) == whole
+            assert [r["titles"] for r in server.requests] == [[n["title"] for n in news[5:10]]]
+    finally:
+        server.shutdown()
+
+
+def make_search_config(server, primary, fallback=()):
+    return {
+        "AI_SEARCH": {
+            "ENABLED": True,
+            "SERPER_API_KEY": "test",
+            "AI_API_KEY": "test",
+            "PRIMARY_KEYWORDS": list(primary),
+            "FALLBACK_KEYWORDS": list(fallback),
+            "AI_MODEL": "stub-model",
+            "AI_API_BASE": f"http://127.0.0.1:{server.server_port}/v1",
+            "SERPER_API_URL": f"http://127.0.0.1:{server.server_port}/news",
+            "SCORE_CACHE_TTL_HOURS": 0,
+        }
+    }
+
+
+def test_search_planner():
+    """跨订阅计划合并相同的查询与评分，结果与逐个订阅搜索一致"""
+    from ai_search import AISearchPlanner, search_pension_news_with_ai
+
+    server = start_stub()
+    try:
+        configs = {
+            1: make_search_config(server, ["养老金", "养老保险"]),
+            2: make_search_config(server, ["养老保险", "养老金"]),
+            3: make_search_config(server, ["个人养老金"], ["养老金", "养老保险"]),
+        }
+        expected = {idx: search_pension_news_with_ai(config) for idx, config in configs.items()}
+        assert len(server.queries) == 4
+        assert sum(len(r["titles"]) for r in server.requests) == 8 + 8 + 12
+
+        server.queries.clear()
+        server.requests.clear()
+        server.delay = 0.1
+        planner = AISearchPlanner()
+        for idx, config in configs.items():
+            assert planner.add(idx, config)
+        results = planner.run()
+
+        assert results[1] == expected[1] and results[3] == expected[3]
+        # 订阅 2 的关键字只是顺序不同，与订阅 1 合并为一组（桩服务按关键字顺序返回）
+        assert results[2] == results[1]
+        assert sorted(n["url"] for n in results[2]) == sorted(n["url"] for n in expected[2])
+        # 订阅 3 的备用查询与订阅 1、2 的主查询相同，只执行一次
+        assert sorted(server.queries) == ["个人养老金", "养老金 OR 养老保险"], server.queries
+        # 两组评分上下文，每篇文章在各自上下文中只评一次分
+        scored = sum(len(r["titles"]) for r in server.requests)
+        assert scored == 8 + 12, scored
+    finally:
+        server.shutdown()
+
+
+def main():
+    """主函数"""
+    print("=" * 60)
+    print("AI 评分缓存测试")
+    print("=" * 60 + "\n")
+
+    passed = True
+    tests = (
+        test_only_unseen_sent, test_cache_key_context, test_failure_not_cached,
+        test_chunked_scoring, test_search_planner,
+    )
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__doc__}")
+        except AssertionError as e:
+            passed = False
+            print(f"❌ {test.__doc__}: {e}")
+
+    return passed
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,142 @@
+# coding=utf-8
+
+"""
+消息分批测试与基准脚本
+检查 split_content_into_batches 的分批约束，并用 5000 条标题的合成报告测量各推送类型的分批耗时
+"""
+
+import random
+import re
+import sys
+import time
+
+
+NEWS_LINE = re.compile(r"^  \d+\. ", re.MULTILINE)
+FORMAT_TYPES = ["feishu", "dingtalk", "wework", "telegram", "ntfy", "bark", "slack"]
+
+
+def build_report_data(title_count, seed=20240101):
+    """构造合成报告数据（结构同 prepare_report_data 的返回值）"""
+    rng = random.Random(seed)
+    sources = ["微博", "知乎", "百度热搜", "今日头条", "Hacker News"]
+
+    def make_title(index, is_new=False):
+        words = "".join(rng.choice("热点新闻政策科技AI发布会Market ") for _ in range(rng.randint(8, 40)))
+        return {
+            "title": f"{words} #{index}",
+            "source_name": rng.choice(sources),
+            "time_display": rng.choice(["", "08时00分 ~ 10时30分"]),
+            "count": rng.randint(1, 5),
+            "ranks": [rng.randint(1, 30) for _ in range(rng.randint(1, 3))],
+            "rank_threshold": 5,
+            "url": f"https://example.com/news/{index}",
+            "mobile_url": rng.choice(["", f"https://m.example.com/news/{index}"]),
+            "is_new": is_new,
+        }
+
+    stats = []
+    index = 0
+    group_count = max(1, title_count // 100)
+    for group in range(group_count):
+        size = title_count // group_count + (1 if group < title_count % group_count else 0)
+        titles = [make_title(index + j, is_new=rng.random() < 0.2) for j in range(size)]
+        index += size
+        stats.append(
+            {"word": f"关键词{group + 1}", "count": size, "percentage": 0, "titles": titles}
+        )
+
+    new_titles = []
+    for source in sources:
+        titles = [make_title(index + j) for j in range(20)]
+        index += 20
+        new_titles.append({"source_id": source, "source_name": source, "titles": titles})
+
+    return {
+        "stats": stats,
+        "new_titles": new_titles,
+        "failed_ids": ["toutiao", "thepaper"],
+        "total_new_count": sum(len(source["titles"]) for source in new_titles),
+    }
+
+
+def test_batches_respect_limit_and_keep_group_header():
+    """每个批次不超过上限，新闻不丢不重，且词组标题与新闻不被拆开"""
+    from main import split_content_into_batches
+
+    report_data = build_report_data(500)
+    expected_lines = sum(len(stat["titles"]) for stat in report_data["stats"])
+    expected_lines += report_data["total_new_count"]
+    for format_type in FORMAT_TYPES:
+        for max_bytes in (1200, 4000, 20000):
+            batches = split_content_into_batches(report_data, format_type, max_bytes=max_bytes)
+            assert batches, format_type
+            for batch in batches:
+                assert len(batch.encode("utf-8")) <= max_bytes, (format_type, max_bytes)
+
+            # 每条新闻恰好出现一次
+            news_lines = [NEWS_LINE.findall(batch) for batch in batches]
+            assert sum(len(lines) for lines in news_lines) == expected_lines, format_type
+
+            # 每个批次的第一条新闻前必有词组/来源标题
+            for batch, lines in zip(batches, news_lines):
+                if lines:
+                    first_news = NEWS_LINE.search(batch).start()
+                    assert "条" in batch[:first_news], (format_type, max_bytes)
+
+
+def test_truncate_to_bytes():
+    """按字节截断不破坏多字节字符"""
+    from main import _truncate_to_bytes
+
+    for text in ("abc", "中文测试", "a中b文🆕c"):
+        encoded = text.encode("utf-8")
+        for max_bytes in range(len(encoded) + 2):
+            result = _truncate_to_bytes(text, max_bytes)
+            assert encoded.startswith(result.encode("utf-8"))
+            assert len(result.encode("utf-8")) <= max_bytes
+            assert len(result.encode("utf-8")) > max_bytes - 4 or len(encoded) <= max_bytes
+
+
+def benchmark(title_count=5000, repeat=3):
+    """合成报告的分批耗时：首次（含渲染）与再次（仅装箱）"""
+    from main import split_content_into_batches
+
+    print(f"合成报告：{title_count} 条标题")
+    for format_type in FORMAT_TYPES:
+        report_data = build_report_data(title_count)
+        start = time.perf_counter()
+        batches = split_content_into_batches(report_data, format_type)
+        first = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            split_content_into_batches(report_data, format_type)
+        packing = (time.perf_counter() - start) / repeat
+
+        print(
+            f"  {format_type:<9} 批次数 {len(batches):>4}  首次 {first * 1000:8.1f} ms  再次 {packing * 1000:8.1f} ms"
+        )
+
+
+def main():
+    """主函数"""
+    print("=" * 60)
+    print("消息分批测试")
+    print("=" * 60 + "\n")
+
+    passed = True
+    for test in (test_batches_respect_limit_and_keep_group_header, test_truncate_to_bytes):
+        try:
+            test()
+            print(f"✅ {test.__doc__}")
+        except AssertionError as e:
+            passed = False
+            print(f"❌ {test.__doc__}: {e}")
+
+    print()
+    benchmark()
+    return passed
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,182 @@
+# coding=utf-8
+
+"""
+MCP 缓存服务测试脚本
+检查 CacheService 按条目数和字节数淘汰最久未使用的条目、签名变化和过期时失效，
+按天读取的数据在新的 txt 文件落盘后立即刷新，标题字符索引存放在同一个缓存中，
+以及多个线程同时获取全局缓存时只创建一个实例
+"""
+
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+
+def test_lru_eviction():
+    """超出条目数或字节数限额时淘汰最久未使用的条目"""
+    from mcp_server.services.cache_service import CacheService
+
+    cache = CacheService(max_entries=3, max_bytes=1000)
+    for key in ("a", "b", "c"):
+        cache.set(key, key, size=100)
+    # 读取 a 后 b 成为最久未使用
+    assert cache.get("a", ttl=None) == "a"
+    cache.set("d", "d", size=100)
+    assert cache.get("b", ttl=None) is None
+    assert [cache.get(key, ttl=None) for key in ("a", "c", "d")] == ["a", "c", "d"]
+
+    # 字节数超限时淘汰最久未使用的条目，直到回到限额以内
+    cache.set("e", "e", size=800)
+    stats = cache.get_stats()
+    assert stats["total_bytes"] == 1000, stats
+    assert stats["evictions"] == 2, stats
+    assert cache.get("a", ttl=None) is None
+    assert [cache.get(key, ttl=None) for key in ("c", "d", "e")] == ["c", "d", "e"]
+
+    # 单个条目超过总限额时不缓存，也不挤掉已有条目
+    cache.set("huge", "x", size=2000)
+    assert cache.get("huge", ttl=None) is None
+    assert cache.get("e", ttl=None) == "e"
+
+    # 同一键重复写入不重复计数
+    cache.set("e", "e2", size=300)
+    assert cache.get_stats()["total_bytes"] == 500
+
+
+def test_signature_and_ttl():
+    """签名不一致或超过 TTL 的条目失效"""
+    from mcp_server.services.cache_service import CacheService
+
+    cache = CacheService()
+    cache.set("day", {"titles": 1}, signature=("08时00分.txt", 100))
+    assert cache.get("day", ttl=None, signature=("08时00分.txt", 100)) == {"titles": 1}
+    assert cache.get("day", ttl=None, signature=("09时00分.txt", 120)) is None
+    # 失效的条目已被删除
+    assert cache.get("day", ttl=None) is None
+    assert cache.get_stats()["invalidations"] == 1
+
+    cache.set("short", 1)
+    time.sleep(0.05)
+    assert cache.get("short", ttl=0.01) is None
+    assert cache.get_stats()["expirations"] == 1
+
+    calls = []
+    value = cache.get_or_load("loaded", lambda: calls.append(1) or "v", ttl=None, signature="s1")
+    assert value == "v" and cache.get_or_load("loaded", lambda: "w", ttl=None, signature="s1") == "v"
+    assert cache.get_or_load("loaded", lambda: "w", ttl=None, signature="s2") == "w"
+    assert calls == [1]
+
+
+def write_txt(txt_dir, time_info, titles):
+    lines = ["weibo | 微博"]
+    lines += [f"{rank}. {title} [URL:https://weibo.example.com/{rank}]" for rank, title in enumerate(titles, 1)]
+    (txt_dir / f"{time_info}.txt").write_text("\n".join(lines) + "\n\n", encoding="utf-8")
+
+
+def test_day_data_invalidation():
+    """按天读取的数据缓存，在新的 txt 文件落盘后立即刷新"""
+    from mcp_server.services.parser_service import ParserService
+
+    date = datetime(2030, 1, 1)
+    with tempfile.TemporaryDirectory() as root:
+        parser = ParserService(project_root=root)
+        txt_dir = Path(root) / "output" / parser.get_date_folder_name(date) / "txt"
+        txt_dir.mkdir(parents=True)
+        write_txt(txt_dir, "08时00分", ["标题一", "标题二"])
+
+        all_titles, id_to_name, _ = parser.read_all_titles_for_date(date)
+        assert sorted(all_titles["weibo"]) == ["标题一", "标题二"]
+        assert id_to_name == {"weibo": "微博"}
+        assert parser.read_all_titles_for_date(date)[0] is all_titles
+
+        write_txt(txt_dir, "09时00分", ["标题三", "标题一"])
+        all_titles, _, timestamps = parser.read_all_titles_for_date(date)
+        assert sorted(all_titles["weibo"]) == ["标题一", "标题三", "标题二"]
+        assert all_titles["weibo"]["标题一"]["ranks"] == [1, 2]
+        assert sorted(timestamps) == ["08时00分.txt", "09时00分.txt"]
+
+
+def test_similarity_profiles_cached():
+    """标题字符索引按天存入全局缓存（计入字节数），新的 txt 文件落盘后重建"""
+    from mcp_server.services.cache_service import get_cache
+    from mcp_server.services.parser_service import ParserService
+    from mcp_server.services.similarity import SimilarityService
+
+    date = datetime(2030, 1, 2)
+    with tempfile.TemporaryDirectory() as root:
+        parser = ParserService(project_root=root)
+        txt_dir = Path(root) / "output" / parser.get_date_folder_name(date) / "txt"
+        txt_dir.mkdir(parents=True)
+        write_txt(txt_dir, "08时00分", ["标题一", "标题二"])
+
+        service = SimilarityService(parser)
+        assert service.cache is get_cache()
+        before = get_cache().get_stats()["total_bytes"]
+        profiles = service.get_day_profiles(date)
+        assert profiles.titles == ["标题一", "标题二"]
+        assert profiles.memory_size() > 0
+        assert get_cache().get_stats()["total_bytes"] >= before + profiles.memory_size()
+        assert service.get_day_profiles(date) is profiles
+        assert service.get_day_profiles(date, lowercase=True) is not profiles
+
+        write_txt(txt_dir, "09时00分", ["标题三"])
+        refreshed = service.get_day_profiles(date)
+        assert refreshed is not profiles
+        assert sorted(refreshed.titles) == ["标题一", "标题三", "标题二"]
+
+
+def test_global_cache_singleton():
+    """多个线程同时首次获取全局缓存时只创建一个实例"""
+    from mcp_server.services import cache_service
+
+    class SlowCacheService(cache_service.CacheService):
+        def __init__(self, *args, **kwargs):
+            time.sleep(0.05)
+            super().__init__(*args, **kwargs)
+
+    original = cache_service._global_cache, cache_service.CacheService
+    cache_service._global_cache = None
+    cache_service.CacheService = SlowCacheService
+    try:
+        caches = []
+        threads = [
+            threading.Thread(target=lambda: caches.append(cache_service.get_cache()))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(caches) == 8
+        assert len({id(cache) for cache in caches}) == 1
+    finally:
+        cache_service._global_cache, cache_service.CacheService = original
+
+
+def main():
+    """主函数"""
+    print("=" * 60)
+    print("MCP 缓存服务测试")
+    print("=" * 60 + "\n")
+
+    passed = True
+    tests = (
+        test_lru_eviction, test_signature_and_ttl, test_day_data_invalidation,
+        test_similarity_profiles_cached, test_global_cache_singleton,
+    )
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__doc__}")
+        except AssertionError as e:
+            passed = False
+            print(f"❌ {test.__doc__}: {e}")
+
+    return passed
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,274 @@
+# coding=utf-8
+
+"""
+当日增量汇总测试脚本
+在临时目录中模拟多次爬取落盘，检查 DailyAggregate 逐次合并的结果与完整重建一致，
+txt 文件被修改（crc32 不符）后自动重建，爬虫端和 MCP 服务得到的最新批次新增标题一致，
+以及一次运行只落盘一次、只加载一次当日汇总
+"""
+
+import json
+import os
+import sys
+import tempfile
+from contextlib import contextmanager, redirect_stdout
+from io import StringIO
+from pathlib import Path
+
+
+CRAWLS = {
+    "08时00分": {
+        "weibo": ["热搜一", "热搜二", "热搜三"],
+        "zhihu": ["问题一", "问题二"],
+    },
+    "09时00分": {
+        "weibo": ["热搜二", "热搜四", "热搜一"],
+        "zhihu": ["问题二", "问题三"],
+    },
+    "10时00分": {
+        "weibo": ["热搜五", "热搜二"],
+        "baidu": ["百度一"],
+    },
+}
+
+ID_TO_NAME = {"weibo": "微博", "zhihu": "知乎", "baidu": "百度热搜"}
+
+
+@contextmanager
+def day_workspace():
+    """切换到临时目录（先在项目目录加载 main，读取配置文件）"""
+    import main
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        try:
+            yield Path(workdir)
+        finally:
+            os.chdir(cwd)
+
+
+def write_crawl(time_info, platforms):
+    """按爬虫的方式保存一次爬取（txt + 快照 + 汇总）"""
+    import main
+
+    results = {
+        source_id: {
+            title: {"ranks": [rank], "url": f"https://example.com/{source_id}/{title}", "mobileUrl": ""}
+            for rank, title in enumerate(titles, 1)
+        }
+        for source_id, titles in platforms.items()
+    }
+    original = main.format_time_filename
+    main.format_time_filename = lambda: time_info
+    try:
+        with redirect_stdout(StringIO()):
+            main.save_titles_to_file(results, ID_TO_NAME, [])
+    finally:
+        main.format_time_filename = original
+
+
+def day_dir():
+    import main
+
+    return Path("output") / main.format_date_folder()
+
+
+class StubFetcher:
+    """按给定数据返回爬取结果"""
+
+    def __init__(self, results):
+        self.results = results
+
+    def crawl_websites(self, ids, request_interval):
+        id_to_name = {source_id: ID_TO_NAME.get(source_id, source_id) for source_id in self.results}
+        return self.results, id_to_name, []
+
+
+def run_analyzer(time_info, platforms, report_mode, **strategy):
+    """按 NewsAnalyzer.run 的流程执行一次爬取和分析（不推送、不打开浏览器）"""
+    import main
+
+    results = {
+        source_id: {
+            title: {"ranks": [rank], "url": "", "mobileUrl": ""}
+            for rank, title in enumerate(titles, 1)
+        }
+        for source_id, titles in platforms.items()
+    }
+    frequency_file = Path("config") / "frequency_words.txt"
+    frequency_file.parent.mkdir(exist_ok=True)
+    frequency_file.write_text("热搜\n\n问题\n", encoding="utf-8")
+    original = main.format_time_filename, main.CONFIG["PLATFORMS"]
+    main.format_time_filename = lambda: time_info
+    main.CONFIG["PLATFORMS"] = [{"id": source_id, "name": ID_TO_NAME[source_id]} for source_id in ID_TO_NAME]
+    try:
+        with redirect_stdout(StringIO()):
+            analyzer = main.NewsAnalyzer()
+            analyzer.report_mode = report_mode
+            analyzer.is_docker_container = True
+            analyzer.data_fetcher = StubFetcher(results)
+            analyzer._send_notification_if_needed = lambda *args, **kwargs: False
+            analyzer._supplement_with_ai_search = (
+                lambda stats, data_source, title_info, new_titles, *args: (data_source, title_info, new_titles)
+            )
+            mode_strategy = dict(main.NewsAnalyzer.MODE_STRATEGIES[report_mode], **strategy)
+            analyzer._execute_mode_strategy(mode_strategy, *analyzer._crawl_data())
+    finally:
+        main.format_time_filename, main.CONFIG["PLATFORMS"] = original
+
+
+def test_run_saves_once():
+    """一次运行只落盘一次：快照存储和当日汇总各只记录一次爬取"""
+    import main
+
+    with day_workspace():
+        run_analyzer(
+            "08时00分", CRAWLS["08时00分"], "incremental",
+            should_send_realtime=False, should_generate_summary=False,
+        )
+
+        store = main.SnapshotStore(day_dir() / main.SNAPSHOT_FILENAME)
+        records = store._scan(store._read_bytes())[1]
+        crawl_frames = [r for r in records if r[0] == main.SnapshotStore.RECORD_CRAWL]
+        assert len(crawl_frames) == 1, len(crawl_frames)
+        with open(day_dir() / main.DailyAggregate.FILENAME, encoding="utf-8") as f:
+            assert list(json.load(f)["sources"]) == ["08时00分"]
+
+
+def test_aggregate_loaded_once():
+    """实时报告、新增标题和汇总报告共用一次加载的当日汇总"""
+    import main
+
+    original_load = main.DailyAggregate.load
+    calls = []
+
+    def counting_load(self, *args, **kwargs):
+        calls.append(args)
+        return original_load(self, *args, **kwargs)
+
+    main.DailyAggregate.load = counting_load
+    try:
+        for report_mode in ("current", "incremental", "daily"):
+            with day_workspace():
+                write_crawl("08时00分", CRAWLS["08时00分"])
+                calls.clear()
+                run_analyzer("09时00分", CRAWLS["09时00分"], report_mode)
+                assert len(calls) == 1, (report_mode, len(calls))
+    finally:
+        main.DailyAggregate.load = original_load
+
+
+def test_incremental_matches_rebuild():
+    """逐次合并的汇总与从全部快照完整重建的结果一致"""
+    import main
+
+    with day_workspace():
+        for time_info, platforms in CRAWLS.items():
+            write_crawl(time_info, platforms)
+
+        all_results, id_to_name, title_info, _ = main.DailyAggregate().load()
+        rebuilt = main.DailyAggregate().rebuild()
+        assert all_results == rebuilt["all_results"]
+        assert id_to_name == rebuilt["id_to_name"]
+        assert title_info == rebuilt["title_info"]
+
+        assert title_info["weibo"]["热搜二"]["count"] == 3
+        assert title_info["weibo"]["热搜二"]["first_time"] == "08时00分"
+        assert title_info["weibo"]["热搜二"]["last_time"] == "10时00分"
+        assert title_info["weibo"]["热搜一"]["ranks"] == [1, 3]
+
+
+def test_rebuild_on_checksum_mismatch():
+    """txt 文件内容被修改（大小不变、crc32 不符）后汇总按新内容重建"""
+    import main
+
+    with day_workspace():
+        for time_info, platforms in CRAWLS.items():
+            write_crawl(time_info, platforms)
+        main.DailyAggregate().load()
+
+        txt_path = day_dir() / "txt" / "09时00分.txt"
+        content = txt_path.read_text(encoding="utf-8")
+        edited = content.replace("问题三", "问题九")
+        assert len(edited.encode("utf-8")) == len(content.encode("utf-8"))
+        txt_path.write_text(edited, encoding="utf-8")
+
+        _, _, title_info, _ = main.DailyAggregate().load()
+        assert "问题九" in title_info["zhihu"]
+        assert "问题三" not in title_info["zhihu"]
+
+        # 重建后的汇总记录了新的指纹，再次读取不再重建
+        with open(day_dir() / main.DailyAggregate.FILENAME, encoding="utf-8") as f:
+            sources = json.load(f)["sources"]
+        assert sources["09时00分"]["crc"] == main.file_fingerprint(txt_path)[1]
+
+
+def mcp_new_titles():
+    """MCP 服务读取的 (索引结果, 逐次比对结果)"""
+    import main
+    from mcp_server.services.parser_service import ParserService
+
+    service = ParserService(project_root=os.getcwd())
+    # 爬虫按北京时间命名日期目录
+    service.get_date_folder_name = lambda date=None: main.format_date_folder()
+    indexed = service.read_latest_new_titles()[0]
+    diffed = service._diff_latest_snapshot(day_dir())[0]
+    return indexed, diffed
+
+
+def test_new_titles_single_crawl():
+    """当天只有一次爬取时没有新增标题"""
+    import main
+
+    with day_workspace():
+        write_crawl("08时00分", CRAWLS["08时00分"])
+
+        assert main.DailyAggregate().load()[3] == {}
+        with open(day_dir() / main.DailyAggregate.NEW_TITLES_FILENAME, encoding="utf-8") as f:
+            assert json.load(f)["new_titles"] == {}
+        assert mcp_new_titles() == ({}, {})
+
+
+def test_new_titles_two_crawls():
+    """第二次爬取后只有新出现的标题算新增，MCP 索引与逐次比对结果一致"""
+    import main
+
+    with day_workspace():
+        for time_info in ("08时00分", "09时00分"):
+            write_crawl(time_info, CRAWLS[time_info])
+
+        new_titles = main.DailyAggregate().load()[3]
+        assert {k: sorted(v) for k, v in new_titles.items()} == {
+            "weibo": ["热搜四"], "zhihu": ["问题三"]
+        }
+        indexed, diffed = mcp_new_titles()
+        assert indexed == new_titles
+        assert diffed == new_titles
+
+
+def main():
+    """主函数"""
+    print("=" * 60)
+    print("当日增量汇总测试")
+    print("=" * 60 + "\n")
+
+    passed = True
+    tests = (
+        test_incremental_matches_rebuild, test_rebuild_on_checksum_mismatch,
+        test_new_titles_single_crawl, test_new_titles_two_crawls,
+        test_run_saves_once, test_aggregate_loaded_once,
+    )
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__doc__}")
+        except AssertionError as e:
+            passed = False
+            print(f"❌ {test.__doc__}: {e}")
+
+    return passed
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,136 @@
+# coding=utf-8
+
+"""
+合并数据文件测试脚本
+在临时目录中模拟多次爬取落盘，检查 MCP 服务读取的 day_pack.bin 视图与逐个合并 txt 文件
+得到的结果一致（包括平台和标题顺序），不使用 mmap 时结果相同，以及 txt 文件变化后不再使用
+"""
+
+import os
+import sys
+from pathlib import Path
+
+from test_daily_aggregate import CRAWLS, day_dir, day_workspace, write_crawl
+
+
+def as_dicts(all_titles):
+    """视图转换为普通字典（保留顺序）"""
+    return [
+        (platform_id, [(title, dict(info)) for title, info in titles.items()])
+        for platform_id, titles in all_titles.items()
+    ]
+
+
+def load_both():
+    """返回 (合并数据文件的结果, 逐个合并 txt 的结果)"""
+    from mcp_server.services.parser_service import ParserService
+    from mcp_server.services.snapshot_store import txt_file_stats
+    from mcp_server.services.day_pack import get_day_pack_store
+
+    parser = ParserService(project_root=os.getcwd())
+    folder = day_dir()
+    txt_dir = folder / "txt"
+    pack = get_day_pack_store().get(folder, txt_file_stats(txt_dir))
+    assert pack is not None
+
+    txt_files = {f.stem: f for f in txt_dir.glob("*.txt")}
+    txt_stats = {time_info: f.stat() for time_info, f in txt_files.items()}
+    merged = parser._build_day_merge(folder, txt_files, txt_stats).result()
+    return pack, parser._pack_result(pack, folder, txt_stats, None), merged
+
+
+def test_pack_matches_merge():
+    """合并数据文件与逐个合并 txt 文件的结果一致"""
+    with day_workspace():
+        for time_info, platforms in CRAWLS.items():
+            write_crawl(time_info, platforms)
+
+        pack, (packed, packed_names, packed_times), (merged, names, times) = load_both()
+        assert as_dicts(packed) == as_dicts(merged)
+        assert packed_names == names
+        assert packed_times == times
+
+        # 平台过滤与按标题查找
+        filtered = pack.all_titles(["zhihu", "baidu"])
+        assert list(filtered) == [p for p in merged if p in ("zhihu", "baidu")]
+        assert filtered["zhihu"]["问题二"] == merged["zhihu"]["问题二"]
+        assert "不存在" not in filtered["zhihu"]
+
+
+def test_platform_view_reused():
+    """同一平台的视图只建一次，按标题查找不会每次重建索引"""
+    with day_workspace():
+        for time_info, platforms in CRAWLS.items():
+            write_crawl(time_info, platforms)
+
+        pack = load_both()[0]
+        titles = pack.all_titles()
+        assert titles["weibo"] is titles["weibo"]
+        assert pack.all_titles()["weibo"] is titles["weibo"]
+        assert titles["weibo"]["热搜二"]["ranks"] == [2, 1, 2]
+        lookup = titles["weibo"]._lookup
+        assert lookup is not None
+        titles["weibo"]["热搜一"]
+        assert titles["weibo"]._lookup is lookup
+
+
+def test_read_without_mmap():
+    """不使用 mmap（Windows）时读入内存，结果相同"""
+    from mcp_server.services import day_pack
+
+    with day_workspace():
+        for time_info, platforms in CRAWLS.items():
+            write_crawl(time_info, platforms)
+
+        path = day_dir() / day_pack.DAY_PACK_FILENAME
+        mapped = day_pack.DayPack.open(path)
+        day_pack.USE_MMAP = False
+        try:
+            loaded = day_pack.DayPack.open(path)
+        finally:
+            day_pack.USE_MMAP = True
+        assert isinstance(loaded._blob.obj, bytes)
+        assert as_dicts(loaded.all_titles()) == as_dicts(mapped.all_titles())
+
+        # 读入内存后文件不再被占用，可以直接替换
+        os.replace(path, Path(str(path) + ".bak"))
+
+
+def test_stale_pack_ignored():
+    """txt 文件变化后不再使用旧的合并数据文件"""
+    from mcp_server.services.day_pack import get_day_pack_store
+    from mcp_server.services.snapshot_store import txt_file_stats
+
+    with day_workspace():
+        for time_info, platforms in CRAWLS.items():
+            write_crawl(time_info, platforms)
+
+        txt_dir = day_dir() / "txt"
+        (txt_dir / "11时00分.txt").write_text("weibo | 微博\n1. 手工加入\n\n", encoding="utf-8")
+        assert get_day_pack_store().get(day_dir(), txt_file_stats(txt_dir)) is None
+
+
+def main():
+    """主函数"""
+    print("=" * 60)
+    print("合并数据文件测试")
+    print("=" * 60 + "\n")
+
+    passed = True
+    tests = (
+        test_pack_matches_merge, test_platform_view_reused,
+        test_read_without_mmap, test_stale_pack_ignored,
+    )
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__doc__}")
+        except AssertionError as e:
+            passed = False
+            print(f"❌ {test.__doc__}: {e}")
+
+    return passed
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
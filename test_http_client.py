@@ -0,0 +1,139 @@
+# coding=utf-8
+
+"""
+HTTP 客户端测试脚本
+用本地桩服务检查共享 HttpClient 的连接复用、重试策略和统计计数
+"""
+
+import json
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """按路径返回状态码：/status/<code> 依次返回 server.statuses 中的状态码"""
+
+    protocol_version = "HTTP/1.1"  # 支持长连接
+
+    def _reply(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        server = self.server
+        with server.lock:
+            server.calls.append((self.command, self.path))
+            status = server.statuses.pop(0) if server.statuses else 200
+        data = json.dumps({"errcode": 0}).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_GET = _reply
+    do_POST = _reply
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.calls = []
+    server.statuses = []
+    server.lock = threading.Lock()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def test_connection_reuse():
+    """同一主机的请求复用连接"""
+    from main import HttpClient
+
+    server, base_url = start_stub()
+    try:
+        client = HttpClient(pool_size=4, max_retries=0)
+        for i in range(5):
+            assert client.get(f"{base_url}/ping/{i}", timeout=5).status_code == 200
+        client.post(f"{base_url}/push", json={"text": "hello"}, timeout=5)
+
+        stats = client.get_stats()
+        assert stats["requests"] == 6
+        assert stats["connections"] == 1, stats
+        assert stats["reused"] == 5, stats
+        assert list(stats["hosts"]) == [base_url]
+    finally:
+        server.shutdown()
+
+
+def test_retry_policy():
+    """GET 在 5xx 时重试，POST 只在 429 时重试"""
+    from main import HttpClient
+
+    server, base_url = start_stub()
+    try:
+        client = HttpClient(pool_size=4, max_retries=2, backoff=0)
+
+        server.statuses = [503, 502]
+        assert client.get(f"{base_url}/data", timeout=5).status_code == 200
+        assert len(server.calls) == 3
+
+        server.calls.clear()
+        server.statuses = [500]
+        assert client.post(f"{base_url}/push", json={}, timeout=5).status_code == 500
+        assert len(server.calls) == 1
+
+        server.calls.clear()
+        server.statuses = [429]
+        assert client.post(f"{base_url}/push", json={}, timeout=5).status_code == 200
+        assert len(server.calls) == 2
+
+        server.calls.clear()
+        server.statuses = [503]
+        assert client.get(f"{base_url}/data", timeout=5, retries=0).status_code == 503
+        assert len(server.calls) == 1
+
+        assert client.get_stats()["retries"] == 3
+    finally:
+        server.shutdown()
+
+
+def test_senders_share_client():
+    """推送函数与 AI 搜索模块使用全局共享的客户端"""
+    import ai_search
+    from main import HTTP_CLIENT, AI_SEARCH_AVAILABLE, send_wework_message
+
+    server, base_url = start_stub()
+    try:
+        before = HTTP_CLIENT.get_stats()["requests"]
+        send_wework_message(f"{base_url}/webhook", "测试消息")
+        send_wework_message(f"{base_url}/webhook", "测试消息")
+        assert HTTP_CLIENT.get_stats()["requests"] == before + 2
+        assert HTTP_CLIENT.get_stats()["hosts"][base_url]["reused"] >= 1
+        if AI_SEARCH_AVAILABLE:
+            assert ai_search._http_client is HTTP_CLIENT
+    finally:
+        server.shutdown()
+
+
+def main():
+    """主函数"""
+    print("=" * 60)
+    print("HTTP 客户端测试")
+    print("=" * 60 + "\n")
+
+    passed = True
+    for test in (test_connection_reuse, test_retry_policy, test_senders_share_client):
+        try:
+            test()
+            print(f"✅ {test.__doc__}")
+        except AssertionError as e:
+            passed = False
+            print(f"❌ {test.__doc__}: {e}")
+
+    return passed
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
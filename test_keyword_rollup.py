@@ -0,0 +1,100 @@
+# coding=utf-8
+
+"""
+关键词统计一致性测试脚本
+爬虫端（main.py 的 KeywordRollup）和 MCP 服务（keyword_rollup.py）各有一份分词和统计实现，
+检查两者的分词结果一致，以及爬虫写入的统计文件与 MCP 端由同一份 txt 数据计算的统计表一致
+"""
+
+import os
+import sys
+
+from test_daily_aggregate import day_dir, day_workspace, write_crawl
+
+
+CRAWLS = {
+    "08时00分": {
+        "weibo": ["养老金 上调 方案公布", "养老金 并轨，最新进展", "延迟退休 方案 养老金 上调"],
+        "zhihu": ["如何看待 养老金 上调？", "延迟退休 的 影响"],
+    },
+    "09时00分": {
+        "weibo": ["养老金 上调 方案公布", "社保 基数 调整", "延迟退休 方案 养老金 上调"],
+        "baidu": ["养老金 上调 养老金 到账", "社保 基数 调整 https://example.com/a"],
+    },
+}
+
+TITLES = [
+    "养老金 上调 方案公布", "A股 收盘：沪指 涨 1%", "一个 人 的 养老 自己 规划",
+    "https://example.com/x 链接 标题", "重复 重复 重复", "", "   ", "单",
+    "Apple 发布 iPhone、iPad 和 Mac！", "标题【独家】内容……",
+]
+
+
+def test_extract_keywords():
+    """爬虫端与 MCP 端的分词结果一致"""
+    import main
+    from mcp_server.services import keyword_rollup
+
+    assert main.KeywordRollup.STOPWORDS == keyword_rollup.STOPWORDS
+    for title in TITLES + [title for crawl in CRAWLS.values() for titles in crawl.values() for title in titles]:
+        for min_length in (1, 2, 3):
+            assert main.KeywordRollup.extract_keywords(title, min_length) == (
+                keyword_rollup.extract_keywords(title, min_length)
+            ), (title, min_length)
+
+
+def test_rollup_matches():
+    """爬虫写入的统计文件与 MCP 端由 txt 数据计算的统计表一致"""
+    import main
+    from mcp_server.services.keyword_rollup import DayRollup, KeywordRollupService
+    from mcp_server.services.parser_service import ParserService
+
+    with day_workspace():
+        for time_info, platforms in CRAWLS.items():
+            write_crawl(time_info, platforms)
+        assert (day_dir() / main.KeywordRollup.FILENAME).exists()
+
+        parser = ParserService(project_root=os.getcwd())
+        parser.get_date_folder_name = lambda date=None: main.format_date_folder()
+        from_file = KeywordRollupService(parser).get_day_rollup()
+        assert from_file.crawl_keyword_counts, "未使用爬虫写入的统计文件"
+        from_titles = DayRollup.from_titles(*parser.read_all_titles_for_date())
+
+        assert from_file.keyword_counts == from_titles.keyword_counts
+        assert list(from_file.keyword_counts) == list(from_titles.keyword_counts)
+        assert from_file.keyword_samples == from_titles.keyword_samples
+        assert sorted(from_file.pairs) == sorted(from_titles.pairs)
+        assert from_file.platform_counts == from_titles.platform_counts
+        assert from_file.crawl_files == from_titles.crawl_files
+        assert from_file.keyword_counts["养老金"] == 6
+
+        # 按次统计与逐次分词结果一致
+        for time_info, platforms in CRAWLS.items():
+            expected = {}
+            for titles in platforms.values():
+                for title in titles:
+                    for keyword in main.KeywordRollup.extract_keywords(main.clean_title(title)):
+                        expected[keyword] = expected.get(keyword, 0) + 1
+            assert from_file.crawl_keyword_counts[time_info] == expected, time_info
+
+
+def main():
+    """主函数"""
+    print("=" * 60)
+    print("关键词统计一致性测试")
+    print("=" * 60 + "\n")
+
+    passed = True
+    for test in (test_extract_keywords, test_rollup_matches):
+        try:
+            test()
+            print(f"✅ {test.__doc__}")
+        except AssertionError as e:
+            passed = False
+            print(f"❌ {test.__doc__}: {e}")
+
+    return passed
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,101 @@
+# coding=utf-8
+
+"""
+通知并行分发测试脚本
+检查 NotificationDispatcher 并行发送时各任务日志整段输出不交错、不替换全局 sys.stdout，
+以及超时任务记为失败，结束后仍输出其日志
+"""
+
+import io
+import sys
+import threading
+import time
+from contextlib import redirect_stdout
+
+
+def make_sender(name, delay, stdouts, success=True):
+    """构造一个分两段输出日志的发送函数，记录调用时的 sys.stdout"""
+
+    def send(label, log=print):
+        stdouts.append(sys.stdout)
+        log(f"{name}{label} 开始")
+        time.sleep(delay)
+        log(f"{name}{label} 完成")
+        return success
+
+    return send
+
+
+def test_grouped_logs():
+    """各任务日志整段输出，不替换全局 sys.stdout，其他线程的输出不受影响"""
+    import main
+
+    stdouts = []
+    dispatcher = main.NotificationDispatcher(timeout=5)
+    dispatcher.add("feishu", "账号1", make_sender("飞书", 0.2, stdouts), "账号1")
+    dispatcher.add("feishu", "账号2", make_sender("飞书", 0.1, stdouts, success=False), "账号2")
+    dispatcher.add("wework", "", make_sender("企业微信", 0.15, stdouts), "")
+
+    buffer = io.StringIO()
+    with redirect_stdout(buffer):
+        # 分发期间其他线程直接写入原输出
+        other = threading.Thread(target=lambda: (time.sleep(0.05), print("其他线程")))
+        other.start()
+        started = time.monotonic()
+        results = dispatcher.dispatch()
+        elapsed = time.monotonic() - started
+        other.join()
+        assert sys.stdout is buffer
+
+    assert all(stdout is buffer for stdout in stdouts), stdouts
+    assert elapsed < 0.2 + 0.15 + 0.1, elapsed
+    assert results["feishu"]["success"] is True
+    assert [r["success"] for r in results["feishu"]["accounts"]] == [True, False]
+    assert results["feishu"]["accounts"][1]["error"] == "发送失败"
+    assert results["wework"]["success"] is True
+
+    lines = buffer.getvalue().splitlines()
+    assert "其他线程" in lines
+    for name in ("飞书账号1", "飞书账号2", "企业微信"):
+        start = lines.index(f"{name} 开始")
+        assert lines[start + 1] == f"{name} 完成", lines
+
+
+def test_timeout():
+    """超时任务记为失败，结束后仍输出其日志"""
+    import main
+
+    stdouts = []
+    dispatcher = main.NotificationDispatcher(timeout=0.1)
+    dispatcher.add("bark", "", make_sender("Bark", 0.4, stdouts), "")
+
+    buffer = io.StringIO()
+    with redirect_stdout(buffer):
+        results = dispatcher.dispatch()
+        assert results["bark"]["accounts"][0]["error"] == "超时"
+        assert results["bark"]["success"] is False
+        assert buffer.getvalue() == ""
+        time.sleep(0.5)
+    assert buffer.getvalue().splitlines() == ["Bark 开始", "Bark 完成"]
+
+
+def main():
+    """主函数"""
+    print("=" * 60)
+    print("通知并行分发测试")
+    print("=" * 60 + "\n")
+
+    passed = True
+    for test in (test_grouped_logs, test_timeout):
+        try:
+            test()
+            print(f"✅ {test.__doc__}")
+        except AssertionError as e:
+            passed = False
+            print(f"❌ {test.__doc__}: {e}")
+
+    return passed
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
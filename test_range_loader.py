@@ -0,0 +1,94 @@
+# coding=utf-8
+
+"""
+日期范围并发加载测试脚本
+检查 iter_date_range 按日期顺序产出、没有数据的日期产出 None，
+以及多个查询并发时共用同一个有界线程池、单次查询的并发天数不超过 max_workers
+"""
+
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+
+
+def test_ordered_results():
+    """按日期顺序产出，没有数据的日期为 None，完成顺序产出包含全部日期"""
+    from mcp_server.services.range_loader import iter_date_range
+    from mcp_server.utils.errors import DataNotFoundError
+
+    start = datetime(2030, 1, 1)
+    end = start + timedelta(days=5)
+
+    def load(date):
+        # 越早的日期加载越慢
+        time.sleep(0.01 * (end - date).days)
+        if date.day == 3:
+            raise DataNotFoundError("没有数据")
+        return date.day
+
+    results = list(iter_date_range(start, end, load))
+    assert [date.day for date, _ in results] == [1, 2, 3, 4, 5, 6]
+    assert [value for _, value in results] == [1, 2, None, 4, 5, 6]
+
+    unordered = list(iter_date_range(start, end, load, ordered=False))
+    assert sorted(date.day for date, _ in unordered) == [1, 2, 3, 4, 5, 6]
+
+
+def test_shared_bounded_pool():
+    """多个查询并发时共用有界线程池，单次查询并发天数不超过 max_workers"""
+    from mcp_server.services.range_loader import MAX_POOL_WORKERS, iter_date_range
+
+    lock = threading.Lock()
+    thread_names = set()
+    running = {}
+    peak = {}
+
+    def make_load(query):
+        def load(date):
+            with lock:
+                thread_names.add(threading.current_thread().name)
+                running[query] = running.get(query, 0) + 1
+                peak[query] = max(peak.get(query, 0), running[query])
+            time.sleep(0.02)
+            with lock:
+                running[query] -= 1
+            return date
+        return load
+
+    start = datetime(2030, 1, 1)
+    end = start + timedelta(days=9)
+    queries = [
+        threading.Thread(target=lambda q=q: list(iter_date_range(start, end, make_load(q), max_workers=3)))
+        for q in range(6)
+    ]
+    for thread in queries:
+        thread.start()
+    for thread in queries:
+        thread.join()
+
+    assert len(thread_names) <= MAX_POOL_WORKERS, thread_names
+    assert all(name.startswith("date-range") for name in thread_names), thread_names
+    assert max(peak.values()) <= 3, peak
+
+
+def main():
+    """主函数"""
+    print("=" * 60)
+    print("日期范围并发加载测试")
+    print("=" * 60 + "\n")
+
+    passed = True
+    for test in (test_ordered_results, test_shared_bounded_pool):
+        try:
+            test()
+            print(f"✅ {test.__doc__}")
+        except AssertionError as e:
+            passed = False
+            print(f"❌ {test.__doc__}: {e}")
+
+    return passed
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,101 @@
+# coding=utf-8
+
+"""
+标题搜索索引一致性测试脚本
+爬虫端（main.py 的 TitleSearchIndex）和 MCP 服务（DayIndex）各有一份索引实现，
+在临时目录中模拟多次爬取，检查两者由同一份 txt 数据建立的索引和搜索结果一致
+"""
+
+import json
+import os
+import sys
+
+from test_daily_aggregate import CRAWLS, day_dir, day_workspace, write_crawl
+
+
+KEYWORDS = ["热搜", "热搜二", "问题", "题三", "百度一", "一", "", "不存在"]
+
+
+def normalize(platforms, docs, postings):
+    """按平台整理文档（保留首次出现顺序），倒排表换成 (平台, 标题) 集合"""
+    by_platform = {platform_id: [] for platform_id in platforms}
+    for platform_index, title, ranks, url, mobile_url in docs:
+        by_platform[platforms[platform_index]].append((title, ranks, url, mobile_url))
+    keys = [(platforms[doc[0]], doc[1]) for doc in docs]
+    return by_platform, {
+        gram: sorted(keys[doc_id] for doc_id in doc_ids)
+        for gram, doc_ids in postings.items()
+    }
+
+
+def build_both():
+    """返回 (爬虫端索引, 由 txt 重建的爬虫端索引, MCP 端索引)"""
+    import main
+    from mcp_server.services.parser_service import ParserService
+    from mcp_server.services.search_index import DayIndex
+
+    with open(day_dir() / main.TitleSearchIndex.FILENAME, encoding="utf-8") as f:
+        saved = json.load(f)
+
+    rebuilt = main.TitleSearchIndex()
+    for txt_path in sorted((day_dir() / "txt").glob("*.txt")):
+        rebuilt.add_snapshot(main.parse_file_titles(txt_path)[0])
+
+    parser = ParserService(project_root=os.getcwd())
+    parser.get_date_folder_name = lambda date=None: main.format_date_folder()
+    all_titles, id_to_name, _ = parser.read_all_titles_for_date()
+    day_index = DayIndex.from_titles(all_titles, id_to_name)
+    return saved, rebuilt, day_index
+
+
+def test_index_matches():
+    """爬虫写入的索引、由 txt 重建的索引与 MCP 端建立的索引内容一致"""
+    with day_workspace():
+        for time_info, platforms in CRAWLS.items():
+            write_crawl(time_info, platforms)
+
+        saved, rebuilt, day_index = build_both()
+        expected = normalize(day_index.platforms, day_index.docs, day_index.postings)
+        assert normalize(saved["platforms"], saved["docs"], saved["postings"]) == expected
+        assert normalize(rebuilt.platforms, rebuilt.docs, rebuilt.postings) == expected
+        assert expected[0]["weibo"][1][:2] == ("热搜二", [2, 1, 2])
+
+
+def test_search_matches():
+    """读取爬虫写入的索引与 MCP 端重建的索引搜索结果一致"""
+    from mcp_server.services.search_index import DayIndex
+
+    with day_workspace():
+        for time_info, platforms in CRAWLS.items():
+            write_crawl(time_info, platforms)
+
+        saved, _, day_index = build_both()
+        loaded = DayIndex(saved["platforms"], saved["docs"], saved["postings"], day_index.id_to_name)
+        for keyword in KEYWORDS:
+            assert loaded.search(keyword) == day_index.search(keyword), keyword
+            assert loaded.search(keyword, ["zhihu"]) == day_index.search(keyword, ["zhihu"]), keyword
+        assert [title for _, title, _ in day_index.search("热搜")] == [
+            "热搜一", "热搜二", "热搜三", "热搜四", "热搜五"
+        ]
+
+
+def main():
+    """主函数"""
+    print("=" * 60)
+    print("标题搜索索引一致性测试")
+    print("=" * 60 + "\n")
+
+    passed = True
+    for test in (test_index_matches, test_search_matches):
+        try:
+            test()
+            print(f"✅ {test.__doc__}")
+        except AssertionError as e:
+            passed = False
+            print(f"❌ {test.__doc__}: {e}")
+
+    return passed
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,193 @@
+# coding=utf-8
+
+"""
+快照存储测试脚本
+检查 SnapshotStore 追加/读取往返一致、MCP 读取器与爬虫端结果一致，
+末尾残缺帧被忽略并在下次追加前截断，以及 txt 文件被修改后对应快照被跳过
+"""
+
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+
+def make_sections(crawl):
+    """构造一次爬取的 sections（格式同 _prepare_title_sections）"""
+    return [
+        ("weibo", "微博", [
+            (rank, f"微博标题{(crawl + rank) % 7}", f"https://weibo.example.com/{rank}", "")
+            for rank in range(1, 6)
+        ]),
+        ("zhihu", "知乎", [
+            (1, f"知乎问题{crawl}", "", f"https://m.zhihu.example.com/{crawl}")
+        ]),
+        ("empty", "empty", []),
+    ]
+
+
+def expected_titles(sections):
+    """与 parse_file_titles 一致的 (titles_by_id, id_to_name)"""
+    titles_by_id = {}
+    id_to_name = {}
+    for source_id, name, items in sections:
+        if not items:
+            continue
+        id_to_name[source_id] = name
+        titles_by_id[source_id] = {
+            title: {"ranks": [rank], "url": url, "mobileUrl": mobile_url}
+            for rank, title, url, mobile_url in items
+        }
+    return titles_by_id, id_to_name
+
+
+def write_crawls(day_dir, count):
+    """写入 count 次爬取（txt + 快照），返回 {time_info: sections}"""
+    from main import SnapshotStore, SNAPSHOT_FILENAME
+
+    txt_dir = day_dir / "txt"
+    txt_dir.mkdir(parents=True, exist_ok=True)
+    store = SnapshotStore(day_dir / SNAPSHOT_FILENAME)
+    crawls = {}
+    for crawl in range(count):
+        time_info = f"{8 + crawl:02d}时00分"
+        sections = make_sections(crawl)
+        txt_path = txt_dir / f"{time_info}.txt"
+        txt_path.write_text(f"crawl {crawl}\n", encoding="utf-8")
+        store.append(time_info, sections, ["toutiao"] if crawl % 2 else [], txt_path)
+        crawls[time_info] = sections
+    return crawls
+
+
+def test_round_trip():
+    """多次追加后读取结果与写入一致，MCP 读取器结果相同"""
+    from main import SnapshotStore, SNAPSHOT_FILENAME, SNAPSHOT_INDEX_FILENAME
+    from mcp_server.services.snapshot_store import SnapshotReader
+
+    with tempfile.TemporaryDirectory() as tmp:
+        day_dir = Path(tmp)
+        crawls = write_crawls(day_dir, 4)
+        assert (day_dir / SNAPSHOT_INDEX_FILENAME).exists()
+
+        stored = SnapshotStore(day_dir / SNAPSHOT_FILENAME).read(day_dir / "txt")
+        assert sorted(stored) == sorted(crawls)
+        for crawl, (time_info, sections) in enumerate(sorted(crawls.items())):
+            titles_by_id, id_to_name, failed_ids = stored[time_info]
+            assert (titles_by_id, id_to_name) == expected_titles(sections), time_info
+            assert failed_ids == (["toutiao"] if crawl % 2 else [])
+
+        assert SnapshotReader(day_dir / SNAPSHOT_FILENAME).read(day_dir / "txt") == stored
+
+        # 旁路索引只记录末尾偏移和字符串数，不随当天数据增长
+        with open(day_dir / SNAPSHOT_INDEX_FILENAME, encoding="utf-8") as f:
+            index = json.load(f)
+        assert sorted(index) == ["magic", "store_mtime_ns", "store_size", "string_count"], index
+        assert index["store_size"] == (day_dir / SNAPSHOT_FILENAME).stat().st_size
+
+        # 旁路索引有效时追加不完整扫描快照文件
+        store = SnapshotStore(day_dir / SNAPSHOT_FILENAME)
+
+        def fail_read():
+            raise AssertionError("追加时重新扫描了快照文件")
+
+        store._read_bytes = fail_read
+        store.append("12时00分", make_sections(4), [])
+        stored = SnapshotStore(day_dir / SNAPSHOT_FILENAME).read()
+        assert sorted(stored) == sorted(crawls) + ["12时00分"]
+        assert stored["12时00分"][:2] == expected_titles(make_sections(4))
+
+        # 没有旁路索引时按扫描追加，结果相同
+        os.remove(day_dir / SNAPSHOT_INDEX_FILENAME)
+        store = SnapshotStore(day_dir / SNAPSHOT_FILENAME)
+        store.append("13时00分", make_sections(5), [])
+        stored = store.read()
+        assert stored["12时00分"][:2] == expected_titles(make_sections(4))
+        assert stored["13时00分"][:2] == expected_titles(make_sections(5))
+        assert len(stored) == 6
+
+
+def test_truncated_frame():
+    """末尾残缺的帧被忽略，下次追加前截断"""
+    from main import SnapshotStore, SNAPSHOT_FILENAME
+    from mcp_server.services.snapshot_store import SnapshotReader
+
+    with tempfile.TemporaryDirectory() as tmp:
+        day_dir = Path(tmp)
+        crawls = write_crawls(day_dir, 3)
+        path = day_dir / SNAPSHOT_FILENAME
+        # 截断到最后一个爬取帧中间（其后是 txt 状态帧）
+        size = path.stat().st_size - SnapshotStore._FRAME.size - SnapshotStore._TXT_STAT.size
+        with open(path, "r+b") as f:
+            f.truncate(size - 5)
+
+        store = SnapshotStore(path)
+        stored = store.read()
+        assert sorted(stored) == sorted(crawls)[:2]
+        assert SnapshotReader(path).read() == stored
+
+        store.append("11时00分", make_sections(3), [])
+        stored = store.read()
+        assert sorted(stored) == sorted(crawls)[:2] + ["11时00分"]
+        assert stored["11时00分"][:2] == expected_titles(make_sections(3))
+        assert SnapshotReader(path).read() == stored
+
+
+def test_modified_txt_skipped():
+    """txt 文件内容被修改后跳过对应快照，只改 mtime 时仍然使用"""
+    from main import SnapshotStore, SNAPSHOT_FILENAME
+    from mcp_server.services.snapshot_store import SnapshotReader
+
+    with tempfile.TemporaryDirectory() as tmp:
+        day_dir = Path(tmp)
+        write_crawls(day_dir, 3)
+        txt_dir = day_dir / "txt"
+
+        # 大小和 mtime 与记录一致时不计算 crc32
+        import main
+
+        def fail_fingerprint(file_path):
+            raise AssertionError(f"未修改的文件计算了 crc32: {file_path}")
+
+        original = main.file_fingerprint, SnapshotReader.__dict__["file_fingerprint"]
+        main.file_fingerprint = fail_fingerprint
+        SnapshotReader.file_fingerprint = staticmethod(fail_fingerprint)
+        try:
+            for reader in (SnapshotStore(day_dir / SNAPSHOT_FILENAME), SnapshotReader(day_dir / SNAPSHOT_FILENAME)):
+                assert len(reader.read(txt_dir)) == 3, type(reader)
+        finally:
+            main.file_fingerprint, SnapshotReader.file_fingerprint = original
+
+        # 大小不变、mtime 变化：按 crc32 校验，内容相同仍然使用
+        touched = txt_dir / "08时00分.txt"
+        st = touched.stat()
+        os.utime(touched, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+        # 大小不变、内容变化
+        (txt_dir / "09时00分.txt").write_text("crawl X\n", encoding="utf-8")
+        # 大小变化
+        (txt_dir / "10时00分.txt").write_text("crawl 2 edited\n", encoding="utf-8")
+
+        for reader in (SnapshotStore(day_dir / SNAPSHOT_FILENAME), SnapshotReader(day_dir / SNAPSHOT_FILENAME)):
+            assert sorted(reader.read(txt_dir)) == ["08时00分"], type(reader)
+
+
+def main():
+    """主函数"""
+    print("=" * 60)
+    print("快照存储测试")
+    print("=" * 60 + "\n")
+
+    passed = True
+    for test in (test_round_trip, test_truncated_frame, test_modified_txt_skipped):
+        try:
+            test()
+            print(f"✅ {test.__doc__}")
+        except AssertionError as e:
+            passed = False
+            print(f"❌ {test.__doc__}: {e}")
+
+    return passed
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
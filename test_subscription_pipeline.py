@@ -0,0 +1,203 @@
+# coding=utf-8
+
+"""
+订阅并行处理测试脚本
+用本地桩服务模拟小红书接口和企业微信 webhook，检查多个订阅的慢请求互相重叠、
+各订阅日志整段输出不交错且不替换全局 sys.stdout，以及超过处理时限的订阅记为失败且不再推送
+"""
+
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from contextlib import redirect_stdout
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """/xhs 延迟后返回两条笔记，/webhook 记录推送内容"""
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        server = self.server
+        if self.path == "/xhs":
+            time.sleep(server.delay)
+            keyword = body["keyword"]
+            payload = {"data": {"articles": [
+                {"id": f"{keyword}-{i}", "title": f"{keyword}笔记{i}", "likes": 10 - i,
+                 "link": f"https://xhs.example.com/{keyword}/{i}"}
+                for i in range(2)
+            ]}}
+        else:
+            with server.lock:
+                server.pushes.append(self.path)
+            payload = {"errcode": 0}
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub(delay):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.delay = delay
+    server.pushes = []
+    server.lock = threading.Lock()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class StubSubscriptionManager:
+    """只提供流水线用到的方法，记录调用时的 sys.stdout"""
+
+    def __init__(self):
+        self.stdouts = []
+
+    def print_match_summary(self, subscription, shown, total, log=print):
+        self.stdouts.append(sys.stdout)
+        log(f"   匹配 {shown}/{total} 条")
+
+    def get_webhooks(self, subscription):
+        return subscription.get("webhooks", [])
+
+
+def make_subscriptions(server, count):
+    base = f"http://127.0.0.1:{server.server_port}"
+    return [
+        {
+            "id": f"sub_{i}",
+            "name": f"订阅{i}",
+            "keywords": {"normal": [f"关键词{i}"]},
+            "xhs": {"enabled": True, "keywords": [f"关键词{i}"]},
+            "webhooks": [{"name": f"群{i}", "type": "wework", "url": f"{base}/webhook/{i}"}],
+        }
+        for i in range(1, count + 1)
+    ]
+
+
+def run_pipeline(server, subscriptions, ai_future=None, **kwargs):
+    """在临时目录中运行流水线，返回 (成功数, 失败数, 日志, 耗时, 小红书历史)"""
+    import main
+
+    match_results = [
+        ([{"title": f"{sub['name']}新闻", "platform": "微博", "platform_id": "weibo",
+           "rank": 1, "url": f"https://example.com/{sub['id']}", "mobileUrl": "", "ranks": [1]}], 1)
+        for sub in subscriptions
+    ]
+    main.CONFIG["xhs"] = {"enabled": True, "base_url": f"http://127.0.0.1:{server.server_port}/xhs",
+                          "timeout_seconds": 30}
+    cwd = os.getcwd()
+    buffer = io.StringIO()
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        try:
+            manager = StubSubscriptionManager()
+            pipeline = main.SubscriptionPipeline(manager, **kwargs)
+            started = time.monotonic()
+            with redirect_stdout(buffer):
+                success, fail = pipeline.run(
+                    subscriptions, match_results, ai_future,
+                    set(range(1, len(subscriptions) + 1)) if ai_future else None
+                )
+            elapsed = time.monotonic() - started
+            # 工作线程不替换全局 sys.stdout
+            assert all(stdout is buffer for stdout in manager.stdouts), manager.stdouts
+            history_path = os.path.join("output", "xhs_history.json")
+            history = {}
+            if os.path.exists(history_path):
+                with open(history_path, encoding="utf-8") as f:
+                    history = json.load(f)
+        finally:
+            os.chdir(cwd)
+            main.CONFIG.pop("xhs", None)
+    return success, fail, buffer.getvalue(), elapsed, history
+
+
+def test_overlap_and_grouped_logs():
+    """多个订阅的小红书请求重叠进行，日志按订阅整段输出，历史记录不丢失"""
+    server = start_stub(delay=0.5)
+    try:
+        subscriptions = make_subscriptions(server, 4)
+        success, fail, log, elapsed, history = run_pipeline(
+            server, subscriptions, max_workers=4, deadline_seconds=30
+        )
+        assert (success, fail) == (4, 0), (success, fail)
+        assert elapsed < 4 * 0.5, elapsed
+        assert sorted(server.pushes) == [f"/webhook/{i}" for i in range(1, 5)]
+        # 并行写入的历史记录全部保留
+        assert sorted(history) == [sub["id"] for sub in subscriptions], history
+
+        # 每个订阅从标题行到完成行之间不夹杂其他订阅的日志
+        for i in range(1, 5):
+            start = log.index(f"处理订阅: 订阅{i}")
+            end = log.index(f"订阅 [订阅{i}] 完成")
+            block = log[start:end]
+            for j in range(1, 5):
+                if j != i:
+                    assert f"订阅{j}" not in block, (i, j)
+    finally:
+        server.shutdown()
+
+
+def test_deadline():
+    """超过处理时限的订阅记为失败，不再推送"""
+    server = start_stub(delay=0.6)
+    try:
+        subscriptions = make_subscriptions(server, 2)
+        success, fail, log, elapsed, _ = run_pipeline(
+            server, subscriptions, max_workers=2, deadline_seconds=0.3
+        )
+        assert (success, fail) == (0, 2), (success, fail)
+        assert server.pushes == []
+        assert "处理超时" in log
+        assert elapsed < 0.6 + 0.3, elapsed
+    finally:
+        server.shutdown()
+
+
+def test_ai_wait_timeout():
+    """AI 搜索结果超过处理时限未返回时按超时处理"""
+    from concurrent.futures import Future
+
+    server = start_stub(delay=0)
+    try:
+        subscriptions = make_subscriptions(server, 1)
+        _, fail, log, elapsed, _ = run_pipeline(
+            server, subscriptions, ai_future=Future(), max_workers=1, deadline_seconds=0.3
+        )
+        assert "AI搜索超过处理时限" in log, log
+        assert "AI搜索失败" not in log
+        assert fail == 1 and server.pushes == []
+        assert elapsed < 1, elapsed
+    finally:
+        server.shutdown()
+
+
+def main():
+    """主函数"""
+    print("=" * 60)
+    print("订阅并行处理测试")
+    print("=" * 60 + "\n")
+
+    passed = True
+    for test in (test_overlap_and_grouped_logs, test_deadline, test_ai_wait_timeout):
+        try:
+            test()
+            print(f"✅ {test.__doc__}")
+        except AssertionError as e:
+            passed = False
+            print(f"❌ {test.__doc__}: {e}")
+
+    return passed
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
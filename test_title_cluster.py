@@ -0,0 +1,140 @@
+# coding=utf-8
+
+"""
+近似标题聚类测试脚本
+检查 TitleClusterer 的聚类约束，并与逐一比较全部聚类代表的暴力实现对比召回率
+"""
+
+import random
+import sys
+
+
+SOURCES = ["微博", "知乎", "百度热搜", "今日头条", "抖音"]
+
+
+def build_titles(story_count=300, seed=20240101):
+    """构造合成标题：每个事件在若干平台各有一条改写过几个字的标题"""
+    rng = random.Random(seed)
+    alphabet = "国务院发布新政策科技公司推出人工智能模型股市大涨球队夺冠演员回应网友热议"
+    items = []
+    for story in range(story_count):
+        base = "".join(rng.choice(alphabet) for _ in range(rng.randint(10, 24)))
+        for source in rng.sample(SOURCES, rng.randint(1, len(SOURCES))):
+            chars = list(base)
+            for _ in range(rng.randint(0, 2)):
+                chars[rng.randrange(len(chars))] = rng.choice(alphabet)
+            punctuation = rng.choice(["", "！", "：", " "])
+            items.append((story, "".join(chars) + punctuation, source))
+    rng.shuffle(items)
+    return items
+
+
+def brute_force_assign(items, threshold):
+    """暴力实现：与全部聚类代表比较，规则同 TitleClusterer.assign"""
+    from main import TitleClusterer
+
+    clusters = []
+    assigned = []
+    for _, title, source in items:
+        shingles = TitleClusterer.shingles(TitleClusterer.normalize(title))
+        cluster_id = None
+        if len(shingles) >= TitleClusterer.MIN_SHINGLES:
+            best_score = threshold
+            for candidate, (rep_shingles, sources) in enumerate(clusters):
+                if not rep_shingles or source in sources:
+                    continue
+                score = len(shingles & rep_shingles) / len(shingles | rep_shingles)
+                if score >= best_score and (cluster_id is None or score > best_score):
+                    cluster_id, best_score = candidate, score
+        if cluster_id is None:
+            cluster_id = len(clusters)
+            clusters.append((shingles if len(shingles) >= TitleClusterer.MIN_SHINGLES else frozenset(), {source}))
+        else:
+            clusters[cluster_id][1].add(source)
+        assigned.append(cluster_id)
+    return assigned
+
+
+def test_cluster_constraints():
+    """聚类内平台不重复、与代表的相似度达到阈值、结果可复现"""
+    from main import TitleClusterer
+
+    items = build_titles()
+    clusterer = TitleClusterer(0.5)
+    assigned = [clusterer.assign(title, source) for _, title, source in items]
+    again = TitleClusterer(0.5)
+    assert assigned == [again.assign(title, source) for _, title, source in items]
+
+    representatives = {}
+    members = {}
+    for (_, title, source), cluster_id in zip(items, assigned):
+        shingles = TitleClusterer.shingles(TitleClusterer.normalize(title))
+        rep = representatives.setdefault(cluster_id, shingles)
+        assert len(shingles & rep) / len(shingles | rep) >= 0.5, title
+        sources = members.setdefault(cluster_id, [])
+        assert source not in sources, (title, source)
+        sources.append(source)
+
+    assert len(set(assigned)) < len(items)
+
+
+def test_recall_against_brute_force():
+    """LSH 候选应覆盖暴力实现找到的几乎全部合并"""
+    from main import TitleClusterer
+
+    items = build_titles()
+    clusterer = TitleClusterer(0.5)
+    fast = [clusterer.assign(title, source) for _, title, source in items]
+    slow = brute_force_assign(items, 0.5)
+
+    merged_fast = len(items) - len(set(fast))
+    merged_slow = len(items) - len(set(slow))
+    assert merged_fast >= merged_slow * 0.95, (merged_fast, merged_slow)
+
+
+def test_merge_titles():
+    """合并后保留首条并记录其余平台，订阅去重同样合并近似标题"""
+    from main import deduplicate_news_items, merge_clustered_titles, TitleClusterer
+
+    titles = [
+        {"title": "某公司发布新一代人工智能大模型", "source_name": "微博"},
+        {"title": "某公司发布新一代人工智能大模型！", "source_name": "知乎"},
+        {"title": "某公司正式发布新一代人工智能大模型", "source_name": "百度热搜"},
+        {"title": "球队夺得联赛冠军", "source_name": "微博"},
+    ]
+    merged = merge_clustered_titles(titles, TitleClusterer(0.5))
+    assert [item["title"] for item in merged] == [titles[0]["title"], titles[3]["title"]]
+    assert merged[0]["cluster_sources"] == ["知乎", "百度热搜"]
+    assert merged[1]["cluster_sources"] == []
+    assert "cluster_id" not in titles[0]
+
+    news = [
+        {"title": item["title"], "platform": item["source_name"], "url": f"https://example.com/{i}"}
+        for i, item in enumerate(titles)
+    ]
+    deduped = deduplicate_news_items(news)
+    # 只差标点的标题已按归一化标题去掉，近似标题并入聚类
+    assert len(deduped) == 2
+    assert deduped[0]["cluster_sources"] == ["百度热搜"]
+
+
+def main():
+    """主函数"""
+    print("=" * 60)
+    print("近似标题聚类测试")
+    print("=" * 60 + "\n")
+
+    passed = True
+    for test in (test_cluster_constraints, test_recall_against_brute_force, test_merge_titles):
+        try:
+            test()
+            print(f"✅ {test.__doc__}")
+        except AssertionError as e:
+            passed = False
+            print(f"❌ {test.__doc__}: {e}")
+
+    return passed
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
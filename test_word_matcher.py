@@ -0,0 +1,161 @@
+# coding=utf-8
+
+"""
+频率词匹配器一致性测试脚本
+对比编译后的 WordGroupMatcher 与原逐词 `in` 判断实现的结果，确保完全一致，
+并检查频率词和订阅匹配共用同一个 KeywordAutomaton
+"""
+
+import random
+import sys
+from pathlib import Path
+
+
+def legacy_find_group(title, word_groups, filter_words, global_filters=None):
+    """原实现：matches_word_groups + count_word_frequency 中的词组查找，返回词组下标/-1/None"""
+    if not isinstance(title, str):
+        title = str(title) if title is not None else ""
+    if not title.strip():
+        return None
+
+    title_lower = title.lower()
+
+    if global_filters:
+        if any(global_word.lower() in title_lower for global_word in global_filters):
+            return None
+
+    if not word_groups:
+        return -1
+
+    if any(filter_word.lower() in title_lower for filter_word in filter_words):
+        return None
+
+    for index, group in enumerate(word_groups):
+        required_words = group["required"]
+        normal_words = group["normal"]
+
+        if required_words:
+            if not all(req_word.lower() in title_lower for req_word in required_words):
+                continue
+
+        if normal_words:
+            if not any(normal_word.lower() in title_lower for normal_word in normal_words):
+                continue
+
+        return index
+
+    return None
+
+
+def load_real_titles():
+    """读取 output 目录下已有的全部标题"""
+    from main import parse_file_titles
+
+    titles = []
+    for txt_file in sorted(Path("output").glob("*/txt/*.txt")):
+        titles_by_id, _ = parse_file_titles(txt_file)
+        for source_titles in titles_by_id.values():
+            titles.extend(source_titles.keys())
+    return titles
+
+
+def random_case(rng, alphabet):
+    """随机生成一组词组配置"""
+    def word():
+        return "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 3)))
+
+    word_groups = []
+    for index in range(rng.randint(0, 30)):
+        required = [word() for _ in range(rng.choice([0, 0, 1, 2]))]
+        normal = [word() for _ in range(rng.randint(0 if required else 1, 4))]
+        word_groups.append(
+            {
+                "required": required,
+                "normal": normal,
+                "group_key": " ".join(normal or required) + f"#{index}",
+                "max_count": 0,
+            }
+        )
+    filter_words = [word() for _ in range(rng.randint(0, 3))]
+    global_filters = [word() for _ in range(rng.randint(0, 2))]
+    return word_groups, filter_words, global_filters
+
+
+def test_matcher_with_config():
+    """使用 config/frequency_words.txt 与真实标题对比"""
+    from main import load_frequency_words, WordGroupMatcher
+
+    word_groups, filter_words, global_filters = load_frequency_words()
+    titles = load_real_titles() + ["", "   ", None, 123, "ABC abc Ａ"]
+    matcher = WordGroupMatcher(word_groups, filter_words, global_filters)
+
+    for title in titles:
+        expected = legacy_find_group(title, word_groups, filter_words, global_filters)
+        assert matcher.find_group_index(title) == expected, title
+
+
+def test_matcher_randomized():
+    """随机词组与标题对比，覆盖重叠词、大小写、空词组等情况"""
+    from main import WordGroupMatcher, matches_word_groups
+
+    rng = random.Random(20240101)
+    alphabet = list("养老金保险改革政策AIaiAbB ")
+    titles = [
+        "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 25)))
+        for _ in range(300)
+    ]
+
+    for _ in range(200):
+        word_groups, filter_words, global_filters = random_case(rng, alphabet)
+        matcher = WordGroupMatcher(word_groups, filter_words, global_filters)
+        for title in titles:
+            expected = legacy_find_group(title, word_groups, filter_words, global_filters)
+            assert matcher.find_group_index(title) == expected, (title, word_groups)
+            assert matches_word_groups(
+                title, word_groups, filter_words, global_filters
+            ) == (expected is not None)
+
+
+def test_shared_automaton():
+    """频率词与订阅匹配共用 keyword_automaton 中的自动机，命中结果与 `in` 判断一致"""
+    import main
+    import subscription_manager
+    from keyword_automaton import KeywordAutomaton
+
+    assert main.KeywordAutomaton is KeywordAutomaton
+    assert subscription_manager.KeywordAutomaton is KeywordAutomaton
+
+    rng = random.Random(20240102)
+    alphabet = list("养老金保险aAb")
+    for _ in range(200):
+        patterns = [
+            "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 4)))
+            for _ in range(rng.randint(0, 12))
+        ]
+        automaton = KeywordAutomaton(patterns)
+        for _ in range(20):
+            text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 20)))
+            expected = {index for index, pattern in enumerate(patterns) if pattern in text}
+            assert automaton.find_ids(text) == expected, (patterns, text)
+
+
+def main():
+    """主函数"""
+    print("=" * 60)
+    print("频率词匹配器一致性测试")
+    print("=" * 60 + "\n")
+
+    passed = True
+    for test in (test_matcher_with_config, test_matcher_randomized, test_shared_automaton):
+        try:
+            test()
+            print(f"✅ {test.__doc__}")
+        except AssertionError as e:
+            passed = False
+            print(f"❌ {test.__doc__}: {e}")
+
+    return passed
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)